@@ -11,6 +11,7 @@ from typing import Dict, Any
 from datetime import datetime
 
 from .core.load_test import LoadTest
+from .core.distributed import Controller, Worker, DEFAULT_PORT
 from .reporting.report_generator import ReportGenerator
 from .schema_validator import SchemaValidator
 from .logging_setup import setup_logging, get_logger
@@ -39,8 +40,10 @@ def main():
 @click.option('--ci-mode', is_flag=True, help='Modo CI/CD (sem saída interativa)')
 @click.option('--output-dir', type=click.Path(), default='./results', 
               help='Diretório para salvar resultados')
+@click.option('--workers', type=click.IntRange(min=1), default=None,
+              help='Número de processos para dividir os usuários virtuais')
 @click.option('--verbose', '-v', is_flag=True, help='Modo verbose')
-def run(config_file, ci_mode, output_dir, verbose):
+def run(config_file, ci_mode, output_dir, workers, verbose):
     """
     Executa um teste de carga a partir de arquivo de configuração
     
@@ -48,6 +51,7 @@ def run(config_file, ci_mode, output_dir, verbose):
     Exemplo:
         mobileloadx run config.yaml
         mobileloadx run config.yaml --output-dir ./my-results --verbose
+        mobileloadx run config.yaml --workers 8
     """
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -57,6 +61,8 @@ def run(config_file, ci_mode, output_dir, verbose):
         
         # Criar teste a partir do arquivo de configuração
         test = LoadTest(name="CLI Test", config_file=config_file)
+        if workers:
+            test.workers = workers
         
         click.echo(f"▶️  Iniciando teste: {test.name}")
         click.echo(f"   Usuários: {test.max_virtual_users} | Duração: {test.duration}s")
@@ -64,65 +70,285 @@ def run(config_file, ci_mode, output_dir, verbose):
         # Executar teste
         results = test.run()
         
-        # Criar diretório de saída
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        # Gerar relatórios
-        click.echo("\n📄 Gerando relatórios...")
-        generator = ReportGenerator(results)
-        
-        html_file = output_path / "report.html"
-        json_file = output_path / "report.json"
-        csv_file = output_path / "report.csv"
-        
-        generator.generate_html(str(html_file))
-        generator.generate_json(str(json_file))
-        generator.generate_csv(str(csv_file))
-        
-        # Exibir resumo
-        click.echo("\n" + "="*60)
-        click.echo("📊 RESULTADOS DO TESTE")
-        click.echo("="*60)
-        click.echo(f"Teste: {results.test_name}")
-        click.echo(f"Duração: {results.duration:.1f}s")
-        click.echo(f"Usuários simultâneos: {results.max_concurrent_users}")
+        _report_results(results, output_dir)
+    
+    except Exception as e:
+        click.secho(f"\n❌ Erro: {e}", fg='red', bold=True)
+        if verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+
+def _report_results(results, output_dir: str):
+    """Gera os relatórios, exibe o resumo e encerra com o status dos thresholds"""
+    # Criar diretório de saída
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    # Gerar relatórios
+    click.echo("\n📄 Gerando relatórios...")
+    generator = ReportGenerator(results)
+    
+    html_file = output_path / "report.html"
+    json_file = output_path / "report.json"
+    csv_file = output_path / "report.csv"
+    
+    generator.generate_html(str(html_file))
+    generator.generate_json(str(json_file))
+    generator.generate_csv(str(csv_file))
+    
+    # Exibir resumo
+    click.echo("\n" + "="*60)
+    click.echo("📊 RESULTADOS DO TESTE")
+    click.echo("="*60)
+    click.echo(f"Teste: {results.test_name}")
+    click.echo(f"Duração: {results.duration:.1f}s")
+    click.echo(f"Usuários simultâneos: {results.max_concurrent_users}")
+    
+    if results.warmup:
+        warmup = results.warmup
+        click.echo(f"\n🔥 WARM-UP (fora da medição)")
+        click.echo(
+            f"  Duração: {warmup['duration']:.1f}s | Sessões prontas: {warmup['ready']} | Falhas: {warmup['failed']}"
+        )
+        for device, stats in warmup['devices'].items():
+            click.echo(
+                f"  {device}: média {stats['avg']:.2f}s, máx. {stats['max']:.2f}s ({stats['count']} sessão(ões))"
+            )
+    
+    click.echo(f"\n📈 AÇÕES")
+    click.echo(f"  Total: {results.total_actions}")
+    click.echo(f"  Sucesso: {results.successful_actions} ({results.success_rate:.1f}%)")
+    click.echo(f"  Falhas: {results.failed_actions} ({results.error_rate:.1f}%)")
+    
+    click.echo(f"\n⏱️  TEMPO DE RESPOSTA")
+    click.echo(f"  Média: {results.response_time_avg:.0f}ms")
+    click.echo(f"  P95: {results.response_time_p95:.0f}ms")
+    click.echo(f"  P99: {results.response_time_p99:.0f}ms")
+    
+    if len(results.platforms) > 1:
+        click.echo(f"\n🧩 POR PLATAFORMA")
+        for platform, stats in results.platforms.items():
+            click.echo(
+                f"  {platform}: {stats['count']} ações, {stats['success_rate']:.1f}% sucesso, "
+                f"média {stats['avg_duration'] * 1000:.0f}ms, P95 {stats['p95'] * 1000:.0f}ms"
+            )
+    
+    if results.transactions:
+        click.echo(f"\n🧾 TRANSAÇÕES")
+        for name, stats in results.transactions.items():
+            click.echo(
+                f"  {name}: {stats['count']} execuções, {stats['error_rate']:.1f}% erro, "
+                f"média {stats['avg'] * 1000:.0f}ms, P95 {stats['p95'] * 1000:.0f}ms"
+            )
+    
+    if results.steps:
+        # As ações mais lentas em média, com a parte gasta buscando o elemento
+        slowest = sorted(
+            ((scenario, step, stats) for scenario, steps in results.steps.items() for step, stats in steps.items()),
+            key=lambda item: item[2]['avg'],
+            reverse=True
+        )[:5]
+        click.echo(f"\n🐢 AÇÕES MAIS LENTAS")
+        for scenario, step, stats in slowest:
+            click.echo(
+                f"  {scenario} › {step}: média {stats['avg'] * 1000:.0f}ms "
+                f"(busca {stats['lookup_avg'] * 1000:.0f}ms, polling {stats.get('poll_wait_avg', 0) * 1000:.0f}ms, "
+                f"interação {stats['interaction_avg'] * 1000:.0f}ms), "
+                f"P95 {stats['p95'] * 1000:.0f}ms"
+            )
         
-        click.echo(f"\n📈 AÇÕES")
-        click.echo(f"  Total: {results.total_actions}")
-        click.echo(f"  Sucesso: {results.successful_actions} ({results.success_rate:.1f}%)")
-        click.echo(f"  Falhas: {results.failed_actions} ({results.error_rate:.1f}%)")
+        # Ações repetidas pela política de falha (tempo fora da duração medida)
+        retried = [
+            (scenario, step, stats) for scenario, steps in results.steps.items()
+            for step, stats in steps.items() if stats.get('retries')
+        ]
+        if retried:
+            click.echo(f"\n🔁 NOVAS TENTATIVAS")
+            for scenario, step, stats in retried:
+                click.echo(f"  {scenario} › {step}: {stats['retries']} tentativa(s), {stats['retry_time']:.1f}s")
+    
+    if results.iterations:
+        iterations = results.iterations
+        click.echo(f"\n🗓️  ITERAÇÕES")
+        click.echo(f"  Agendadas: {iterations['scheduled']}")
+        click.echo(f"  Iniciadas: {iterations['started']} (atrasadas: {iterations['late']})")
+        click.echo(f"  Descartadas: {iterations['dropped']}")
+        click.echo(f"  Atraso médio: {iterations['avg_lag'] * 1000:.0f}ms (máx. {iterations['max_lag'] * 1000:.0f}ms)")
+    
+    if results.sessions:
+        sessions = results.sessions
+        click.echo(f"\n🔌 SESSÕES")
+        click.echo(
+            f"  Criadas: {sessions['created']} | Tempo médio: {sessions['create_avg']:.2f}s | "
+            f"P95: {sessions['create_p95']:.2f}s"
+        )
+        if sessions['pool_hits'] or sessions['pool_misses']:
+            click.echo(
+                f"  Pool: {sessions['pool_hits']} hit(s) | {sessions['pool_misses']} miss(es) | "
+                f"Taxa: {sessions['pool_hit_rate'] * 100:.1f}%"
+            )
+    
+    if results.element_cache:
+        element_cache = results.element_cache
+        click.echo(f"\n🧩 CACHE DE ELEMENTOS")
+        click.echo(
+            f"  {element_cache['hits']} hit(s) | {element_cache['misses']} miss(es) | "
+            f"Taxa: {element_cache['hit_rate'] * 100:.1f}%"
+        )
+        click.echo(f"  Buscas evitadas: {element_cache['lookups_saved']} | Handles expirados: {element_cache['stale']}")
+    
+    if results.device_wait:
+        device_wait = results.device_wait
+        click.echo(f"\n⏳ ESPERA POR DEVICE")
+        click.echo(
+            f"  Média: {device_wait['avg'] * 1000:.0f}ms | P95: {device_wait['p95'] * 1000:.0f}ms | "
+            f"Máx.: {device_wait['max'] * 1000:.0f}ms"
+        )
+        if device_wait['timeouts']:
+            click.echo(f"  Sem device no prazo: {device_wait['timeouts']}")
+    
+    if results.drain.get('in_flight'):
+        drain = results.drain
+        click.echo(f"\n⏹️  ENCERRAMENTO")
+        click.echo(f"  Em andamento no fim: {drain['in_flight']} | Drain: {drain['overrun']:.1f}s")
+        click.echo(f"  Fora da janela (não medidos): {drain['overtime_actions']}")
+        if drain['hard_stop']:
+            click.echo(f"  Hard stop: {drain['cancelled']} cenário(s) cancelado(s)")
+    
+    if results.session_health:
+        health = results.session_health
+        click.echo(f"\n🩺 SAÚDE DAS SESSÕES")
+        click.echo(
+            f"  Sessões perdidas: {health['lost']} | Recriadas: {health['recovered']} | "
+            f"Tentativas: {health['recreate_attempts']}"
+        )
+        click.echo(f"  Tempo sem sessão: {health['downtime_total']:.1f}s (máx. {health['downtime_max']:.1f}s)")
+        for device, opens in health['circuit_opens'].items():
+            click.echo(f"  Circuito aberto em {device}: {opens}x")
+    
+    click.echo(f"\n📱 DEVICE")
+    click.echo(f"  CPU média: {results.avg_cpu:.1f}%")
+    click.echo(f"  Memória pico: {results.peak_memory:.1f}MB")
+    
+    # Thresholds
+    if results.thresholds:
+        click.echo(f"\n🎯 THRESHOLDS")
+        threshold_results = results.check_thresholds()
+        for metric, passed in threshold_results.items():
+            status = "✅" if passed else "❌"
+            click.echo(f"  {status} {metric}")
+    
+    click.echo(f"\n📁 Relatórios salvos em: {output_path.absolute()}")
+    click.echo(f"  - {html_file.name}")
+    click.echo(f"  - {json_file.name}")
+    click.echo(f"  - {csv_file.name}")
+    
+    # Status final
+    if results.passed_thresholds:
+        click.secho("\n✅ TESTE PASSOU", fg='green', bold=True)
+        sys.exit(0)
+    else:
+        click.secho("\n❌ TESTE FALHOU", fg='red', bold=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('config_file', type=click.Path(exists=True))
+@click.option('--bind', default='0.0.0.0', show_default=True, help='Endereço de escuta')
+@click.option('--port', type=int, default=DEFAULT_PORT, show_default=True, help='Porta de escuta')
+@click.option('--expect-workers', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Número de workers aguardados antes de iniciar')
+@click.option('--register-timeout', type=float, default=60, show_default=True,
+              help='Tempo máximo de espera pelos workers (segundos)')
+@click.option('--output-dir', type=click.Path(), default='./results',
+              help='Diretório para salvar resultados')
+@click.option('--verbose', '-v', is_flag=True, help='Modo verbose')
+def controller(config_file, bind, port, expect_workers, register_timeout, output_dir, verbose):
+    """
+    Distribui um teste de carga entre workers remotos
+    
+    \b
+    Exemplo:
+        mobileloadx controller config.yaml --expect-workers 6
+        mobileloadx controller config.yaml --bind 127.0.0.1 --port 6000
+    """
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
+    try:
+        click.echo(f"🚀 Carregando configuração: {config_file}")
+        test = LoadTest(name="CLI Test", config_file=config_file)
         
-        click.echo(f"\n⏱️  TEMPO DE RESPOSTA")
-        click.echo(f"  Média: {results.response_time_avg:.0f}ms")
-        click.echo(f"  P95: {results.response_time_p95:.0f}ms")
-        click.echo(f"  P99: {results.response_time_p99:.0f}ms")
+        distributed_controller = Controller(test, host=bind, port=port, expected_workers=expect_workers)
+        try:
+            click.echo(f"📡 Aguardando {expect_workers} worker(s) em {bind}:{distributed_controller.port}")
+            registered = distributed_controller.wait_for_workers(timeout=register_timeout)
+            click.echo(f"✅ {registered} worker(s) registrado(s)")
+            
+            click.echo(f"▶️  Iniciando teste: {test.name}")
+            click.echo(f"   Usuários: {test.max_virtual_users} | Duração: {test.duration}s")
+            
+            test.runner = distributed_controller
+            results = test.run()
+        finally:
+            distributed_controller.close()
         
-        click.echo(f"\n📱 DEVICE")
-        click.echo(f"  CPU média: {results.avg_cpu:.1f}%")
-        click.echo(f"  Memória pico: {results.peak_memory:.1f}MB")
+        _report_results(results, output_dir)
+    
+    except Exception as e:
+        click.secho(f"\n❌ Erro: {e}", fg='red', bold=True)
+        if verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+
+@main.command()
+@click.option('--controller', 'controller_address', required=True,
+              help='Endereço do controller (host:porta)')
+@click.option('--name', type=str, default=None, help='Nome do worker (padrão: hostname)')
+@click.option('--device', 'devices', multiple=True,
+              help='Device deste host no formato plataforma:serial (pode repetir)')
+@click.option('--appium-url', type=str, default=None, help='Servidor Appium deste host')
+@click.option('--connect-timeout', type=float, default=30, show_default=True,
+              help='Tempo máximo para conectar no controller (segundos)')
+@click.option('--verbose', '-v', is_flag=True, help='Modo verbose')
+def worker(controller_address, name, devices, appium_url, connect_timeout, verbose):
+    """
+    Executa a parte do teste enviada por um controller
+    
+    \b
+    Exemplo:
+        mobileloadx worker --controller 10.0.0.5:5557
+        mobileloadx worker --controller 10.0.0.5:5557 --device android:R58M123 --appium-url http://localhost:4723
+    """
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
+    try:
+        host, _, port = controller_address.rpartition(':')
+        if not host or not port.isdigit():
+            raise click.BadParameter("use o formato host:porta", param_hint='--controller')
         
-        # Thresholds
-        if results.thresholds:
-            click.echo(f"\n🎯 THRESHOLDS")
-            threshold_results = results.check_thresholds()
-            for metric, passed in threshold_results.items():
-                status = "✅" if passed else "❌"
-                click.echo(f"  {status} {metric}")
+        device_map = {}
+        for item in devices:
+            platform, _, serial = item.partition(':')
+            if not serial:
+                raise click.BadParameter(f"device inválido: {item}", param_hint='--device')
+            device_map.setdefault(platform.lower(), []).append(serial)
         
-        click.echo(f"\n📁 Relatórios salvos em: {output_path.absolute()}")
-        click.echo(f"  - {html_file.name}")
-        click.echo(f"  - {json_file.name}")
-        click.echo(f"  - {csv_file.name}")
+        click.echo(f"📡 Conectando ao controller {host}:{port}")
+        distributed_worker = Worker(host, int(port), name=name, devices=device_map, appium_server_url=appium_url)
         
-        # Status final
-        if results.passed_thresholds:
-            click.secho("\n✅ TESTE PASSOU", fg='green', bold=True)
-            sys.exit(0)
+        if distributed_worker.run(connect_timeout=connect_timeout):
+            click.secho("✅ Shard concluído", fg='green')
         else:
-            click.secho("\n❌ TESTE FALHOU", fg='red', bold=True)
-            sys.exit(1)
+            click.echo("Nenhum shard atribuído a este worker")
     
+    except click.BadParameter:
+        raise
     except Exception as e:
         click.secho(f"\n❌ Erro: {e}", fg='red', bold=True)
         if verbose:
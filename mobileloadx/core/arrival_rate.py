@@ -0,0 +1,276 @@
+"""
+Executor de modelo aberto (taxa de chegada de iterações)
+
+Ao contrário do loop fechado de _user_lifecycle, as iterações começam em
+horários fixos definidos pela taxa alvo, independentemente de quanto as
+anteriores demoraram. Cada iteração usa um usuário virtual livre de um
+pool pré-alocado; sem usuário livre a iteração é descartada (dropped).
+Mesma ideia do executor constant-arrival-rate do k6.
+"""
+
+import math
+import time
+import queue
+import threading
+import logging
+from dataclasses import dataclass, field, replace
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+from .scheduler import EventScheduler
+logger = logging.getLogger(__name__)
+
+# Executores aceitos em virtual_users.executor
+ARRIVAL_RATE_EXECUTORS = ("constant-arrival-rate", "ramping-arrival-rate")
+
+
+@dataclass
+class ArrivalRateConfig:
+    """Configuração do executor de taxa de chegada"""
+    executor: str = "constant-arrival-rate"
+    rate: float = 1.0  # iterações por time_unit (no ramping, taxa inicial)
+    time_unit: float = 1.0  # segundos
+    pre_allocated: Optional[int] = None  # None = max de usuários virtuais
+    stages: List[Dict[str, float]] = field(default_factory=list)  # [{target, duration}]
+    late_threshold: float = 0.1  # atraso (s) a partir do qual a iteração conta como atrasada
+    
+    def __post_init__(self):
+        if self.executor not in ARRIVAL_RATE_EXECUTORS:
+            raise ValueError(f"Executor desconhecido: {self.executor} (use um de {list(ARRIVAL_RATE_EXECUTORS)})")
+        if self.rate < 0:
+            raise ValueError("A taxa de chegada não pode ser negativa")
+        if self.time_unit <= 0:
+            raise ValueError("time_unit deve ser maior que zero")
+        if self.executor == "ramping-arrival-rate" and not self.stages:
+            raise ValueError("O executor ramping-arrival-rate requer stages")
+        for stage in self.stages:
+            if 'target' not in stage or 'duration' not in stage:
+                raise ValueError(f"Stage inválido (use target e duration): {stage}")
+    
+    def scaled(self, fraction: float) -> "ArrivalRateConfig":
+        """Retorna uma cópia com a taxa multiplicada por fraction (usado nos shards)"""
+        return replace(
+            self,
+            rate=self.rate * fraction,
+            pre_allocated=max(1, round(self.pre_allocated * fraction)) if self.pre_allocated else None,
+            stages=[dict(stage, target=stage['target'] * fraction) for stage in self.stages],
+        )
+    
+    def segments(self) -> List[tuple]:
+        """
+        Segmentos de taxa em iterações por segundo
+        
+        Returns:
+            Lista de (taxa_inicial, taxa_final, duração); o último segmento
+            tem duração infinita e mantém a última taxa
+        """
+        per_second = 1.0 / self.time_unit
+        segments = []
+        current = self.rate * per_second
+        
+        if self.executor == "ramping-arrival-rate":
+            for stage in self.stages:
+                target = stage['target'] * per_second
+                if stage['duration'] > 0:
+                    segments.append((current, target, float(stage['duration'])))
+                current = target
+        
+        segments.append((current, current, math.inf))
+        return segments
+    
+    def iteration_offsets(self) -> Iterator[float]:
+        """
+        Gera os instantes (segundos desde o início) em que cada iteração começa
+        
+        A k-ésima iteração começa quando a integral da taxa atinge k.
+        """
+        elapsed = 0.0
+        done = 0.0  # iterações acumuladas até o início do segmento
+        k = 0
+        
+        for start_rate, end_rate, duration in self.segments():
+            # Iterações no segmento: start_rate * t + a * t²
+            a = (end_rate - start_rate) / (2 * duration) if duration != math.inf else 0.0
+            total = start_rate * duration + a * duration * duration if duration != math.inf else math.inf
+            
+            while k - done < total:
+                remaining = k - done
+                if a == 0:
+                    if start_rate <= 0:
+                        break
+                    t = remaining / start_rate
+                else:
+                    t = (-start_rate + math.sqrt(start_rate * start_rate + 4 * a * remaining)) / (2 * a)
+                yield elapsed + t
+                k += 1
+            
+            if duration == math.inf:
+                return
+            elapsed += duration
+            done += total
+
+
+class ArrivalRateExecutor:
+    """Executa iterações de cenário em uma taxa de chegada fixa ou em rampa"""
+    
+    def __init__(self, load_test, config: ArrivalRateConfig):
+        """
+        Args:
+            load_test: LoadTest em execução
+            config: Configuração da taxa de chegada
+        """
+        self.load_test = load_test
+        self.config = config
+        self.max_users = load_test.max_virtual_users
+        self.pre_allocated = min(config.pre_allocated or self.max_users, self.max_users)
+        
+        self.users = []
+        self.end_time = 0.0
+        self.idle: "queue.Queue" = queue.Queue()
+        self.lock = threading.Lock()
+        self.iterations: Dict[Future, object] = {}  # iterações em andamento -> usuário
+        self.executor = ThreadPoolExecutor(max_workers=max(1, self.max_users))
+        self.pre_allocated_ready = False
+    
+    def _allocate(self, count: int) -> list:
+        """Cria mais usuários virtuais (sessão iniciada na primeira iteração)"""
+        with self.lock:
+            new_users = self.load_test._spawn_users(len(self.users) + count, len(self.users))
+            self.users.extend(new_users)
+            return new_users
+    
+    def _start_user(self, user):
+        """
+        Inicia a sessão de um usuário pré-alocado
+        
+        Os usuários mantêm o device entre iterações, então um usuário sem
+        device livre agora nunca receberia um: ele fica fora do pool, o que
+        limita o pool à capacidade dos devices.
+        """
+        try:
+            if not self.load_test._try_lease_device(user):
+                logger.info(f"Usuário {user.user_id}: sem device livre, fora do pool")
+                return
+            user.start()
+        except Exception as e:
+            logger.error(f"Erro ao iniciar usuário {user.user_id}: {e}")
+        self.idle.put(user)
+    
+    def pre_allocate(self):
+        """
+        Cria os usuários pré-alocados e inicia as suas sessões em paralelo
+        
+        Chamado pelo LoadTest antes de o relógio do teste e o coletor
+        começarem, para que a criação das sessões não consuma a janela medida.
+        """
+        if self.pre_allocated_ready:
+            return
+        self.pre_allocated_ready = True
+        
+        for future in [self.executor.submit(self._start_user, user) for user in self._allocate(self.pre_allocated)]:
+            future.result()
+        
+        logger.info(
+            f"Executor {self.config.executor}: {self.pre_allocated} usuário(s) pré-alocado(s), "
+            f"máximo {self.max_users}"
+        )
+    
+    def _record(self, user, status: str, lag: float):
+        """Registra o início (ou descarte) de uma iteração"""
+        self.load_test.metrics_collector.record_iteration(
+            user_id=user.user_id if user else None,
+            status=status,
+            lag=lag,
+            platform=user.platform if user else None
+        )
+    
+    def _run_iteration(self, user, scheduled: float):
+        """Executa uma iteração agendada e devolve o usuário ao pool"""
+        pooled = True
+        try:
+            if user.session_lost and not user.recover_session(self.end_time):
+                self._record(user, "dropped", 0.0)
+                return
+            if not user.is_active:
+                # Espera pelo device até late_threshold: sem device a iteração é descartada perto do horário
+                if not self.load_test._lease_device(user, scheduled + self.config.late_threshold):
+                    self._record(user, "dropped", max(0.0, time.monotonic() - scheduled))
+                    pooled = False
+                    return
+                user.start()
+            
+            lag = max(0.0, time.monotonic() - scheduled)
+            self._record(user, "late" if lag > self.config.late_threshold else "on_time", lag)
+            user.execute_scenario(paced=False)
+        except Exception as e:
+            logger.error(f"Erro na iteração do usuário {user.user_id}: {e}")
+        finally:
+            if pooled:
+                self.idle.put(user)
+    
+    def _dispatch(self, executor: ThreadPoolExecutor, scheduled: float):
+        """Entrega a iteração agendada a um usuário livre (ou a descarta)"""
+        try:
+            user = self.idle.get_nowait()
+        except queue.Empty:
+            allocated = self._allocate(1) if len(self.users) < self.max_users else []
+            if not allocated:
+                self._record(None, "dropped", 0.0)
+                return
+            user = allocated[0]
+        
+        user.deadline = self.end_time
+        with self.lock:
+            future = executor.submit(self._run_iteration, user, scheduled)
+            self.iterations[future] = user
+        # Iterações concluídas saem do mapa: o tamanho fica limitado aos usuários em uso
+        future.add_done_callback(self._forget)
+    
+    def _forget(self, future: Future):
+        with self.lock:
+            self.iterations.pop(future, None)
+    
+    def run(self, end_time: float):
+        """Agenda as iterações até end_time (time.monotonic)"""
+        load_test = self.load_test
+        executor = self.executor
+        scheduler = EventScheduler()
+        self.end_time = end_time
+        remaining = set()
+        
+        try:
+            self.pre_allocate()
+            
+            # Cada iteração agenda a seguinte; o scheduler só acorda no horário exato
+            start = time.monotonic()
+            offsets = self.config.iteration_offsets()
+            
+            def schedule_next():
+                offset = next(offsets, None)
+                if offset is not None and start + offset < end_time:
+                    scheduler.call_at(start + offset, fire, start + offset)
+            
+            def fire(scheduled: float):
+                self._dispatch(executor, scheduled)
+                schedule_next()
+            
+            schedule_next()
+            scheduler.call_at(end_time, scheduler.stop)
+            load_test._on_stop = scheduler.stop
+            
+            if load_test.is_running:
+                scheduler.run()
+            
+            # Iterações em andamento têm drain_timeout para terminar
+            with self.lock:
+                in_flight = dict(self.iterations)
+            remaining = load_test._drain_threads(in_flight, end_time)
+        finally:
+            load_test._on_stop = None
+            executor.shutdown(wait=not remaining)
+            
+            for user in self.users:
+                user.stop()
+                load_test._release_user(user)
+            
+            logger.info(f"Executor {self.config.executor}: {len(self.users)} usuário(s) utilizados")
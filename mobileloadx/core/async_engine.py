@@ -0,0 +1,924 @@
+"""
+Engine de execução assíncrona (asyncio) para usuários virtuais
+
+Cada usuário virtual roda como uma corrotina e conversa com o Appium
+diretamente pelo protocolo W3C WebDriver, usando um cliente HTTP
+compartilhado com conexões keep-alive. Um único processo consegue assim
+manter milhares de sessões sem uma thread de SO por usuário.
+"""
+
+import asyncio
+import base64
+import json
+import ssl
+import time
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .virtual_user import VirtualUser
+from .scenario import Action, ScenarioRun
+from .driver_script import DriverScriptBatch
+from .element_cache import ElementCache
+from .session_metadata import SessionMetadata
+from .session_pool import reset_scripts
+from .warmup import WarmupConfig, run_warmup_async
+
+logger = logging.getLogger(__name__)
+
+
+# Chave W3C que identifica referências de elementos
+W3C_ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# Capabilities padrão W3C (as demais recebem o prefixo "appium:")
+W3C_STANDARD_CAPABILITIES = {
+    "browserName", "browserVersion", "platformName", "acceptInsecureCerts",
+    "pageLoadStrategy", "proxy", "setWindowRect", "timeouts",
+    "strictFileInteractability", "unhandledPromptBehavior", "webSocketUrl",
+}
+
+
+class WebDriverError(Exception):
+    """Erro retornado pelo servidor WebDriver"""
+    
+    def __init__(self, error: str, message: str = "", status: int = 500):
+        super().__init__(f"{error}: {message}" if message else error)
+        self.error = error
+        self.message = message
+        self.status = status
+
+
+class AsyncHTTPClient:
+    """
+    Cliente HTTP/1.1 mínimo sobre asyncio streams
+    
+    Mantém um pool de conexões keep-alive por host, compartilhado entre
+    todos os usuários virtuais do event loop.
+    """
+    
+    def __init__(self, max_connections_per_host: int = 256, timeout: float = 120.0):
+        """
+        Args:
+            max_connections_per_host: Máximo de conexões simultâneas por host
+            timeout: Timeout de cada requisição em segundos
+        """
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        
+        # (esquema, host, porta) -> conexões ociosas (reader, writer)
+        self._idle: Dict[Tuple[str, str, int], List[tuple]] = defaultdict(list)
+        self._limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self.connections_opened = 0
+    
+    async def request(self, method: str, url: str, payload: Any = None) -> Tuple[int, Any]:
+        """
+        Executa uma requisição JSON
+        
+        Args:
+            method: Método HTTP
+            url: URL completa
+            payload: Corpo da requisição (serializado como JSON)
+        
+        Returns:
+            Tupla (status HTTP, corpo decodificado)
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {parts.hostname}:{port}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Accept: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+        
+        semaphore = self._limits.get(key)
+        if semaphore is None:
+            semaphore = self._limits[key] = asyncio.Semaphore(self.max_connections_per_host)
+        
+        async with semaphore:
+            # Uma conexão reaproveitada pode ter sido fechada pelo servidor:
+            # nesse caso tenta de novo com uma conexão nova
+            for attempt in range(2):
+                conn, reused = await self._acquire(key)
+                try:
+                    status, data, keep_alive = await asyncio.wait_for(
+                        self._exchange(conn, head + body), self.timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    self._close(conn)
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    self._close(conn)
+                    raise
+                
+                if keep_alive:
+                    self._idle[key].append(conn)
+                else:
+                    self._close(conn)
+                
+                return status, json.loads(data) if data else None
+        
+        raise ConnectionError(f"Falha ao conectar em {url}")  # pragma: no cover
+    
+    async def _acquire(self, key: Tuple[str, str, int]):
+        """Obtém uma conexão ociosa do pool ou abre uma nova"""
+        idle = self._idle[key]
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            writer.close()
+        
+        scheme, host, port = key
+        ssl_context = ssl.create_default_context() if scheme == "https" else None
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ssl_context), self.timeout
+        )
+        self.connections_opened += 1
+        return (reader, writer), False
+    
+    async def _exchange(self, conn, raw_request: bytes) -> Tuple[int, bytes, bool]:
+        """Envia a requisição e lê a resposta completa"""
+        reader, writer = conn
+        writer.write(raw_request)
+        await writer.drain()
+        
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Conexão encerrada pelo servidor")
+        
+        version, status = status_line.decode("latin-1").split()[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = bytearray()
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                data += await reader.readexactly(size)
+                await reader.readexactly(2)
+            data = bytes(data)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        
+        return int(status), data, keep_alive
+    
+    @staticmethod
+    def _close(conn):
+        """Fecha uma conexão"""
+        conn[1].close()
+    
+    async def close(self):
+        """Fecha todas as conexões ociosas"""
+        for connections in self._idle.values():
+            for conn in connections:
+                self._close(conn)
+        self._idle.clear()
+
+
+class AsyncWebDriverSession:
+    """
+    Sessão W3C WebDriver assíncrona
+    
+    Implementa apenas os comandos usados pelas ações dos cenários.
+    """
+    
+    def __init__(self, client: AsyncHTTPClient, server_url: str):
+        self.client = client
+        self.server_url = server_url.rstrip("/")
+        self.session_id: Optional[str] = None
+        self.capabilities: Dict[str, Any] = {}
+    
+    async def _command(self, method: str, path: str, payload: Any = None) -> Any:
+        """Executa um comando WebDriver e retorna o campo 'value'"""
+        status, data = await self.client.request(method, f"{self.server_url}{path}", payload)
+        value = data.get("value") if isinstance(data, dict) else None
+        
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            details = value if isinstance(value, dict) else {}
+            raise WebDriverError(details.get("error", f"http {status}"), details.get("message", ""), status)
+        
+        return value
+    
+    async def _session_command(self, method: str, path: str, payload: Any = None) -> Any:
+        """Executa um comando no escopo da sessão"""
+        return await self._command(method, f"/session/{self.session_id}{path}", payload)
+    
+    async def create(self, capabilities: Dict[str, Any]):
+        """Cria a sessão (POST /session)"""
+        value = await self._command("POST", "/session", {
+            "capabilities": {"alwaysMatch": capabilities, "firstMatch": [{}]}
+        })
+        self.session_id = value["sessionId"]
+        self.capabilities = value.get("capabilities") or {}
+    
+    async def quit(self):
+        """Encerra a sessão (DELETE /session/{id})"""
+        if self.session_id:
+            await self._command("DELETE", f"/session/{self.session_id}")
+            self.session_id = None
+    
+    async def find_element(self, using: str, value: str) -> str:
+        """Busca um elemento e retorna seu id W3C"""
+        element = await self._session_command("POST", "/element", {"using": using, "value": value})
+        return element[W3C_ELEMENT_KEY]
+    
+    async def active_element(self) -> str:
+        """Retorna o elemento com foco"""
+        element = await self._session_command("GET", "/element/active")
+        return element[W3C_ELEMENT_KEY]
+    
+    async def click(self, element_id: str):
+        """Clica em um elemento"""
+        await self._session_command("POST", f"/element/{element_id}/click", {})
+    
+    async def send_keys(self, element_id: str, text: str):
+        """Envia texto para um elemento"""
+        await self._session_command("POST", f"/element/{element_id}/value", {"text": text, "value": list(text)})
+    
+    async def back(self):
+        """Navega para trás"""
+        await self._session_command("POST", "/back", {})
+    
+    async def get_window_rect(self) -> Dict[str, int]:
+        """Retorna posição e tamanho da janela"""
+        return await self._session_command("GET", "/window/rect")
+    
+    async def set_implicit_wait(self, seconds: float):
+        """Define o implicit wait da sessão (espera do servidor na busca de elementos)"""
+        await self._session_command("POST", "/timeouts", {"implicit": int(seconds * 1000)})
+    
+    async def get_orientation(self) -> str:
+        """Retorna a orientação da tela ("PORTRAIT" ou "LANDSCAPE")"""
+        return await self._session_command("GET", "/orientation")
+    
+    async def set_orientation(self, orientation: str):
+        """Altera a orientação da tela"""
+        await self._session_command("POST", "/orientation", {"orientation": orientation})
+    
+    async def get_context(self) -> str:
+        """Retorna o contexto atual (NATIVE_APP ou WEBVIEW_*)"""
+        return await self._session_command("GET", "/context")
+    
+    async def set_context(self, name: str):
+        """Troca o contexto da sessão"""
+        await self._session_command("POST", "/context", {"name": name})
+    
+    async def perform_actions(self, actions: List[Dict[str, Any]]):
+        """Executa uma sequência de W3C Actions"""
+        await self._session_command("POST", "/actions", {"actions": actions})
+    
+    async def execute_script(self, script: str, args: Dict[str, Any]) -> Any:
+        """Executa um script (ex.: comandos "mobile:" do Appium)"""
+        return await self._session_command("POST", "/execute/sync", {"script": script, "args": [args]})
+    
+    async def screenshot(self) -> bytes:
+        """Retorna a tela do device em PNG"""
+        return base64.b64decode(await self._session_command("GET", "/screenshot") or "")
+    
+    async def execute_driver(self, script: str, timeout_ms: int) -> Any:
+        """Executa um script WebdriverIO no servidor (plugin execute-driver) e retorna o seu resultado"""
+        value = await self._session_command("POST", "/appium/execute_driver", {
+            "script": script, "type": "webdriverio", "timeout": timeout_ms
+        })
+        return (value or {}).get("result")
+
+
+async def _platform_version(session: AsyncWebDriverSession) -> Optional[str]:
+    """Versão da plataforma informada na criação da sessão"""
+    return session.capabilities.get("platformVersion") or session.capabilities.get("appium:platformVersion")
+
+
+# Leitura de cada metadado da sessão assíncrona (equivalente a scenario.DRIVER_METADATA)
+SESSION_METADATA = {
+    "window_size": lambda session: session.get_window_rect(),
+    "orientation": lambda session: session.get_orientation(),
+    "platform_version": _platform_version,
+    "context": lambda session: session.get_context(),
+}
+
+
+async def session_metadata(session: AsyncWebDriverSession, metadata: SessionMetadata, key: str) -> Any:
+    """Metadado da sessão pelo cache (lido do Appium apenas na primeira vez)"""
+    return await metadata.fetch_async(key, lambda: SESSION_METADATA[key](session))
+
+
+def _bind_find(action: Action) -> Callable[[AsyncWebDriverSession, SessionMetadata], Awaitable[Tuple[str, float]]]:
+    """
+    Busca do elemento com o polling da ação (equivalente a Action._bind_find)
+    
+    A função retornada devolve (id do elemento, tempo parado entre tentativas).
+    """
+    using, value = action.locator
+    timeout = action.params.get("timeout", action.default_timeout)
+    polling = action.find_polling
+    # implicit: o servidor espera o elemento dentro da própria busca
+    implicit_wait = timeout if polling.strategy == "implicit" else 0
+    
+    async def find(session: AsyncWebDriverSession, metadata: SessionMetadata) -> Tuple[str, float]:
+        if metadata.get("implicit_wait", 0) != implicit_wait:
+            await session.set_implicit_wait(implicit_wait)
+            metadata.changed("implicit_wait", implicit_wait)
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waited = 0.0
+        
+        for interval in polling.intervals():
+            try:
+                return await session.find_element(using, value), waited
+            except WebDriverError as e:
+                if e.error != "no such element" or loop.time() >= deadline:
+                    raise
+            delay = max(0.0, min(interval, deadline - loop.time()))
+            await asyncio.sleep(delay)
+            waited += delay
+    return find
+
+
+def _bind_element(
+    action: Action,
+    interact: Callable[[AsyncWebDriverSession, str], Awaitable[None]]
+) -> Callable[..., Awaitable[Tuple[float, float]]]:
+    """Busca do elemento e interação com o cache da sessão (mesma regra de Action._bind_element)"""
+    locator = action.locator
+    find = _bind_find(action)
+    
+    async def step(session, cache, metadata):
+        started = time.monotonic()
+        element_id = cache.get(locator) if cache is not None else None
+        if element_id is None:
+            element_id, poll_wait = await find(session, metadata)
+            if cache is not None:
+                cache.put(locator, element_id)
+            lookup = time.monotonic() - started
+            await interact(session, element_id)
+            return lookup, poll_wait
+        
+        lookup, poll_wait = time.monotonic() - started, 0.0
+        try:
+            await interact(session, element_id)
+        except WebDriverError as e:
+            if e.error != "stale element reference":
+                raise
+            cache.invalidate(locator)
+            started = time.monotonic()
+            element_id, poll_wait = await find(session, metadata)
+            cache.put(locator, element_id)
+            lookup += time.monotonic() - started
+            await interact(session, element_id)
+        return lookup, poll_wait
+    return step
+
+
+def compile_async_action(action: Action) -> Callable[..., Awaitable[Optional[Tuple[float, float]]]]:
+    """
+    Monta a execução da ação pela sessão assíncrona (uma vez por ação)
+    
+    A validação é a mesma de Action.compile; locator, timeout e demais
+    parâmetros ficam resolvidos na função retornada.
+    
+    Raises:
+        ValueError: Tipo de ação desconhecido ou parâmetros inválidos
+    """
+    action.compile()
+    params = action.params
+    
+    # Cada função retorna (tempo de busca, espera entre tentativas) ou None sem busca
+    if action.action_type == "tap":
+        async def click(session, element_id):
+            await session.click(element_id)
+        
+        step = _bind_element(action, click)
+    elif action.action_type == "input":
+        text = params.get("text", "")
+        
+        async def send_keys(session, element_id):
+            await session.send_keys(element_id, text)
+        
+        if action.locator:
+            step = _bind_element(action, send_keys)
+        else:
+            async def step(session, cache, metadata):
+                await send_keys(session, await session.active_element())
+    elif action.action_type == "wait":
+        timeout = params.get("timeout", 1)
+        
+        async def step(session, cache, metadata):
+            await asyncio.sleep(timeout)
+    elif action.gesture is not None:  # scroll, swipe e gesture
+        gesture = action.gesture
+        
+        if gesture.relative:
+            async def step(session, cache, metadata):
+                await session.perform_actions(gesture.payload(await session_metadata(session, metadata, "window_size")))
+        else:
+            payload = gesture.payload()
+            
+            async def step(session, cache, metadata):
+                await session.perform_actions(payload)
+    elif action.action_type == "back":
+        async def step(session, cache, metadata):
+            await session.back()
+    elif action.action_type == "rotate":
+        orientation = params["orientation"].upper()
+        
+        async def step(session, cache, metadata):
+            await session.set_orientation(orientation)
+            metadata.changed("orientation", orientation)
+    elif action.action_type == "switch_context":
+        context = params["context"]
+        
+        async def step(session, cache, metadata):
+            await session.set_context(context)
+            metadata.changed("context", context)
+    elif action.action_type == "if_present":
+        find = _bind_find(action)
+        
+        async def step(session, cache, metadata):
+            started = time.monotonic()
+            try:
+                _, poll_wait = await find(session, metadata)
+            except WebDriverError as e:
+                if e.error != "no such element":
+                    raise
+                return None
+            return time.monotonic() - started, poll_wait
+    else:  # marcadores de transação (tratados por ScenarioRun.mark)
+        async def step(session, cache, metadata):
+            return None
+    
+    return step
+
+
+async def execute_action(
+    action: Action,
+    session: AsyncWebDriverSession,
+    platform: str,
+    cache: Optional[ElementCache] = None,
+    metadata: Optional[SessionMetadata] = None
+) -> Optional[Tuple[float, float]]:
+    """
+    Executa uma ação do cenário pela sessão assíncrona
+    
+    Args:
+        cache: Cache de elementos da sessão (None = busca a cada ação)
+        metadata: Metadados da sessão (None = lidos do Appium a cada ação)
+    
+    Returns:
+        Tempo de busca do elemento e espera entre tentativas (None se a
+        ação não busca elemento)
+    """
+    if action.async_step is None:
+        action.async_step = compile_async_action(action)
+    return await action.async_step(session, cache, metadata if metadata is not None else SessionMetadata())
+
+
+class AsyncVirtualUser(VirtualUser):
+    """
+    Usuário virtual executado como corrotina
+    
+    Reaproveita seleção de cenários e registro de métricas do VirtualUser,
+    mas fala W3C WebDriver pelo cliente HTTP compartilhado.
+    """
+    
+    def __init__(self, *args, http_client: Optional[AsyncHTTPClient] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.http_client = http_client or AsyncHTTPClient()
+        self.session: Optional[AsyncWebDriverSession] = None
+    
+    def _build_capabilities(self) -> Dict[str, Any]:
+        """Monta as capabilities W3C equivalentes às options do Appium"""
+        if self.platform == "android":
+            capabilities = {"platformName": "Android", "appium:automationName": "UiAutomator2"}
+        elif self.platform == "ios":
+            capabilities = {"platformName": "iOS", "appium:automationName": "XCUITest"}
+        else:
+            raise ValueError(f"Plataforma não suportada: {self.platform}")
+        
+        capabilities["appium:app"] = self.app
+        if self.device:
+            capabilities["appium:udid"] = self.device
+        
+        for key, value in self.capabilities.items():
+            if key == "appium_server_url":
+                continue
+            if key in W3C_STANDARD_CAPABILITIES or ":" in key:
+                capabilities[key] = value
+            else:
+                capabilities[f"appium:{key}"] = value
+        
+        return capabilities
+    
+    async def _create_session_async(self) -> AsyncWebDriverSession:
+        """Cria uma nova sessão W3C no Appium (instala e abre o app)"""
+        appium_server_url = self.capabilities.get('appium_server_url', 'http://localhost:4723')
+        session = AsyncWebDriverSession(self.http_client, appium_server_url)
+        await session.create(self._build_capabilities())
+        return session
+    
+    async def start_async(self):
+        """Inicia a sessão W3C no Appium (reaproveitando uma sessão do pool, se houver)"""
+        try:
+            logger.debug(f"Usuário {self.user_id}: Iniciando sessão Appium (asyncio)")
+            
+            session = self._checkout_session()
+            if session is None:
+                started = time.monotonic()
+                session = await self._create_session_async()
+                self._record_session("miss" if self.session_pool else "new", time.monotonic() - started)
+            
+            self.session = session
+            self.driver = session
+            self.is_active = True
+            self.start_time = time.time()
+            
+            logger.info(f"Usuário {self.user_id}: Sessão iniciada com sucesso")
+        
+        except Exception as e:
+            logger.error(f"Usuário {self.user_id}: Erro ao iniciar sessão: {e}")
+            self.errors += 1
+            raise
+    
+    async def _release_session_async(self) -> bool:
+        """Versão de _release_session para a sessão assíncrona"""
+        if self.session_pool is None or not self.session_pool.reuse or not self.is_active:
+            return False
+        if self.cancel_event.is_set():
+            # Sessão interrompida no meio de uma ação: não volta ao pool
+            return False
+        
+        try:
+            if self.metadata.get("implicit_wait"):
+                await self.session.set_implicit_wait(0)
+            for script, args in reset_scripts(self.platform, self.session_pool.config):
+                await self.session.execute_script(script, args)
+        except Exception as e:
+            logger.warning(f"Usuário {self.user_id}: Falha no reset da sessão, encerrando: {e}")
+            return False
+        
+        return self.session_pool.checkin(self.device, self.session)
+    
+    async def stop_async(self):
+        """Encerra a sessão W3C (ou a devolve ao pool)"""
+        if self.session and await self._release_session_async():
+            # A sessão agora pertence ao pool
+            self.session = self.driver = None
+            logger.debug(f"Usuário {self.user_id}: Sessão devolvida ao pool")
+        elif self.session:
+            try:
+                await self.session.quit()
+                logger.debug(f"Usuário {self.user_id}: Sessão encerrada")
+            except Exception as e:
+                logger.error(f"Usuário {self.user_id}: Erro ao encerrar: {e}")
+        
+        self.is_active = False
+        self.metadata.clear()
+        self._flush_element_cache()
+    
+    async def recover_session_async(self, deadline: float) -> bool:
+        """Versão de recover_session que espera sem bloquear o event loop"""
+        session = self.session
+        self.session = None
+        self._forget_session()
+        if session:
+            try:
+                await session.quit()
+            except Exception:
+                pass
+        
+        attempts = 0
+        while self._recovering(deadline):
+            wait = self._circuit_wait()
+            if wait > 0:
+                await asyncio.sleep(min(wait, max(0.0, deadline - time.monotonic())))
+                continue
+            
+            attempts += 1
+            started = time.monotonic()
+            try:
+                session = await self._create_session_async()
+            except Exception as e:
+                logger.warning(f"Usuário {self.user_id}: Falha ao recriar sessão (tentativa {attempts}): {e}")
+                if self.breaker:
+                    self.breaker.record_failure(self.device)
+                delay = self.health.delay(attempts - 1, self.rng)
+                await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+                continue
+            
+            self._record_session("new", time.monotonic() - started)
+            if self.breaker:
+                self.breaker.record_success(self.device)
+            self.session = self.driver = session
+            self.is_active = True
+            self._record_session_loss(attempts, True)
+            return True
+        
+        self._record_session_loss(attempts, False)
+        return False
+    
+    async def execute_scenario_async(self):
+        """Executa um cenário aleatório (baseado em pesos) sem bloquear o event loop"""
+        if not self.is_active or not self.session:
+            logger.warning(f"Usuário {self.user_id}: Tentativa de executar sem sessão ativa")
+            return
+        
+        scenario = self._select_scenario()
+        run = ScenarioRun()
+        
+        try:
+            logger.debug(f"Usuário {self.user_id}: Executando cenário '{scenario.name}'")
+            await self._run_actions(scenario, run, scenario.next_variables(self.user_id, self.rng))
+            self._record_success(scenario, run.elapsed)
+            self._check_session(None)
+        
+        except asyncio.CancelledError:
+            # Hard stop: registra e propaga o cancelamento da corrotina
+            self._record_cancelled(scenario)
+            self._record_timings(scenario, run)
+            raise
+        except Exception as e:
+            self._record_failure(scenario, e, run.elapsed)
+            self._check_session(e)
+        
+        self._record_timings(scenario, run)
+        await asyncio.sleep(self._pacing_delay(scenario, run.started))
+    
+    async def _run_actions(self, scenario, run: ScenarioRun, variables: Optional[Dict[str, Any]] = None):
+        """Executa as ações do cenário (mesmo registro de tempos de Scenario.execute)"""
+        try:
+            plan, walk = scenario.bind(variables, self.rng)
+            for segment in walk:
+                if isinstance(segment, DriverScriptBatch):
+                    await self._run_batch(scenario, segment, run)
+                    continue
+                
+                idx = segment
+                action, _ = plan[idx]
+                if run.mark(action):
+                    continue
+                
+                walk.found = await self._run_step(scenario, idx, action, run)
+                
+                # Think time fica fora da duração medida
+                think = scenario.think_after(action, self.rng)
+                if think > 0:
+                    paused_at = time.monotonic()
+                    await asyncio.sleep(think)
+                    run.add_pause(time.monotonic() - paused_at)
+        except BaseException as e:
+            run.close(e)
+            raise
+        
+        run.close()
+    
+    async def _run_step(self, scenario, idx: int, action: Action, run: ScenarioRun) -> bool:
+        """Executa uma ação com a política de falha (mesmo registro de Scenario._run_step)"""
+        policy = action.failure
+        first_started = time.monotonic()
+        for attempt in range(policy.retries + 1):
+            started = time.monotonic()
+            try:
+                timing = await execute_action(action, self.session, self.platform, self.element_cache, self.metadata)
+            except Exception as e:
+                if policy.can_retry(attempt, e):
+                    logger.warning(
+                        f"Ação {idx + 1} ({action.action_type}) falhou, "
+                        f"tentativa {attempt + 2} de {policy.retries + 1}: {e}"
+                    )
+                    await asyncio.sleep(policy.delay(attempt))
+                    continue
+                
+                run.step(idx, action, started, None, e, retries=attempt, retry_time=started - first_started)
+                if policy.screenshot:
+                    await self._save_screenshot(policy.screenshot_path(scenario.name, idx + 1))
+                if not policy.tolerates(e):
+                    logger.error(f"Erro na ação {idx + 1} ({action.action_type}): {e}")
+                    raise
+                logger.warning(f"Erro na ação {idx + 1} ({action.action_type}), cenário continua: {e}")
+                return False
+            
+            lookup, poll_wait = timing or (None, 0.0)
+            run.step(
+                idx, action, started, lookup,
+                poll_wait=poll_wait, retries=attempt, retry_time=started - first_started
+            )
+            return timing is not None
+    
+    async def _save_screenshot(self, path: str):
+        """Salva a tela do device após uma falha (erro no screenshot só vai para o log)"""
+        try:
+            image = await self.session.screenshot()
+            with open(path, "wb") as f:
+                f.write(image)
+            logger.info(f"Screenshot da falha salvo em {path}")
+        except Exception as e:
+            logger.warning(f"Falha ao salvar screenshot em {path}: {e}")
+    
+    async def _run_batch(self, scenario, batch: DriverScriptBatch, run: ScenarioRun):
+        """Executa um lote de ações no servidor (mesmo registro de Scenario._execute_batch)"""
+        thinks = [scenario.think_after(action, self.rng) for _, action in batch.items]
+        window_size = None
+        if batch.needs_window_size:
+            window_size = await session_metadata(self.session, self.metadata, "window_size")
+        script, timeout_ms = batch.prepare(thinks, self.metadata, window_size)
+        
+        started = time.monotonic()
+        try:
+            result = await self.session.execute_driver(script, timeout_ms)
+        except Exception as e:
+            batch.fail(run, started, e)
+            raise
+        batch.record(run, started, result, self.metadata)
+
+
+class AsyncEngine:
+    """
+    Executa o LoadTest em um único event loop asyncio
+    
+    Segue o mesmo ramp-up do engine de threads e grava no mesmo
+    MetricsCollector, de modo que os TestResults são equivalentes.
+    """
+    
+    def __init__(self, load_test, max_connections: int = 256):
+        """
+        Args:
+            load_test: LoadTest a ser executado
+            max_connections: Máximo de conexões HTTP por servidor Appium
+        """
+        self.load_test = load_test
+        self.max_connections = max_connections
+        self.client = AsyncHTTPClient(max_connections_per_host=max_connections)
+        # O mesmo event loop cria as sessões pré-aquecidas e executa o teste
+        self.loop = asyncio.new_event_loop()
+    
+    def warm_sessions(self):
+        """Fase de warm-up antes do início do teste (bloqueante)"""
+        try:
+            self.loop.run_until_complete(self._warm_sessions())
+        except BaseException:
+            self.loop.run_until_complete(self._close_sessions())
+            self.loop.close()
+            raise
+    
+    async def _warm_sessions(self):
+        """Cria as sessões do plano de warm-up (ver LoadTest._run_warmup)"""
+        load_test = self.load_test
+        
+        async def bring_up(item: Tuple[int, Optional[str]]):
+            platform_index, device = item
+            user = load_test._session_template(
+                platform_index, device,
+                user_class=AsyncVirtualUser, http_client=self.client
+            )
+            session = await user._create_session_async()
+            if not user.session_pool.add(device, session):
+                await session.quit()
+        
+        await run_warmup_async(
+            load_test._warm_plan(), bring_up,
+            load_test.warmup or WarmupConfig(), load_test._record_warmup,
+            strict=load_test.warmup is not None
+        )
+    
+    async def _close_sessions(self):
+        """Encerra as sessões que ficaram ociosas no pool e as conexões HTTP"""
+        for session in self.load_test._drain_session_pools():
+            try:
+                await session.quit()
+            except Exception as e:
+                logger.error(f"Erro ao encerrar sessão do pool: {e}")
+        
+        await self.client.close()
+    
+    def run(self, end_time: float):
+        """Executa o teste até end_time (time.monotonic, bloqueante)"""
+        try:
+            self.loop.run_until_complete(self._run(end_time))
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+    
+    async def _run(self, end_time: float):
+        """Loop principal de controle de carga"""
+        load_test = self.load_test
+        client = self.client
+        
+        tasks: Dict[asyncio.Task, AsyncVirtualUser] = {}
+        active_users: List[AsyncVirtualUser] = []
+        target = [0]
+        
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
+        
+        def apply_target(target_users: int):
+            target[0] = target_users
+            new_users = load_test._adjust_users(
+                active_users, target_users,
+                user_class=AsyncVirtualUser, http_client=client
+            )
+            for user in new_users:
+                tasks[asyncio.create_task(self._user_lifecycle(user, end_time))] = user
+        
+        def call_at(when: float, callback, *args):
+            # Converte time.monotonic para o relógio do event loop
+            return loop.call_at(loop.time() + (when - time.monotonic()), callback, *args)
+        
+        # Cada mudança de alvo e o fim do teste disparam no instante exato
+        handles = [
+            call_at(load_test.start_monotonic + offset, apply_target, target_users)
+            for offset, target_users in load_test._spawn_schedule()
+            if load_test.start_monotonic + offset < end_time
+        ]
+        handles.append(call_at(end_time, finished.set))
+        
+        # Vagas liberadas por usuários aposentados completam o alvo atual
+        load_test._on_release = lambda: loop.call_soon(apply_target, target[0])
+        load_test._on_stop = lambda: loop.call_soon_threadsafe(finished.set)
+        
+        try:
+            if load_test.is_running:
+                await finished.wait()
+            
+            for handle in handles:
+                handle.cancel()
+            
+            logger.info("Aguardando conclusão dos usuários virtuais...")
+            await self._drain(tasks, end_time)
+            
+            finished_tasks = [task for task in tasks if task.done()]
+            for result in await asyncio.gather(*finished_tasks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error(f"Erro na corrotina do usuário: {result}")
+        
+        finally:
+            load_test._on_release = None
+            load_test._on_stop = None
+            await self._close_sessions()
+    
+    async def _drain(self, tasks: Dict[asyncio.Task, AsyncVirtualUser], end_time: float):
+        """Espera os cenários em andamento pelo período de drain e cancela os restantes (hard stop)"""
+        load_test = self.load_test
+        pending = {task for task in tasks if not task.done()}
+        in_flight = len(pending)
+        
+        if pending and load_test.drain_timeout != 0:
+            _, pending = await asyncio.wait(pending, timeout=load_test.drain_timeout)
+        
+        if pending:
+            logger.warning(f"Hard stop: cancelando {len(pending)} usuário(s) em andamento")
+            for task in pending:
+                tasks[task].cancel_event.set()
+                task.cancel()
+            # Cada corrotina encerra a própria sessão no finally, todas em paralelo
+            await asyncio.wait(pending, timeout=load_test.HARD_STOP_GRACE)
+        
+        load_test._record_drain(in_flight, end_time, cancelled=len(pending))
+    
+    async def _user_lifecycle(self, user: AsyncVirtualUser, end_time: float):
+        """Executa o lifecycle de um usuário virtual"""
+        user.deadline = end_time
+        try:
+            if not await self.load_test._lease_device_async(user, end_time) or user.retired:
+                return
+            
+            await user.start_async()
+            
+            while time.monotonic() < end_time and self.load_test.is_running and not user.retired:
+                if user.session_lost and not await user.recover_session_async(end_time):
+                    break
+                await user.execute_scenario_async()
+                # Garante que cenários sem I/O não monopolizem o event loop
+                await asyncio.sleep(0)
+        except Exception as e:
+            logger.error(f"Erro no usuário {user.user_id}: {e}")
+        finally:
+            await user.stop_async()
+            self.load_test._release_user(user)
@@ -0,0 +1,35 @@
+"""
+Backoff exponencial com jitter das novas tentativas de criar sessão
+
+Compartilhado pelo warm-up (sessões criadas antes da medição) e pelo
+watchdog de sessões (sessões recriadas durante o teste), para que as duas
+políticas calculem e validem o atraso da mesma forma.
+"""
+
+import random
+from dataclasses import dataclass
+
+
+@dataclass
+class ExponentialBackoff:
+    """Atraso entre tentativas: backoff * 2^tentativa, limitado a max_backoff, com jitter"""
+    backoff: float = 1.0  # atraso antes da segunda tentativa (segundos)
+    max_backoff: float = 30.0
+    jitter: float = 0.5  # variação aleatória do atraso (fração)
+    
+    def __post_init__(self):
+        if self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError(f"Backoff não pode ser negativo: backoff={self.backoff}, max_backoff={self.max_backoff}")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError(f"Jitter deve estar entre 0 e 1: {self.jitter}")
+    
+    def delay(self, attempt: int, rng: random.Random = random) -> float:
+        """
+        Atraso antes da próxima tentativa
+        
+        Args:
+            attempt: Tentativa que falhou (0 = primeira)
+            rng: Gerador de números aleatórios
+        """
+        base = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return base * (1 + rng.uniform(-self.jitter, self.jitter))
@@ -0,0 +1,121 @@
+"""
+Controle de fluxo nos cenários: loops, condicionais e ramos sorteados
+
+O plano de um cenário é uma árvore de blocos: cada bloco é uma lista cujos
+itens são a posição de uma ação em Scenario.actions (ou um lote do modo
+batch) ou um nó de controle com os seus próprios blocos. A árvore é montada
+uma vez ao carregar o cenário; a cada iteração Walk a percorre, sorteando
+repetições e ramos e seguindo o resultado das verificações de presença.
+
+Como as ações de um bloco repetido mantêm a sua posição, as métricas por
+ação (ex.: "4. tap product") agregam todas as repetições do loop.
+"""
+
+import random
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Iterator, List, Sequence, Tuple, Union
+
+# Construções aceitas na lista de ações do cenário
+CONTROL_FLOW = ("loop", "if_present", "random_branch", "call")
+
+Block = List[Any]
+
+
+@dataclass
+class Loop:
+    """Repete o bloco um número fixo ou sorteado (mínimo, máximo) de vezes"""
+    times: Tuple[int, int]
+    body: Block
+    
+    def __post_init__(self):
+        low, high = self.times
+        if low < 0 or high < low:
+            raise ValueError(f"Repetições inválidas no loop: {list(self.times)}")
+    
+    def map_blocks(self, compile_block: Callable[[Block], Block]) -> "Loop":
+        return replace(self, body=compile_block(self.body))
+
+
+@dataclass
+class IfPresent:
+    """Executa then se o elemento da ação probe estiver na tela, senão otherwise"""
+    probe: int  # posição da ação if_present (verificação de presença)
+    then: Block
+    otherwise: Block = field(default_factory=list)
+    
+    def map_blocks(self, compile_block: Callable[[Block], Block]) -> "IfPresent":
+        return replace(self, then=compile_block(self.then), otherwise=compile_block(self.otherwise))
+
+
+@dataclass
+class RandomBranch:
+    """Executa um dos blocos, sorteado pelos pesos (um bloco vazio pula o trecho)"""
+    weights: List[float]
+    branches: List[Block]
+    
+    def __post_init__(self):
+        if not self.branches:
+            raise ValueError("random_branch requer ao menos um ramo")
+        if any(weight < 0 for weight in self.weights) or sum(self.weights) <= 0:
+            raise ValueError(f"Pesos inválidos em random_branch: {self.weights}")
+    
+    def map_blocks(self, compile_block: Callable[[Block], Block]) -> "RandomBranch":
+        return replace(self, branches=[compile_block(branch) for branch in self.branches])
+
+
+# Nós de controle (os demais itens de um bloco são posições de ações ou lotes)
+CONTROL_NODES = (Loop, IfPresent, RandomBranch)
+
+
+def parse_times(times: Union[int, Sequence[int]]) -> Tuple[int, int]:
+    """Converte times do loop: número fixo ou [mínimo, máximo]"""
+    if isinstance(times, int):
+        return (times, times)
+    if isinstance(times, (list, tuple)) and len(times) == 2:
+        return (int(times[0]), int(times[1]))
+    raise ValueError(f"times do loop deve ser um número ou [mínimo, máximo]: {times!r}")
+
+
+def shift(block: Block, offset: int) -> Block:
+    """Desloca as posições das ações do bloco (inclusão de um sub-cenário no plano)"""
+    shifted = []
+    for node in block:
+        if isinstance(node, int):
+            shifted.append(node + offset)
+            continue
+        node = node.map_blocks(lambda inner: shift(inner, offset))
+        if isinstance(node, IfPresent):
+            node = replace(node, probe=node.probe + offset)
+        shifted.append(node)
+    return shifted
+
+
+class Walk:
+    """
+    Percurso do plano em uma iteração
+    
+    Itera sobre as posições das ações (ou lotes) na ordem de execução. O
+    loop de execução informa em found se o elemento da última verificação
+    de presença foi encontrado, antes de pedir o próximo item.
+    """
+    
+    def __init__(self, program: Block, rng: Any = random):
+        self.found = False
+        self._rng = rng
+        self._nodes = self._walk(program)
+    
+    def __iter__(self) -> Iterator[Any]:
+        return self._nodes
+    
+    def _walk(self, block: Block) -> Iterator[Any]:
+        for node in block:
+            if isinstance(node, Loop):
+                for _ in range(self._rng.randint(*node.times)):
+                    yield from self._walk(node.body)
+            elif isinstance(node, IfPresent):
+                yield node.probe
+                yield from self._walk(node.then if self.found else node.otherwise)
+            elif isinstance(node, RandomBranch):
+                yield from self._walk(self._rng.choices(node.branches, weights=node.weights)[0])
+            else:
+                yield node
@@ -0,0 +1,152 @@
+"""
+Broker de devices: empresta devices aos usuários virtuais
+
+Cada device aceita no máximo max_sessions_per_device sessões ao mesmo
+tempo. Usuários sem device livre esperam numa fila FIFO e recebem o
+device diretamente de quem o devolve, de modo que a carga fica limitada
+pela capacidade real dos devices em vez de sessões falhando.
+"""
+
+import asyncio
+import threading
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+
+from .distribution import DeviceSelector
+
+logger = logging.getLogger(__name__)
+
+
+class _Waiter:
+    """Usuário esperando um device (engine de threads)"""
+    
+    def __init__(self):
+        self.device: Optional[str] = None
+        self.event = threading.Event()
+    
+    def grant(self, device: Optional[str]):
+        self.device = device
+        self.event.set()
+
+
+class _AsyncWaiter:
+    """Usuário esperando um device (engine asyncio)"""
+    
+    def __init__(self, broker: "DeviceBroker", loop: asyncio.AbstractEventLoop):
+        self.broker = broker
+        self.loop = loop
+        self.future = loop.create_future()
+    
+    def grant(self, device: Optional[str]):
+        self.loop.call_soon_threadsafe(self._resolve, device)
+    
+    def _resolve(self, device: Optional[str]):
+        if self.future.done():
+            # A espera expirou antes da entrega: devolve o device
+            if device is not None:
+                self.broker.release(device)
+            return
+        self.future.set_result(device)
+
+
+class DeviceBroker:
+    """Empresta os devices de uma plataforma respeitando o limite por device"""
+    
+    def __init__(
+        self,
+        devices: List[str],
+        strategy: str = "round-robin",
+        weights: Optional[Dict[str, float]] = None,
+        max_sessions_per_device: Optional[int] = None
+    ):
+        """
+        Args:
+            devices: Devices da plataforma
+            strategy: Estratégia de escolha ("round-robin", "least-loaded" ou "weighted")
+            weights: Pesos por device (estratégia "weighted")
+            max_sessions_per_device: Sessões simultâneas por device (None = sem limite)
+        """
+        if max_sessions_per_device is not None and max_sessions_per_device < 1:
+            raise ValueError("max_sessions_per_device deve ser pelo menos 1")
+        
+        self.selector = DeviceSelector(devices, strategy, weights)
+        self.devices = self.selector.devices
+        self.max_sessions = max_sessions_per_device
+        
+        self.waiters: deque = deque()
+        self.lock = threading.Lock()
+        self.closed = False
+    
+    @property
+    def waiting(self) -> int:
+        """Usuários na fila de espera"""
+        with self.lock:
+            return len(self.waiters)
+    
+    def _try_acquire(self) -> Optional[str]:
+        """Empresta um device livre sem esperar (chamado com lock)"""
+        if self.waiters or self.closed:
+            return None
+        return self.selector.acquire(self.max_sessions)
+    
+    def acquire(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Empresta um device, esperando na fila se todos estão no limite
+        
+        Args:
+            timeout: Tempo máximo de espera (segundos); None = sem limite
+        
+        Returns:
+            Device emprestado ou None se o tempo acabou ou o broker foi fechado
+        """
+        with self.lock:
+            device = self._try_acquire()
+            if device is not None or self.closed:
+                return device
+            waiter = _Waiter()
+            self.waiters.append(waiter)
+        
+        waiter.event.wait(timeout)
+        
+        with self.lock:
+            if waiter.device is None and waiter in self.waiters:
+                self.waiters.remove(waiter)
+            return waiter.device
+    
+    async def acquire_async(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Versão de acquire() que espera sem bloquear o event loop"""
+        with self.lock:
+            device = self._try_acquire()
+            if device is not None or self.closed:
+                return device
+            waiter = _AsyncWaiter(self, asyncio.get_running_loop())
+            self.waiters.append(waiter)
+        
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            with self.lock:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+            return None
+    
+    def release(self, device: Optional[str]):
+        """Devolve um device e o repassa ao primeiro da fila"""
+        if device is None:
+            return
+        
+        with self.lock:
+            self.selector.release(device)
+            while self.waiters and not self.closed:
+                next_device = self.selector.acquire(self.max_sessions)
+                if next_device is None:
+                    break
+                self.waiters.popleft().grant(next_device)
+    
+    def close(self):
+        """Acorda todos os usuários em espera sem device (fim do teste)"""
+        with self.lock:
+            self.closed = True
+            while self.waiters:
+                self.waiters.popleft().grant(None)
@@ -0,0 +1,551 @@
+"""
+Modo distribuído controller/worker sobre TCP
+
+O controller divide o teste (usuários virtuais, devices e cenários) entre
+os workers registrados. Cada worker executa seu shard localmente, com os
+devices que ele enxerga, e envia lotes compactos de métricas de volta ao
+controller, que gera o relatório único.
+
+Cada worker faz o warm-up do seu shard e responde ready; o controller só
+inicia o relógio (e envia start) quando todos estão prontos.
+
+Protocolo: uma mensagem JSON por linha.
+
+    worker -> controller: register, ready, metrics, done, error
+    controller -> worker: job, start, stop, shutdown
+"""
+
+import json
+import socket
+import threading
+import time
+import logging
+from collections import defaultdict
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scenario import Scenario
+from .sharding import ShardSpec, split_shards, build_shard_test
+
+logger = logging.getLogger(__name__)
+
+# Porta padrão do controller
+DEFAULT_PORT = 5557
+
+
+def send_message(wfile, message: Dict[str, Any], lock: Optional[threading.Lock] = None):
+    """Envia uma mensagem (uma linha JSON)"""
+    data = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+    if lock:
+        with lock:
+            wfile.write(data)
+            wfile.flush()
+    else:
+        wfile.write(data)
+        wfile.flush()
+
+
+def read_message(rfile) -> Optional[Dict[str, Any]]:
+    """Lê uma mensagem; retorna None quando a conexão é encerrada"""
+    line = rfile.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def encode_batch(kind: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Codifica registros de métricas em formato compacto (colunas + linhas)
+    
+    Args:
+        kind: "action", "device" ou "iteration"
+        records: Registros do MetricsCollector
+    """
+    fields: List[str] = []
+    for record in records:
+        for key in record:
+            if key not in fields:
+                fields.append(key)
+    
+    return {
+        "type": "metrics",
+        "kind": kind,
+        "fields": fields,
+        "rows": [[record.get(key) for key in fields] for record in records],
+    }
+
+
+def decode_batch(message: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+    """Decodifica um lote gerado por encode_batch"""
+    fields = message["fields"]
+    return message["kind"], [dict(zip(fields, row)) for row in message["rows"]]
+
+
+def shard_to_dict(spec: ShardSpec) -> Dict[str, Any]:
+    """Serializa um shard para envio ao worker"""
+    return {
+        "index": spec.index,
+        "name": spec.name,
+        "duration": spec.duration,
+        "virtual_users": spec.virtual_users,
+        "ramp_up_time": spec.ramp_up_time,
+        "engine": spec.engine,
+        "user_id_offset": spec.user_id_offset,
+        "platforms": [asdict(platform_config) for platform_config in spec.platforms],
+        "scenarios": [dict(scenario.to_dict(), weight=weight) for scenario, weight in spec.scenarios],
+        "arrival_rate": asdict(spec.arrival_rate) if spec.arrival_rate else None,
+        "profile": asdict(spec.profile) if spec.profile else None,
+        "warmup": asdict(spec.warmup) if spec.warmup else None,
+        "drain_timeout": spec.drain_timeout,
+        "workers": spec.workers,
+        "seed": spec.seed,
+        "scenario_mix": spec.scenario_mix,
+        "session_health": asdict(spec.session_health) if spec.session_health else None,
+        "device_metrics": spec.device_metrics,
+    }
+
+
+def shard_from_dict(data: Dict[str, Any]) -> ShardSpec:
+    """Reconstrói um shard recebido do controller"""
+    from .load_test import PlatformConfig
+    from .arrival_rate import ArrivalRateConfig
+    from .session_pool import SessionPoolConfig
+    from .warmup import WarmupConfig
+    from .session_health import SessionHealthConfig
+    from .profile import LoadProfile, Stage
+    
+    profile = None
+    if data.get("profile"):
+        profile = LoadProfile(
+            stages=[Stage(**stage) for stage in data["profile"]["stages"]],
+            start=data["profile"]["start"],
+            scale=data["profile"]["scale"],
+        )
+    
+    return ShardSpec(
+        index=data["index"],
+        name=data["name"],
+        duration=data["duration"],
+        virtual_users=data["virtual_users"],
+        ramp_up_time=data["ramp_up_time"],
+        engine=data["engine"],
+        user_id_offset=data["user_id_offset"],
+        platforms=[
+            PlatformConfig(**dict(
+                platform_data,
+                session_pool=(
+                    SessionPoolConfig(**platform_data["session_pool"]) if platform_data.get("session_pool") else None
+                )
+            ))
+            for platform_data in data["platforms"]
+        ],
+        scenarios=[
+            (Scenario.from_dict(scenario_data), scenario_data.get("weight", 100))
+            for scenario_data in data["scenarios"]
+        ],
+        arrival_rate=ArrivalRateConfig(**data["arrival_rate"]) if data.get("arrival_rate") else None,
+        profile=profile,
+        warmup=WarmupConfig(**data["warmup"]) if data.get("warmup") else None,
+        drain_timeout=data.get("drain_timeout", ShardSpec.drain_timeout),
+        workers=data.get("workers", 1),
+        seed=data.get("seed"),
+        scenario_mix=data.get("scenario_mix", ShardSpec.scenario_mix),
+        session_health=SessionHealthConfig(**data["session_health"]) if data.get("session_health") else None,
+        device_metrics=data.get("device_metrics"),
+    )
+
+
+class WorkerConnection:
+    """Conexão do controller com um worker registrado"""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.rfile = sock.makefile("rb")
+        self.wfile = sock.makefile("wb")
+        self.write_lock = threading.Lock()
+        self.name = "%s:%s" % sock.getpeername()[:2]
+        self.devices: Dict[str, List[str]] = {}
+        self.appium_server_url: Optional[str] = None
+        self.records_received = 0
+        # Warm-up concluído (ou worker que não vai mais iniciar)
+        self.ready = threading.Event()
+    
+    def register(self, registration: Dict[str, Any]):
+        """Aplica os dados da mensagem de registro"""
+        self.name = registration.get("name") or self.name
+        self.devices = registration.get("devices") or {}
+        self.appium_server_url = registration.get("appium_server_url")
+    
+    def send(self, message: Dict[str, Any]):
+        send_message(self.wfile, message, self.write_lock)
+    
+    def close(self):
+        for resource in (self.rfile, self.wfile, self.sock):
+            try:
+                resource.close()
+            except OSError:
+                pass
+
+
+class Controller:
+    """
+    Controller do modo distribuído
+    
+    Aceita registros de workers e, ao ser usado como runner do LoadTest
+    (load_test.runner = controller), distribui os shards e mescla os
+    lotes de métricas recebidos.
+    """
+    
+    def __init__(self, load_test, host: str = "0.0.0.0", port: int = DEFAULT_PORT, expected_workers: int = 1):
+        """
+        Args:
+            load_test: LoadTest a ser distribuído
+            host: Endereço de escuta
+            port: Porta de escuta (0 = porta livre escolhida pelo SO)
+            expected_workers: Número de workers aguardados antes de iniciar
+        """
+        self.load_test = load_test
+        self.expected_workers = expected_workers
+        self.workers: List[WorkerConnection] = []
+        self.threads: Optional[List[Tuple[WorkerConnection, threading.Thread]]] = None
+        
+        self.server = socket.create_server((host, port))
+        self.host = host
+        self.port = self.server.getsockname()[1]
+    
+    def wait_for_workers(self, timeout: float = 60.0) -> int:
+        """
+        Aguarda o registro dos workers
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        
+        Returns:
+            Número de workers registrados
+        """
+        logger.info(f"Aguardando {self.expected_workers} worker(s) em {self.host}:{self.port}")
+        deadline = time.monotonic() + timeout
+        
+        while len(self.workers) < self.expected_workers:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            self.server.settimeout(remaining)
+            try:
+                sock, address = self.server.accept()
+            except socket.timeout:
+                break
+            
+            sock.settimeout(remaining)
+            connection = WorkerConnection(sock)
+            try:
+                registration = read_message(connection.rfile)
+                if not registration or registration.get("type") != "register":
+                    raise ValueError("mensagem de registro inválida")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Registro de worker recusado ({address[0]}): {e}")
+                connection.close()
+                continue
+            
+            sock.settimeout(None)
+            connection.register(registration)
+            self.workers.append(connection)
+            logger.info(f"Worker registrado: {connection.name} ({len(self.workers)}/{self.expected_workers})")
+        
+        if not self.workers:
+            raise TimeoutError("Nenhum worker registrado")
+        
+        if len(self.workers) < self.expected_workers:
+            logger.warning(f"Iniciando com {len(self.workers)} de {self.expected_workers} worker(s)")
+        
+        return len(self.workers)
+    
+    def _apply_worker_resources(self, shard: ShardSpec, worker: WorkerConnection):
+        """Usa os devices e o servidor Appium anunciados pelo worker"""
+        if worker.devices.get("android") and shard.device_metrics is not None:
+            # Devices locais do worker: só ele os lê
+            shard.device_metrics = dict(
+                shard.device_metrics,
+                collect=self.load_test.device_metrics_config()["collect"],
+                devices=list(worker.devices["android"]),
+            )
+        for platform_config in shard.platforms:
+            if worker.devices.get(platform_config.platform):
+                platform_config.devices = list(worker.devices[platform_config.platform])
+            if worker.appium_server_url:
+                platform_config.capabilities = dict(
+                    platform_config.capabilities, appium_server_url=worker.appium_server_url
+                )
+    
+    def _receive(self, worker: WorkerConnection):
+        """Recebe os lotes de métricas de um worker até a mensagem 'done'"""
+        collector = self.load_test.metrics_collector
+        
+        try:
+            while True:
+                message = read_message(worker.rfile)
+                if message is None:
+                    logger.error(f"Worker {worker.name} desconectou antes de concluir")
+                    return
+                
+                if message.get("type") == "ready":
+                    worker.ready.set()
+                elif message.get("type") == "metrics":
+                    kind, records = decode_batch(message)
+                    collector.merge({f"{kind}_metrics": records})
+                    worker.records_received += len(records)
+                elif message.get("type") == "done":
+                    logger.info(f"Worker {worker.name} concluído ({worker.records_received} registros)")
+                    return
+                elif message.get("type") == "error":
+                    # Shard não pode rodar no worker: o teste não tem como ficar completo
+                    logger.error(f"Worker {worker.name} não executou o shard: {message.get('error')}")
+                    self.load_test.stop()
+                    return
+        except (OSError, ValueError) as e:
+            logger.error(f"Erro na conexão com o worker {worker.name}: {e}")
+        finally:
+            worker.ready.set()
+    
+    def prepare(self):
+        """Distribui os shards e aguarda o warm-up de todos os workers (interface de runner do LoadTest)"""
+        load_test = self.load_test
+        shards = split_shards(load_test, len(self.workers))
+        threads = []
+        
+        for index, worker in enumerate(self.workers):
+            if index >= len(shards):
+                worker.send({"type": "shutdown"})
+                continue
+            
+            shard = shards[index]
+            self._apply_worker_resources(shard, worker)
+            worker.send({"type": "job", "shard": shard_to_dict(shard)})
+            logger.info(f"Shard {shard.index} ({shard.virtual_users} usuários) enviado para {worker.name}")
+            
+            thread = threading.Thread(target=self._receive, args=(worker,), daemon=True)
+            thread.start()
+            threads.append((worker, thread))
+        self.threads = threads
+        
+        for worker, _ in threads:
+            while load_test.is_running and not worker.ready.wait(timeout=0.5):
+                pass
+    
+    def run(self, end_time: float):
+        """
+        Libera os workers e aguarda a conclusão (interface de runner do LoadTest)
+        
+        Cada worker mede load_test.duration a partir do start; end_time não
+        é enviado porque os relógios dos hosts não são comparáveis.
+        """
+        load_test = self.load_test
+        if self.threads is None:
+            self.prepare()
+        threads = self.threads
+        
+        for worker, _ in threads:
+            try:
+                worker.send({"type": "start"})
+            except OSError:
+                pass
+        
+        stop_sent = False
+        for worker, thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+                if not load_test.is_running and not stop_sent:
+                    for other, _ in threads:
+                        try:
+                            other.send({"type": "stop"})
+                        except OSError:
+                            pass
+                    stop_sent = True
+    
+    def close(self):
+        """Encerra as conexões e o socket de escuta"""
+        for worker in self.workers:
+            worker.close()
+        self.server.close()
+
+
+class MetricsStreamer:
+    """Acumula registros do coletor local e envia em lotes ao controller"""
+    
+    def __init__(self, send, batch_size: int = 200, flush_interval: float = 0.5):
+        """
+        Args:
+            send: Função que envia uma mensagem ao controller
+            batch_size: Tamanho que força o envio imediato do lote
+            flush_interval: Intervalo máximo entre envios (segundos)
+        """
+        self.send = send
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self.buffers: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._flush_loop, daemon=True)
+    
+    def on_record(self, kind: str, record: Dict[str, Any]):
+        """Listener do MetricsCollector"""
+        with self.lock:
+            self.buffers[kind].append(record)
+            full = len(self.buffers[kind]) >= self.batch_size
+        
+        if full:
+            self.flush()
+    
+    def flush(self):
+        """Envia os registros acumulados"""
+        with self.lock:
+            batches, self.buffers = self.buffers, defaultdict(list)
+        
+        for kind, records in batches.items():
+            self.send(encode_batch(kind, records))
+    
+    def _flush_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+    
+    def start(self):
+        self.thread.start()
+    
+    def stop(self):
+        """Para o envio periódico e envia o que restou"""
+        self.stop_event.set()
+        self.thread.join(timeout=5)
+        self.flush()
+
+
+class Worker:
+    """
+    Worker do modo distribuído
+    
+    Conecta no controller, recebe um shard, executa localmente e envia
+    as métricas em lotes.
+    """
+    
+    def __init__(
+        self,
+        controller_host: str,
+        controller_port: int = DEFAULT_PORT,
+        name: Optional[str] = None,
+        devices: Optional[Dict[str, List[str]]] = None,
+        appium_server_url: Optional[str] = None
+    ):
+        """
+        Args:
+            controller_host: Host do controller
+            controller_port: Porta do controller
+            name: Nome do worker (padrão: hostname)
+            devices: Devices acessíveis neste host por plataforma
+            appium_server_url: Servidor Appium local deste host
+        """
+        self.controller_host = controller_host
+        self.controller_port = controller_port
+        self.name = name or socket.gethostname()
+        self.devices = devices or {}
+        self.appium_server_url = appium_server_url
+        self.test = None
+    
+    def _connect(self, timeout: float) -> socket.socket:
+        """Conecta no controller, tentando novamente até o timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return socket.create_connection((self.controller_host, self.controller_port), timeout=5)
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.5)
+    
+    def run(self, connect_timeout: float = 30.0) -> bool:
+        """
+        Executa o ciclo completo do worker
+        
+        Args:
+            connect_timeout: Tempo máximo para conectar no controller
+        
+        Returns:
+            True se um shard foi executado
+        """
+        sock = self._connect(connect_timeout)
+        sock.settimeout(None)
+        rfile = sock.makefile("rb")
+        wfile = sock.makefile("wb")
+        write_lock = threading.Lock()
+        
+        def send(message):
+            send_message(wfile, message, write_lock)
+        
+        try:
+            send({
+                "type": "register",
+                "name": self.name,
+                "devices": self.devices,
+                "appium_server_url": self.appium_server_url,
+            })
+            logger.info(f"Worker {self.name} registrado em {self.controller_host}:{self.controller_port}")
+            
+            message = read_message(rfile)
+            if not message or message.get("type") != "job":
+                logger.info(f"Worker {self.name}: nenhum shard recebido")
+                return False
+            
+            self.test = build_shard_test(shard_from_dict(message["shard"]))
+            try:
+                # Os caminhos das fontes de dados são os do controller: falha antes de iniciar
+                for scenario, _ in self.test.scenarios:
+                    for source in scenario.data_sources:
+                        source.open()
+            except (OSError, ValueError) as e:
+                logger.error(f"Worker {self.name}: fonte de dados indisponível neste host: {e}")
+                send({"type": "error", "error": str(e)})
+                return False
+            
+            streamer = MetricsStreamer(send)
+            self.test.metrics_collector.add_listener(streamer.on_record)
+            
+            # Depois do warm-up o teste espera o start do controller
+            start = threading.Event()
+            
+            def wait_for_start():
+                send({"type": "ready"})
+                start.wait()
+            
+            self.test.start_gate = wait_for_start
+            threading.Thread(target=self._listen, args=(rfile, start), daemon=True).start()
+            
+            streamer.start()
+            try:
+                self.test.run()
+            finally:
+                streamer.stop()
+                send({"type": "done"})
+            
+            return True
+        finally:
+            for resource in (rfile, wfile, sock):
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+    
+    def _listen(self, rfile, start: threading.Event):
+        """Libera o teste local no 'start' e o para no 'stop' do controller"""
+        try:
+            while True:
+                message = read_message(rfile)
+                if message is None or message.get("type") == "stop":
+                    break
+                if message.get("type") == "start":
+                    start.set()
+        except (OSError, ValueError):
+            pass
+        
+        if self.test is not None and self.test.is_running:
+            self.test.stop()
+        start.set()
@@ -0,0 +1,168 @@
+"""
+Distribuição de usuários virtuais entre plataformas e devices
+"""
+
+import threading
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Estratégias aceitas na chave 'distribute' de cada plataforma
+DISTRIBUTION_STRATEGIES = ("round-robin", "least-loaded", "weighted")
+
+
+def _largest_remainder(total: int, weights: List[float]) -> List[int]:
+    """Divide total proporcionalmente aos pesos, preservando a soma"""
+    weight_sum = sum(weights)
+    if total <= 0 or weight_sum <= 0:
+        return [0] * len(weights)
+    
+    exact = [total * w / weight_sum for w in weights]
+    counts = [int(x) for x in exact]
+    remainders = sorted(range(len(weights)), key=lambda i: (exact[i] - counts[i], -i), reverse=True)
+    for i in remainders[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def compute_platform_quotas(platforms: List, max_users: int) -> List[int]:
+    """
+    Calcula quantos usuários virtuais cada plataforma recebe
+    
+    Plataformas com 'users' recebem a quota absoluta. O restante de
+    max_users é dividido entre as demais proporcionalmente a 'share'
+    (padrão 1, ou seja, divisão igual).
+    
+    Args:
+        platforms: Lista de PlatformConfig
+        max_users: Total de usuários virtuais do teste
+    
+    Returns:
+        Lista de quotas na mesma ordem das plataformas
+    """
+    absolute = sum(p.users for p in platforms if p.users is not None)
+    if absolute > max_users:
+        raise ValueError(
+            f"Quotas de usuários das plataformas ({absolute}) excedem o máximo de usuários virtuais ({max_users})"
+        )
+    
+    relative = [i for i, p in enumerate(platforms) if p.users is None]
+    shares = [platforms[i].share if platforms[i].share is not None else 1.0 for i in relative]
+    
+    quotas = [p.users if p.users is not None else 0 for p in platforms]
+    for i, count in zip(relative, _largest_remainder(max_users - absolute, shares)):
+        quotas[i] = count
+    
+    return quotas
+
+
+class PlatformAllocator:
+    """
+    Escolhe a plataforma de cada novo usuário virtual
+    
+    Intercala as plataformas proporcionalmente às quotas, de modo que
+    durante o ramp-up todas recebem carga ao mesmo tempo.
+    """
+    
+    def __init__(self, platforms: List, max_users: int):
+        self.platforms = platforms
+        self.quotas = compute_platform_quotas(platforms, max_users)
+        self.assigned = [0] * len(platforms)
+        self.lock = threading.Lock()
+        
+        for platform_config, quota in zip(platforms, self.quotas):
+            logger.info(f"Plataforma {platform_config.platform}: quota de {quota} usuário(s)")
+    
+    def next_platform(self) -> Optional[int]:
+        """
+        Reserva uma vaga e retorna o índice da plataforma
+        
+        Returns:
+            Índice da plataforma ou None se todas as quotas estão cheias
+        """
+        with self.lock:
+            candidates = [i for i, quota in enumerate(self.quotas) if self.assigned[i] < quota]
+            if not candidates:
+                return None
+            
+            # Plataforma mais distante da sua quota (proporcionalmente)
+            index = min(candidates, key=lambda i: (self.assigned[i] / self.quotas[i], i))
+            self.assigned[index] += 1
+            return index
+    
+    def release(self, index: int):
+        """Devolve a vaga de um usuário que terminou"""
+        with self.lock:
+            if self.assigned[index] > 0:
+                self.assigned[index] -= 1
+
+
+class DeviceSelector:
+    """
+    Escolhe o device de cada usuário virtual dentro de uma plataforma
+    
+    Estratégias:
+        round-robin: percorre os devices em ordem
+        least-loaded: device com menos usuários ativos
+        weighted: round-robin suave ponderado por device_weights
+    """
+    
+    def __init__(self, devices: List[str], strategy: str = "round-robin", weights: Optional[Dict[str, float]] = None):
+        if strategy not in DISTRIBUTION_STRATEGIES:
+            raise ValueError(
+                f"Estratégia de distribuição desconhecida: {strategy} (use um de {list(DISTRIBUTION_STRATEGIES)})"
+            )
+        
+        self.devices = list(devices)
+        self.strategy = strategy
+        self.weights = {device: float((weights or {}).get(device, 1)) for device in self.devices}
+        
+        self.active: Dict[str, int] = {device: 0 for device in self.devices}
+        self._next = 0
+        self._current_weights: Dict[str, float] = {device: 0.0 for device in self.devices}
+        self.lock = threading.Lock()
+    
+    def acquire(self, limit: Optional[int] = None) -> Optional[str]:
+        """
+        Escolhe um device e o marca como em uso
+        
+        Args:
+            limit: Máximo de usuários ativos por device (None = sem limite)
+        
+        Returns:
+            Device escolhido ou None se não há devices (ou todos estão no limite)
+        """
+        with self.lock:
+            candidates = [d for d in self.devices if limit is None or self.active[d] < limit]
+            if not candidates:
+                return None
+            
+            if self.strategy == "least-loaded":
+                device = min(candidates, key=lambda d: self.active[d])
+            elif self.strategy == "weighted":
+                # Smooth weighted round-robin (mesmo algoritmo do nginx)
+                total = sum(self.weights[d] for d in candidates)
+                for d in candidates:
+                    self._current_weights[d] += self.weights[d]
+                device = max(candidates, key=lambda d: self._current_weights[d])
+                self._current_weights[device] -= total
+            else:
+                # Próximo device na ordem que ainda tem capacidade
+                for step in range(len(self.devices)):
+                    device = self.devices[(self._next + step) % len(self.devices)]
+                    if device in candidates:
+                        self._next += step + 1
+                        break
+            
+            self.active[device] += 1
+            return device
+    
+    def release(self, device: Optional[str]):
+        """Libera um device usado por um usuário que terminou"""
+        if device is None:
+            return
+        
+        with self.lock:
+            if self.active.get(device, 0) > 0:
+                self.active[device] -= 1
@@ -0,0 +1,282 @@
+"""
+Execução de ações em lote no servidor (Appium executeDriverScript)
+
+Cada ação executada pelo cliente custa uma ou mais idas e voltas até o
+Appium; com o gerador longe da farm, o RTT da rede domina os tempos
+medidos. Com Scenario(batch=True), ações consecutivas viram um único
+script WebdriverIO executado pelo Appium (POST /appium/execute_driver),
+que mede cada passo no servidor e devolve os tempos, registrados como se
+as ações tivessem rodado localmente.
+
+Ações que alteram os metadados da sessão (rotate, switch_context), os
+marcadores de transação e as ações com política de falha (novas
+tentativas, continue ou screenshot, ver failure_policy) continuam no
+cliente e separam os lotes. O think
+time de cada ação é sorteado no cliente e executado dentro do script,
+descontado das durações como no modo normal. Dentro do lote não há cache
+de elementos nem interrupção pelo hard stop (verificado entre lotes).
+
+Requer o plugin execute-driver no servidor Appium
+(appium plugin install execute-driver).
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .session_metadata import SessionMetadata
+
+logger = logging.getLogger(__name__)
+
+# Ações executadas dentro do script; as demais rodam no cliente
+BATCHABLE_ACTIONS = ("tap", "input", "wait", "scroll", "swipe", "gesture", "back")
+
+# Folga somada ao pior caso das ações no timeout do script (segundos)
+DRIVER_SCRIPT_MARGIN = 60
+
+# Funções comuns do script: busca com o polling da ação e loop dos passos.
+# data (think time, implicit wait e payloads por execução) é definido antes.
+SCRIPT_PRELUDE = """\
+const ELEMENT = "element-6066-11e4-a23f-4f4d5d2e5f45";
+let implicit = data.implicit;
+async function find(using, value, timeout, polling) {
+  const wanted = polling.implicit ? timeout : 0;
+  if (implicit !== wanted) {
+    await driver.setTimeouts(wanted);
+    implicit = wanted;
+  }
+  const deadline = Date.now() + timeout;
+  let interval = polling.interval;
+  let waited = 0;
+  for (;;) {
+    let element = null;
+    try {
+      element = await driver.findElement(using, value);
+    } catch (e) {}
+    const id = element && (element[ELEMENT] || element.ELEMENT);
+    if (id) return [id, waited];
+    const remaining = deadline - Date.now();
+    if (remaining <= 0) throw new Error("Elemento não encontrado em " + timeout / 1000 + "s: " + value);
+    const delay = Math.min(interval, remaining);
+    await driver.pause(delay);
+    waited += delay;
+    interval = Math.min(polling.max, interval * polling.factor);
+  }
+}
+async function element(t, using, value, timeout, polling) {
+  const [id, waited] = await find(using, value, timeout, polling);
+  t.lookup = Date.now() - t.started;
+  t.poll = waited;
+  return id;
+}
+"""
+
+SCRIPT_LOOP = """\
+const began = Date.now();
+const steps = [];
+for (let i = 0; i < actions.length; i++) {
+  const t = {started: Date.now(), lookup: 0, poll: 0};
+  let error = null;
+  try {
+    await actions[i](t);
+  } catch (e) {
+    error = String((e && e.message) || e);
+  }
+  const finished = Date.now();
+  const step = {
+    duration: finished - t.started, lookup: t.lookup, poll: t.poll,
+    error: error, offset: finished - began, think: 0
+  };
+  steps.push(step);
+  if (error) break;
+  if (data.think[i] > 0) {
+    await driver.pause(data.think[i]);
+    step.think = Date.now() - finished;
+  }
+}
+return {steps: steps, implicit: implicit};
+"""
+
+
+class DriverScriptError(Exception):
+    """Falha de uma ação executada dentro do script no servidor"""
+
+
+def _ms(seconds: float) -> int:
+    return int(round(seconds * 1000))
+
+
+class DriverScriptBatch:
+    """
+    Ações consecutivas do cenário executadas em um único executeDriverScript
+    
+    O corpo do script é montado uma vez; a cada execução só os dados
+    (think time sorteado, implicit wait da sessão e gestos com coordenadas
+    relativas) são serializados no início do script.
+    """
+    
+    def __init__(self, items: Sequence[Tuple[int, Any]]):
+        """
+        Args:
+            items: (posição no cenário, Action compilada) de cada ação do lote
+        """
+        self.items = list(items)
+        self.relative = {
+            str(position): action.gesture
+            for position, (_, action) in enumerate(self.items)
+            if action.gesture is not None and action.gesture.relative
+        }
+        self.body = "const actions = [\n{}];\n".format(
+            "".join(f"  async (t) => {{ {self._translate(position, action)} }},\n"
+                    for position, (_, action) in enumerate(self.items))
+        )
+        # Pior caso das ações (buscas e waits), sem o think time
+        self.budget = sum(action.params.get('timeout', action.default_timeout if action.locator else 1)
+                          for _, action in self.items if action.locator or action.action_type == "wait")
+    
+    @property
+    def needs_window_size(self) -> bool:
+        """Se algum gesto do lote usa coordenadas relativas ao tamanho da tela"""
+        return bool(self.relative)
+    
+    def _translate(self, position: int, action: Any) -> str:
+        """Código JavaScript de uma ação (recebe t, onde registra busca e polling)"""
+        params = action.params
+        
+        if action.locator:
+            polling = action.find_polling
+            find = "await element(t, {}, {}, {}, {})".format(
+                json.dumps(action.locator[0]),
+                json.dumps(action.locator[1]),
+                _ms(params.get('timeout', action.default_timeout)),
+                json.dumps({
+                    "implicit": polling.strategy == "implicit",
+                    "interval": _ms(polling.interval),
+                    "factor": polling.factor if polling.strategy == "backoff" else 1,
+                    "max": _ms(polling.max_interval if polling.strategy == "backoff" else polling.interval),
+                })
+            )
+            if action.action_type == "tap":
+                return f"await driver.elementClick({find});"
+            return f"await driver.elementSendKeys({find}, {json.dumps(params.get('text', ''))});"
+        
+        if action.action_type == "input":
+            text = json.dumps(params.get('text', ''))
+            return ("const active = await driver.getActiveElement(); "
+                    f"await driver.elementSendKeys(active[ELEMENT] || active.ELEMENT, {text});")
+        if action.action_type == "wait":
+            return f"await driver.pause({_ms(params.get('timeout', 1))});"
+        if action.action_type == "back":
+            return "await driver.back();"
+        if str(position) in self.relative:
+            return f"await driver.performActions(data.payloads[{json.dumps(str(position))}]);"
+        return f"await driver.performActions({json.dumps(action.gesture.payload())});"
+    
+    def prepare(
+        self,
+        thinks: List[float],
+        metadata: SessionMetadata,
+        window_size: Optional[Dict[str, int]] = None
+    ) -> Tuple[str, int]:
+        """
+        Monta o script de uma execução do lote
+        
+        Args:
+            thinks: Think time sorteado após cada ação (segundos)
+            metadata: Metadados da sessão (implicit wait atual)
+            window_size: Tamanho da tela, se needs_window_size
+        
+        Returns:
+            (script, timeout do script em milissegundos)
+        """
+        data = {
+            "think": [_ms(think) for think in thinks],
+            "implicit": _ms(metadata.get("implicit_wait", 0)),
+            "payloads": {position: gesture.payload(window_size) for position, gesture in self.relative.items()},
+        }
+        script = f"const data = {json.dumps(data)};\n{SCRIPT_PRELUDE}{self.body}{SCRIPT_LOOP}"
+        return script, _ms(self.budget + sum(thinks) + DRIVER_SCRIPT_MARGIN)
+    
+    def fail(self, run: Any, started: float, error: Exception):
+        """Registra a falha da chamada ao servidor na primeira ação do lote"""
+        index, action = self.items[0]
+        run.step(index, action, started, None, error)
+        logger.error(f"Erro no lote de ações {index + 1}-{self.items[-1][0] + 1} (executeDriverScript): {error}")
+    
+    def record(self, run: Any, started: float, result: Optional[Dict[str, Any]], metadata: SessionMetadata):
+        """
+        Registra os tempos medidos no servidor como passos do cenário
+        
+        Args:
+            run: ScenarioRun da execução
+            started: Início da chamada (time.monotonic), base do fim de cada passo
+            result: Retorno do script ({"steps": [...], "implicit": ms})
+            metadata: Metadados da sessão (recebe o implicit wait final)
+        
+        Raises:
+            DriverScriptError: Ação falhou no servidor ou o script não
+                executou todas as ações
+        """
+        result = result or {}
+        steps = result.get("steps") or []
+        
+        implicit = result.get("implicit", 0) / 1000
+        if metadata.get("implicit_wait", 0) != implicit:
+            metadata.changed("implicit_wait", implicit)
+        
+        for (index, action), step in zip(self.items, steps):
+            error = DriverScriptError(step["error"]) if step.get("error") else None
+            run.record(
+                index,
+                action,
+                duration=step["duration"] / 1000,
+                lookup=step.get("lookup", 0) / 1000,
+                error=error,
+                poll_wait=step.get("poll", 0) / 1000,
+                finished=started + step.get("offset", step["duration"]) / 1000
+            )
+            run.add_pause(step.get("think", 0) / 1000)
+            if error is not None:
+                logger.error(f"Erro na ação {index + 1} ({action.action_type}): {error}")
+                raise error
+        
+        if len(steps) < len(self.items):
+            index, action = self.items[len(steps)]
+            error = DriverScriptError(f"Script executou {len(steps)} de {len(self.items)} ações")
+            run.step(index, action, started, None, error)
+            raise error
+
+
+def segment_plan(block: Sequence[Any], actions: Sequence[Any]) -> List[Any]:
+    """
+    Divide um bloco do cenário em lotes para o servidor e ações no cliente
+    
+    Args:
+        block: Posições das ações em actions e nós de controle (ver control_flow)
+        actions: Ações do cenário
+    
+    Returns:
+        Na ordem do bloco: a posição (int) de cada ação executada pelo
+        cliente, um DriverScriptBatch com as ações consecutivas em lote ou
+        o nó de controle (que separa os lotes)
+    """
+    segments: List[Any] = []
+    pending: List[Tuple[int, Any]] = []
+    
+    for node in block:
+        batchable = (
+            isinstance(node, int)
+            and actions[node].action_type in BATCHABLE_ACTIONS
+            and not actions[node].failure.active
+        )
+        if batchable:
+            pending.append((node, actions[node]))
+            continue
+        if pending:
+            segments.append(DriverScriptBatch(pending))
+            pending = []
+        segments.append(node)
+    
+    if pending:
+        segments.append(DriverScriptBatch(pending))
+    return segments
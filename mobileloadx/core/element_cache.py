@@ -0,0 +1,55 @@
+"""
+Cache de elementos por sessão
+
+Cada tap e input com locator faz uma busca completa no Appium antes da
+interação. Com o cache ligado, o handle encontrado fica guardado por
+locator na sessão do usuário virtual e é reaproveitado nas execuções
+seguintes; quando a tela é recriada e o handle expira (stale element
+reference), o engine invalida a entrada, busca de novo e repete a
+interação uma vez.
+"""
+
+from typing import Any, Dict, Hashable, Optional
+
+
+class ElementCache:
+    """
+    Handles de elementos de uma sessão Appium, por locator
+    
+    Usado por um único usuário virtual (thread ou corrotina), por isso
+    não há lock. Deve ser limpo sempre que a sessão muda.
+    """
+    
+    def __init__(self):
+        self._elements: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # hits cujo handle expirou e foi buscado de novo
+    
+    def get(self, locator: Hashable) -> Optional[Any]:
+        """Retorna o handle guardado para o locator (None se não houver)"""
+        element = self._elements.get(locator)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+    
+    def put(self, locator: Hashable, element: Any):
+        """Guarda o handle encontrado para o locator"""
+        self._elements[locator] = element
+    
+    def invalidate(self, locator: Hashable):
+        """Descarta um handle que expirou"""
+        self._elements.pop(locator, None)
+        self.stale += 1
+    
+    def clear(self):
+        """Descarta todos os handles (fim ou troca de sessão)"""
+        self._elements.clear()
+    
+    def take_counters(self) -> Dict[str, int]:
+        """Retorna os contadores acumulados e os zera"""
+        counters = {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+        self.hits = self.misses = self.stale = 0
+        return counters
@@ -0,0 +1,98 @@
+"""
+Política de falha das ações
+
+Sem política, a primeira falha de uma ação derruba a iteração inteira: um
+tap instável descarta todo o tempo de device já gasto no cenário. A
+política pode ser configurada por cenário ou por ação (a da ação
+substitui a do cenário):
+
+- retries: novas tentativas da ação, com backoff exponencial entre elas
+- on_failure: "abort_iteration" (padrão: a falha encerra a iteração) ou
+  "continue" (a falha é registrada e o cenário segue para a próxima ação)
+- screenshot: salva a tela do device em screenshot_dir quando a ação falha
+
+As tentativas que falharam e as esperas entre elas são registradas à parte
+(retries e retry_time), fora da duração da ação. Erros de sessão perdida
+(ver session_health) nunca são repetidos nem tolerados.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from .session_health import is_session_fatal
+
+# Comportamentos aceitos em on_failure
+ON_FAILURE_MODES = ("abort_iteration", "continue")
+
+# Timeout padrão da busca de elementos (segundos)
+DEFAULT_TIMEOUT = 10.0
+
+
+@dataclass
+class FailurePolicy:
+    """Configuração da política de falha das ações"""
+    retries: int = 0  # novas tentativas após a primeira falha
+    backoff: float = 0.5  # atraso antes da segunda tentativa (segundos)
+    max_backoff: float = 5.0
+    on_failure: str = "abort_iteration"
+    screenshot: bool = False  # salva a tela quando a ação falha
+    screenshot_dir: str = "screenshots"
+    
+    def __post_init__(self):
+        if self.on_failure not in ON_FAILURE_MODES:
+            raise ValueError(
+                f"on_failure desconhecido: {self.on_failure} "
+                f"(use um de {list(ON_FAILURE_MODES)})"
+            )
+        if self.retries < 0:
+            raise ValueError(f"retries não pode ser negativo: {self.retries}")
+        if self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError("Backoff da política de falha não pode ser negativo")
+    
+    @classmethod
+    def parse(cls, spec: Union[None, int, dict, "FailurePolicy"]) -> Optional["FailurePolicy"]:
+        """
+        Converte a configuração da política
+        
+        Args:
+            spec: Número (novas tentativas), dicionário com os campos de
+                FailurePolicy, FailurePolicy ou None
+        """
+        if spec is None or isinstance(spec, cls):
+            return spec
+        if isinstance(spec, int) and not isinstance(spec, bool):
+            return cls(retries=spec)
+        if isinstance(spec, dict):
+            return cls(**spec)
+        raise ValueError(f"Política de falha inválida: {spec!r}")
+    
+    @property
+    def active(self) -> bool:
+        """Se a política muda o padrão (a ação precisa ser executada pelo cliente, fora dos lotes)"""
+        return self.retries > 0 or self.on_failure == "continue" or self.screenshot
+    
+    def delay(self, attempt: int) -> float:
+        """Atraso antes da próxima tentativa (attempt: tentativa que falhou, 0 = primeira)"""
+        return min(self.max_backoff, self.backoff * 2 ** attempt)
+    
+    def can_retry(self, attempt: int, error: BaseException) -> bool:
+        """Se a ação deve ser repetida após a falha da tentativa attempt"""
+        return attempt < self.retries and not is_session_fatal(error)
+    
+    def tolerates(self, error: BaseException) -> bool:
+        """Se o cenário segue após a falha (continue, exceto com a sessão perdida)"""
+        return self.on_failure == "continue" and not is_session_fatal(error)
+    
+    def screenshot_path(self, scenario: str, step: int) -> str:
+        """Arquivo do screenshot de uma falha (cria o diretório)"""
+        os.makedirs(self.screenshot_dir, exist_ok=True)
+        name = re.sub(r"[^\w.-]+", "_", scenario).strip("_") or "scenario"
+        return os.path.join(self.screenshot_dir, f"{name}-{step}-{time.time_ns()}.png")
+    
+    def to_dict(self) -> dict:
+        """Serializa no formato aceito por parse (apenas campos não padrão)"""
+        defaults = FailurePolicy()
+        return {key: value for key, value in vars(self).items() if value != getattr(defaults, key)}
@@ -0,0 +1,239 @@
+"""
+Fontes de dados (feeders) para parametrizar as ações
+
+Cada cenário pode declarar data_sources (arquivos CSV com cabeçalho ou
+JSONL, um registro por linha). A cada iteração o usuário virtual recebe
+uma linha de cada fonte, e os placeholders ${coluna} (ou ${fonte.coluna})
+dos parâmetros das ações são substituídos pelos valores da linha.
+
+O arquivo não é carregado inteiro: é mapeado em memória (mmap) e só o
+início e o fim de cada linha ficam indexados (16 bytes por linha). Cada
+linha é lida e convertida apenas quando sorteada.
+
+Modos de atribuição:
+- unique: uma linha fixa por usuário virtual (linha = id do usuário)
+- sequential: próxima linha a cada iteração; falha quando o arquivo acaba
+- circular: como sequential, voltando ao início no fim do arquivo
+- random: linha sorteada a cada iteração
+
+Os cursores são contadores atômicos (itertools.count), sem lock por
+iteração. Com workers, sequential e circular dividem as linhas entre os
+processos (linha i vai para o worker i % workers), e unique já é global
+porque os ids dos usuários são únicos entre os workers.
+"""
+
+import csv
+import json
+import mmap
+import random
+import re
+import itertools
+import threading
+import logging
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modos de atribuição das linhas
+FEEDER_MODES = ("unique", "sequential", "circular", "random")
+
+# Formatos aceitos (padrão: pela extensão do arquivo)
+FEEDER_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# ${coluna} ou ${fonte.coluna}
+PLACEHOLDER = re.compile(r"\$\{([A-Za-z_][\w.]*)\}")
+
+
+class DataSourceExhausted(Exception):
+    """Fonte de dados sem linha disponível (sequential esgotada ou unique sem linha para o usuário)"""
+
+
+def has_placeholders(value: Any) -> bool:
+    """Se o valor (string, lista ou dicionário) contém placeholders ${...}"""
+    if isinstance(value, str):
+        return PLACEHOLDER.search(value) is not None
+    if isinstance(value, dict):
+        return any(has_placeholders(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(has_placeholders(item) for item in value)
+    return False
+
+
+def substitute(value: Any, variables: Dict[str, Any]) -> Any:
+    """
+    Substitui os placeholders ${...} pelos valores da linha
+    
+    Um valor formado só pelo placeholder mantém o tipo da linha (ex.:
+    números do JSONL); dentro de um texto o valor é convertido em string.
+    
+    Raises:
+        KeyError: Placeholder sem coluna correspondente
+    """
+    if isinstance(value, str):
+        match = PLACEHOLDER.fullmatch(value)
+        if match:
+            return _lookup(variables, match.group(1))
+        return PLACEHOLDER.sub(lambda m: str(_lookup(variables, m.group(1))), value)
+    if isinstance(value, dict):
+        return {key: substitute(item, variables) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute(item, variables) for item in value]
+    return value
+
+
+def _lookup(variables: Dict[str, Any], name: str) -> Any:
+    try:
+        return variables[name]
+    except KeyError:
+        raise KeyError(f"Variável não definida nas fontes de dados: ${{{name}}}") from None
+
+
+def resolve_source_paths(data_sources: List[Any], base_dir: Path) -> List[Any]:
+    """Caminhos relativos das fontes de dados resolvidos a partir de base_dir (diretório da configuração)"""
+    return [
+        dict(source, path=str(Path(base_dir, source["path"]))) if isinstance(source, dict) and "path" in source
+        else source
+        for source in data_sources
+    ]
+
+
+@dataclass
+class DataSourceConfig:
+    """Configuração de uma fonte de dados"""
+    name: str
+    path: str
+    mode: str = "sequential"
+    format: Optional[str] = None  # "csv" ou "jsonl" (padrão: extensão do arquivo)
+    delimiter: str = ","  # apenas CSV
+    
+    def __post_init__(self):
+        if not self.name or "." in self.name:
+            raise ValueError(f"Nome de fonte de dados inválido: {self.name!r}")
+        if self.mode not in FEEDER_MODES:
+            raise ValueError(f"Modo de fonte de dados desconhecido: {self.mode} (use um de {list(FEEDER_MODES)})")
+        if self.format is None:
+            self.format = FEEDER_FORMATS.get(Path(self.path).suffix.lower())
+        if self.format not in FEEDER_FORMATS.values():
+            raise ValueError(
+                f"Formato da fonte de dados '{self.name}' não reconhecido: {self.path} (use .csv ou .jsonl)"
+            )
+
+
+class DataFeeder:
+    """
+    Fornece as linhas de uma fonte de dados aos usuários virtuais
+    
+    O arquivo é aberto e indexado no primeiro uso (também em cada processo
+    worker, pois o mmap não é enviado entre processos).
+    """
+    
+    def __init__(self, config: DataSourceConfig):
+        self.config = config
+        self.partition = (0, 1)  # (índice do worker, total de workers)
+        self._cursor = itertools.count()
+        self._lock = threading.Lock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._offsets: Optional[array] = None  # (início, fim) de cada linha
+        self._columns: Optional[List[str]] = None  # cabeçalho do CSV
+    
+    def __getstate__(self):
+        # Arquivo reaberto e cursor reiniciado no destino (processos worker)
+        return {"config": self.config, "partition": self.partition}
+    
+    def __setstate__(self, state):
+        self.__init__(state["config"])
+        self.partition = state["partition"]
+    
+    @property
+    def name(self) -> str:
+        return self.config.name
+    
+    def set_partition(self, index: int, workers: int):
+        """Restringe sequential e circular às linhas deste worker"""
+        self.partition = (index, workers)
+        self._cursor = itertools.count()
+    
+    def open(self):
+        """Mapeia o arquivo e indexa as linhas (uma vez por processo)"""
+        if self._offsets is not None:
+            return
+        
+        with self._lock:
+            if self._offsets is not None:
+                return
+            
+            with open(self.config.path, "rb") as f:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    raise ValueError(f"Fonte de dados '{self.name}' vazia: {self.config.path}") from None
+            
+            offsets = array("Q")
+            position, size = 0, len(data)
+            while position < size:
+                end = data.find(b"\n", position)
+                end = size if end == -1 else end
+                if data[position:end].strip():
+                    offsets.append(position)
+                    offsets.append(end)
+                position = end + 1
+            
+            if self.config.format == "csv" and offsets:
+                self._columns = self._parse_csv(data[offsets[0]:offsets[1]])
+                del offsets[:2]
+            if not offsets:
+                raise ValueError(f"Fonte de dados '{self.name}' sem linhas: {self.config.path}")
+            
+            self._mmap = data
+            self._offsets = offsets
+            logger.info(f"Fonte de dados '{self.name}': {len(self)} linhas ({self.config.mode})")
+    
+    def __len__(self) -> int:
+        self.open()
+        return len(self._offsets) // 2
+    
+    def _parse_csv(self, raw: bytes) -> List[str]:
+        return next(csv.reader([raw.decode("utf-8-sig").rstrip("\r")], delimiter=self.config.delimiter))
+    
+    def row(self, position: int) -> Dict[str, Any]:
+        """Lê e converte a linha na posição indicada (0 = primeiro registro)"""
+        self.open()
+        raw = self._mmap[self._offsets[2 * position]:self._offsets[2 * position + 1]]
+        if self.config.format == "jsonl":
+            return json.loads(raw)
+        return dict(zip(self._columns, self._parse_csv(raw)))
+    
+    def next_row(self, user_id: int, rng: Any = random) -> Dict[str, Any]:
+        """
+        Linha da próxima iteração do usuário pelo modo da fonte
+        
+        Args:
+            user_id: ID do usuário virtual
+            rng: Gerador do usuário (modo random)
+        
+        Raises:
+            DataSourceExhausted: Não há linha disponível
+        """
+        rows = len(self)
+        mode = self.config.mode
+        
+        if mode == "random":
+            return self.row(rng.randrange(rows))
+        if mode == "unique":
+            if user_id >= rows:
+                raise DataSourceExhausted(
+                    f"Fonte de dados '{self.name}' sem linha para o usuário {user_id} ({rows} linhas)"
+                )
+            return self.row(user_id)
+        
+        index, workers = self.partition
+        mine = range(index, rows, workers)
+        if not mine:
+            raise DataSourceExhausted(f"Fonte de dados '{self.name}' sem linhas para o worker {index}")
+        turn = next(self._cursor)
+        if mode == "sequential" and turn >= len(mine):
+            raise DataSourceExhausted(f"Fonte de dados '{self.name}' esgotada ({rows} linhas)")
+        return self.row(mine[turn % len(mine)])
@@ -0,0 +1,91 @@
+"""
+Gestos em W3C Actions
+
+Um gesto é uma sequência de passos (move, down, up, pause) por dedo,
+enviada ao Appium em uma única requisição POST /actions. Pinch,
+long-press-drag e fling custam assim uma ida ao servidor; scroll e swipe
+são gestos de um dedo montados pelo mesmo caminho.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+# Passos aceitos em cada dedo do gesto
+GESTURE_STEPS = ("move", "down", "up", "pause")
+
+
+def pointer_input(index: int, actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Entrada W3C de um dedo (index a partir de 0)"""
+    return {
+        "type": "pointer",
+        "id": f"finger{index + 1}",
+        "parameters": {"pointerType": "touch"},
+        "actions": actions,
+    }
+
+
+class Gesture:
+    """
+    Gesto com um ou mais dedos, validado ao carregar o cenário
+    
+    Cada dedo é uma lista de passos: "down", "up", {"pause": segundos} ou
+    {"move": [x, y], "duration": segundos}. Com relative=True, x e y são
+    frações (0 a 1) do tamanho da tela.
+    """
+    
+    def __init__(self, pointers: Sequence[Sequence[Any]], relative: bool = False):
+        if not pointers:
+            raise ValueError("Gesto sem pointers")
+        
+        self.relative = relative
+        self.pointers = [[self._parse_step(step) for step in steps] for steps in pointers]
+        # Sem coordenadas relativas o payload não depende da sessão
+        self._payload = None
+        if not relative:
+            self._payload = self.payload()
+    
+    def _parse_step(self, step: Any) -> Dict[str, Any]:
+        """Converte um passo da configuração em uma ação W3C"""
+        if isinstance(step, str):
+            step = {step: None}
+        if not isinstance(step, dict) or len(set(step) & set(GESTURE_STEPS)) != 1:
+            raise ValueError(f"Passo de gesto inválido: {step!r} (use um de {list(GESTURE_STEPS)})")
+        
+        if "down" in step:
+            return {"type": "pointerDown", "button": 0}
+        if "up" in step:
+            return {"type": "pointerUp", "button": 0}
+        if "pause" in step:
+            return {"type": "pause", "duration": int(step["pause"] * 1000)}
+        
+        position = step["move"]
+        if not isinstance(position, (list, tuple)) or len(position) != 2:
+            raise ValueError(f"move requer [x, y]: {position!r}")
+        if self.relative and not all(0 <= value <= 1 for value in position):
+            raise ValueError(f"Coordenadas relativas devem estar entre 0 e 1: {position!r}")
+        return {
+            "type": "pointerMove",
+            "duration": int(step.get("duration", 0) * 1000),
+            "x": position[0],
+            "y": position[1],
+        }
+    
+    def payload(self, window_size: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Payload W3C Actions do gesto
+        
+        Args:
+            window_size: Tamanho da tela ({"width", "height"}); obrigatório
+                com coordenadas relativas
+        """
+        if self._payload is not None:
+            return self._payload
+        
+        width, height = (window_size["width"], window_size["height"]) if self.relative else (1, 1)
+        return [
+            pointer_input(index, [
+                dict(action, x=int(action["x"] * width), y=int(action["y"] * height))
+                if action["type"] == "pointerMove" else action
+                for action in actions
+            ])
+            for index, actions in enumerate(self.pointers)
+        ]
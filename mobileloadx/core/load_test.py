@@ -3,20 +3,40 @@ Classe principal do LoadTest que orquestra toda a execução do teste
 """
 
 import time
+import random
 import threading
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import logging
 
 from .virtual_user import VirtualUser
+from .async_engine import AsyncEngine
+from .sharding import ShardedRunner
+from .distribution import DISTRIBUTION_STRATEGIES, PlatformAllocator
+from .device_broker import DeviceBroker
+from .session_pool import SessionPool, SessionPoolConfig
+from .warmup import WarmupConfig, run_warmup
+from .session_health import CircuitBreaker, SessionHealthConfig
+from .arrival_rate import ArrivalRateConfig, ArrivalRateExecutor
+from .profile import LoadProfile, Stage
+from .scheduler import EventScheduler
 from .scenario import Scenario
+from .feeders import resolve_source_paths
+from .scenario_mix import MIX_MODES, ScenarioMix
 from ..metrics.collector import MetricsCollector
 from ..reporting.results import TestResults
 from ..config.loader import ConfigLoader
 
 logger = logging.getLogger(__name__)
 
+# Engines de execução suportadas
+ENGINES = ("thread", "asyncio")
+
+# Tempo padrão para cenários em andamento terminarem após o fim do teste
+DEFAULT_DRAIN_TIMEOUT = 30.0
+
 
 @dataclass
 class PlatformConfig:
@@ -25,6 +45,13 @@ class PlatformConfig:
     app: str
     devices: List[str]
     capabilities: Dict[str, Any]
+    users: Optional[int] = None  # quota absoluta de usuários virtuais
+    share: Optional[float] = None  # peso relativo na divisão dos usuários restantes
+    distribute: str = "round-robin"  # estratégia de escolha de device
+    device_weights: Dict[str, float] = field(default_factory=dict)
+    max_sessions_per_device: Optional[int] = None  # None = sem limite
+    session_pool: Optional[SessionPoolConfig] = None  # None = sessão nova por usuário
+    element_cache: bool = False  # reaproveita handles de elementos na sessão
 
 
 class LoadTest:
@@ -32,13 +59,21 @@ class LoadTest:
     Classe principal para executar testes de carga em aplicativos mobile
     """
     
+    # Espera máxima pelos usuários depois do hard stop (segundos)
+    HARD_STOP_GRACE = 5.0
+    
     def __init__(
         self,
         name: str,
         duration: int = 300,
         virtual_users: int = 1,
         ramp_up_time: int = 0,
-        config_file: Optional[str] = None
+        config_file: Optional[str] = None,
+        engine: str = "thread",
+        workers: int = 1,
+        drain_timeout: Optional[float] = DEFAULT_DRAIN_TIMEOUT,
+        seed: Optional[int] = None,
+        scenario_mix: str = "random"
     ):
         """
         Inicializa um teste de carga
@@ -49,11 +84,46 @@ class LoadTest:
             virtual_users: Número máximo de usuários virtuais
             ramp_up_time: Tempo para aumentar gradualmente os usuários
             config_file: Arquivo de configuração YAML (opcional)
+            engine: Engine de execução ("thread" ou "asyncio")
+            workers: Número de processos para dividir os usuários virtuais
+            drain_timeout: Segundos para cenários em andamento terminarem após o
+                fim do teste antes do hard stop (None = esperar indefinidamente)
+            seed: Seed da execução (None = sorteada e registrada no log); com a
+                mesma seed cada usuário repete os cenários, think times e ramos
+            scenario_mix: Seleção dos cenários ("random" ou "exact")
         """
         self.name = name
         self.duration = duration
         self.max_virtual_users = virtual_users
         self.ramp_up_time = ramp_up_time
+        self.engine = engine
+        self.workers = workers
+        self.user_id_offset = 0
+        self.seed = seed
+        self.scenario_mix = scenario_mix
+        # Seed usada na última execução (a configurada ou a sorteada)
+        self.run_seed: Optional[int] = None
+        
+        # Executor externo (ex.: controller distribuído); None = execução local
+        self.runner = None
+        # Chamado após o warm-up, antes do relógio: shards esperam o início combinado
+        self.start_gate: Optional[Callable[[], None]] = None
+        
+        # Modelo aberto (taxa de chegada); None = loop fechado por usuário
+        self.arrival_rate: Optional[ArrivalRateConfig] = None
+        
+        # Perfil em estágios; None = ramp-up linear até max_virtual_users
+        self.profile: Optional[LoadProfile] = None
+        
+        # Warm-up antes da medição; None = sessões criadas pelos usuários
+        self.warmup: Optional[WarmupConfig] = None
+        
+        # Watchdog de sessões e circuit breaker por device
+        self.session_health = SessionHealthConfig()
+        
+        # Tempo para cenários em andamento terminarem após o fim do teste;
+        # depois disso vem o hard stop
+        self.drain_timeout = drain_timeout
         
         self.platforms: List[PlatformConfig] = []
         self.scenarios: List[tuple[Scenario, int]] = []  # (scenario, weight)
@@ -63,8 +133,13 @@ class LoadTest:
         self.metrics_collector = MetricsCollector()
         self.is_running = False
         self.start_time = None
+        self.start_monotonic = None
         self.results = None
         
+        # Ganchos do engine em execução: acordar na parada e ao liberar vagas
+        self._on_stop: Optional[Callable[[], None]] = None
+        self._on_release: Optional[Callable[[], None]] = None
+        
         if config_file:
             self._load_from_config(config_file)
     
@@ -74,20 +149,212 @@ class LoadTest:
         app: str,
         device: str = None,
         devices: List[str] = None,
+        users: Optional[int] = None,
+        share: Optional[float] = None,
+        distribute: str = "round-robin",
+        device_weights: Optional[Dict[str, float]] = None,
+        max_sessions_per_device: Optional[int] = None,
+        session_pool: Optional[Any] = None,
+        element_cache: bool = False,
         **capabilities
     ):
-        """Adiciona configuração de plataforma (Android ou iOS)"""
+        """
+        Adiciona configuração de plataforma (Android ou iOS)
+        
+        Args:
+            platform: "android" ou "ios"
+            app: Caminho do app
+            device: Device único
+            devices: Lista de devices
+            users: Quota absoluta de usuários virtuais desta plataforma
+            share: Peso relativo na divisão dos usuários sem quota absoluta
+            distribute: Estratégia de device ("round-robin", "least-loaded" ou "weighted")
+            device_weights: Pesos por device (estratégia "weighted")
+            max_sessions_per_device: Sessões simultâneas por device; usuários
+                excedentes esperam um device livre (None = sem limite)
+            session_pool: Pool de sessões pré-aquecidas (SessionPoolConfig ou dict
+                com size, reset, app_id e deep_link)
+            element_cache: Reaproveita os handles de elementos por locator em
+                cada sessão, buscando de novo os que expirarem
+            **capabilities: Capabilities extras do Appium
+        """
+        if distribute not in DISTRIBUTION_STRATEGIES:
+            raise ValueError(
+                f"Estratégia de distribuição desconhecida: {distribute} (use um de {list(DISTRIBUTION_STRATEGIES)})"
+            )
+        
+        if isinstance(session_pool, dict):
+            session_pool = SessionPoolConfig(**session_pool)
+        
         device_list = devices if devices else ([device] if device else [])
         
         platform_config = PlatformConfig(
             platform=platform.lower(),
             app=app,
             devices=device_list,
-            capabilities=capabilities
+            capabilities=capabilities,
+            users=users,
+            share=share,
+            distribute=distribute,
+            device_weights=device_weights or {},
+            max_sessions_per_device=max_sessions_per_device,
+            session_pool=session_pool,
+            element_cache=element_cache
         )
         self.platforms.append(platform_config)
         logger.info(f"Plataforma adicionada: {platform} com {len(device_list)} device(s)")
     
+    def add_stage(self, duration: float, target: int, easing: str = "linear"):
+        """
+        Adiciona um estágio ao perfil de carga
+        
+        Com estágios, a duração do teste passa a ser a soma das durações e
+        max_virtual_users o maior alvo. Quando o alvo diminui, os usuários
+        excedentes terminam a iteração atual e encerram a sessão.
+        
+        Args:
+            duration: Duração do estágio (segundos)
+            target: Usuários ativos ao final do estágio
+            easing: Curva até o alvo ("linear", "step", "ease-in", "ease-out", "ease-in-out")
+        """
+        if self.profile is None:
+            self.profile = LoadProfile()
+        
+        self.profile.stages.append(Stage(duration=duration, target=target, easing=easing))
+        self.duration = self.profile.duration
+        self.max_virtual_users = self.profile.peak
+        return self
+    
+    def set_arrival_rate(
+        self,
+        rate: float,
+        time_unit: float = 1.0,
+        pre_allocated: Optional[int] = None,
+        stages: Optional[List[Dict[str, float]]] = None,
+        late_threshold: float = 0.1
+    ):
+        """
+        Usa o executor de taxa de chegada (modelo aberto)
+        
+        As iterações começam no ritmo da taxa alvo, independentemente da
+        duração das anteriores. max_virtual_users passa a ser o limite de
+        usuários alocáveis.
+        
+        Args:
+            rate: Iterações por time_unit (com stages, taxa inicial)
+            time_unit: Unidade de tempo da taxa (segundos)
+            pre_allocated: Usuários criados antes do início (padrão: máximo)
+            stages: Rampa de taxas [{target, duration}] (ramping-arrival-rate)
+            late_threshold: Atraso (s) a partir do qual a iteração conta como atrasada
+        """
+        self.arrival_rate = ArrivalRateConfig(
+            executor="ramping-arrival-rate" if stages else "constant-arrival-rate",
+            rate=rate,
+            time_unit=time_unit,
+            pre_allocated=pre_allocated,
+            stages=stages or [],
+            late_threshold=late_threshold
+        )
+    
+    def set_warmup(
+        self,
+        concurrency: int = 4,
+        retries: int = 2,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        jitter: float = 0.5,
+        min_ready: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Cria as sessões dos usuários virtuais antes do início da medição
+        
+        O teste só começa quando min_ready sessões estão prontas; o tempo de
+        warm-up e a latência de criação por device ficam na seção "warmup"
+        dos resultados, fora das métricas do teste.
+        
+        Args:
+            concurrency: Sessões criadas ao mesmo tempo
+            retries: Novas tentativas por sessão (backoff exponencial com jitter)
+            backoff: Atraso antes da primeira nova tentativa (segundos)
+            max_backoff: Atraso máximo entre tentativas (segundos)
+            jitter: Variação aleatória do atraso (fração entre 0 e 1)
+            min_ready: Sessões prontas exigidas (padrão: todas)
+            timeout: Duração máxima do warm-up (segundos)
+        """
+        self.warmup = WarmupConfig(
+            concurrency=concurrency,
+            retries=retries,
+            backoff=backoff,
+            max_backoff=max_backoff,
+            jitter=jitter,
+            min_ready=min_ready,
+            timeout=timeout
+        )
+    
+    def set_session_health(
+        self,
+        enabled: bool = True,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        jitter: float = 0.5,
+        failure_threshold: int = 3,
+        open_time: float = 30.0,
+        fatal_errors: Optional[List[str]] = None
+    ):
+        """
+        Configura o watchdog que recria sessões perdidas no meio do teste
+        
+        Erros que derrubam a sessão (sessão inválida, conexão recusada,
+        instrumentação caída) deixam de gerar falhas em sequência: o usuário
+        recria a sessão com backoff e o tempo sem sessão fica na seção
+        "session_health" dos resultados. Após failure_threshold falhas seguidas
+        em um device, os usuários dele esperam open_time segundos (circuit breaker).
+        
+        Args:
+            enabled: Liga o watchdog (ligado por padrão)
+            backoff: Atraso antes da segunda tentativa de recriar (segundos)
+            max_backoff: Atraso máximo entre tentativas (segundos)
+            jitter: Variação aleatória do atraso (fração entre 0 e 1)
+            failure_threshold: Falhas seguidas que abrem o circuito do device
+            open_time: Tempo com o circuito aberto (segundos)
+            fatal_errors: Trechos de mensagens de erro também tratados como sessão perdida
+        """
+        self.session_health = SessionHealthConfig(
+            enabled=enabled,
+            backoff=backoff,
+            max_backoff=max_backoff,
+            jitter=jitter,
+            failure_threshold=failure_threshold,
+            open_time=open_time,
+            fatal_errors=fatal_errors or []
+        )
+    
+    def set_device_metrics(
+        self,
+        collect: Optional[List[str]] = None,
+        interval: float = 1.0,
+        devices: Optional[List[str]] = None,
+        package: Optional[str] = None,
+        adb: str = "adb"
+    ):
+        """
+        Configura a coleta de métricas dos devices Android durante o teste
+        
+        Cada device é lido por um único adb shell aberto durante todo o
+        teste (CPU e memória do app, bateria e rede).
+        
+        Args:
+            collect: Métricas coletadas (padrão: cpu, memory, battery e
+                network; lista vazia desliga a coleta)
+            interval: Intervalo entre amostras (segundos)
+            devices: Seriais dos devices (None = devices das plataformas android)
+            package: Package do app (None = capability appPackage ou app_id
+                do pool de sessões da plataforma android)
+            adb: Executável do adb
+        """
+        self.metrics_collector = MetricsCollector(interval, collect, devices, package, adb)
+    
     def add_scenario(self, scenario: Scenario, weight: int = 100):
         """
         Adiciona um cenário de teste
@@ -111,12 +378,44 @@ class LoadTest:
         test_config = config.get('test', {})
         self.name = test_config.get('name', self.name)
         self.duration = test_config.get('duration', self.duration)
+        self.engine = test_config.get('engine', self.engine)
+        self.workers = test_config.get('workers', self.workers)
+        self.drain_timeout = test_config.get('drain_timeout', self.drain_timeout)
+        self.seed = test_config.get('seed', self.seed)
+        self.scenario_mix = test_config.get('scenario_mix', self.scenario_mix)
         
         # Usuários virtuais
         vu_config = config.get('virtual_users', {})
         self.max_virtual_users = vu_config.get('max', self.max_virtual_users)
         self.ramp_up_time = vu_config.get('ramp_up_time', self.ramp_up_time)
         
+        executor = vu_config.get('executor')
+        if vu_config.get('stages') and executor in (None, 'ramping-vus'):
+            self.profile = LoadProfile.from_list(vu_config['stages'], start=vu_config.get('initial', 0))
+            self.duration = self.profile.duration
+            self.max_virtual_users = self.profile.peak
+        elif executor is not None and executor != 'ramping-vus':
+            self.arrival_rate = ArrivalRateConfig(
+                executor=executor,
+                rate=vu_config.get('rate', 0 if executor == 'ramping-arrival-rate' else 1),
+                time_unit=vu_config.get('time_unit', 1.0),
+                pre_allocated=vu_config.get('pre_allocated'),
+                stages=vu_config.get('stages', []),
+                late_threshold=vu_config.get('late_threshold', 0.1)
+            )
+        
+        # Warm-up ("warmup: {}" usa os valores padrão)
+        if config.get('warmup') is not None:
+            self.warmup = WarmupConfig(**config['warmup'])
+        
+        # Watchdog de sessões
+        if config.get('session_health') is not None:
+            self.session_health = SessionHealthConfig(**config['session_health'])
+        
+        # Métricas dos devices
+        if config.get('metrics') is not None:
+            self.set_device_metrics(**config['metrics'])
+        
         # Plataformas
         for platform_data in config.get('platforms', []):
             for platform, details in platform_data.items():
@@ -125,12 +424,32 @@ class LoadTest:
                     app=details.get('app'),
                     device=details.get('device'),
                     devices=details.get('devices'),
+                    users=details.get('users'),
+                    share=details.get('share'),
+                    distribute=details.get('distribute', 'round-robin'),
+                    device_weights=details.get('device_weights'),
+                    max_sessions_per_device=details.get('max_sessions_per_device'),
+                    session_pool=details.get('session_pool'),
+                    element_cache=details.get('element_cache', False),
                     **details.get('capabilities', {})
                 )
         
+        # Fontes de dados com caminho relativo ao arquivo de configuração (não ao diretório atual)
+        base_dir = Path(config_file).resolve().parent
+        
+        def with_source_paths(data: Dict[str, Any]) -> Dict[str, Any]:
+            if not data.get('data_sources'):
+                return data
+            return dict(data, data_sources=resolve_source_paths(data['data_sources'], base_dir))
+        
+        # Sub-cenários chamados por call (cada um pode chamar os anteriores)
+        flows: Dict[str, Scenario] = {}
+        for flow_data in config.get('flows', []):
+            flows[flow_data['name']] = Scenario.from_dict(with_source_paths(flow_data), flows)
+        
         # Cenários
         for scenario_data in config.get('scenarios', []):
-            scenario = Scenario.from_dict(scenario_data)
+            scenario = Scenario.from_dict(with_source_paths(scenario_data), flows)
             weight = scenario_data.get('weight', 100)
             self.add_scenario(scenario, weight)
         
@@ -138,8 +457,51 @@ class LoadTest:
         for metric, value in config.get('thresholds', {}).items():
             self.set_threshold(metric, value)
     
+    def device_metrics_config(self) -> Dict[str, Any]:
+        """
+        Configuração da coleta de métricas dos devices, com os devices e o
+        package das plataformas android quando não configurados
+        
+        Returns:
+            Argumentos de set_device_metrics (collect, interval, devices,
+            package e adb)
+        """
+        collector = self.metrics_collector
+        config = {
+            "collect": list(collector.collect),
+            "interval": collector.interval,
+            "devices": list(collector.devices),
+            "package": collector.package,
+            "adb": collector.adb,
+        }
+        android = [platform for platform in self.platforms if platform.platform == "android"]
+        if not android:
+            # iOS não é suportado: sem plataforma android não há o que coletar
+            config["collect"] = []
+            return config
+        
+        if not config["devices"]:
+            config["devices"] = sorted({device for platform in android for device in platform.devices})
+        if config["package"] is None:
+            packages = [
+                platform.capabilities.get("appPackage")
+                or platform.capabilities.get("appium:appPackage")
+                or (platform.session_pool.app_id if platform.session_pool else None)
+                for platform in android
+            ]
+            config["package"] = next((package for package in packages if package), None)
+        return config
+    
+    def _bind_device_metrics(self):
+        """Completa a coleta de métricas com os devices e o package das plataformas android"""
+        for key, value in self.device_metrics_config().items():
+            setattr(self.metrics_collector, key, value)
+    
     def _calculate_users_at_time(self, elapsed_time: float) -> int:
         """Calcula quantos usuários devem estar ativos em um dado momento"""
+        if self.profile is not None:
+            return self.profile.users_at(elapsed_time)
+        
         if elapsed_time >= self.ramp_up_time:
             return self.max_virtual_users
         
@@ -150,48 +512,323 @@ class LoadTest:
         progress = elapsed_time / self.ramp_up_time
         return int(progress * self.max_virtual_users)
     
-    def _create_virtual_user(self, user_id: int, platform_config: PlatformConfig) -> VirtualUser:
-        """Cria um usuário virtual"""
-        device = platform_config.devices[user_id % len(platform_config.devices)] if platform_config.devices else None
+    def _spawn_schedule(self) -> List[Tuple[float, int]]:
+        """
+        Instantes em que o alvo de usuários muda
+        
+        Returns:
+            Lista ordenada de (segundos desde o início, usuários)
+        """
+        if self.profile is not None:
+            return self.profile.change_points()
+        
+        if self.ramp_up_time == 0 or self.max_virtual_users == 0:
+            return [(0.0, self.max_virtual_users)]
+        
+        # Ramp-up linear: o k-ésimo usuário entra em k/max do ramp-up
+        return [
+            (users * self.ramp_up_time / self.max_virtual_users, users)
+            for users in range(1, self.max_virtual_users + 1)
+        ]
+    
+    def _prepare_distribution(self):
+        """Prepara a divisão de usuários entre plataformas e devices para uma execução"""
+        self._platform_allocator = PlatformAllocator(self.platforms, self.max_virtual_users)
+        self._device_brokers = [
+            DeviceBroker(p.devices, p.distribute, p.device_weights, p.max_sessions_per_device)
+            for p in self.platforms
+        ]
+        # Com warm-up, plataformas sem session_pool usam cada sessão pré-aquecida uma vez
+        self._session_pools = [
+            SessionPool(p.session_pool) if p.session_pool
+            else SessionPool(SessionPoolConfig(reset="none"), reuse=False) if self.warmup
+            else None
+            for p in self.platforms
+        ]
+        self._user_platforms: Dict[int, int] = {}
+        self._next_user_id = 0
+        # Tabela de seleção dos cenários, montada uma vez por execução
+        self._mix = ScenarioMix(self.scenarios, self.scenario_mix)
+        self._breakers = [
+            CircuitBreaker(self.session_health, self._circuit_recorder(p.platform))
+            if self.session_health.enabled else None
+            for p in self.platforms
+        ]
+    
+    def _circuit_recorder(self, platform: str) -> Callable[[Optional[str], int], None]:
+        """Callback que registra as aberturas de circuito dos devices da plataforma"""
+        def record(device: Optional[str], failures: int):
+            self.metrics_collector.record_circuit_open(platform=platform, device=device, failures=failures)
+        return record
+    
+    def _create_virtual_user(
+        self,
+        user_id: int,
+        platform_index: int,
+        user_class: type = VirtualUser,
+        **user_kwargs
+    ) -> VirtualUser:
+        """Cria um usuário virtual na plataforma indicada (o device é emprestado no lifecycle)"""
+        platform_config = self.platforms[platform_index]
+        self._user_platforms[user_id] = platform_index
         
-        return VirtualUser(
+        return user_class(
             user_id=user_id,
             platform=platform_config.platform,
             app=platform_config.app,
-            device=device,
+            device=None,
             capabilities=platform_config.capabilities,
             scenarios=self.scenarios,
-            metrics_collector=self.metrics_collector
+            metrics_collector=self.metrics_collector,
+            session_pool=self._session_pools[platform_index],
+            element_cache=platform_config.element_cache,
+            mix=self._mix,
+            seed=self.run_seed,
+            health=self.session_health if self.session_health.enabled else None,
+            breaker=self._breakers[platform_index],
+            **user_kwargs
+        )
+    
+    def _session_template(
+        self,
+        platform_index: int,
+        device: Optional[str],
+        user_class: type = VirtualUser,
+        **user_kwargs
+    ) -> VirtualUser:
+        """Usuário sem vaga nem ID usado apenas para criar sessões no warm-up"""
+        platform_config = self.platforms[platform_index]
+        
+        return user_class(
+            user_id=-1,
+            platform=platform_config.platform,
+            app=platform_config.app,
+            device=device,
+            capabilities=platform_config.capabilities,
+            metrics_collector=self.metrics_collector,
+            session_pool=self._session_pools[platform_index],
+            **user_kwargs
+        )
+    
+    def _warm_plan(self) -> List[Tuple[int, Optional[str]]]:
+        """
+        Sessões a criar no warm-up, distribuídas entre os devices de cada plataforma
+        
+        Cada plataforma aquece session_pool.size sessões ou, com warm-up e
+        sem tamanho de pool, uma por usuário da quota. O total é limitado à
+        quota de usuários e, com max_sessions_per_device, à capacidade dos
+        devices.
+        
+        Returns:
+            Lista de (índice da plataforma, device)
+        """
+        plan = []
+        for index, platform_config in enumerate(self.platforms):
+            quota = self._platform_allocator.quotas[index]
+            if platform_config.session_pool is not None and platform_config.session_pool.size:
+                size = platform_config.session_pool.size
+            elif self.warmup is not None:
+                size = quota
+            else:
+                continue
+            
+            count = min(size, quota)
+            devices = platform_config.devices or [None]
+            if platform_config.devices and platform_config.max_sessions_per_device:
+                count = min(count, platform_config.max_sessions_per_device * len(devices))
+            
+            plan.extend((index, devices[k % len(devices)]) for k in range(count))
+        return plan
+    
+    def _record_warmup(self, item: Tuple[int, Optional[str]], duration: float, attempts: int, error: Optional[str]):
+        """Registra o resultado de um item do plano de warm-up"""
+        platform_index, device = item
+        self.metrics_collector.record_warmup(
+            platform=self.platforms[platform_index].platform,
+            device=device,
+            duration=duration,
+            attempts=attempts,
+            error=error
+        )
+    
+    def _run_warmup(self):
+        """
+        Fase de warm-up (engine de threads)
+        
+        Sem set_warmup, apenas os session_pool com size são aquecidos, e
+        falhas não impedem o início do teste.
+        """
+        def bring_up(item: Tuple[int, Optional[str]]):
+            platform_index, device = item
+            user = self._session_template(platform_index, device)
+            driver = user._create_driver()
+            if not user.session_pool.add(device, driver):
+                driver.quit()
+        
+        run_warmup(
+            self._warm_plan(), bring_up,
+            self.warmup or WarmupConfig(), self._record_warmup,
+            strict=self.warmup is not None
         )
     
-    def _spawn_users(self, target_users: int, current_users: int, platform_config: PlatformConfig):
-        """Cria novos usuários virtuais quando necessário"""
+    def _drain_session_pools(self) -> List[Any]:
+        """Fecha os pools e retorna as sessões ociosas, que o engine deve encerrar"""
+        sessions = []
+        for pool in getattr(self, '_session_pools', []):
+            if pool is not None:
+                sessions.extend(pool.drain())
+        return sessions
+    
+    def _spawn_users(self, target_users: int, current_users: int, **user_kwargs):
+        """Cria novos usuários virtuais quando necessário, distribuídos entre as plataformas"""
         users_to_spawn = target_users - current_users
         
         if users_to_spawn <= 0:
             return []
         
         new_users = []
-        for i in range(users_to_spawn):
-            user_id = current_users + i
-            user = self._create_virtual_user(user_id, platform_config)
+        for _ in range(users_to_spawn):
+            platform_index = self._platform_allocator.next_platform()
+            if platform_index is None:
+                break
+            
+            user_id = self.user_id_offset + self._next_user_id
+            self._next_user_id += 1
+            user = self._create_virtual_user(user_id, platform_index, **user_kwargs)
             new_users.append(user)
-            logger.debug(f"Usuário virtual {user_id} criado")
+            logger.debug(f"Usuário virtual {user_id} criado ({user.platform})")
         
         return new_users
     
+    def _device_broker(self, user: VirtualUser) -> DeviceBroker:
+        """Broker de devices da plataforma do usuário"""
+        return self._device_brokers[self._user_platforms[user.user_id]]
+    
+    def _record_lease(self, user: VirtualUser, device: Optional[str], wait: float) -> bool:
+        """Registra a espera por um device e o atribui ao usuário"""
+        user.device = device
+        self.metrics_collector.record_device_wait(
+            user_id=user.user_id,
+            platform=user.platform,
+            device=device,
+            wait=wait,
+            acquired=device is not None
+        )
+        
+        if device is None:
+            logger.warning(f"Usuário {user.user_id}: Nenhum device livre no prazo")
+            return False
+        return True
+    
+    def _lease_device(self, user: VirtualUser, end_time: float) -> bool:
+        """
+        Empresta um device ao usuário, esperando até end_time se necessário
+        
+        Returns:
+            True se o usuário pode iniciar a sessão
+        """
+        broker = self._device_broker(user)
+        if not broker.devices or user.device is not None:
+            return True
+        
+        start = time.monotonic()
+        device = broker.acquire(timeout=max(0.0, end_time - start))
+        return self._record_lease(user, device, time.monotonic() - start)
+    
+    def _try_lease_device(self, user: VirtualUser) -> bool:
+        """
+        Empresta um device livre sem esperar e sem registrar a espera
+        
+        Usado antes do relógio do teste, quando a espera não faz parte da medição.
+        
+        Returns:
+            True se o usuário pode iniciar a sessão
+        """
+        broker = self._device_broker(user)
+        if not broker.devices or user.device is not None:
+            return True
+        
+        user.device = broker.acquire(timeout=0)
+        return user.device is not None
+    
+    async def _lease_device_async(self, user: VirtualUser, end_time: float) -> bool:
+        """Versão de _lease_device para o engine asyncio"""
+        broker = self._device_broker(user)
+        if not broker.devices or user.device is not None:
+            return True
+        
+        start = time.monotonic()
+        device = await broker.acquire_async(timeout=max(0.0, end_time - start))
+        return self._record_lease(user, device, time.monotonic() - start)
+    
+    def _release_user(self, user: VirtualUser):
+        """Devolve o device e a vaga de um usuário que terminou"""
+        platform_index = self._user_platforms.pop(user.user_id, None)
+        if platform_index is not None:
+            self._device_brokers[platform_index].release(user.device)
+            self._platform_allocator.release(platform_index)
+        
+        if self._on_release:
+            self._on_release()
+    
+    def _adjust_users(self, active_users: List[VirtualUser], target_users: int, **user_kwargs) -> List[VirtualUser]:
+        """
+        Ajusta os usuários ativos ao alvo do momento
+        
+        Cria usuários quando o alvo aumenta. Quando diminui, aposenta os mais
+        recentes: eles terminam a iteração em andamento e encerram a sessão.
+        
+        Args:
+            active_users: Usuários não aposentados (alterada no lugar)
+            target_users: Alvo de usuários ativos
+            **user_kwargs: Repassados para _spawn_users
+        
+        Returns:
+            Usuários criados, cujo lifecycle deve ser iniciado pelo engine
+        """
+        current_users = len(active_users)
+        
+        if target_users > current_users:
+            new_users = self._spawn_users(target_users, current_users, **user_kwargs)
+            active_users.extend(new_users)
+            if new_users:
+                logger.info(f"Usuários ativos: {len(active_users)}/{target_users}")
+            return new_users
+        
+        if target_users < current_users:
+            for user in active_users[target_users:]:
+                user.retire()
+            del active_users[target_users:]
+            logger.info(
+                f"Usuários ativos: {len(active_users)}/{target_users} "
+                f"({current_users - target_users} aposentado(s))"
+            )
+        
+        return []
+    
     def _user_lifecycle(self, user: VirtualUser, end_time: float):
         """Executa o lifecycle de um usuário virtual"""
+        user.deadline = end_time
         try:
+            if not self._lease_device(user, end_time) or user.retired:
+                return
+            
             user.start()
             
-            while time.time() < end_time and self.is_running:
+            while (
+                time.monotonic() < end_time and self.is_running
+                and not user.retired and not user.cancel_event.is_set()
+            ):
+                if user.session_lost and not user.recover_session(end_time):
+                    break
                 user.execute_scenario()
             
             user.stop()
         except Exception as e:
             logger.error(f"Erro no usuário {user.user_id}: {e}")
             user.stop()
+        finally:
+            self._release_user(user)
     
     def run(self) -> TestResults:
         """
@@ -206,54 +843,78 @@ class LoadTest:
         if not self.scenarios:
             raise ValueError("Nenhum cenário configurado")
         
+        if self.engine not in ENGINES:
+            raise ValueError(f"Engine desconhecida: {self.engine} (use um de {list(ENGINES)})")
+        
+        if self.arrival_rate is not None and self.engine != "thread":
+            raise ValueError(f"O executor {self.arrival_rate.executor} requer a engine thread")
+        
+        if self.scenario_mix not in MIX_MODES:
+            raise ValueError(f"Modo de mix de cenários desconhecido: {self.scenario_mix} (use um de {list(MIX_MODES)})")
+        
+        self.run_seed = self.seed if self.seed is not None else random.randrange(2 ** 32)
+        self._prepare_distribution()
+        
         logger.info(f"Iniciando teste: {self.name}")
         logger.info(f"Duração: {self.duration}s | Usuários: {self.max_virtual_users} | Ramp-up: {self.ramp_up_time}s")
+        logger.info(f"Engine: {self.engine} | Workers: {self.workers}")
+        logger.info(f"Seed: {self.run_seed} | Mix de cenários: {self.scenario_mix}")
         
-        self.is_running = True
-        self.start_time = time.time()
-        end_time = self.start_time + self.duration
+        runner = self.runner
+        if runner is None and self.workers > 1:
+            runner = ShardedRunner(self, self.workers)
         
-        # Iniciar coletor de métricas
-        self.metrics_collector.start()
+        async_engine = None
+        if runner is None and self.arrival_rate is None and self.engine == "asyncio":
+            async_engine = AsyncEngine(self)
         
-        # Usar primeira plataforma (pode ser expandido para múltiplas)
-        platform_config = self.platforms[0]
+        arrival_executor = None
+        if runner is None and self.arrival_rate is not None:
+            arrival_executor = ArrivalRateExecutor(self, self.arrival_rate)
         
-        active_users = []
-        executor = ThreadPoolExecutor(max_workers=self.max_virtual_users)
-        futures = []
+        self.is_running = True
         
+        # Warm-up antes de o relógio do teste e o coletor começarem
+        # (com runner, cada worker faz o seu e o relógio espera o mais lento)
         try:
-            # Loop principal de controle de carga
-            while time.time() < end_time and self.is_running:
-                elapsed_time = time.time() - self.start_time
-                target_users = self._calculate_users_at_time(elapsed_time)
-                current_users = len(active_users)
-                
-                # Spawn novos usuários se necessário
-                if target_users > current_users:
-                    new_users = self._spawn_users(target_users, current_users, platform_config)
-                    
-                    for user in new_users:
-                        active_users.append(user)
-                        future = executor.submit(self._user_lifecycle, user, end_time)
-                        futures.append(future)
-                    
-                    logger.info(f"Usuários ativos: {len(active_users)}/{target_users}")
-                
-                time.sleep(1)  # Check a cada segundo
-            
-            # Aguardar conclusão de todos os usuários
-            logger.info("Aguardando conclusão dos usuários virtuais...")
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    logger.error(f"Erro na thread do usuário: {e}")
+            if runner is not None:
+                runner.prepare()
+            elif async_engine is not None:
+                async_engine.warm_sessions()
+            else:
+                self._run_warmup()
+            # Sessões pré-alocadas do executor de taxa de chegada, fora da janela medida
+            if arrival_executor is not None:
+                arrival_executor.pre_allocate()
+            if self.start_gate is not None:
+                self.start_gate()
+        except Exception:
+            self.is_running = False
+            self._close_session_pools()
+            raise
+        
+        self.start_time = time.time()
+        # Prazos usam relógio monotônico, imune a ajustes do relógio do sistema
+        self.start_monotonic = time.monotonic()
+        end_time = self.start_monotonic + self.duration
+        
+        # Iniciar coletor de métricas (com runner cada worker coleta as suas)
+        if runner is None:
+            self._bind_device_metrics()
+            self.metrics_collector.start()
         
+        try:
+            if runner is not None:
+                runner.run(end_time)
+            elif async_engine is not None:
+                async_engine.run(end_time)
+            elif arrival_executor is not None:
+                arrival_executor.run(end_time)
+            else:
+                self._run_threaded(end_time)
         finally:
             self.is_running = False
-            executor.shutdown(wait=True)
+            self._close_session_pools()
             self.metrics_collector.stop()
         
         # Coletar e analisar resultados
@@ -263,6 +924,102 @@ class LoadTest:
         logger.info(f"Teste concluído: {self.name}")
         return self.results
     
+    def _run_threaded(self, end_time: float):
+        """
+        Executa os usuários virtuais em um pool de threads (uma por usuário)
+        
+        Args:
+            end_time: Fim do teste (time.monotonic)
+        """
+        active_users = []
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_virtual_users))
+        lifecycles: Dict[Future, VirtualUser] = {}
+        remaining = set()
+        scheduler = EventScheduler()
+        target = [0]
+        
+        def apply_target(target_users: int):
+            # Criar ou aposentar usuários conforme o alvo
+            target[0] = target_users
+            for user in self._adjust_users(active_users, target_users):
+                lifecycles[executor.submit(self._user_lifecycle, user, end_time)] = user
+        
+        # Cada mudança de alvo e o fim do teste disparam no instante exato
+        for offset, target_users in self._spawn_schedule():
+            if self.start_monotonic + offset < end_time:
+                scheduler.call_at(self.start_monotonic + offset, apply_target, target_users)
+        scheduler.call_at(end_time, scheduler.stop)
+        
+        # Vagas liberadas por usuários aposentados completam o alvo atual
+        self._on_release = lambda: scheduler.call_soon(apply_target, target[0])
+        self._on_stop = scheduler.stop
+        
+        try:
+            if self.is_running:
+                scheduler.run()
+            
+            # Aguardar conclusão dos usuários (drain) e cancelar os atrasados
+            remaining = self._drain_threads(lifecycles, end_time)
+            for future in lifecycles:
+                if future.done() and future.exception():
+                    logger.error(f"Erro na thread do usuário: {future.exception()}")
+        
+        finally:
+            self._on_release = None
+            self._on_stop = None
+            executor.shutdown(wait=not remaining)
+    
+    def _drain_threads(self, lifecycles: Dict[Future, VirtualUser], end_time: float) -> set:
+        """
+        Aguarda os cenários em andamento após o fim do teste (drain) e
+        cancela os que excederem drain_timeout (hard stop)
+        
+        Args:
+            lifecycles: Future de cada lifecycle -> usuário virtual
+            end_time: Fim do teste (time.monotonic)
+        
+        Returns:
+            Lifecycles que não terminaram nem após o hard stop
+        """
+        pending = {future for future in lifecycles if not future.done()}
+        in_flight = len(pending)
+        if pending:
+            logger.info(f"Aguardando conclusão de {in_flight} usuário(s) virtual(is)...")
+            _, pending = wait(pending, timeout=self.drain_timeout)
+        
+        cancelled = len(pending)
+        if pending:
+            logger.warning(f"Hard stop: cancelando {cancelled} cenário(s) em andamento")
+            # Encerrar as sessões em paralelo interrompe comandos bloqueados
+            with ThreadPoolExecutor(max_workers=min(cancelled, 32)) as aborter:
+                list(aborter.map(lambda future: lifecycles[future].abort(), pending))
+            _, pending = wait(pending, timeout=self.HARD_STOP_GRACE)
+            if pending:
+                logger.error(f"{len(pending)} usuário(s) virtual(is) não terminaram após o hard stop")
+        
+        self._record_drain(in_flight, end_time, cancelled)
+        return pending
+    
+    def _record_drain(self, in_flight: int, end_time: float, cancelled: int):
+        """Registra o resultado do drain no coletor de métricas"""
+        overrun = max(0.0, time.monotonic() - end_time)
+        self.metrics_collector.record_drain(
+            in_flight=in_flight,
+            overrun=overrun,
+            hard_stop=cancelled > 0,
+            cancelled=cancelled
+        )
+        if in_flight:
+            logger.info(f"Drain concluído em {overrun:.2f}s ({cancelled} cenário(s) cancelado(s))")
+    
+    def _close_session_pools(self):
+        """Encerra as sessões ociosas dos pools (engine de threads)"""
+        for driver in self._drain_session_pools():
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.error(f"Erro ao encerrar sessão do pool: {e}")
+    
     def _generate_results(self) -> TestResults:
         """Gera os resultados do teste"""
         metrics_data = self.metrics_collector.get_metrics()
@@ -270,7 +1027,7 @@ class LoadTest:
         results = TestResults(
             test_name=self.name,
             start_time=self.start_time,
-            duration=time.time() - self.start_time,
+            duration=time.monotonic() - self.start_monotonic,
             max_virtual_users=self.max_virtual_users,
             metrics=metrics_data,
             thresholds=self.thresholds
@@ -282,3 +1039,10 @@ class LoadTest:
         """Para o teste prematuramente"""
         logger.warning("Parando teste...")
         self.is_running = False
+        
+        # Acorda usuários esperando device
+        for broker in getattr(self, '_device_brokers', []):
+            broker.close()
+        
+        if self._on_stop:
+            self._on_stop()
@@ -0,0 +1,76 @@
+"""
+Polling da busca de elementos
+
+Por padrão a busca repete a cada 0,5s (intervalo do WebDriverWait): um
+elemento que aparece logo após a primeira tentativa custa quase meio
+segundo, cobrado do app. O polling pode ser configurado por cenário ou por
+ação:
+
+- fixed: intervalo fixo (ex.: 0.05 para polling rápido)
+- backoff: começa em interval e multiplica por factor até max_interval
+- implicit: uma única busca com implicit wait no servidor Appium
+
+O tempo parado entre tentativas é registrado à parte (poll_wait) para não
+ser confundido com a latência do app.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+# Estratégias aceitas em polling.strategy
+POLLING_STRATEGIES = ("fixed", "backoff", "implicit")
+
+
+@dataclass
+class PollingConfig:
+    """Configuração do polling da busca de elementos (segundos)"""
+    strategy: str = "fixed"
+    interval: float = 0.5  # fixed: intervalo; backoff: primeiro intervalo
+    factor: float = 2.0  # backoff: multiplicador a cada tentativa
+    max_interval: float = 2.0  # backoff: limite do intervalo
+    
+    def __post_init__(self):
+        if self.strategy not in POLLING_STRATEGIES:
+            raise ValueError(
+                f"Estratégia de polling desconhecida: {self.strategy} "
+                f"(use uma de {list(POLLING_STRATEGIES)})"
+            )
+        if self.interval <= 0:
+            raise ValueError("Intervalo de polling deve ser positivo")
+        if self.factor < 1:
+            raise ValueError(f"Fator de backoff inválido: {self.factor}")
+        if self.max_interval < self.interval:
+            raise ValueError(f"max_interval ({self.max_interval}) menor que interval ({self.interval})")
+    
+    @classmethod
+    def parse(cls, spec: Union[None, float, dict, "PollingConfig"]) -> Optional["PollingConfig"]:
+        """
+        Converte a configuração do polling
+        
+        Args:
+            spec: Número (intervalo fixo em segundos), dicionário com os
+                campos de PollingConfig, PollingConfig ou None
+        """
+        if spec is None or isinstance(spec, cls):
+            return spec
+        if isinstance(spec, (int, float)):
+            return cls(interval=float(spec))
+        if isinstance(spec, dict):
+            return cls(**spec)
+        raise ValueError(f"Polling inválido: {spec!r}")
+    
+    def intervals(self) -> Iterator[float]:
+        """Intervalos entre tentativas consecutivas"""
+        interval = self.interval
+        while True:
+            yield interval
+            if self.strategy == "backoff":
+                interval = min(self.max_interval, interval * self.factor)
+    
+    def to_dict(self) -> dict:
+        """Serializa no formato aceito por parse (apenas campos não padrão)"""
+        defaults = PollingConfig()
+        return {
+            key: value for key, value in vars(self).items()
+            if key == "strategy" or value != getattr(defaults, key)
+        }
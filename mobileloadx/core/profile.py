@@ -0,0 +1,159 @@
+"""
+Perfis de carga em múltiplos estágios (step, spike, soak, ramp-down)
+
+Cada estágio leva o número de usuários virtuais do alvo anterior até o
+seu alvo, durante a sua duração, seguindo uma curva de easing.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+# Curvas aceitas em stages[].easing
+EASINGS = ("linear", "step", "ease-in", "ease-out", "ease-in-out")
+
+
+def ease(easing: str, progress: float) -> float:
+    """
+    Aplica a curva de easing a um progresso entre 0 e 1
+    
+    Args:
+        easing: Nome da curva (ver EASINGS)
+        progress: Fração do estágio já decorrida
+    
+    Returns:
+        Fração do caminho até o alvo
+    """
+    if easing == "step":
+        return 1.0 if progress > 0 else 0.0
+    if easing == "ease-in":
+        return progress * progress
+    if easing == "ease-out":
+        return 1 - (1 - progress) ** 2
+    if easing == "ease-in-out":
+        return 2 * progress * progress if progress < 0.5 else 1 - 2 * (1 - progress) ** 2
+    return progress
+
+
+def inverse_ease(easing: str, fraction: float) -> float:
+    """Progresso do estágio em que a curva atinge fraction (inversa de ease)"""
+    if easing == "step":
+        return 0.0
+    if easing == "ease-in":
+        return math.sqrt(fraction)
+    if easing == "ease-out":
+        return 1 - math.sqrt(1 - fraction)
+    if easing == "ease-in-out":
+        return math.sqrt(fraction / 2) if fraction < 0.5 else 1 - math.sqrt((1 - fraction) / 2)
+    return fraction
+
+
+@dataclass
+class Stage:
+    """Estágio do perfil de carga"""
+    duration: float
+    target: float
+    easing: str = "linear"
+    
+    def __post_init__(self):
+        if self.duration < 0:
+            raise ValueError(f"Duração de estágio inválida: {self.duration}")
+        if self.target < 0:
+            raise ValueError(f"Alvo de estágio inválido: {self.target}")
+        if self.easing not in EASINGS:
+            raise ValueError(f"Easing desconhecido: {self.easing} (use um de {list(EASINGS)})")
+
+
+@dataclass
+class LoadProfile:
+    """
+    Sequência de estágios que define os usuários ativos ao longo do teste
+    
+    Após o último estágio o último alvo é mantido.
+    """
+    stages: List[Stage] = field(default_factory=list)
+    start: float = 0  # usuários no instante zero (virtual_users.initial)
+    scale: float = 1.0  # fração aplicada aos alvos (shards)
+    
+    @classmethod
+    def from_list(cls, stages: List[Dict[str, Any]], start: float = 0) -> "LoadProfile":
+        """
+        Cria o perfil a partir da lista 'stages' da configuração
+        
+        Cada estágio aceita 'target' (ou 'users'), 'duration' e 'easing'.
+        """
+        profile = cls(start=start)
+        for data in stages:
+            target = data.get('target', data.get('users'))
+            if target is None or 'duration' not in data:
+                raise ValueError(f"Estágio inválido (use target e duration): {data}")
+            profile.stages.append(Stage(
+                duration=data['duration'],
+                target=target,
+                easing=data.get('easing', 'linear')
+            ))
+        return profile
+    
+    @property
+    def duration(self) -> float:
+        """Duração total dos estágios (segundos)"""
+        return sum(stage.duration for stage in self.stages)
+    
+    @property
+    def peak(self) -> int:
+        """Maior número de usuários simultâneos do perfil"""
+        return round(max([self.start] + [stage.target for stage in self.stages]) * self.scale)
+    
+    def scaled(self, fraction: float) -> "LoadProfile":
+        """Retorna uma cópia com os alvos multiplicados por fraction (usado nos shards)"""
+        return LoadProfile(stages=list(self.stages), start=self.start, scale=self.scale * fraction)
+    
+    def users_at(self, elapsed_time: float) -> int:
+        """Número de usuários que devem estar ativos em elapsed_time segundos"""
+        previous = self.start
+        stage_start = 0.0
+        
+        for stage in self.stages:
+            if elapsed_time < stage_start + stage.duration:
+                progress = (elapsed_time - stage_start) / stage.duration
+                value = previous + (stage.target - previous) * ease(stage.easing, progress)
+                return round(value * self.scale)
+            
+            previous = stage.target
+            stage_start += stage.duration
+        
+        return round(previous * self.scale)
+    
+    def change_points(self) -> List[Tuple[float, int]]:
+        """
+        Instantes em que o número de usuários muda
+        
+        Calculados pela inversa do easing, para que o scheduler dispare cada
+        mudança no instante exato em vez de consultar users_at periodicamente.
+        
+        Returns:
+            Lista ordenada de (segundos desde o início, usuários)
+        """
+        points = [(0.0, self.users_at(0))]
+        previous = self.start
+        stage_start = 0.0
+        
+        for stage in self.stages:
+            low = round(previous * self.scale)
+            high = round(stage.target * self.scale)
+            
+            if stage.duration == 0 or stage.easing == "step" or low == high:
+                if low != high:
+                    points.append((stage_start, high))
+            else:
+                step = 1 if high > low else -1
+                for level in range(low + step, high + step, step):
+                    # round() muda de nível ao cruzar a metade entre dois inteiros
+                    boundary = (level - 0.5 * step) / self.scale
+                    fraction = min(1.0, max(0.0, (boundary - previous) / (stage.target - previous)))
+                    points.append((stage_start + inverse_ease(stage.easing, fraction) * stage.duration, level))
+            
+            previous = stage.target
+            stage_start += stage.duration
+        
+        return points
@@ -3,128 +3,711 @@ Classe que representa um cenário de teste (sequência de ações)
 """
 
 import time
+import random
+import threading
 import logging
-from typing import List, Dict, Any
-from selenium.webdriver.common.by import By
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.remote.command import Command
+
+from .control_flow import CONTROL_FLOW, CONTROL_NODES, Block, IfPresent, Loop, RandomBranch, Walk, parse_times, shift
+from .driver_script import DriverScriptBatch, segment_plan
+from .element_cache import ElementCache
+from .failure_policy import DEFAULT_TIMEOUT, FailurePolicy
+from .feeders import DataFeeder, DataSourceConfig, has_placeholders, substitute
+from .gestures import Gesture
+from .polling import PollingConfig
+from .session_metadata import SessionMetadata
+from .think_time import ThinkTime
 
 logger = logging.getLogger(__name__)
 
+# Marcadores que delimitam uma transação (grupo de ações medido como um passo de negócio)
+TRANSACTION_MARKERS = ("transaction_start", "transaction_end")
+
+# Tipos de ação suportados
+ACTION_TYPES = (
+    "tap", "input", "wait", "scroll", "swipe", "gesture", "back", "rotate", "switch_context", "if_present"
+) + TRANSACTION_MARKERS
+
+# Locators aceitos nos parâmetros da ação, em ordem de prioridade
+LOCATOR_STRATEGIES = {
+    "id": AppiumBy.ID,
+    "xpath": AppiumBy.XPATH,
+    "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
+    "class_name": AppiumBy.CLASS_NAME,
+}
+
+# Início e fim do scroll em fração da altura da tela
+SCROLL_FRACTIONS = {"down": (0.8, 0.2), "up": (0.2, 0.8)}
+
+# Orientações aceitas pela ação rotate
+ORIENTATIONS = ("PORTRAIT", "LANDSCAPE")
+
+# Leitura de cada metadado da sessão no driver do Appium (ver SessionMetadata)
+DRIVER_METADATA = {
+    "window_size": lambda driver: driver.get_window_size(),
+    "orientation": lambda driver: driver.orientation,
+    "platform_version": lambda driver: driver.capabilities.get("platformVersion"),
+    "context": lambda driver: driver.current_context,
+}
+
+
+class ScenarioCancelled(Exception):
+    """Cenário interrompido pelo hard stop do teste"""
+
+
+def pause(seconds: float, cancel_event: Optional[threading.Event] = None):
+    """Dorme pelo tempo indicado (cancel_event interrompe a pausa)"""
+    if cancel_event is None:
+        time.sleep(seconds)
+    elif cancel_event.wait(seconds):
+        raise ScenarioCancelled("Espera interrompida pelo hard stop")
+
+
+def session_metadata(driver, metadata: SessionMetadata, key: str) -> Any:
+    """Metadado da sessão pelo cache (lido do driver apenas na primeira vez)"""
+    return metadata.fetch(key, lambda: DRIVER_METADATA[key](driver))
+
+
+def set_implicit_wait(driver, metadata: SessionMetadata, seconds: float):
+    """Ajusta o implicit wait da sessão só quando muda (0 = padrão do Appium)"""
+    if metadata.get("implicit_wait", 0) != seconds:
+        driver.implicitly_wait(seconds)
+        metadata.changed("implicit_wait", seconds)
+
+
+def perform_actions(driver, payload: List[Dict[str, Any]]):
+    """Executa um payload W3C Actions no driver (uma requisição)"""
+    driver.execute(Command.W3C_ACTIONS, {"actions": payload})
+
+
+def save_screenshot(driver, path: str):
+    """Salva a tela do device após uma falha (erro no screenshot só vai para o log)"""
+    try:
+        driver.get_screenshot_as_file(path)
+        logger.info(f"Screenshot da falha salvo em {path}")
+    except Exception as e:
+        logger.warning(f"Falha ao salvar screenshot em {path}: {e}")
+
+
+class ScenarioRun:
+    """
+    Tempos de uma execução do cenário
+    
+    Guarda a duração de cada ação (separando a busca do elemento da
+    interação) e de cada transação, descontando o think time. É preenchido
+    pelo loop de execução (threads ou asyncio) e lido pelo usuário virtual
+    mesmo quando o cenário falha no meio.
+    """
+    
+    def __init__(self):
+        self.started = time.monotonic()
+        self.paused = 0.0
+        self.steps: List[Dict[str, Any]] = []
+        self.transactions: List[Dict[str, Any]] = []
+        self._open: Dict[str, Tuple[float, float]] = {}  # nome -> (início, paused no início)
+    
+    @property
+    def elapsed(self) -> float:
+        """Duração até agora, sem o think time"""
+        return time.monotonic() - self.started - self.paused
+    
+    def add_pause(self, seconds: float):
+        """Desconta uma pausa (think time) das durações"""
+        self.paused += seconds
+    
+    def step(
+        self,
+        index: int,
+        action: "Action",
+        started: float,
+        lookup: Optional[float],
+        error: Optional[Exception] = None,
+        poll_wait: float = 0.0,
+        retries: int = 0,
+        retry_time: float = 0.0
+    ):
+        """
+        Registra uma ação executada
+        
+        Args:
+            index: Posição da ação no cenário (0 = primeira)
+            action: Ação executada
+            started: Início da ação (time.monotonic)
+            lookup: Tempo de busca do elemento (segundos; None se não houve busca)
+            error: Exceção da ação (None se bem-sucedida)
+            poll_wait: Parte da busca parada entre tentativas (não é latência do app)
+            retries: Tentativas anteriores que falharam (política de falha)
+            retry_time: Tempo gasto nas tentativas anteriores e nas esperas entre elas
+        """
+        finished = time.monotonic()
+        self.record(index, action, finished - started, lookup, error, poll_wait, finished, retries, retry_time)
+    
+    def record(
+        self,
+        index: int,
+        action: "Action",
+        duration: float,
+        lookup: Optional[float],
+        error: Optional[Exception] = None,
+        poll_wait: float = 0.0,
+        finished: Optional[float] = None,
+        retries: int = 0,
+        retry_time: float = 0.0
+    ):
+        """
+        Registra uma ação com a duração já medida (ex.: no servidor, ver driver_script)
+        
+        Args:
+            finished: Fim da ação (time.monotonic; None = agora)
+        """
+        lookup = lookup or 0.0
+        self.steps.append({
+            "step": index + 1,
+            "action": action.label,
+            "duration": duration,
+            "lookup": lookup,
+            "interaction": duration - lookup,
+            "poll_wait": poll_wait,
+            "retries": retries,
+            "retry_time": retry_time,
+            "success": error is None,
+            "error": str(error) if error is not None else None,
+            "finished": finished if finished is not None else time.monotonic()
+        })
+    
+    def mark(self, action: "Action") -> bool:
+        """
+        Trata os marcadores de transação
+        
+        Returns:
+            True se a ação era um marcador (nada a executar no driver)
+        """
+        if action.action_type == "transaction_start":
+            self.begin_transaction(action.label)
+        elif action.action_type == "transaction_end":
+            self.end_transaction(action.label)
+        else:
+            return False
+        return True
+    
+    def begin_transaction(self, name: str):
+        """Abre uma transação"""
+        self._open[name] = (time.monotonic(), self.paused)
+    
+    def end_transaction(self, name: str, error: Optional[Exception] = None):
+        """Fecha uma transação aberta, descontando o think time do período"""
+        started, paused = self._open.pop(name)
+        finished = time.monotonic()
+        self.transactions.append({
+            "name": name,
+            "duration": finished - started - (self.paused - paused),
+            "success": error is None,
+            "error": str(error) if error is not None else None,
+            "finished": finished
+        })
+    
+    def close(self, error: Optional[Exception] = None):
+        """Fecha as transações ainda abertas (fim do cenário ou falha)"""
+        for name in list(self._open):
+            self.end_transaction(name, error)
+
 
 class Action:
-    """Representa uma ação individual no cenário"""
+    """
+    Representa uma ação individual no cenário
+    
+    compile() valida os parâmetros e monta, uma única vez, a função que
+    executa a ação com o locator já resolvido; Scenario.add_action compila
+    cada ação, de modo que erros de configuração aparecem ao carregar o
+    cenário e não no meio do teste.
+    """
     
     def __init__(self, action_type: str, **params):
         self.action_type = action_type
+        # Pausa após a ação (substitui o think time do cenário)
+        self.think_time = ThinkTime.parse(params.pop('think_time', None))
+        # Polling da busca do elemento (substitui o do cenário)
+        self.polling = PollingConfig.parse(params.pop('polling', None))
+        # Política de falha (substitui a do cenário)
+        self.failure_policy = FailurePolicy.parse(params.pop('failure_policy', None))
         self.params = params
+        
+        # Preenchidos por compile()
+        self.locator: Optional[Tuple[str, str]] = None
+        self.label = action_type
+        self.gesture: Optional[Gesture] = None  # scroll, swipe e gesture
+        self.find_polling = PollingConfig()  # da ação, do cenário ou o padrão
+        self.failure = FailurePolicy()  # da ação, do cenário ou o padrão
+        self.default_timeout = DEFAULT_TIMEOUT  # busca sem 'timeout' nos parâmetros
+        # Parâmetros com ${var}: a ação é montada de novo a cada iteração (ver bind)
+        self.templated = has_placeholders(params)
+        self._step: Optional[Callable] = None
+        # Execução compilada pelo engine asyncio (ver async_engine.compile_async_action)
+        self.async_step: Optional[Callable] = None
     
-    def execute(self, driver, platform: str):
-        """Executa a ação no driver"""
-        if self.action_type == "tap":
-            self._tap(driver, platform)
-        elif self.action_type == "input":
-            self._input(driver)
-        elif self.action_type == "wait":
-            self._wait()
-        elif self.action_type == "scroll":
-            self._scroll(driver, platform)
-        elif self.action_type == "swipe":
-            self._swipe(driver)
-        elif self.action_type == "back":
-            self._back(driver)
-        else:
-            raise ValueError(f"Tipo de ação desconhecido: {self.action_type}")
-    
-    def _find_element(self, driver, platform: str):
-        """Encontra elemento baseado em diferentes locators"""
-        wait = WebDriverWait(driver, self.params.get('timeout', 10))
-        
-        if 'id' in self.params:
-            if platform == "android":
-                locator = (By.ID, self.params['id'])
-            else:  # iOS
-                locator = (By.ID, self.params['id'])
-        elif 'xpath' in self.params:
-            locator = (By.XPATH, self.params['xpath'])
-        elif 'accessibility_id' in self.params:
-            locator = (By.ACCESSIBILITY_ID, self.params['accessibility_id'])
-        elif 'class_name' in self.params:
-            locator = (By.CLASS_NAME, self.params['class_name'])
-        else:
+    def __getstate__(self):
+        # Funções compiladas não são serializáveis (envio aos processos worker)
+        return dict(vars(self), _step=None, async_step=None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa a ação no formato de Scenario.from_dict ({tipo: parâmetros})"""
+        params = dict(self.params)
+        if self.think_time:
+            params['think_time'] = self.think_time.to_dict()
+        if self.polling:
+            params['polling'] = self.polling.to_dict()
+        if self.failure_policy:
+            params['failure_policy'] = self.failure_policy.to_dict()
+        return {self.action_type: params}
+    
+    def execute(
+        self,
+        driver,
+        platform: str,
+        cancel_event: Optional[threading.Event] = None,
+        cache: Optional[ElementCache] = None,
+        metadata: Optional[SessionMetadata] = None
+    ):
+        """Executa a ação no driver (cancel_event interrompe esperas; cache reaproveita elementos)"""
+        step = self._step or self.compile()
+        step(driver, cancel_event, cache, metadata if metadata is not None else SessionMetadata())
+    
+    def compile(
+        self,
+        polling: Optional[PollingConfig] = None,
+        failure_policy: Optional[FailurePolicy] = None,
+        timeout: Optional[float] = None
+    ) -> Callable:
+        """
+        Valida a ação e monta a sua execução
+        
+        Args:
+            polling: Polling padrão do cenário (o da ação tem prioridade)
+            failure_policy: Política de falha padrão do cenário (a da ação tem prioridade)
+            timeout: Timeout padrão do cenário na busca de elementos (o
+                'timeout' da ação tem prioridade)
+        
+        Returns:
+            Função (driver, cancel_event, cache, metadata) que executa a ação
+        
+        Raises:
+            ValueError: Tipo de ação desconhecido ou parâmetros inválidos
+        """
+        if self._step is None:
+            binder = getattr(self, f"_bind_{self.action_type}", None)
+            if self.action_type not in ACTION_TYPES or binder is None:
+                raise ValueError(f"Tipo de ação desconhecido: {self.action_type}")
+            
+            self.locator = self._resolve_locator()
+            self.label = self._build_label()
+            self.find_polling = self.polling or polling or PollingConfig()
+            self.failure = self.failure_policy or failure_policy or FailurePolicy()
+            self.default_timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+            self._step = binder()
+        return self._step
+    
+    def clone(self) -> "Action":
+        """Cópia não compilada da ação (inclusão em outro cenário)"""
+        action = Action(self.action_type, **self.params)
+        action.think_time = self.think_time
+        action.polling = self.polling
+        action.failure_policy = self.failure_policy
+        return action
+    
+    def bind(
+        self,
+        variables: Dict[str, Any],
+        polling: Optional[PollingConfig] = None,
+        failure_policy: Optional[FailurePolicy] = None,
+        timeout: Optional[float] = None
+    ) -> "Action":
+        """
+        Cópia compilada da ação com os ${var} substituídos pela linha da iteração
+        
+        O label continua o da ação original, para que as métricas não se
+        dividam por valor das fontes de dados.
+        
+        Raises:
+            KeyError: Placeholder sem coluna nas fontes de dados
+        """
+        bound = Action(self.action_type, **substitute(self.params, variables))
+        bound.think_time = self.think_time
+        bound.polling = self.polling
+        bound.failure_policy = self.failure_policy
+        bound.compile(polling, failure_policy, timeout)
+        bound.label = self.label
+        return bound
+    
+    def _build_label(self) -> str:
+        """Nome da ação nas métricas: 'name' explícito, nome da transação ou tipo e locator"""
+        if 'name' in self.params:
+            return str(self.params['name'])
+        if self.locator:
+            return f"{self.action_type} {self.locator[1]}"
+        return self.action_type
+    
+    def _resolve_locator(self) -> Optional[Tuple[str, str]]:
+        """Locator (estratégia, valor) da ação; obrigatório no tap"""
+        for key, strategy in LOCATOR_STRATEGIES.items():
+            if key in self.params:
+                return (strategy, self.params[key])
+        
+        if self.action_type in ("tap", "if_present"):
             raise ValueError("Nenhum locator válido fornecido")
+        return None
+    
+    def _bind_find(self) -> Callable:
+        """
+        Busca do elemento com o polling da ação
+        
+        Returns:
+            Função (driver, metadata) -> (elemento, tempo parado entre tentativas)
+        """
+        locator = self.locator
+        timeout = self.params.get('timeout', self.default_timeout)
+        polling = self.find_polling
+        
+        if polling.strategy == "backoff":
+            def find_backoff(driver, metadata):
+                set_implicit_wait(driver, metadata, 0)
+                deadline = time.monotonic() + timeout
+                waited = 0.0
+                for interval in polling.intervals():
+                    try:
+                        return driver.find_element(*locator), waited
+                    except NoSuchElementException:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutException(f"Elemento não encontrado em {timeout}s: {locator[1]}")
+                    delay = min(interval, remaining)
+                    time.sleep(delay)
+                    waited += delay
+            return find_backoff
         
-        element = wait.until(EC.presence_of_element_located(locator))
-        return element
+        # implicit: o servidor espera o elemento dentro da própria busca
+        implicit_wait = timeout if polling.strategy == "implicit" else 0
+        condition = EC.presence_of_element_located(locator)
+        
+        def find(driver, metadata):
+            set_implicit_wait(driver, metadata, implicit_wait)
+            in_requests = 0.0
+            
+            def timed_condition(d):
+                nonlocal in_requests
+                request_started = time.monotonic()
+                try:
+                    return condition(d)
+                finally:
+                    in_requests += time.monotonic() - request_started
+            
+            started = time.monotonic()
+            element = WebDriverWait(driver, timeout, poll_frequency=polling.interval).until(timed_condition)
+            return element, max(0.0, time.monotonic() - started - in_requests)
+        return find
     
-    def _tap(self, driver, platform: str):
+    def _bind_element(self, interact: Callable[[Any], None]) -> Callable:
+        """
+        Busca do elemento e interação, reaproveitando o handle do cache da sessão
+        
+        Um handle do cache que expirou (StaleElementReferenceException) é
+        descartado, buscado de novo e a interação é repetida uma vez.
+        """
+        locator = self.locator
+        find = self._bind_find()
+        
+        def step(driver, cancel_event, cache, metadata):
+            started = time.monotonic()
+            element = cache.get(locator) if cache is not None else None
+            if element is None:
+                element, poll_wait = find(driver, metadata)
+                if cache is not None:
+                    cache.put(locator, element)
+                lookup = time.monotonic() - started
+                interact(element)
+                return lookup, poll_wait
+            
+            lookup, poll_wait = time.monotonic() - started, 0.0
+            try:
+                interact(element)
+            except StaleElementReferenceException:
+                cache.invalidate(locator)
+                started = time.monotonic()
+                element, poll_wait = find(driver, metadata)
+                cache.put(locator, element)
+                lookup += time.monotonic() - started
+                interact(element)
+            return lookup, poll_wait
+        return step
+    
+    # Cada função compilada retorna (tempo de busca do elemento, espera entre
+    # tentativas da busca), ou None se a ação não busca elemento
+    
+    def _bind_tap(self) -> Callable:
         """Ação de tap/click em elemento"""
-        element = self._find_element(driver, platform)
-        element.click()
+        return self._bind_element(lambda element: element.click())
     
-    def _input(self, driver):
+    def _bind_input(self) -> Callable:
         """Ação de input de texto"""
         text = self.params.get('text', '')
         
-        # Se há um elemento específico, usa ele, senão busca o elemento ativo
-        if any(k in self.params for k in ['id', 'xpath', 'accessibility_id', 'class_name']):
-            element = self._find_element(driver, 'android')  # Plataforma não importa aqui
-            element.send_keys(text)
-        else:
-            # Envia para o elemento ativo
-            driver.switch_to.active_element.send_keys(text)
+        # Se há um elemento específico, usa ele, senão o elemento ativo
+        if self.locator is None:
+            def input_active(driver, cancel_event, cache, metadata):
+                driver.switch_to.active_element.send_keys(text)
+            return input_active
+        
+        return self._bind_element(lambda element: element.send_keys(text))
     
-    def _wait(self):
+    def _bind_wait(self) -> Callable:
         """Ação de espera"""
         timeout = self.params.get('timeout', 1)
-        time.sleep(timeout)
+        
+        def wait(driver, cancel_event, cache, metadata):
+            pause(timeout, cancel_event)
+        return wait
     
-    def _scroll(self, driver, platform: str):
-        """Ação de scroll"""
-        direction = self.params.get('direction', 'down')
-        duration = self.params.get('duration', 1)
+    def _bind_gestures(self, gesture: Gesture) -> Callable:
+        """Envia o gesto em uma única requisição W3C Actions"""
+        self.gesture = gesture
         
-        size = driver.get_window_size()
-        start_x = size['width'] // 2
+        if gesture.relative:
+            def perform_relative(driver, cancel_event, cache, metadata):
+                perform_actions(driver, gesture.payload(session_metadata(driver, metadata, "window_size")))
+            return perform_relative
         
-        if direction == 'down':
-            start_y = size['height'] * 0.8
-            end_y = size['height'] * 0.2
-        elif direction == 'up':
-            start_y = size['height'] * 0.2
-            end_y = size['height'] * 0.8
-        else:
+        payload = gesture.payload()
+        
+        def perform(driver, cancel_event, cache, metadata):
+            perform_actions(driver, payload)
+        return perform
+    
+    def _bind_scroll(self) -> Callable:
+        """Ação de scroll (swipe vertical no centro da tela)"""
+        direction = self.params.get('direction', 'down')
+        if direction not in SCROLL_FRACTIONS:
             raise ValueError(f"Direção inválida: {direction}")
+        start_fraction, end_fraction = SCROLL_FRACTIONS[direction]
+        duration = self.params.get('duration', 1)
         
-        driver.swipe(start_x, start_y, start_x, end_y, int(duration * 1000))
+        return self._bind_gestures(Gesture([[
+            {'move': [0.5, start_fraction]}, 'down', {'move': [0.5, end_fraction], 'duration': duration}, 'up'
+        ]], relative=True))
     
-    def _swipe(self, driver):
+    def _bind_swipe(self) -> Callable:
         """Ação de swipe customizado"""
-        start_x = self.params.get('start_x')
-        start_y = self.params.get('start_y')
-        end_x = self.params.get('end_x')
-        end_y = self.params.get('end_y')
-        duration = self.params.get('duration', 1)
+        missing = [key for key in ('start_x', 'start_y', 'end_x', 'end_y') if key not in self.params]
+        if missing:
+            raise ValueError(f"Swipe sem coordenadas: {', '.join(missing)}")
+        params = self.params
         
-        driver.swipe(start_x, start_y, end_x, end_y, int(duration * 1000))
+        return self._bind_gestures(Gesture([[
+            {'move': [params['start_x'], params['start_y']]}, 'down',
+            {'move': [params['end_x'], params['end_y']], 'duration': params.get('duration', 1)}, 'up'
+        ]]))
+    
+    def _bind_gesture(self) -> Callable:
+        """Gesto com um ou mais dedos (pinch, long-press-drag, fling...)"""
+        return self._bind_gestures(Gesture(self.params.get('pointers'), relative=self.params.get('relative', False)))
     
-    def _back(self, driver):
+    def _bind_back(self) -> Callable:
         """Ação de voltar (Android back button ou iOS navigation)"""
-        driver.back()
+        def back(driver, cancel_event, cache, metadata):
+            driver.back()
+        return back
+    
+    def _bind_rotate(self) -> Callable:
+        """Ação de rotação da tela (invalida o tamanho da tela no cache da sessão)"""
+        orientation = str(self.params.get('orientation', '')).upper()
+        if orientation not in ORIENTATIONS:
+            raise ValueError(f"Orientação inválida: {self.params.get('orientation')}")
+        
+        def rotate(driver, cancel_event, cache, metadata):
+            driver.orientation = orientation
+            metadata.changed("orientation", orientation)
+        return rotate
+    
+    def _bind_switch_context(self) -> Callable:
+        """Troca de contexto (NATIVE_APP ou WEBVIEW_*), atualizando o cache da sessão"""
+        context = self.params.get('context')
+        if not context:
+            raise ValueError("switch_context requer context")
+        
+        def switch_context(driver, cancel_event, cache, metadata):
+            driver.switch_to.context(context)
+            metadata.changed("context", context)
+        return switch_context
+    
+    def _bind_if_present(self) -> Callable:
+        """
+        Verificação de presença do elemento (condição de if_present)
+        
+        Retorna o tempo de busca se o elemento está na tela ou None se não
+        apareceu em timeout (padrão 0: uma única busca).
+        """
+        self.params.setdefault('timeout', 0)
+        find = self._bind_find()
+        
+        def probe(driver, cancel_event, cache, metadata):
+            started = time.monotonic()
+            try:
+                _, poll_wait = find(driver, metadata)
+            except TimeoutException:
+                return None
+            return time.monotonic() - started, poll_wait
+        return probe
+    
+    def _bind_transaction_start(self) -> Callable:
+        """Início de transação (medida pelo loop do cenário)"""
+        return self._bind_marker()
+    
+    def _bind_transaction_end(self) -> Callable:
+        """Fim de transação (medida pelo loop do cenário)"""
+        return self._bind_marker()
+    
+    def _bind_marker(self) -> Callable:
+        if not self.params.get('name'):
+            raise ValueError(f"{self.action_type} requer name")
+        return _marker
+
+
+def _marker(driver, cancel_event, cache, metadata):
+    """Marcadores de transação não executam nada no driver"""
 
 
 class Scenario:
     """
     Representa um cenário de teste (conjunto de ações)
+    
+    As ações ficam em actions/plan na ordem em que foram definidas; program
+    é a árvore de execução (ver control_flow), com loops, condicionais,
+    ramos sorteados e sub-cenários incluídos por call.
     """
     
-    def __init__(self, name: str):
+    def __init__(
+        self,
+        name: str,
+        think_time=None,
+        pacing: Optional[float] = None,
+        polling=None,
+        batch: bool = False,
+        data_sources: Optional[List[Any]] = None,
+        failure_policy=None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            name: Nome do cenário
+            think_time: Pausa após cada ação, fora do tempo medido (segundos
+                ou configuração de ThinkTime)
+            pacing: Intervalo fixo entre o início de duas iterações do
+                mesmo usuário (segundos)
+            polling: Polling da busca de elementos das ações (intervalo em
+                segundos ou configuração de PollingConfig)
+            batch: Executa ações consecutivas em um único executeDriverScript
+                no servidor Appium (ver driver_script)
+            data_sources: Fontes de dados dos placeholders ${var} das ações
+                (dicionários de DataSourceConfig ou DataFeeder, ver feeders)
+            failure_policy: Novas tentativas, continue e screenshot das ações
+                que falham (número de tentativas ou configuração de FailurePolicy)
+            timeout: Timeout padrão da busca de elementos das ações (segundos)
+        """
+        if pacing is not None and pacing < 0:
+            raise ValueError(f"Pacing inválido: {pacing}")
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"Timeout inválido: {timeout}")
+        
         self.name = name
         self.actions: List[Action] = []
+        # Plano de execução: (ação, função compilada) na ordem do cenário
+        self.plan: List[Tuple[Action, Callable]] = []
+        # Árvore de execução: posições em actions e nós de controle (ver control_flow)
+        self.program: Block = []
+        self.open_transactions: List[str] = []  # abertas até a última ação adicionada
+        self.think_time = ThinkTime.parse(think_time)
+        self.pacing = pacing
+        self.polling = PollingConfig.parse(polling)
+        self.failure_policy = FailurePolicy.parse(failure_policy)
+        self.timeout = timeout
+        self.batch = batch
+        self.data_sources: List[DataFeeder] = [
+            source if isinstance(source, DataFeeder) else DataFeeder(DataSourceConfig(**source))
+            for source in data_sources or []
+        ]
+        names = [source.name for source in self.data_sources]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Fontes de dados com nome repetido: {names}")
+        # Árvore com os lotes do modo batch (montada na primeira execução)
+        self.segments: Optional[Block] = None
     
     def add_action(self, action: Action):
-        """Adiciona uma ação ao cenário"""
+        """
+        Adiciona uma ação ao cenário, compilando-a
+        
+        Raises:
+            ValueError: Ação inválida (tipo desconhecido, locator ausente,
+                transação fechada sem ter sido aberta...)
+        """
+        step = self._compile(action)
+        
+        if action.action_type == "transaction_start":
+            if action.label in self.open_transactions:
+                raise ValueError(f"Transação '{action.label}' já está aberta")
+            self.open_transactions.append(action.label)
+        elif action.action_type == "transaction_end":
+            if action.label not in self.open_transactions:
+                raise ValueError(f"Transação '{action.label}' não foi aberta")
+            self.open_transactions.remove(action.label)
+        
+        self.program.append(self._register(action, step))
+    
+    def _register(self, action: Action, step: Optional[Callable] = None) -> int:
+        """Inclui a ação compilada no plano e retorna a sua posição"""
+        if step is None:
+            step = self._compile(action)
         self.actions.append(action)
+        self.plan.append((action, step))
+        self.segments = None
+        return len(self.actions) - 1
+    
+    def _compile(self, action: Action) -> Callable:
+        """Compila a ação com os padrões do cenário (polling, política de falha e timeout)"""
+        return action.compile(self.polling, self.failure_policy, self.timeout)
+    
+    def _include(self, body: "Scenario") -> Block:
+        """
+        Copia as ações de um sub-cenário para este plano
+        
+        Returns:
+            Árvore do sub-cenário com as posições deste cenário
+        
+        Raises:
+            ValueError: Sub-cenário com transação aberta
+        """
+        if body.open_transactions:
+            raise ValueError(f"Transação '{body.open_transactions[0]}' não foi fechada no bloco")
+        
+        offset = len(self.actions)
+        for action in body.actions:
+            self._register(action.clone())
+        return shift(body.program, offset)
+    
+    def _add_node(self, node: Any):
+        self.program.append(node)
+        self.segments = None
+    
+    def __getstate__(self):
+        # O plano é recompilado no destino (envio aos processos worker)
+        return dict(vars(self), plan=None, segments=None)
+    
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self.plan = [(action, self._compile(action)) for action in self.actions]
     
     def tap(self, **locator):
         """Helper: Adiciona ação de tap"""
@@ -154,47 +737,414 @@ class Scenario:
                               end_x=end_x, end_y=end_y, duration=duration))
         return self
     
+    def gesture(self, pointers: List[List[Any]], relative: bool = False, name: Optional[str] = None):
+        """
+        Helper: Adiciona um gesto W3C (um item de pointers por dedo)
+        
+        Exemplo (pinch out com coordenadas relativas):
+            scenario.gesture([
+                [{'move': [0.45, 0.5]}, 'down', {'move': [0.2, 0.5], 'duration': 0.3}, 'up'],
+                [{'move': [0.55, 0.5]}, 'down', {'move': [0.8, 0.5], 'duration': 0.3}, 'up'],
+            ], relative=True, name='Zoom')
+        """
+        params = {"pointers": pointers, "relative": relative}
+        if name:
+            params["name"] = name
+        self.add_action(Action("gesture", **params))
+        return self
+    
     def back(self):
         """Helper: Adiciona ação de back"""
         self.add_action(Action("back"))
         return self
     
-    def execute(self, driver, platform: str):
+    def rotate(self, orientation: str):
+        """Helper: Adiciona ação de rotação ("portrait" ou "landscape")"""
+        self.add_action(Action("rotate", orientation=orientation))
+        return self
+    
+    def switch_context(self, context: str):
+        """Helper: Adiciona troca de contexto (ex.: "NATIVE_APP", "WEBVIEW_com.example")"""
+        self.add_action(Action("switch_context", context=context))
+        return self
+    
+    def transaction_start(self, name: str):
+        """Helper: Abre uma transação (as ações seguintes são medidas em conjunto)"""
+        self.add_action(Action("transaction_start", name=name))
+        return self
+    
+    def transaction_end(self, name: str):
+        """Helper: Fecha uma transação aberta"""
+        self.add_action(Action("transaction_end", name=name))
+        return self
+    
+    def loop(self, times, body: "Scenario"):
+        """
+        Helper: Repete as ações de body (número fixo ou [mínimo, máximo] sorteado a cada iteração)
+        
+        Exemplo (ver de 3 a 6 produtos sem voltar à tela inicial):
+            scenario.loop([3, 6], Scenario('Produto').tap(id='product').back())
+        """
+        self._add_node(Loop(parse_times(times), self._include(body)))
+        return self
+    
+    def if_present(self, then: "Scenario", otherwise: Optional["Scenario"] = None, timeout: float = 0, **locator):
+        """Helper: Executa then se o elemento estiver na tela (até timeout segundos), senão otherwise"""
+        probe = Action("if_present", timeout=timeout, **locator)
+        position = self._register(probe)
+        self._add_node(IfPresent(
+            position,
+            self._include(then),
+            self._include(otherwise) if otherwise is not None else []
+        ))
+        return self
+    
+    def random_branch(self, branches: List[Tuple[float, Optional["Scenario"]]]):
+        """Helper: Executa um dos ramos (peso, cenário), sorteado a cada iteração; None pula o trecho"""
+        self._add_node(RandomBranch(
+            [weight for weight, _ in branches],
+            [self._include(body) if body is not None else [] for _, body in branches]
+        ))
+        return self
+    
+    def call(self, flow: "Scenario"):
+        """Helper: Inclui as ações de um sub-cenário nomeado (compiladas neste cenário)"""
+        self.program.extend(self._include(flow))
+        self.segments = None
+        return self
+    
+    def think_after(self, action: Action, rng: Any = random) -> float:
+        """Sorteia o think time após a ação (0 se não configurado ou verificação de presença)"""
+        if action.action_type == "if_present":
+            return 0.0
+        think_time = action.think_time or self.think_time
+        return think_time.sample(rng) if think_time else 0.0
+    
+    def next_variables(self, user_id: int, rng: Any = random) -> Optional[Dict[str, Any]]:
+        """
+        Valores dos placeholders para a próxima iteração do usuário
+        
+        Args:
+            user_id: ID do usuário virtual
+            rng: Gerador do usuário (fontes no modo random)
+        
+        Returns:
+            Colunas da linha de cada fonte, como "coluna" e "fonte.coluna"
+            (None se o cenário não tem fontes de dados)
+        
+        Raises:
+            DataSourceExhausted: Fonte sem linha disponível
+        """
+        if not self.data_sources:
+            return None
+        
+        variables: Dict[str, Any] = {}
+        for source in self.data_sources:
+            row = source.next_row(user_id, rng)
+            variables.update(row)
+            variables.update({f"{source.name}.{column}": value for column, value in row.items()})
+        return variables
+    
+    def bind(
+        self,
+        variables: Optional[Dict[str, Any]],
+        rng: Any = random
+    ) -> Tuple[List[Tuple[Action, Callable]], Walk]:
+        """
+        Plano e percurso de uma iteração, com as ações ${var} montadas para a linha
+        
+        Sem variáveis ou sem ações parametrizadas, o plano compilado é
+        reaproveitado.
+        """
+        if variables is None or not any(action.templated for action in self.actions):
+            return self.plan, Walk(self.execution_segments(), rng)
+        
+        bound_actions = [
+            action.bind(variables, self.polling, self.failure_policy, self.timeout) if action.templated else action
+            for action in self.actions
+        ]
+        plan = [(bound, bound._step) for bound in bound_actions]
+        return plan, Walk(self._compile_block(self.program, [action for action, _ in plan]), rng)
+    
+    def execution_segments(self) -> Block:
+        """Árvore de execução: posição de cada ação no cliente, lote no servidor (batch) ou nó de controle"""
+        if self.segments is None:
+            self.segments = self._compile_block(self.program, self.actions)
+        return self.segments
+    
+    def _compile_block(self, block: Block, actions: List[Action]) -> Block:
+        """Agrupa as ações consecutivas de cada bloco em lotes (modo batch)"""
+        nodes = [
+            node.map_blocks(lambda inner: self._compile_block(inner, actions))
+            if isinstance(node, CONTROL_NODES) else node
+            for node in block
+        ]
+        return segment_plan(nodes, actions) if self.batch else nodes
+    
+    def execute(
+        self,
+        driver,
+        platform: str,
+        cancel_event: Optional[threading.Event] = None,
+        run: Optional[ScenarioRun] = None,
+        cache: Optional[ElementCache] = None,
+        metadata: Optional[SessionMetadata] = None,
+        variables: Optional[Dict[str, Any]] = None,
+        rng: Any = random
+    ) -> ScenarioRun:
         """
         Executa todas as ações do cenário
         
         Args:
             driver: Appium WebDriver
             platform: "android" ou "ios"
+            cancel_event: Quando definido, interrompe o cenário antes da próxima ação
+            run: Registro dos tempos, preenchido mesmo se o cenário falhar
+            cache: Cache de elementos da sessão (None = busca a cada ação)
+            metadata: Metadados da sessão (None = cache só desta execução)
+            variables: Valores dos ${var} das ações (ver next_variables)
+            rng: Gerador do usuário (think time, repetições e ramos)
+        
+        Returns:
+            Tempos da execução (por ação, por transação e think time)
         """
         logger.debug(f"Executando cenário: {self.name} ({len(self.actions)} ações)")
+        run = run if run is not None else ScenarioRun()
+        metadata = metadata if metadata is not None else SessionMetadata()
+        
+        try:
+            plan, walk = self.bind(variables, rng)
+            for segment in walk:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ScenarioCancelled(f"Cenário '{self.name}' interrompido pelo hard stop")
+                
+                if isinstance(segment, DriverScriptBatch):
+                    self._execute_batch(segment, driver, run, metadata, rng)
+                    continue
+                
+                idx = segment
+                action, step = plan[idx]
+                if run.mark(action):
+                    continue
+                
+                walk.found = self._run_step(idx, action, step, driver, run, cancel_event, cache, metadata)
+                
+                think = self.think_after(action, rng)
+                if think > 0:
+                    paused_at = time.monotonic()
+                    pause(think, cancel_event)
+                    run.add_pause(time.monotonic() - paused_at)
+        except Exception as e:
+            run.close(e)
+            raise
         
-        for idx, action in enumerate(self.actions):
+        run.close()
+        return run
+    
+    def _run_step(
+        self,
+        idx: int,
+        action: Action,
+        step: Callable,
+        driver,
+        run: ScenarioRun,
+        cancel_event: Optional[threading.Event],
+        cache: Optional[ElementCache],
+        metadata: SessionMetadata
+    ) -> bool:
+        """
+        Executa uma ação com a política de falha e registra o seu tempo
+        
+        A duração registrada é a da última tentativa; as anteriores e as
+        esperas entre elas ficam em retries e retry_time.
+        
+        Returns:
+            Se a ação encontrou o elemento (False no if_present sem o
+            elemento ou na falha tolerada por on_failure: continue)
+        
+        Raises:
+            Exception: Erro da última tentativa, quando a política encerra a iteração
+        """
+        policy = action.failure
+        first_started = time.monotonic()
+        for attempt in range(policy.retries + 1):
+            started = time.monotonic()
             try:
-                logger.debug(f"  Ação {idx + 1}/{len(self.actions)}: {action.action_type}")
-                action.execute(driver, platform)
-            except Exception as e:
-                logger.error(f"Erro na ação {idx + 1} ({action.action_type}): {e}")
+                timing = step(driver, cancel_event, cache, metadata)
+            except ScenarioCancelled:
                 raise
+            except Exception as e:
+                if policy.can_retry(attempt, e):
+                    logger.warning(
+                        f"Ação {idx + 1} ({action.action_type}) falhou, "
+                        f"tentativa {attempt + 2} de {policy.retries + 1}: {e}"
+                    )
+                    pause(policy.delay(attempt), cancel_event)
+                    continue
+                
+                run.step(idx, action, started, None, e, retries=attempt, retry_time=started - first_started)
+                if policy.screenshot:
+                    save_screenshot(driver, policy.screenshot_path(self.name, idx + 1))
+                if not policy.tolerates(e):
+                    logger.error(f"Erro na ação {idx + 1} ({action.action_type}): {e}")
+                    raise
+                logger.warning(f"Erro na ação {idx + 1} ({action.action_type}), cenário continua: {e}")
+                return False
+            
+            lookup, poll_wait = timing or (None, 0.0)
+            run.step(
+                idx, action, started, lookup,
+                poll_wait=poll_wait, retries=attempt, retry_time=started - first_started
+            )
+            return timing is not None
+    
+    def _execute_batch(
+        self,
+        batch: DriverScriptBatch,
+        driver,
+        run: ScenarioRun,
+        metadata: SessionMetadata,
+        rng: Any = random
+    ):
+        """Executa um lote de ações no servidor e registra os tempos medidos lá"""
+        thinks = [self.think_after(action, rng) for _, action in batch.items]
+        window_size = session_metadata(driver, metadata, "window_size") if batch.needs_window_size else None
+        script, timeout_ms = batch.prepare(thinks, metadata, window_size)
+        
+        started = time.monotonic()
+        try:
+            result = driver.execute_driver(script, timeout_ms=timeout_ms).result
+        except Exception as e:
+            batch.fail(run, started, e)
+            raise
+        batch.record(run, started, result, metadata)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializa o cenário no mesmo formato aceito por from_dict
+        
+        Returns:
+            Dicionário com 'name', 'actions' (com loops, condicionais e ramos;
+            sub-cenários de call já incluídos) e, se configurados,
+            'think_time', 'pacing', 'polling', 'failure_policy', 'timeout',
+            'batch' e 'data_sources'
+        """
+        data = {
+            'name': self.name,
+            'actions': self._block_to_list(self.program)
+        }
+        if self.think_time:
+            data['think_time'] = self.think_time.to_dict()
+        if self.pacing is not None:
+            data['pacing'] = self.pacing
+        if self.polling:
+            data['polling'] = self.polling.to_dict()
+        if self.failure_policy:
+            data['failure_policy'] = self.failure_policy.to_dict()
+        if self.timeout is not None:
+            data['timeout'] = self.timeout
+        if self.batch:
+            data['batch'] = True
+        if self.data_sources:
+            data['data_sources'] = [asdict(source.config) for source in self.data_sources]
+        return data
+    
+    def _block_to_list(self, block: Block) -> List[Dict[str, Any]]:
+        """Serializa um bloco da árvore de execução no formato de from_dict"""
+        items = []
+        for node in block:
+            if isinstance(node, Loop):
+                low, high = node.times
+                items.append({'loop': {
+                    'times': low if low == high else [low, high],
+                    'actions': self._block_to_list(node.body)
+                }})
+            elif isinstance(node, IfPresent):
+                params = dict(self.actions[node.probe].to_dict()['if_present'], then=self._block_to_list(node.then))
+                if node.otherwise:
+                    params['else'] = self._block_to_list(node.otherwise)
+                items.append({'if_present': params})
+            elif isinstance(node, RandomBranch):
+                items.append({'random_branch': [
+                    {'weight': weight, 'actions': self._block_to_list(branch)}
+                    for weight, branch in zip(node.weights, node.branches)
+                ]})
+            else:
+                items.append(self.actions[node].to_dict())
+        return items
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Scenario':
+    def from_dict(cls, data: Dict[str, Any], flows: Optional[Dict[str, 'Scenario']] = None) -> 'Scenario':
         """
         Cria um cenário a partir de dicionário (usado para carregar de YAML)
         
         Args:
-            data: Dicionário com 'name' e 'actions'
+            data: Dicionário com 'name', 'actions' e, opcionalmente,
+                'think_time', 'pacing', 'polling', 'failure_policy', 'timeout',
+                'batch' e 'data_sources'
+            flows: Sub-cenários disponíveis para call, por nome
         
         Returns:
             Scenario configurado
+        
+        Raises:
+            ValueError: Ação inválida no cenário
         """
-        scenario = cls(data['name'])
+        scenario = cls(
+            data['name'],
+            think_time=data.get('think_time'),
+            pacing=data.get('pacing'),
+            polling=data.get('polling'),
+            batch=data.get('batch', False),
+            data_sources=data.get('data_sources'),
+            failure_policy=data.get('failure_policy'),
+            timeout=data.get('timeout')
+        )
+        
+        try:
+            scenario._add_items(data.get('actions', []), flows or {})
+        except ValueError as e:
+            raise ValueError(f"Cenário '{scenario.name}', {e}") from e
         
-        for action_data in data.get('actions', []):
+        return scenario
+    
+    def _add_items(self, items: List[Dict[str, Any]], flows: Dict[str, 'Scenario']):
+        """Adiciona ações e construções de controle de fluxo no formato de from_dict"""
+        for idx, action_data in enumerate(items):
             # Cada ação é um dicionário com um único key (tipo da ação)
             action_type = list(action_data.keys())[0]
             action_params = action_data[action_type]
             
-            scenario.add_action(Action(action_type, **action_params))
+            try:
+                if action_type in CONTROL_FLOW:
+                    self._add_control(action_type, action_params, flows)
+                else:
+                    self.add_action(Action(action_type, **action_params))
+            except ValueError as e:
+                raise ValueError(f"ação {idx + 1} ({action_type}): {e}") from e
+    
+    def _add_control(self, kind: str, params: Any, flows: Dict[str, 'Scenario']):
+        """Adiciona loop, if_present, random_branch ou call a partir da configuração"""
+        def body(items) -> 'Scenario':
+            block = Scenario(self.name)
+            block._add_items(items or [], flows)
+            return block
         
-        return scenario
+        if kind == "loop":
+            if 'times' not in params:
+                raise ValueError("loop requer times")
+            self.loop(params['times'], body(params.get('actions')))
+        elif kind == "if_present":
+            params = dict(params)
+            then, otherwise = params.pop('then', None), params.pop('else', None)
+            if not then and not otherwise:
+                raise ValueError("if_present requer then ou else")
+            self.if_present(body(then), body(otherwise) if otherwise else None, **params)
+        elif kind == "random_branch":
+            branches = params.get('branches') if isinstance(params, dict) else params
+            self.random_branch([(branch.get('weight', 1), body(branch.get('actions'))) for branch in branches or []])
+        else:
+            name = params.get('flow') if isinstance(params, dict) else params
+            if name not in flows:
+                raise ValueError(f"Sub-cenário não definido em flows: {name}")
+            self.call(flows[name])
@@ -0,0 +1,126 @@
+"""
+Seleção ponderada dos cenários (mix de cenários)
+
+A tabela de sorteio é montada uma vez por teste e compartilhada pelos
+usuários virtuais; cada usuário sorteia com o próprio gerador (ver
+user_rng), então a sequência de cenários de cada usuário se repete entre
+execuções com a mesma seed.
+
+Modos:
+- random: sorteio independente a cada iteração pelo método alias (O(1)
+  por sorteio, independente do número de cenários)
+- exact: sequência intercalada fixa em que qualquer trecho segue os pesos
+  (weighted round-robin suave), compartilhada pelos usuários do processo;
+  mesmo execuções curtas atingem o mix configurado
+"""
+
+import math
+import random
+import itertools
+from fractions import Fraction
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Modos de seleção dos cenários
+MIX_MODES = ("random", "exact")
+
+# Resolução dos pesos fracionários no modo exact (fatias por ciclo)
+EXACT_RESOLUTION = 1000
+
+
+def user_rng(seed: Optional[int], user_id: int) -> random.Random:
+    """
+    Gerador de números aleatórios do usuário virtual
+    
+    Com seed, o gerador depende só da seed e do id do usuário (estável
+    entre execuções e processos); sem seed, é iniciado pelo sistema.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}:{user_id}")
+
+
+class AliasTable:
+    """Sorteio ponderado em O(1) pelo método alias (Vose)"""
+    
+    def __init__(self, weights: Sequence[float]):
+        total = sum(weights)
+        if not weights or any(weight < 0 for weight in weights) or total <= 0:
+            raise ValueError(f"Pesos dos cenários inválidos: {list(weights)} (use pesos >= 0 com soma maior que zero)")
+        
+        count = len(weights)
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+    
+    def __len__(self) -> int:
+        return len(self.alias)
+    
+    def sample(self, rng: Any = random) -> int:
+        """Sorteia um índice (um único número aleatório: coluna e moeda)"""
+        position = rng.random() * len(self.alias)
+        column = int(position)
+        return column if position - column < self.probability[column] else self.alias[column]
+
+
+def interleave(weights: Sequence[float]) -> List[int]:
+    """
+    Um ciclo da sequência exata: cada índice aparece na proporção do peso
+    e, em qualquer trecho, no máximo uma vez a mais ou a menos que o ideal
+    
+    Pesos fracionários são aproximados a EXACT_RESOLUTION fatias por ciclo.
+    """
+    shares = [Fraction(weight).limit_denominator(EXACT_RESOLUTION) for weight in weights]
+    scale = math.lcm(*(share.denominator for share in shares))
+    counts = [int(share * scale) for share in shares]
+    divisor = math.gcd(*counts)
+    counts = [count // divisor for count in counts]
+    total = sum(counts)
+    
+    # Weighted round-robin suave: escolhe o maior crédito acumulado
+    credit = [0] * len(counts)
+    cycle = []
+    for _ in range(total):
+        for index, count in enumerate(counts):
+            credit[index] += count
+        chosen = max(range(len(counts)), key=credit.__getitem__)
+        credit[chosen] -= total
+        cycle.append(chosen)
+    return cycle
+
+
+class ScenarioMix:
+    """Seleção dos cenários de um teste pelos pesos"""
+    
+    def __init__(self, scenarios: List[Tuple[Any, float]], mode: str = "random"):
+        """
+        Args:
+            scenarios: Lista de (Scenario, peso)
+            mode: "random" (sorteio a cada iteração) ou "exact" (sequência intercalada)
+        """
+        if mode not in MIX_MODES:
+            raise ValueError(f"Modo de mix de cenários desconhecido: {mode} (use um de {list(MIX_MODES)})")
+        if not scenarios:
+            raise ValueError("Nenhum cenário configurado")
+        
+        self.mode = mode
+        self.scenarios = [scenario for scenario, _ in scenarios]
+        weights = [weight for _, weight in scenarios]
+        self.table = AliasTable(weights)
+        self.cycle = interleave(weights) if mode == "exact" else []
+        # Posição na sequência exata (contador atômico, sem lock)
+        self._cursor = itertools.count()
+    
+    def select(self, rng: Any = random) -> Any:
+        """Cenário da próxima iteração"""
+        if self.cycle:
+            return self.scenarios[self.cycle[next(self._cursor) % len(self.cycle)]]
+        return self.scenarios[self.table.sample(rng)]
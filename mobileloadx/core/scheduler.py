@@ -0,0 +1,102 @@
+"""
+Agendador de eventos em relógio monotônico
+
+Substitui o loop de controle que acordava a cada segundo: cada criação de
+usuário, mudança de estágio e fim de teste é agendada para o instante
+exato em que acontece, e a thread só acorda quando há trabalho.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import logging
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledEvent:
+    """Evento agendado (retornado por EventScheduler.call_at)"""
+    
+    __slots__ = ("when", "callback", "args", "cancelled")
+    
+    def __init__(self, when: float, callback: Callable, args: tuple):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+    
+    def cancel(self):
+        """Cancela o evento (ignorado se já foi executado)"""
+        self.cancelled = True
+
+
+class EventScheduler:
+    """
+    Fila de eventos em heap, executados em ordem de horário
+    
+    Os horários usam time.monotonic(). Callbacks rodam na thread que chama
+    run(), um de cada vez, então podem alterar estado compartilhado sem lock
+    próprio. Outras threads agendam eventos com call_at/call_soon.
+    """
+    
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+    
+    def call_at(self, when: float, callback: Callable, *args: Any) -> ScheduledEvent:
+        """
+        Agenda callback(*args) para o instante when (time.monotonic)
+        
+        Returns:
+            ScheduledEvent, que pode ser cancelado
+        """
+        event = ScheduledEvent(when, callback, args)
+        with self._condition:
+            heapq.heappush(self._heap, (when, next(self._sequence), event))
+            self._condition.notify()
+        return event
+    
+    def call_soon(self, callback: Callable, *args: Any) -> ScheduledEvent:
+        """Agenda callback(*args) para o próximo ciclo do scheduler"""
+        return self.call_at(time.monotonic(), callback, *args)
+    
+    def stop(self):
+        """Encerra run() (pode ser chamado de qualquer thread)"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+    
+    def _next_due(self) -> Optional[ScheduledEvent]:
+        """Espera até o próximo evento vencer; None quando o scheduler parou"""
+        with self._condition:
+            while not self._stopped:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                
+                when, _, event = self._heap[0]
+                delay = when - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                
+                heapq.heappop(self._heap)
+                if not event.cancelled:
+                    return event
+            return None
+    
+    def run(self):
+        """Executa os eventos até stop()"""
+        while True:
+            event = self._next_due()
+            if event is None:
+                return
+            
+            try:
+                event.callback(*event.args)
+            except Exception as e:
+                logger.error(f"Erro em evento agendado: {e}")
@@ -0,0 +1,167 @@
+"""
+Saúde das sessões: watchdog por usuário virtual e circuit breaker por device
+
+Quando a sessão do Appium morre no meio do teste (sessão inválida, servidor
+recusando conexões, instrumentação do app caída), as iterações seguintes
+falhariam na hora, inflando a taxa de erro. O usuário virtual separa esses
+erros fatais dos erros do cenário: registra a falha do cenário em
+andamento, descarta a sessão e a recria com backoff exponencial, contando
+o tempo sem sessão (downtime).
+
+Cada device tem um circuit breaker: após failure_threshold falhas
+seguidas (erros fatais ou sessões que não sobem) o circuito abre e os
+usuários do device esperam open_time segundos; depois uma única tentativa
+testa o device (half-open) antes de liberar os demais.
+"""
+
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .backoff import ExponentialBackoff
+
+logger = logging.getLogger(__name__)
+
+# Trechos de mensagens de erro que indicam sessão perdida (minúsculas)
+SESSION_FATAL_ERRORS = (
+    "invalid session id",
+    "session is either terminated or not started",
+    "a session is either terminated",
+    "connection refused",
+    "connection reset",
+    "connection aborted",
+    "failed to establish a new connection",
+    "max retries exceeded",
+    "remote end closed connection",
+    "conexão encerrada pelo servidor",
+    "econnrefused",
+    "econnreset",
+    "socket hang up",
+    "instrumentation process is not running",
+    "could not proxy command to the remote server",
+)
+
+
+def is_session_fatal(error: BaseException, extra: Optional[List[str]] = None) -> bool:
+    """
+    Se o erro indica que a sessão do Appium não pode mais ser usada
+    
+    Args:
+        error: Exceção da ação (Selenium, WebDriverError do engine asyncio ou de conexão)
+        extra: Trechos de mensagem adicionais considerados fatais
+    """
+    if isinstance(error, ConnectionError):
+        return True
+    message = str(error).lower()
+    return any(pattern in message for pattern in SESSION_FATAL_ERRORS + tuple(p.lower() for p in extra or ()))
+
+
+@dataclass
+class SessionHealthConfig(ExponentialBackoff):
+    """
+    Configuração do watchdog de sessões e do circuit breaker por device
+    
+    backoff, max_backoff e jitter (ExponentialBackoff) definem o atraso
+    entre as tentativas de recriar a sessão.
+    """
+    enabled: bool = True
+    failure_threshold: int = 3  # falhas seguidas que abrem o circuito do device
+    open_time: float = 30.0  # tempo com o circuito aberto antes de testar o device
+    fatal_errors: List[str] = field(default_factory=list)  # trechos extras de mensagens fatais
+    
+    def __post_init__(self):
+        super().__post_init__()
+        if self.failure_threshold < 1:
+            raise ValueError(f"failure_threshold deve ser pelo menos 1: {self.failure_threshold}")
+        if self.open_time < 0:
+            raise ValueError(f"open_time não pode ser negativo: {self.open_time}")
+    
+    def is_fatal(self, error: BaseException) -> bool:
+        """Se o erro derruba a sessão (sempre False com o watchdog desligado)"""
+        return self.enabled and is_session_fatal(error, self.fatal_errors)
+
+
+class _Circuit:
+    """Estado do circuito de um device"""
+    
+    def __init__(self):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    """Circuit breaker por device de uma plataforma (device None = plataforma sem devices)"""
+    
+    def __init__(self, config: SessionHealthConfig, on_open: Optional[Callable[[Optional[str], int], None]] = None):
+        """
+        Args:
+            config: Limite de falhas e tempo aberto
+            on_open: Callback(device, falhas) a cada abertura do circuito
+        """
+        self.config = config
+        self.on_open = on_open
+        self.lock = threading.Lock()
+        self.circuits: Dict[Optional[str], _Circuit] = {}
+    
+    def state(self, device: Optional[str]) -> str:
+        """Estado do circuito do device: closed, open ou half-open"""
+        with self.lock:
+            circuit = self.circuits.get(device)
+            if circuit is None or circuit.opened_at is None:
+                return "closed"
+            if circuit.probing or time.monotonic() >= circuit.opened_at + self.config.open_time:
+                return "half-open"
+            return "open"
+    
+    def wait_time(self, device: Optional[str]) -> float:
+        """
+        Segundos até o usuário poder tentar o device (0 = pode tentar agora)
+        
+        Com o circuito fechado retorna 0. Aberto, retorna o tempo restante;
+        ao fim dele, o primeiro usuário recebe 0 (tentativa de teste) e os
+        demais esperam o resultado.
+        """
+        with self.lock:
+            circuit = self.circuits.get(device)
+            if circuit is None or circuit.opened_at is None:
+                return 0.0
+            
+            remaining = circuit.opened_at + self.config.open_time - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if circuit.probing:
+                return max(self.config.backoff, 0.01)
+            circuit.probing = True
+            return 0.0
+    
+    def record_success(self, device: Optional[str]):
+        """Sessão criada ou cenário concluído: zera as falhas e fecha o circuito do device"""
+        if device not in self.circuits:
+            return
+        with self.lock:
+            circuit = self.circuits.pop(device, None)
+        if circuit is not None and circuit.opened_at is not None:
+            logger.info(f"Circuito do device {device or '(padrão)'} fechado")
+    
+    def record_failure(self, device: Optional[str]):
+        """Registra um erro fatal ou falha ao criar sessão; abre o circuito no limite"""
+        with self.lock:
+            circuit = self.circuits.setdefault(device, _Circuit())
+            circuit.failures += 1
+            below_threshold = circuit.failures < self.config.failure_threshold
+            if not circuit.probing and (circuit.opened_at is not None or below_threshold):
+                return
+            
+            circuit.opened_at = time.monotonic()
+            circuit.probing = False
+            failures = circuit.failures
+        
+        logger.warning(
+            f"Circuito do device {device or '(padrão)'} aberto após {failures} falha(s) seguidas; "
+            f"nova tentativa em {self.config.open_time:.0f}s"
+        )
+        if self.on_open:
+            self.on_open(device, failures)
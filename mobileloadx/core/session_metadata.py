@@ -0,0 +1,72 @@
+"""
+Cache de metadados da sessão Appium
+
+Tamanho da tela, orientação, versão da plataforma e contexto atual mudam
+raramente durante uma sessão, mas ações como o scroll precisavam consultá-los
+no Appium a cada execução. O cache guarda cada valor na primeira leitura e só
+o descarta quando uma ação muda a orientação ou o contexto.
+"""
+
+from typing import Any, Awaitable, Callable, Dict
+
+# Metadados mantidos por sessão (implicit_wait é definido pelo polling, não lido)
+METADATA_KEYS = ("window_size", "orientation", "platform_version", "context", "implicit_wait")
+
+# Metadados que deixam de valer quando outro muda
+INVALIDATED_BY = {
+    "orientation": ("window_size",),
+    "context": ("window_size",),  # webviews têm viewport próprio
+}
+
+
+class SessionMetadata:
+    """
+    Metadados de uma sessão Appium, lidos sob demanda
+    
+    As ações que mudam um metadado gravam o novo valor em changed(): rotate
+    grava orientation e switch_context grava context, e ambas descartam
+    window_size, relido no próximo scroll ou gesto com coordenadas
+    relativas; o polling grava implicit_wait sem descartar nada.
+    platform_version só sai do cache em clear(), quando a sessão é recriada.
+    """
+    
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+    
+    def fetch(self, key: str, load: Callable[[], Any]) -> Any:
+        """
+        Retorna o metadado, lendo do driver apenas na primeira vez
+        
+        Args:
+            key: Um de METADATA_KEYS
+            load: Leitura do valor no driver
+        """
+        if key not in self._values:
+            self._values[key] = load()
+        return self._values[key]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Valor conhecido do metadado, sem consultar o driver"""
+        return self._values.get(key, default)
+    
+    async def fetch_async(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Versão de fetch para a sessão assíncrona"""
+        if key not in self._values:
+            self._values[key] = await load()
+        return self._values[key]
+    
+    def changed(self, key: str, value: Any):
+        """
+        Registra a mudança de um metadado feita por uma ação
+        
+        Args:
+            key: "orientation", "context" ou "implicit_wait"
+            value: Novo valor
+        """
+        self._values[key] = value
+        for dependent in INVALIDATED_BY.get(key, ()):
+            self._values.pop(dependent, None)
+    
+    def clear(self):
+        """Descarta todos os metadados (fim ou troca de sessão)"""
+        self._values.clear()
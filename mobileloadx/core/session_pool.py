@@ -0,0 +1,131 @@
+"""
+Pool de sessões Appium pré-aquecidas
+
+Criar uma sessão com options.app instala e abre o app, o que leva de
+dezenas de segundos em devices reais. O pool cria as sessões antes do
+início do teste e as repassa entre usuários virtuais: ao terminar, o
+usuário reinicia o estado do app (reset) e devolve a sessão ao pool, e o
+próximo usuário do mesmo device a reaproveita.
+"""
+
+import threading
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Estratégias de reset do app entre um usuário e o próximo
+RESET_STRATEGIES = ("none", "terminate-activate", "clear-data", "deep-link")
+
+
+@dataclass
+class SessionPoolConfig:
+    """Configuração do pool de sessões de uma plataforma"""
+    size: int = 0  # sessões pré-aquecidas (limitadas aos usuários da plataforma)
+    reset: str = "terminate-activate"
+    app_id: Optional[str] = None  # package (Android) ou bundle id (iOS)
+    deep_link: Optional[str] = None  # URL aberta no reset "deep-link"
+    
+    def __post_init__(self):
+        if self.size < 0:
+            raise ValueError(f"Tamanho de pool inválido: {self.size}")
+        if self.reset not in RESET_STRATEGIES:
+            raise ValueError(f"Reset desconhecido: {self.reset} (use um de {list(RESET_STRATEGIES)})")
+        if self.reset in ("terminate-activate", "clear-data") and not self.app_id:
+            raise ValueError(f"O reset {self.reset} requer app_id")
+        if self.reset == "deep-link" and not self.deep_link:
+            raise ValueError("O reset deep-link requer deep_link")
+
+
+def reset_scripts(platform: str, config: SessionPoolConfig) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Comandos "mobile:" que reiniciam o estado do app entre usuários
+    
+    Args:
+        platform: "android" ou "ios"
+        config: Configuração do pool
+    
+    Returns:
+        Lista de (script, argumentos) para execute_script
+    """
+    app_key = "bundleId" if platform == "ios" else "appId"
+    app = {app_key: config.app_id}
+    
+    if config.reset == "terminate-activate":
+        return [("mobile: terminateApp", app), ("mobile: activateApp", app)]
+    if config.reset == "clear-data":
+        return [("mobile: clearApp", app), ("mobile: activateApp", app)]
+    if config.reset == "deep-link":
+        args = {"url": config.deep_link}
+        if config.app_id:
+            args["bundleId" if platform == "ios" else "package"] = config.app_id
+        return [("mobile: deepLink", args)]
+    return []
+
+
+class SessionPool:
+    """
+    Sessões ociosas de uma plataforma, separadas por device
+    
+    O pool só guarda as sessões; criar, reiniciar e encerrar cabe ao
+    usuário virtual, que conhece o tipo de sessão do seu engine. Com
+    reuse=False (warm-up sem session_pool) cada sessão pré-aquecida atende
+    um único usuário e é encerrada ao fim dele.
+    """
+    
+    def __init__(self, config: SessionPoolConfig, reuse: bool = True):
+        self.config = config
+        self.reuse = reuse
+        self._idle: Dict[Optional[str], List[Any]] = defaultdict(list)
+        self.lock = threading.Lock()
+        self.closed = False
+    
+    @property
+    def idle(self) -> int:
+        """Sessões ociosas no pool"""
+        with self.lock:
+            return sum(len(sessions) for sessions in self._idle.values())
+    
+    def checkout(self, device: Optional[str]) -> Optional[Any]:
+        """Retira uma sessão ociosa do device (None se não houver)"""
+        with self.lock:
+            sessions = self._idle.get(device)
+            return sessions.pop() if sessions else None
+    
+    def add(self, device: Optional[str], session: Any) -> bool:
+        """
+        Guarda uma sessão recém-criada (warm-up)
+        
+        Returns:
+            False se o pool foi fechado; o chamador deve encerrar a sessão
+        """
+        with self.lock:
+            if self.closed:
+                return False
+            self._idle[device].append(session)
+            return True
+    
+    def checkin(self, device: Optional[str], session: Any) -> bool:
+        """
+        Devolve uma sessão já reiniciada ao pool
+        
+        Returns:
+            False se o pool foi fechado ou não reaproveita sessões; o
+            chamador deve encerrar a sessão
+        """
+        if not self.reuse:
+            return False
+        return self.add(device, session)
+    
+    def drain(self) -> List[Any]:
+        """Fecha o pool e retorna as sessões ociosas para serem encerradas"""
+        with self.lock:
+            self.closed = True
+            sessions = [session for idle in self._idle.values() for session in idle]
+            self._idle.clear()
+        
+        if sessions:
+            logger.debug(f"Pool de sessões fechado com {len(sessions)} sessão(ões) ociosa(s)")
+        return sessions
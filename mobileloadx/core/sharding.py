@@ -0,0 +1,318 @@
+"""
+Execução em múltiplos processos (sharding de usuários virtuais)
+
+Divide os usuários virtuais e os devices entre N processos worker. Cada
+worker executa um LoadTest local com seu próprio MetricsCollector e
+devolve os registros brutos, que o processo pai mescla em um único
+TestResults.
+
+Cada worker faz o seu warm-up e avisa que está pronto; o relógio do
+processo pai e de todos os shards começa junto, depois do warm-up mais
+lento, para que as janelas medidas coincidam.
+"""
+
+import copy
+import queue
+import threading
+import logging
+import multiprocessing
+from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from typing import Any, Dict, List, Optional
+
+from .distribution import compute_platform_quotas
+
+logger = logging.getLogger(__name__)
+
+# Eventos compartilhados com os workers (definidos no initializer)
+_stop_event = None
+_start_event = None
+_ready_queue = None
+
+
+@dataclass
+class ShardSpec:
+    """Parte do teste executada por um processo worker"""
+    index: int
+    name: str
+    duration: float  # segundos medidos a partir do início combinado
+    virtual_users: int
+    ramp_up_time: int
+    engine: str
+    user_id_offset: int
+    platforms: List[Any]
+    scenarios: List[tuple]
+    arrival_rate: Optional[Any] = None  # ArrivalRateConfig proporcional ao shard
+    profile: Optional[Any] = None  # LoadProfile proporcional ao shard
+    warmup: Optional[Any] = None  # WarmupConfig com min_ready proporcional
+    drain_timeout: Optional[float] = 30.0  # mesmo padrão do LoadTest
+    workers: int = 1  # total de workers (divisão das linhas das fontes de dados)
+    seed: Optional[int] = None  # seed da execução (geradores dos usuários)
+    scenario_mix: str = "random"
+    session_health: Optional[Any] = None  # SessionHealthConfig (None = padrão)
+    device_metrics: Optional[Dict[str, Any]] = None  # argumentos de set_device_metrics
+
+
+def _split_evenly(total: int, parts: int) -> List[int]:
+    """Divide total em parts partes com diferença máxima de 1"""
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def split_device_metrics(config: Dict[str, Any], index: int, parts: int) -> Dict[str, Any]:
+    """
+    Coleta de métricas de um shard: cada device é lido por um único worker
+    
+    Args:
+        config: Configuração da coleta (LoadTest.device_metrics_config)
+        index: Posição do shard
+        parts: Número de shards
+    
+    Returns:
+        Argumentos de set_device_metrics do shard (collect vazio quando não
+        sobra device para o shard)
+    """
+    # Sem devices configurados a coleta lê o único device do adb: só o primeiro shard
+    devices = config["devices"] or [None]
+    own = devices[index::parts]
+    return dict(
+        config,
+        collect=list(config["collect"]) if own else [],
+        devices=[device for device in own if device is not None],
+    )
+
+
+def split_shards(load_test, workers: int) -> List[ShardSpec]:
+    """
+    Divide um LoadTest em shards
+    
+    A quota de usuários de cada plataforma é dividida igualmente. Os devices de cada
+    plataforma são repartidos entre os workers quando há devices
+    suficientes; caso contrário todos os workers compartilham a lista.
+    
+    Args:
+        load_test: LoadTest de origem
+        workers: Número de processos
+    
+    Returns:
+        Lista de ShardSpec (shards sem usuários são omitidos)
+    """
+    shards = []
+    user_id_offset = 0
+    
+    # Cada quota de plataforma é dividida entre os workers; o rodízio do
+    # ponto de partida evita que o primeiro worker acumule as sobras
+    quotas = compute_platform_quotas(load_test.platforms, load_test.max_virtual_users)
+    platform_parts = []
+    offset = 0
+    for quota in quotas:
+        parts = _split_evenly(quota, workers)
+        platform_parts.append(parts[-offset:] + parts[:-offset] if offset else parts)
+        offset = (offset + quota) % workers
+    
+    for index in range(workers):
+        users = sum(parts[index] for parts in platform_parts)
+        if users == 0:
+            continue
+        
+        platforms = []
+        for platform_config, parts in zip(load_test.platforms, platform_parts):
+            shard_platform = copy.copy(platform_config)
+            shard_platform.users = parts[index]
+            shard_platform.share = None
+            if len(platform_config.devices) >= workers:
+                shard_platform.devices = platform_config.devices[index::workers]
+            platforms.append(shard_platform)
+        
+        shards.append(ShardSpec(
+            index=index,
+            name=load_test.name,
+            duration=load_test.duration,
+            virtual_users=users,
+            ramp_up_time=load_test.ramp_up_time,
+            engine=load_test.engine,
+            user_id_offset=user_id_offset,
+            platforms=platforms,
+            scenarios=load_test.scenarios,
+            arrival_rate=(
+                load_test.arrival_rate.scaled(users / load_test.max_virtual_users)
+                if load_test.arrival_rate else None
+            ),
+            profile=(
+                load_test.profile.scaled(users / load_test.max_virtual_users)
+                if load_test.profile else None
+            ),
+            warmup=(
+                load_test.warmup.scaled(users / load_test.max_virtual_users)
+                if load_test.warmup else None
+            ),
+            drain_timeout=load_test.drain_timeout,
+            workers=workers,
+            seed=load_test.run_seed,
+            scenario_mix=load_test.scenario_mix,
+            session_health=load_test.session_health,
+        ))
+        user_id_offset += users
+    
+    device_metrics = load_test.device_metrics_config()
+    for position, shard in enumerate(shards):
+        shard.device_metrics = split_device_metrics(device_metrics, position, len(shards))
+    
+    return shards
+
+
+def build_shard_test(spec: ShardSpec):
+    """Cria o LoadTest local que executa um shard"""
+    from .load_test import LoadTest
+    
+    test = LoadTest(
+        name=f"{spec.name} [worker {spec.index}]",
+        duration=spec.duration,
+        virtual_users=spec.virtual_users,
+        ramp_up_time=spec.ramp_up_time,
+        engine=spec.engine,
+        seed=spec.seed,
+        scenario_mix=spec.scenario_mix,
+    )
+    test.user_id_offset = spec.user_id_offset
+    test.platforms = spec.platforms
+    test.scenarios = spec.scenarios
+    test.arrival_rate = spec.arrival_rate
+    test.profile = spec.profile
+    test.warmup = spec.warmup
+    test.drain_timeout = spec.drain_timeout
+    if spec.session_health is not None:
+        test.session_health = spec.session_health
+    if spec.device_metrics is not None:
+        test.set_device_metrics(**spec.device_metrics)
+    
+    # sequential e circular não repetem linhas entre os workers
+    if spec.workers > 1:
+        for scenario, _ in spec.scenarios:
+            for source in scenario.data_sources:
+                source.set_partition(spec.index, spec.workers)
+    return test
+
+
+def _init_worker(stop_event, start_event=None, ready_queue=None):
+    """Initializer dos processos worker"""
+    global _stop_event, _start_event, _ready_queue
+    _stop_event = stop_event
+    _start_event = start_event
+    _ready_queue = ready_queue
+
+
+def run_shard(spec: ShardSpec) -> Dict[str, Any]:
+    """
+    Executa um shard no processo worker
+    
+    Returns:
+        Registros brutos do MetricsCollector do worker
+    """
+    test = build_shard_test(spec)
+    
+    # Propaga o LoadTest.stop() do processo pai
+    if _stop_event is not None:
+        def watch_stop():
+            _stop_event.wait()
+            test.stop()
+        
+        threading.Thread(target=watch_stop, daemon=True).start()
+    
+    # Depois do warm-up o shard espera o início combinado com os demais
+    if _start_event is not None:
+        def wait_for_start():
+            _ready_queue.put(spec.index)
+            _start_event.wait()
+        
+        test.start_gate = wait_for_start
+    
+    test.run()
+    return test.metrics_collector.export()
+
+
+class ShardedRunner:
+    """Executa um LoadTest dividido em processos worker"""
+    
+    def __init__(self, load_test, workers: int):
+        """
+        Args:
+            load_test: LoadTest a ser executado
+            workers: Número de processos worker
+        """
+        self.load_test = load_test
+        self.workers = workers
+        
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.futures: Dict[Future, ShardSpec] = {}
+        self.stop_event = None
+        self.start_event = None
+    
+    def prepare(self):
+        """Inicia os shards e aguarda o warm-up de todos (antes do relógio do teste)"""
+        load_test = self.load_test
+        shards = split_shards(load_test, self.workers)
+        
+        # spawn funciona igual em Linux, macOS e Windows
+        context = multiprocessing.get_context("spawn")
+        self.stop_event = context.Event()
+        self.start_event = context.Event()
+        ready_queue = context.Queue()
+        
+        logger.info(f"Executando {len(shards)} shard(s) em processos separados")
+        
+        self.executor = ProcessPoolExecutor(
+            max_workers=len(shards),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.stop_event, self.start_event, ready_queue)
+        )
+        self.futures = {self.executor.submit(run_shard, shard): shard for shard in shards}
+        
+        # Shards que terminaram sem chegar ao início (erro no warm-up) não são aguardados
+        ready = set()
+        try:
+            while load_test.is_running:
+                finished = {shard.index for future, shard in self.futures.items() if future.done()}
+                if len(ready | finished) >= len(shards):
+                    break
+                try:
+                    ready.add(ready_queue.get(timeout=0.5))
+                except queue.Empty:
+                    pass
+        except BaseException:
+            # Interrompido antes do início: os shards são liberados já parados
+            self.stop_event.set()
+            self.start_event.set()
+            self.executor.shutdown(wait=False)
+            raise
+    
+    def run(self, end_time: float):
+        """
+        Libera os shards e mescla as métricas no coletor do LoadTest
+        
+        Cada shard mede load_test.duration a partir da liberação; end_time
+        só faz parte da interface de runner.
+        """
+        load_test = self.load_test
+        if self.executor is None:
+            self.prepare()
+        
+        self.start_event.set()
+        
+        with self.executor:
+            pending = set(self.futures)
+            
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                
+                for future in done:
+                    shard = self.futures[future]
+                    try:
+                        load_test.metrics_collector.merge(future.result())
+                        logger.info(f"Shard {shard.index} concluído ({shard.virtual_users} usuários)")
+                    except Exception as e:
+                        logger.error(f"Erro no shard {shard.index}: {e}")
+                
+                if not load_test.is_running and not self.stop_event.is_set():
+                    self.stop_event.set()
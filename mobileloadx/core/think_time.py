@@ -0,0 +1,83 @@
+"""
+Think time: pausas do usuário entre ações, fora da latência medida
+
+Cada pausa é sorteada de uma distribuição (constant, uniform, normal ou
+exponential) definida no cenário ou em uma ação. Junto com o pacing do
+cenário, torna a carga oferecida por usuário virtual controlada e
+reproduzível sem usar ações "wait", que contam no tempo do cenário.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+# Distribuições aceitas em think_time.distribution
+THINK_TIME_DISTRIBUTIONS = ("constant", "uniform", "normal", "exponential")
+
+
+@dataclass
+class ThinkTime:
+    """Distribuição do think time (segundos)"""
+    distribution: str = "constant"
+    mean: float = 0.0  # constant: valor fixo; normal e exponential: média
+    stddev: float = 0.0  # desvio padrão da normal
+    min: float = 0.0  # uniform: limite inferior; demais: corte inferior
+    max: Optional[float] = None  # uniform: limite superior; demais: corte superior
+    
+    def __post_init__(self):
+        if self.distribution not in THINK_TIME_DISTRIBUTIONS:
+            raise ValueError(
+                f"Distribuição de think time desconhecida: {self.distribution} "
+                f"(use uma de {list(THINK_TIME_DISTRIBUTIONS)})"
+            )
+        if self.mean < 0 or self.stddev < 0 or self.min < 0:
+            raise ValueError("Think time não pode ser negativo")
+        if self.max is not None and self.max < self.min:
+            raise ValueError(f"Think time máximo ({self.max}) menor que o mínimo ({self.min})")
+        if self.distribution == "uniform" and self.max is None:
+            raise ValueError("Think time uniform requer max")
+    
+    @classmethod
+    def parse(cls, spec: Union[None, float, dict, "ThinkTime"]) -> Optional["ThinkTime"]:
+        """
+        Converte a configuração do think time
+        
+        Args:
+            spec: Número (constante em segundos), dicionário com os campos
+                de ThinkTime, ThinkTime ou None
+        """
+        if spec is None or isinstance(spec, cls):
+            return spec
+        if isinstance(spec, (int, float)):
+            return cls(mean=float(spec))
+        if isinstance(spec, dict):
+            return cls(**spec)
+        raise ValueError(f"Think time inválido: {spec!r}")
+    
+    def sample(self, rng: Any = random) -> float:
+        """
+        Sorteia uma pausa
+        
+        Args:
+            rng: Gerador de números aleatórios
+        """
+        if self.distribution == "uniform":
+            return rng.uniform(self.min, self.max)
+        
+        if self.distribution == "normal":
+            value = rng.gauss(self.mean, self.stddev)
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        else:
+            value = self.mean
+        
+        value = max(self.min, value)
+        return value if self.max is None else min(self.max, value)
+    
+    def to_dict(self) -> dict:
+        """Serializa no formato aceito por parse (apenas campos não padrão)"""
+        defaults = ThinkTime()
+        return {
+            key: value for key, value in vars(self).items()
+            if key == "distribution" or value != getattr(defaults, key)
+        }
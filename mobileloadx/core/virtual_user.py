@@ -2,15 +2,20 @@
 Classe que representa um usuário virtual executando ações no app
 """
 
-import random
 import time
+import threading
 import logging
 from typing import List, Dict, Any, Optional
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.options.ios import XCUITestOptions
 
-from .scenario import Scenario
+from .scenario import Scenario, ScenarioCancelled, ScenarioRun
+from .session_pool import SessionPool, reset_scripts
+from .element_cache import ElementCache
+from .session_metadata import SessionMetadata
+from .scenario_mix import ScenarioMix, user_rng
+from .session_health import CircuitBreaker, SessionHealthConfig
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +33,13 @@ class VirtualUser:
         device: Optional[str] = None,
         capabilities: Dict[str, Any] = None,
         scenarios: List[tuple] = None,
-        metrics_collector = None
+        metrics_collector = None,
+        session_pool: Optional[SessionPool] = None,
+        element_cache: bool = False,
+        mix: Optional[ScenarioMix] = None,
+        seed: Optional[int] = None,
+        health: Optional[SessionHealthConfig] = None,
+        breaker: Optional[CircuitBreaker] = None
     ):
         """
         Inicializa um usuário virtual
@@ -41,6 +52,13 @@ class VirtualUser:
             capabilities: Capabilities extras do Appium
             scenarios: Lista de (Scenario, weight)
             metrics_collector: Coletor de métricas
+            session_pool: Pool de sessões pré-aquecidas da plataforma (opcional)
+            element_cache: Reaproveita os handles de elementos na sessão
+            mix: Seleção dos cenários compartilhada pelo teste (padrão:
+                sorteio pelos pesos de scenarios)
+            seed: Seed da execução; o gerador do usuário depende dela e do ID
+            health: Watchdog de sessões (None = sessão perdida não é recriada)
+            breaker: Circuit breaker dos devices da plataforma
         """
         self.user_id = user_id
         self.platform = platform.lower()
@@ -49,40 +67,85 @@ class VirtualUser:
         self.capabilities = capabilities or {}
         self.scenarios = scenarios or []
         self.metrics_collector = metrics_collector
+        self.session_pool = session_pool
+        self.element_cache = ElementCache() if element_cache else None
+        self.mix = mix
+        # Sorteios do usuário: cenário, think time, loops/ramos e linhas random
+        self.rng = user_rng(seed, user_id)
+        self.health = health
+        self.breaker = breaker
+        # Sessão perdida por erro fatal: início (time.monotonic) e erro
+        self.session_lost_at: Optional[float] = None
+        self.session_error: Optional[str] = None
+        # Tamanho da tela, orientação etc. lidos uma vez por sessão
+        self.metadata = SessionMetadata()
         
         self.driver = None
         self.is_active = False
+        self.retired = False
+        # Fim do teste (time.monotonic); cenários concluídos depois são marcados como overtime
+        self.deadline: Optional[float] = None
+        self.cancel_event = threading.Event()
         self.actions_executed = 0
         self.errors = 0
         self.start_time = None
     
+    def _create_driver(self):
+        """Cria uma nova sessão no Appium (instala e abre o app)"""
+        if self.platform == "android":
+            options = UiAutomator2Options()
+            options.app = self.app
+            if self.device:
+                options.udid = self.device
+            options.automation_name = "UiAutomator2"
+        elif self.platform == "ios":
+            options = XCUITestOptions()
+            options.app = self.app
+            if self.device:
+                options.udid = self.device
+            options.automation_name = "XCUITest"
+        else:
+            raise ValueError(f"Plataforma não suportada: {self.platform}")
+        
+        # Adicionar capabilities customizadas
+        for key, value in self.capabilities.items():
+            setattr(options, key, value)
+        
+        # Conectar ao Appium server
+        appium_server_url = self.capabilities.get('appium_server_url', 'http://localhost:4723')
+        return webdriver.Remote(appium_server_url, options=options)
+    
+    def _record_session(self, source: str, duration: float):
+        """Registra a origem da sessão ("hit", "miss" ou "new") e o tempo de criação"""
+        if self.metrics_collector:
+            self.metrics_collector.record_session(
+                user_id=self.user_id,
+                platform=self.platform,
+                device=self.device,
+                source=source,
+                duration=duration
+            )
+    
+    def _checkout_session(self) -> Optional[Any]:
+        """Retira uma sessão pré-aquecida do pool, se houver"""
+        if self.session_pool is None:
+            return None
+        
+        session = self.session_pool.checkout(self.device)
+        if session is not None:
+            self._record_session("hit", 0)
+        return session
+    
     def start(self):
-        """Inicia a sessão do Appium"""
+        """Inicia a sessão do Appium (reaproveitando uma sessão do pool, se houver)"""
         try:
             logger.debug(f"Usuário {self.user_id}: Iniciando sessão Appium")
             
-            if self.platform == "android":
-                options = UiAutomator2Options()
-                options.app = self.app
-                if self.device:
-                    options.udid = self.device
-                options.automation_name = "UiAutomator2"
-            elif self.platform == "ios":
-                options = XCUITestOptions()
-                options.app = self.app
-                if self.device:
-                    options.udid = self.device
-                options.automation_name = "XCUITest"
-            else:
-                raise ValueError(f"Plataforma não suportada: {self.platform}")
-            
-            # Adicionar capabilities customizadas
-            for key, value in self.capabilities.items():
-                setattr(options, key, value)
-            
-            # Conectar ao Appium server
-            appium_server_url = self.capabilities.get('appium_server_url', 'http://localhost:4723')
-            self.driver = webdriver.Remote(appium_server_url, options=options)
+            self.driver = self._checkout_session()
+            if self.driver is None:
+                started = time.monotonic()
+                self.driver = self._create_driver()
+                self._record_session("miss" if self.session_pool else "new", time.monotonic() - started)
             
             self.is_active = True
             self.start_time = time.time()
@@ -94,9 +157,38 @@ class VirtualUser:
             self.errors += 1
             raise
     
+    def _release_session(self) -> bool:
+        """
+        Reinicia o app e devolve a sessão ao pool
+        
+        Returns:
+            True se a sessão ficou no pool; False se deve ser encerrada
+        """
+        if self.session_pool is None or not self.session_pool.reuse or not self.is_active:
+            return False
+        if self.cancel_event.is_set():
+            # Sessão interrompida no meio de uma ação: não volta ao pool
+            return False
+        
+        try:
+            # O próximo usuário da sessão parte do implicit wait padrão
+            if self.metadata.get("implicit_wait"):
+                self.driver.implicitly_wait(0)
+            for script, args in reset_scripts(self.platform, self.session_pool.config):
+                self.driver.execute_script(script, args)
+        except Exception as e:
+            logger.warning(f"Usuário {self.user_id}: Falha no reset da sessão, encerrando: {e}")
+            return False
+        
+        return self.session_pool.checkin(self.device, self.driver)
+    
     def stop(self):
-        """Encerra a sessão do Appium"""
-        if self.driver:
+        """Encerra a sessão do Appium (ou a devolve ao pool)"""
+        if self.driver and self._release_session():
+            # A sessão agora pertence ao pool
+            self.driver = None
+            logger.debug(f"Usuário {self.user_id}: Sessão devolvida ao pool")
+        elif self.driver:
             try:
                 self.driver.quit()
                 logger.debug(f"Usuário {self.user_id}: Sessão encerrada")
@@ -104,60 +196,311 @@ class VirtualUser:
                 logger.error(f"Usuário {self.user_id}: Erro ao encerrar: {e}")
         
         self.is_active = False
+        self.metadata.clear()
+        self._flush_element_cache()
+    
+    def _flush_element_cache(self):
+        """Descarta os handles da sessão encerrada e registra os contadores do cache"""
+        if self.element_cache is None:
+            return
+        
+        self.element_cache.clear()
+        counters = self.element_cache.take_counters()
+        if self.metrics_collector and (counters['hits'] or counters['misses']):
+            self.metrics_collector.record_element_cache(
+                user_id=self.user_id,
+                platform=self.platform,
+                **counters
+            )
+    
+    def abort(self):
+        """
+        Hard stop: cancela o cenário em andamento e encerra a sessão
+        
+        Chamado de outra thread; comandos em andamento na sessão encerrada
+        falham e o cenário é registrado como cancelado.
+        """
+        self.cancel_event.set()
+        driver, self.driver = self.driver, None
+        self.is_active = False
+        
+        if driver:
+            try:
+                driver.quit()
+                logger.debug(f"Usuário {self.user_id}: Sessão encerrada pelo hard stop")
+            except Exception as e:
+                logger.error(f"Usuário {self.user_id}: Erro ao encerrar: {e}")
+    
+    def retire(self):
+        """Pede que o usuário encerre após a iteração em andamento (ramp-down)"""
+        self.retired = True
+        logger.debug(f"Usuário {self.user_id}: Aposentado")
+    
+    @property
+    def session_lost(self) -> bool:
+        """Se a sessão caiu e precisa ser recriada antes da próxima iteração"""
+        return self.session_lost_at is not None
+    
+    def _check_session(self, error: Optional[BaseException]):
+        """Watchdog: separa erros que derrubam a sessão dos erros do cenário"""
+        if self.health is None:
+            return
+        if error is None:
+            if self.breaker:
+                self.breaker.record_success(self.device)
+            return
+        if not self.health.is_fatal(error):
+            return
+        
+        logger.warning(f"Usuário {self.user_id}: Sessão perdida, será recriada: {error}")
+        self.session_lost_at = time.monotonic()
+        self.session_error = str(error)
+        if self.breaker:
+            self.breaker.record_failure(self.device)
+    
+    def _forget_session(self):
+        """Esquece a sessão perdida (não volta ao pool) e o estado ligado a ela"""
+        self.driver = None
+        self.is_active = False
+        self.metadata.clear()
+        self._flush_element_cache()
+    
+    def _recovering(self, deadline: float) -> bool:
+        """Se ainda vale tentar recriar a sessão (teste em andamento e usuário ativo)"""
+        return not self.cancel_event.is_set() and not self.retired and time.monotonic() < deadline
+    
+    def _circuit_wait(self) -> float:
+        """Espera pelo circuito do device (0 = pode tentar agora)"""
+        return self.breaker.wait_time(self.device) if self.breaker else 0.0
+    
+    def _record_session_loss(self, attempts: int, recovered: bool):
+        """Registra o tempo sem sessão e encerra o estado de sessão perdida"""
+        downtime = time.monotonic() - self.session_lost_at
+        if recovered:
+            logger.info(f"Usuário {self.user_id}: Sessão recriada após {downtime:.1f}s ({attempts} tentativa(s))")
+        else:
+            logger.warning(f"Usuário {self.user_id}: Sessão não recriada ({attempts} tentativa(s))")
+        
+        if self.metrics_collector:
+            self.metrics_collector.record_session_loss(
+                user_id=self.user_id,
+                platform=self.platform,
+                device=self.device,
+                error=self.session_error,
+                downtime=downtime,
+                attempts=attempts,
+                recovered=recovered
+            )
+        self.session_lost_at = None
+        self.session_error = None
+    
+    def recover_session(self, deadline: float) -> bool:
+        """
+        Recria a sessão perdida com backoff, respeitando o circuito do device
+        
+        Args:
+            deadline: Desiste no fim do teste (time.monotonic)
+        
+        Returns:
+            True se a nova sessão está pronta
+        """
+        driver = self.driver
+        self._forget_session()
+        if driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        
+        attempts = 0
+        while self._recovering(deadline):
+            wait = self._circuit_wait()
+            if wait > 0:
+                self.cancel_event.wait(min(wait, max(0.0, deadline - time.monotonic())))
+                continue
+            
+            attempts += 1
+            started = time.monotonic()
+            try:
+                self.driver = self._create_driver()
+            except Exception as e:
+                logger.warning(f"Usuário {self.user_id}: Falha ao recriar sessão (tentativa {attempts}): {e}")
+                if self.breaker:
+                    self.breaker.record_failure(self.device)
+                delay = self.health.delay(attempts - 1, self.rng)
+                self.cancel_event.wait(min(delay, max(0.0, deadline - time.monotonic())))
+                continue
+            
+            self._record_session("new", time.monotonic() - started)
+            if self.breaker:
+                self.breaker.record_success(self.device)
+            self.is_active = True
+            self._record_session_loss(attempts, True)
+            return True
+        
+        self._record_session_loss(attempts, False)
+        return False
     
     def _select_scenario(self) -> Scenario:
         """Seleciona um cenário baseado nos pesos"""
-        if not self.scenarios:
-            raise ValueError("Nenhum cenário configurado")
-        
-        # Seleção ponderada
-        scenarios_list = [s[0] for s in self.scenarios]
-        weights = [s[1] for s in self.scenarios]
+        if self.mix is None:
+            if not self.scenarios:
+                raise ValueError("Nenhum cenário configurado")
+            self.mix = ScenarioMix(self.scenarios)
         
-        return random.choices(scenarios_list, weights=weights)[0]
+        return self.mix.select(self.rng)
     
-    def execute_scenario(self):
+    def execute_scenario(self, paced: bool = True):
         """
         Executa um cenário aleatório (baseado em pesos)
+        
+        Args:
+            paced: Aguarda o pacing do cenário ao final da iteração (o
+                executor de taxa de chegada define o próprio ritmo)
         """
         if not self.is_active or not self.driver:
             logger.warning(f"Usuário {self.user_id}: Tentativa de executar sem sessão ativa")
             return
         
         scenario = self._select_scenario()
+        run = ScenarioRun()
         
         try:
             logger.debug(f"Usuário {self.user_id}: Executando cenário '{scenario.name}'")
-            start_time = time.time()
-            
-            scenario.execute(self.driver, self.platform)
             
-            elapsed_time = time.time() - start_time
-            self.actions_executed += 1
-            
-            # Coletar métrica de tempo de execução
-            if self.metrics_collector:
-                self.metrics_collector.record_action(
-                    user_id=self.user_id,
-                    scenario=scenario.name,
-                    duration=elapsed_time,
-                    success=True
-                )
-            
-            logger.debug(f"Usuário {self.user_id}: Cenário '{scenario.name}' executado em {elapsed_time:.2f}s")
+            # Think time fica fora da duração medida
+            scenario.execute(
+                self.driver, self.platform, self.cancel_event, run, self.element_cache, self.metadata,
+                variables=scenario.next_variables(self.user_id, self.rng), rng=self.rng
+            )
+            self._record_success(scenario, run.elapsed)
+            self._check_session(None)
             
         except Exception as e:
-            logger.error(f"Usuário {self.user_id}: Erro ao executar cenário '{scenario.name}': {e}")
-            self.errors += 1
-            
-            if self.metrics_collector:
-                self.metrics_collector.record_action(
-                    user_id=self.user_id,
-                    scenario=scenario.name,
-                    duration=0,
-                    success=False,
-                    error=str(e)
-                )
+            if isinstance(e, ScenarioCancelled) or self.cancel_event.is_set():
+                self._record_cancelled(scenario)
+            else:
+                self._record_failure(scenario, e, run.elapsed)
+                self._check_session(e)
+        
+        self._record_timings(scenario, run)
+        
+        if paced:
+            self.cancel_event.wait(self._pacing_delay(scenario, run.started))
+    
+    def _pacing_delay(self, scenario: Scenario, start_time: float) -> float:
+        """
+        Espera até o início da próxima iteração pelo pacing do cenário
+        
+        Args:
+            scenario: Cenário executado
+            start_time: Início da iteração (time.monotonic)
+        
+        Returns:
+            Segundos a aguardar (nunca além do fim do teste)
+        """
+        if not scenario.pacing:
+            return 0.0
+        
+        now = time.monotonic()
+        delay = scenario.pacing - (now - start_time)
+        if self.deadline is not None:
+            delay = min(delay, self.deadline - now)
+        return max(0.0, delay)
+    
+    def _overtime(self, finished: Optional[float] = None) -> bool:
+        """
+        Se o resultado terminou depois do fim do teste (fica fora das estatísticas)
+        
+        Args:
+            finished: Fim do resultado (time.monotonic; padrão: agora)
+        """
+        if finished is None:
+            finished = time.monotonic()
+        return self.deadline is not None and finished > self.deadline
+    
+    def _record_success(self, scenario: Scenario, elapsed_time: float):
+        """Registra a execução bem-sucedida de um cenário"""
+        self.actions_executed += 1
+        
+        # Coletar métrica de tempo de execução
+        if self.metrics_collector:
+            self.metrics_collector.record_action(
+                user_id=self.user_id,
+                scenario=scenario.name,
+                duration=elapsed_time,
+                success=True,
+                platform=self.platform,
+                overtime=self._overtime()
+            )
+        
+        logger.debug(f"Usuário {self.user_id}: Cenário '{scenario.name}' executado em {elapsed_time:.2f}s")
+    
+    def _record_failure(self, scenario: Scenario, error: Exception, elapsed_time: float):
+        """Registra a falha de um cenário com o tempo decorrido até a falha"""
+        logger.error(f"Usuário {self.user_id}: Erro ao executar cenário '{scenario.name}': {error}")
+        self.errors += 1
+        
+        if self.metrics_collector:
+            self.metrics_collector.record_action(
+                user_id=self.user_id,
+                scenario=scenario.name,
+                duration=elapsed_time,
+                success=False,
+                error=str(error),
+                platform=self.platform,
+                overtime=self._overtime()
+            )
+    
+    def _record_timings(self, scenario: Scenario, run: ScenarioRun):
+        """Registra os tempos por ação e por transação de uma execução"""
+        if not self.metrics_collector:
+            return
+        
+        for step in run.steps:
+            self.metrics_collector.record_step(
+                user_id=self.user_id,
+                scenario=scenario.name,
+                step=step['step'],
+                action=step['action'],
+                duration=step['duration'],
+                lookup=step['lookup'],
+                poll_wait=step['poll_wait'],
+                retries=step['retries'],
+                retry_time=step['retry_time'],
+                success=step['success'],
+                error=step['error'],
+                platform=self.platform,
+                overtime=self._overtime(step['finished'])
+            )
+        
+        for transaction in run.transactions:
+            self.metrics_collector.record_transaction(
+                user_id=self.user_id,
+                scenario=scenario.name,
+                name=transaction['name'],
+                duration=transaction['duration'],
+                success=transaction['success'],
+                error=transaction['error'],
+                platform=self.platform,
+                overtime=self._overtime(transaction['finished'])
+            )
+    
+    def _record_cancelled(self, scenario: Scenario):
+        """Registra um cenário interrompido pelo hard stop (fora das estatísticas)"""
+        logger.warning(f"Usuário {self.user_id}: Cenário '{scenario.name}' cancelado pelo hard stop")
+        
+        if self.metrics_collector:
+            self.metrics_collector.record_action(
+                user_id=self.user_id,
+                scenario=scenario.name,
+                duration=0,
+                success=False,
+                error="cancelado pelo hard stop",
+                platform=self.platform,
+                overtime=True,
+                cancelled=True
+            )
     
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas do usuário"""
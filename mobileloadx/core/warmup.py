@@ -0,0 +1,196 @@
+"""
+Fase de warm-up: criação das sessões antes do início da medição
+
+As sessões são criadas em paralelo, com limite de concorrência para não
+sobrecarregar o servidor Appium, e cada falha é repetida com backoff
+exponencial e jitter. O teste só começa (e o MetricsCollector só começa a
+contar) quando o número mínimo de sessões está pronto.
+"""
+
+import asyncio
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional
+
+from .backoff import ExponentialBackoff
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupError(Exception):
+    """Warm-up terminou com menos sessões prontas que o mínimo exigido"""
+
+
+@dataclass
+class WarmupConfig(ExponentialBackoff):
+    """Configuração da fase de warm-up (backoff, max_backoff e jitter em ExponentialBackoff)"""
+    concurrency: int = 4  # sessões criadas ao mesmo tempo
+    retries: int = 2  # novas tentativas por sessão após a primeira falha
+    min_ready: Optional[int] = None  # sessões prontas exigidas; None = todas
+    timeout: Optional[float] = None  # duração máxima do warm-up (segundos)
+    
+    def __post_init__(self):
+        super().__post_init__()
+        if self.concurrency < 1:
+            raise ValueError(f"Concorrência de warm-up inválida: {self.concurrency}")
+        if self.retries < 0:
+            raise ValueError(f"Número de tentativas inválido: {self.retries}")
+    
+    def scaled(self, fraction: float) -> "WarmupConfig":
+        """Retorna uma cópia com min_ready proporcional (usado nos shards)"""
+        min_ready = None if self.min_ready is None else round(self.min_ready * fraction)
+        return WarmupConfig(**dict(vars(self), min_ready=min_ready))
+
+
+class _Progress:
+    """Contagem de sessões prontas compartilhada entre as tentativas"""
+    
+    def __init__(self, required: int, deadline: Optional[float]):
+        self.required = required
+        self.deadline = deadline
+        self.ready = 0
+        self.lock = threading.Lock()
+    
+    def done(self) -> bool:
+        """Mínimo atingido: itens ainda não iniciados são pulados"""
+        with self.lock:
+            return self.ready >= self.required
+    
+    def remaining(self) -> Optional[float]:
+        """Tempo restante até o prazo do warm-up (None = sem prazo)"""
+        return None if self.deadline is None else self.deadline - time.monotonic()
+    
+    def expired(self) -> bool:
+        """Prazo do warm-up esgotado: nenhuma tentativa nova começa"""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+    
+    def add_ready(self):
+        with self.lock:
+            self.ready += 1
+
+
+def _check(progress: _Progress, total: int, strict: bool):
+    """Valida o resultado do warm-up"""
+    logger.info(f"Warm-up concluído: {progress.ready}/{total} sessão(ões) pronta(s)")
+    if progress.ready < progress.required and strict:
+        raise WarmupError(f"Warm-up incompleto: {progress.ready}/{progress.required} sessões prontas")
+
+
+def run_warmup(
+    plan: List[Any],
+    bring_up: Callable[[Any], None],
+    config: WarmupConfig,
+    record: Callable[[Any, float, int, Optional[str]], None],
+    strict: bool = True
+) -> int:
+    """
+    Executa o warm-up em um pool de threads
+    
+    Args:
+        plan: Itens a preparar (um por sessão)
+        bring_up: Cria a sessão de um item (lança exceção em caso de falha)
+        config: Configuração do warm-up
+        record: Callback(item, duração, tentativas, erro) ao fim de cada item
+        strict: Lança WarmupError quando o mínimo não é atingido
+    
+    Returns:
+        Número de sessões prontas
+    """
+    required = len(plan) if config.min_ready is None else min(config.min_ready, len(plan))
+    deadline = time.monotonic() + config.timeout if config.timeout is not None else None
+    progress = _Progress(required, deadline)
+    
+    def prepare(item):
+        if progress.done():
+            return
+        
+        # Duração desde a primeira tentativa (inclui as novas tentativas e o backoff)
+        started = time.monotonic()
+        error = f"Prazo do warm-up esgotado ({config.timeout}s)"
+        attempts = 0
+        while attempts <= config.retries and not progress.expired():
+            attempts += 1
+            try:
+                bring_up(item)
+            except Exception as e:
+                error = str(e)
+            else:
+                progress.add_ready()
+                record(item, time.monotonic() - started, attempts, None)
+                return
+            
+            if attempts > config.retries or progress.expired():
+                break
+            
+            delay = config.delay(attempts - 1)
+            logger.warning(
+                f"Falha ao criar sessão no warm-up (tentativa {attempts}), nova tentativa em {delay:.1f}s: {error}"
+            )
+            remaining = progress.remaining()
+            time.sleep(delay if remaining is None else min(delay, remaining))
+        
+        record(item, time.monotonic() - started, attempts, error)
+    
+    if plan:
+        logger.info(f"Warm-up: criando {len(plan)} sessão(ões), {config.concurrency} por vez...")
+        with ThreadPoolExecutor(max_workers=min(config.concurrency, len(plan))) as executor:
+            list(executor.map(prepare, plan))
+    
+    _check(progress, len(plan), strict)
+    return progress.ready
+
+
+async def run_warmup_async(
+    plan: List[Any],
+    bring_up: Callable[[Any], Awaitable[None]],
+    config: WarmupConfig,
+    record: Callable[[Any, float, int, Optional[str]], None],
+    strict: bool = True
+) -> int:
+    """Versão de run_warmup para o engine asyncio (bring_up é uma corrotina)"""
+    required = len(plan) if config.min_ready is None else min(config.min_ready, len(plan))
+    deadline = time.monotonic() + config.timeout if config.timeout is not None else None
+    progress = _Progress(required, deadline)
+    semaphore = asyncio.Semaphore(config.concurrency)
+    
+    async def prepare(item):
+        async with semaphore:
+            if progress.done():
+                return
+            
+            started = time.monotonic()
+            error = f"Prazo do warm-up esgotado ({config.timeout}s)"
+            attempts = 0
+            while attempts <= config.retries and not progress.expired():
+                attempts += 1
+                try:
+                    await bring_up(item)
+                except Exception as e:
+                    error = str(e)
+                else:
+                    progress.add_ready()
+                    record(item, time.monotonic() - started, attempts, None)
+                    return
+                
+                if attempts > config.retries or progress.expired():
+                    break
+                
+                delay = config.delay(attempts - 1)
+                logger.warning(
+                    f"Falha ao criar sessão no warm-up (tentativa {attempts}), nova tentativa em {delay:.1f}s: {error}"
+                )
+                remaining = progress.remaining()
+                await asyncio.sleep(delay if remaining is None else min(delay, remaining))
+            
+            record(item, time.monotonic() - started, attempts, error)
+    
+    if plan:
+        logger.info(f"Warm-up: criando {len(plan)} sessão(ões), {config.concurrency} por vez...")
+        await asyncio.gather(*(prepare(item) for item in plan))
+    
+    _check(progress, len(plan), strict)
+    return progress.ready
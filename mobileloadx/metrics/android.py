@@ -0,0 +1,276 @@
+"""
+Métricas do device Android por um canal adb shell persistente
+
+Abrir um `adb shell` por amostra custa um processo novo e o handshake com
+o adb server a cada intervalo, e a própria coleta passa a pesar no host e
+no device. Aqui cada device tem um único `adb shell` aberto durante todo o
+teste: os comandos são escritos no stdin e a saída de cada um é lida até
+um marcador ecoado logo depois.
+
+O pid do app é resolvido uma vez (pidof) e só de novo se o processo sumir.
+A CPU do app vem da diferença de utime + stime em /proc/<pid>/stat entre
+duas amostras, dividida pela diferença do total de /proc/stat (percentual
+da capacidade do device, todos os núcleos). Memória e bateria vêm do
+dumpsys; a rede, de /proc/net/dev (todo o device, sem loopback), contada
+desde a primeira amostra.
+"""
+
+import queue
+import itertools
+import subprocess
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Linhas do App Summary do dumpsys meminfo (KB) -> campo da métrica de memória
+MEMINFO_FIELDS = {
+    "Java Heap": "heap",
+    "Native Heap": "native",
+    "Graphics": "graphics",
+    "TOTAL PSS": "total",
+    "TOTAL": "total",
+}
+
+
+class AdbShell:
+    """Um `adb shell` aberto com o device, reaproveitado por todos os comandos"""
+    
+    def __init__(self, serial: Optional[str] = None, adb: str = "adb", timeout: float = 5.0):
+        """
+        Args:
+            serial: Serial do device (None = o único device conectado)
+            adb: Executável do adb
+            timeout: Tempo máximo de cada comando (segundos)
+        """
+        self.command = [adb] + (["-s", serial] if serial else []) + ["shell"]
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.lines: Optional[queue.Queue] = None
+        self.lock = threading.Lock()
+        self.markers = itertools.count()
+        self.starts = 0
+    
+    def _open(self):
+        """Inicia o adb shell e a thread que lê a sua saída"""
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self.starts += 1
+        self.lines = queue.Queue()
+        threading.Thread(target=_pump, args=(self.process.stdout, self.lines), daemon=True).start()
+        logger.debug(f"adb shell aberto: {' '.join(self.command)}")
+    
+    def run(self, command: str) -> str:
+        """
+        Executa um comando no shell do device
+        
+        Returns:
+            Saída do comando (stdout)
+        
+        Raises:
+            FileNotFoundError: adb não encontrado
+            ConnectionError: adb shell encerrado (device desconectado)
+            TimeoutError: Comando sem resposta em timeout segundos
+        """
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self._open()
+            
+            marker = f"__mobileloadx_{next(self.markers)}__"
+            try:
+                self.process.stdin.write(f"{command}; echo {marker}\n")
+                self.process.stdin.flush()
+            except OSError as e:
+                self._close()
+                raise ConnectionError(f"adb shell encerrado: {e}") from e
+            
+            output: List[str] = []
+            deadline = time.monotonic() + self.timeout
+            while True:
+                try:
+                    line = self.lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # Saída atrasada chegaria no próximo comando: descarta o canal
+                    self._close()
+                    raise TimeoutError(f"adb shell sem resposta em {self.timeout}s: {command}")
+                if line is None:
+                    self._close()
+                    raise ConnectionError("adb shell encerrado")
+                
+                text = line.rstrip("\r\n")
+                if text.endswith(marker):
+                    output.append(text[:-len(marker)])
+                    return "\n".join(output).strip("\n")
+                output.append(text)
+    
+    def _close(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+    
+    def close(self):
+        """Encerra o adb shell"""
+        with self.lock:
+            self._close()
+
+
+def _pump(stdout, lines: queue.Queue):
+    """Repassa as linhas do adb shell para a fila (None = fim da saída)"""
+    for line in stdout:
+        lines.put(line)
+    lines.put(None)
+
+
+def parse_pid(output: str) -> Optional[int]:
+    """Primeiro pid da saída do pidof (None se o app não está rodando)"""
+    for token in output.split():
+        if token.isdigit():
+            return int(token)
+    return None
+
+
+def parse_cpu_ticks(output: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Ticks de CPU do processo e do device
+    
+    Args:
+        output: Saída de `cat /proc/<pid>/stat; head -n 1 /proc/stat`
+    
+    Returns:
+        (utime + stime do processo, total do device); None no que faltar
+    """
+    process = total = None
+    for line in output.splitlines():
+        if line.startswith("cpu "):
+            total = sum(int(value) for value in line.split()[1:9])
+        elif ")" in line:
+            # O nome do processo (entre parênteses) pode conter espaços
+            fields = line.rsplit(")", 1)[1].split()
+            process = int(fields[11]) + int(fields[12])
+    return process, total
+
+
+def parse_meminfo(output: str) -> Optional[Dict[str, float]]:
+    """Memória do app em MB pelo App Summary do dumpsys meminfo"""
+    memory: Dict[str, float] = {}
+    for line in output.splitlines():
+        label, _, values = line.strip().partition(":")
+        field = MEMINFO_FIELDS.get(label)
+        if field is None or field in memory or not values.split():
+            continue
+        value = values.split()[0]
+        if value.isdigit():
+            memory[field] = int(value) / 1024
+    return memory if "total" in memory else None
+
+
+def parse_battery(output: str) -> Optional[Dict[str, Any]]:
+    """Nível (%), temperatura (°C) e tensão (mV) pelo dumpsys battery"""
+    values = {}
+    for line in output.splitlines():
+        key, _, value = line.strip().partition(":")
+        if key in ("level", "temperature", "voltage") and value.strip().lstrip("-").isdigit():
+            values[key] = int(value)
+    if "level" not in values:
+        return None
+    if "temperature" in values:
+        values["temperature"] = values["temperature"] / 10  # décimos de grau
+    return values
+
+
+def parse_net_dev(output: str) -> Dict[str, int]:
+    """Bytes e pacotes recebidos e enviados pelas interfaces (sem loopback) em /proc/net/dev"""
+    totals = {"rx_bytes": 0, "tx_bytes": 0, "rx_packets": 0, "tx_packets": 0}
+    for line in output.splitlines():
+        interface, separator, counters = line.partition(":")
+        fields = counters.split()
+        if not separator or interface.strip() == "lo" or len(fields) < 10 or not fields[0].isdigit():
+            continue
+        totals["rx_bytes"] += int(fields[0])
+        totals["rx_packets"] += int(fields[1])
+        totals["tx_bytes"] += int(fields[8])
+        totals["tx_packets"] += int(fields[9])
+    return totals
+
+
+class AndroidProbe:
+    """Coleta as métricas de um device Android pelo seu adb shell"""
+    
+    def __init__(self, serial: Optional[str] = None, package: Optional[str] = None, adb: str = "adb"):
+        """
+        Args:
+            serial: Serial do device (None = o único device conectado)
+            package: Package do app (CPU e memória; None = só bateria e rede)
+            adb: Executável do adb
+        """
+        self.serial = serial
+        self.package = package
+        self.shell = AdbShell(serial, adb)
+        self.pid: Optional[int] = None
+        self.last_ticks: Optional[Tuple[int, int]] = None
+        self.network_baseline: Optional[Dict[str, int]] = None
+    
+    def _resolve_pid(self) -> Optional[int]:
+        """pid do app (resolvido uma vez; de novo só depois que o processo some)"""
+        if self.pid is None and self.package:
+            self.pid = parse_pid(self.shell.run(f"pidof {self.package}"))
+            if self.pid is not None:
+                logger.debug(f"Device {self.serial or '(padrão)'}: {self.package} com pid {self.pid}")
+        return self.pid
+    
+    def cpu(self) -> Optional[float]:
+        """Uso de CPU do app desde a amostra anterior (% da capacidade do device; None na primeira)"""
+        pid = self._resolve_pid()
+        if pid is None:
+            return None
+        
+        process, total = parse_cpu_ticks(self.shell.run(f"cat /proc/{pid}/stat; head -n 1 /proc/stat"))
+        if process is None or total is None:
+            # O app reiniciou ou foi encerrado: novo pid na próxima amostra
+            self.pid = None
+            self.last_ticks = None
+            return None
+        
+        previous, self.last_ticks = self.last_ticks, (process, total)
+        if previous is None or total <= previous[1]:
+            return None
+        return max(0.0, (process - previous[0]) / (total - previous[1]) * 100)
+    
+    def memory(self) -> Optional[Dict[str, float]]:
+        """Memória do app em MB (total, heap, native e graphics)"""
+        pid = self._resolve_pid()
+        if pid is None:
+            return None
+        return parse_meminfo(self.shell.run(f"dumpsys meminfo {pid}"))
+    
+    def battery(self) -> Optional[Dict[str, Any]]:
+        """Nível, temperatura e tensão da bateria"""
+        return parse_battery(self.shell.run("dumpsys battery"))
+    
+    def network(self) -> Dict[str, int]:
+        """Tráfego do device desde a primeira amostra"""
+        totals = parse_net_dev(self.shell.run("cat /proc/net/dev"))
+        if self.network_baseline is None:
+            self.network_baseline = totals
+        return {key: value - self.network_baseline[key] for key, value in totals.items()}
+    
+    def close(self):
+        """Encerra o adb shell do device"""
+        self.shell.close()
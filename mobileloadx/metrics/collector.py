@@ -3,175 +3,220 @@ Coletor de métricas do device (CPU, memória, bateria, etc)
 """
 
 import time
-import subprocess
 import threading
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from collections import defaultdict
 from datetime import datetime
 
+from .android import AndroidProbe
+
 logger = logging.getLogger(__name__)
 
+# Métricas de device aceitas em collect
+DEVICE_METRICS = ("cpu", "memory", "battery", "network", "fps")
+
+# Métricas coletadas quando collect não é informado
+DEFAULT_DEVICE_METRICS = ("cpu", "memory", "battery", "network")
+
+# Tipos de registro; cada um é guardado em self.<tipo>_metrics
+RECORD_KINDS = (
+    "device", "action", "step", "transaction", "iteration", "device_wait",
+    "session", "element_cache", "warmup", "drain", "session_loss", "circuit",
+)
+
 
 class MetricsCollector:
     """
     Coleta métricas de performance do device durante o teste
     """
     
-    def __init__(self, interval: float = 1.0):
+    def __init__(
+        self,
+        interval: float = 1.0,
+        collect: Optional[List[str]] = None,
+        devices: Optional[List[str]] = None,
+        package: Optional[str] = None,
+        adb: str = "adb"
+    ):
         """
         Args:
             interval: Intervalo de coleta em segundos
+            collect: Métricas do device coletadas (padrão: cpu, memory,
+                battery e network; lista vazia desliga a coleta)
+            devices: Seriais dos devices Android (None = o único conectado ao adb)
+            package: Package do app (CPU e memória do processo)
+            adb: Executável do adb
         """
+        unknown = [metric for metric in collect or [] if metric not in DEVICE_METRICS]
+        if unknown:
+            raise ValueError(f"Métricas de device desconhecidas: {unknown} (use {list(DEVICE_METRICS)})")
+        
         self.interval = interval
+        self.collect = list(collect) if collect is not None else list(DEFAULT_DEVICE_METRICS)
+        self.devices = list(devices or [])
+        self.package = package
+        self.adb = adb
         self.is_collecting = False
         self.collection_thread = None
+        self._stop_event = threading.Event()
+        # Um adb shell persistente por device (ver android.AndroidProbe)
+        self.probes: Dict[Optional[str], AndroidProbe] = {}
+        self._adb_missing = False
         
         # Armazenamento de métricas
         self.device_metrics: List[Dict[str, Any]] = []
         self.action_metrics: List[Dict[str, Any]] = []
+        self.step_metrics: List[Dict[str, Any]] = []
+        self.transaction_metrics: List[Dict[str, Any]] = []
+        self.iteration_metrics: List[Dict[str, Any]] = []
+        self.device_wait_metrics: List[Dict[str, Any]] = []
+        self.session_metrics: List[Dict[str, Any]] = []
+        self.element_cache_metrics: List[Dict[str, Any]] = []
+        self.warmup_metrics: List[Dict[str, Any]] = []
+        self.drain_metrics: List[Dict[str, Any]] = []
+        self.session_loss_metrics: List[Dict[str, Any]] = []
+        self.circuit_metrics: List[Dict[str, Any]] = []
         
         # Lock para thread-safety
         self.lock = threading.Lock()
+        
+        # Callbacks notificados a cada novo registro: callback(kind, record)
+        self.listeners: List[Callable[[str, Dict[str, Any]], None]] = []
     
     def start(self):
         """Inicia a coleta de métricas"""
         if self.is_collecting:
             logger.warning("Coletor já está ativo")
             return
+        if not self.collect:
+            logger.debug("Nenhuma métrica de device configurada")
+            return
         
         logger.info("Iniciando coleta de métricas")
         self.is_collecting = True
+        self._stop_event.clear()
         self.collection_thread = threading.Thread(target=self._collect_loop, daemon=True)
         self.collection_thread.start()
     
     def stop(self):
-        """Para a coleta de métricas"""
+        """Para a coleta de métricas e encerra os adb shells"""
         logger.info("Parando coleta de métricas")
         self.is_collecting = False
+        self._stop_event.set()
         
         if self.collection_thread:
             self.collection_thread.join(timeout=5)
+        
+        for probe in self.probes.values():
+            probe.close()
+        self.probes.clear()
     
     def _collect_loop(self):
-        """Loop principal de coleta"""
+        """Loop principal de coleta (uma amostra por device a cada intervalo)"""
         while self.is_collecting:
-            try:
-                metrics = self._collect_device_metrics()
-                
-                with self.lock:
-                    self.device_metrics.append(metrics)
-                
-            except Exception as e:
-                logger.error(f"Erro ao coletar métricas: {e}")
+            for device in self.devices or [None]:
+                try:
+                    metrics = self._collect_device_metrics(device)
+                    
+                    with self.lock:
+                        self.device_metrics.append(metrics)
+                    self._notify("device", metrics)
+                    
+                except Exception as e:
+                    logger.error(f"Erro ao coletar métricas: {e}")
             
-            time.sleep(self.interval)
+            # Acorda imediatamente em stop(), sem esperar o intervalo terminar
+            self._stop_event.wait(self.interval)
     
-    def _collect_device_metrics(self) -> Dict[str, Any]:
+    def _collect_device_metrics(self, device: Optional[str] = None) -> Dict[str, Any]:
         """
-        Coleta métricas do device conforme configurado em self.collect.
-
-        Nota: Implementação simplificada. Em produção, usar ferramentas
-        específicas como adb para Android e Instruments para iOS.
-        FPS está planejado (não implementado).
+        Coleta métricas do device conforme configurado em self.collect
+        
+        Métricas que falham ficam None na amostra. FPS está planejado (não
+        implementado) e iOS não é suportado.
+        
+        Args:
+            device: Serial do device (None = o único conectado ao adb)
         """
         timestamp = datetime.now()
         metrics = {"timestamp": timestamp.isoformat()}
-
+        if device is not None:
+            metrics["device"] = device
+        
         if "cpu" in self.collect:
-            metrics["cpu"] = self._get_cpu_usage()
+            metrics["cpu"] = self._get_cpu_usage(device)
         if "memory" in self.collect:
-            metrics["memory"] = self._get_memory_usage()
+            metrics["memory"] = self._get_memory_usage(device)
         if "battery" in self.collect:
-            metrics["battery"] = self._get_battery_info()
+            metrics["battery"] = self._get_battery_info(device)
         if "network" in self.collect:
-            metrics["network"] = self._get_network_stats()
+            metrics["network"] = self._get_network_stats(device)
         if "fps" in self.collect:
             # FPS: planejado (coleta via adb/iOS ainda não implementada)
             metrics["fps"] = None
 
         return metrics
     
-    def _get_cpu_usage(self) -> Optional[float]:
+    def _probe_metric(self, name: str, device: Optional[str], read: Callable[[AndroidProbe], Any]) -> Any:
         """
-        Obtém uso de CPU do app
+        Lê uma métrica pelo adb shell do device
         
-        Android: adb shell dumpsys cpuinfo | grep <package>
-        iOS: instruments -t 'Time Profiler'
+        Returns:
+            Valor da métrica ou None se a leitura falhou (sem adb, device
+            desconectado, app fora do ar...)
         """
+        if self._adb_missing:
+            return None
+        
+        probe = self.probes.get(device)
+        if probe is None:
+            probe = self.probes[device] = AndroidProbe(device, self.package, self.adb)
+        
         try:
-            # Exemplo simplificado para Android
-            # Em produção, precisa do package name e parsing adequado
-            result = subprocess.run(
-                ['adb', 'shell', 'dumpsys', 'cpuinfo'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            
-            # Parse básico (precisa ser melhorado)
-            # Retorna um valor simulado para demonstração
-            return 45.5
-            
+            return read(probe)
+        except FileNotFoundError:
+            self._adb_missing = True
+            logger.warning(f"adb não encontrado ({self.adb}): métricas do device desativadas")
         except Exception as e:
-            logger.debug(f"Erro ao coletar CPU: {e}")
-            return None
+            logger.debug(f"Erro ao coletar {name} do device {device or '(padrão)'}: {e}")
+        return None
     
-    def _get_memory_usage(self) -> Optional[Dict[str, float]]:
+    def _get_cpu_usage(self, device: Optional[str] = None) -> Optional[float]:
         """
-        Obtém uso de memória do app
+        Obtém uso de CPU do app (% da capacidade do device desde a amostra anterior)
         
-        Android: adb shell dumpsys meminfo <package>
-        iOS: instruments -t 'Allocations'
+        Android: /proc/<pid>/stat e /proc/stat pelo adb shell do device
         """
-        try:
-            # Exemplo simplificado
-            return {
-                "total": 250.5,  # MB
-                "heap": 150.2,
-                "native": 80.3,
-                "graphics": 20.0
-            }
-        except Exception as e:
-            logger.debug(f"Erro ao coletar memória: {e}")
+        if not self.package:
             return None
+        return self._probe_metric("CPU", device, AndroidProbe.cpu)
     
-    def _get_battery_info(self) -> Optional[Dict[str, Any]]:
+    def _get_memory_usage(self, device: Optional[str] = None) -> Optional[Dict[str, float]]:
         """
-        Obtém informações de bateria
+        Obtém uso de memória do app (MB: total, heap, native e graphics)
         
-        Android: adb shell dumpsys battery
-        iOS: Acesso via IOKit framework
+        Android: dumpsys meminfo <pid>
         """
-        try:
-            # Exemplo simplificado
-            return {
-                "level": 85,  # %
-                "temperature": 32.5,  # °C
-                "voltage": 3850  # mV
-            }
-        except Exception as e:
-            logger.debug(f"Erro ao coletar bateria: {e}")
+        if not self.package:
             return None
+        return self._probe_metric("memória", device, AndroidProbe.memory)
     
-    def _get_network_stats(self) -> Optional[Dict[str, int]]:
+    def _get_battery_info(self, device: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
-        Obtém estatísticas de rede
+        Obtém informações de bateria (nível, temperatura e tensão)
         
-        Android: adb shell cat /proc/net/xt_qtaguid/stats
-        iOS: Network Link Conditioner
+        Android: dumpsys battery
         """
-        try:
-            # Exemplo simplificado
-            return {
-                "rx_bytes": 1024000,  # bytes recebidos
-                "tx_bytes": 512000,   # bytes enviados
-                "rx_packets": 1500,
-                "tx_packets": 800
-            }
-        except Exception as e:
-            logger.debug(f"Erro ao coletar rede: {e}")
-            return None
+        return self._probe_metric("bateria", device, AndroidProbe.battery)
+    
+    def _get_network_stats(self, device: Optional[str] = None) -> Optional[Dict[str, int]]:
+        """
+        Obtém estatísticas de rede do device desde a primeira amostra
+        
+        Android: /proc/net/dev (sem loopback)
+        """
+        return self._probe_metric("rede", device, AndroidProbe.network)
     
     def record_action(
         self,
@@ -179,7 +224,10 @@ class MetricsCollector:
         scenario: str,
         duration: float,
         success: bool,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        platform: Optional[str] = None,
+        overtime: bool = False,
+        cancelled: bool = False
     ):
         """
         Registra métrica de uma ação executada
@@ -190,16 +238,389 @@ class MetricsCollector:
             duration: Duração da execução (segundos)
             success: Se foi bem-sucedida
             error: Mensagem de erro (se houver)
+            platform: Plataforma do usuário virtual (android/ios)
+            overtime: Terminou depois do fim do teste (fica fora das estatísticas)
+            cancelled: Interrompida pelo hard stop
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "scenario": scenario,
+            "duration": duration,
+            "success": success,
+            "error": error,
+            "platform": platform,
+            "overtime": overtime,
+            "cancelled": cancelled
+        }
+        
+        with self.lock:
+            self.action_metrics.append(record)
+        self._notify("action", record)
+    
+    def record_step(
+        self,
+        user_id: int,
+        scenario: str,
+        step: int,
+        action: str,
+        duration: float,
+        lookup: float,
+        success: bool,
+        error: Optional[str] = None,
+        platform: Optional[str] = None,
+        overtime: bool = False,
+        poll_wait: float = 0.0,
+        retries: int = 0,
+        retry_time: float = 0.0
+    ):
+        """
+        Registra o tempo de uma ação individual do cenário
+        
+        Args:
+            user_id: ID do usuário virtual
+            scenario: Nome do cenário
+            step: Posição da ação no cenário (1 = primeira)
+            action: Nome da ação (tipo e locator, ou o 'name' da ação)
+            duration: Duração total da ação (segundos)
+            lookup: Parte da duração gasta buscando o elemento (segundos)
+            success: Se foi bem-sucedida
+            error: Mensagem de erro (se houver)
+            platform: Plataforma do usuário virtual
+            overtime: Terminou depois do fim do teste (fica fora das estatísticas)
+            poll_wait: Parte da busca parada entre tentativas de encontrar o
+                elemento (espera do polling, não latência do app)
+            retries: Tentativas que falharam antes desta (política de falha)
+            retry_time: Tempo gasto nas tentativas que falharam e nas esperas
+                entre elas (fora de duration)
         """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "scenario": scenario,
+            "step": step,
+            "action": action,
+            "duration": duration,
+            "lookup": lookup,
+            "interaction": duration - lookup,
+            "poll_wait": poll_wait,
+            "retries": retries,
+            "retry_time": retry_time,
+            "success": success,
+            "error": error,
+            "platform": platform,
+            "overtime": overtime
+        }
+        
         with self.lock:
-            self.action_metrics.append({
-                "timestamp": datetime.now().isoformat(),
-                "user_id": user_id,
-                "scenario": scenario,
-                "duration": duration,
-                "success": success,
-                "error": error
-            })
+            self.step_metrics.append(record)
+        self._notify("step", record)
+    
+    def record_transaction(
+        self,
+        user_id: int,
+        scenario: str,
+        name: str,
+        duration: float,
+        success: bool,
+        error: Optional[str] = None,
+        platform: Optional[str] = None,
+        overtime: bool = False
+    ):
+        """
+        Registra uma transação (grupo de ações entre transaction_start e transaction_end)
+        
+        Args:
+            user_id: ID do usuário virtual
+            scenario: Nome do cenário
+            name: Nome da transação
+            duration: Duração sem o think time (segundos)
+            success: Se todas as ações da transação foram bem-sucedidas
+            error: Mensagem de erro (se houver)
+            platform: Plataforma do usuário virtual
+            overtime: Terminou depois do fim do teste (fica fora das estatísticas)
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "scenario": scenario,
+            "name": name,
+            "duration": duration,
+            "success": success,
+            "error": error,
+            "platform": platform,
+            "overtime": overtime
+        }
+        
+        with self.lock:
+            self.transaction_metrics.append(record)
+        self._notify("transaction", record)
+    
+    def record_iteration(
+        self,
+        user_id: Optional[int],
+        status: str,
+        lag: float,
+        platform: Optional[str] = None
+    ):
+        """
+        Registra o início de uma iteração agendada (executores de taxa de chegada)
+        
+        Args:
+            user_id: ID do usuário virtual (None se a iteração foi descartada)
+            status: "on_time", "late" ou "dropped"
+            lag: Atraso em relação ao horário agendado (segundos)
+            platform: Plataforma do usuário virtual
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "status": status,
+            "lag": lag,
+            "platform": platform
+        }
+        
+        with self.lock:
+            self.iteration_metrics.append(record)
+        self._notify("iteration", record)
+    
+    def record_device_wait(
+        self,
+        user_id: int,
+        platform: str,
+        device: Optional[str],
+        wait: float,
+        acquired: bool
+    ):
+        """
+        Registra quanto tempo um usuário esperou por um device livre
+        
+        Args:
+            user_id: ID do usuário virtual
+            platform: Plataforma do usuário virtual
+            device: Device emprestado (None se não conseguiu)
+            wait: Tempo de espera (segundos)
+            acquired: Se o device foi obtido dentro do prazo
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "platform": platform,
+            "device": device,
+            "wait": wait,
+            "acquired": acquired
+        }
+        
+        with self.lock:
+            self.device_wait_metrics.append(record)
+        self._notify("device_wait", record)
+    
+    def record_session(
+        self,
+        user_id: int,
+        platform: str,
+        device: Optional[str],
+        source: str,
+        duration: float
+    ):
+        """
+        Registra a obtenção de uma sessão Appium
+        
+        Args:
+            user_id: ID do usuário virtual
+            platform: Plataforma da sessão
+            device: Device da sessão
+            source: "hit" (reaproveitada do pool), "miss" (pool vazio)
+                ou "new" (sem pool)
+            duration: Tempo de criação da sessão (segundos; 0 para "hit")
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "platform": platform,
+            "device": device,
+            "source": source,
+            "duration": duration
+        }
+        
+        with self.lock:
+            self.session_metrics.append(record)
+        self._notify("session", record)
+    
+    def record_element_cache(self, user_id: int, platform: str, hits: int, misses: int, stale: int):
+        """
+        Registra os contadores do cache de elementos de uma sessão encerrada
+        
+        Args:
+            user_id: ID do usuário virtual
+            platform: Plataforma da sessão
+            hits: Buscas atendidas pelo cache
+            misses: Buscas feitas no Appium
+            stale: Hits cujo handle expirou e foi buscado de novo
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "platform": platform,
+            "hits": hits,
+            "misses": misses,
+            "stale": stale
+        }
+        
+        with self.lock:
+            self.element_cache_metrics.append(record)
+        self._notify("element_cache", record)
+    
+    def record_warmup(
+        self,
+        platform: str,
+        device: Optional[str],
+        duration: float,
+        attempts: int,
+        error: Optional[str] = None
+    ):
+        """
+        Registra a criação de uma sessão na fase de warm-up (fora da medição)
+        
+        Args:
+            platform: Plataforma da sessão
+            device: Device da sessão
+            duration: Tempo da última tentativa (segundos)
+            attempts: Número de tentativas
+            error: Erro da última tentativa (None se a sessão ficou pronta)
+        """
+        finished = time.time()
+        record = {
+            "timestamp": datetime.fromtimestamp(finished).isoformat(),
+            "started": finished - duration,
+            "finished": finished,
+            "platform": platform,
+            "device": device,
+            "duration": duration,
+            "attempts": attempts,
+            "success": error is None,
+            "error": error
+        }
+        
+        with self.lock:
+            self.warmup_metrics.append(record)
+        self._notify("warmup", record)
+    
+    def record_drain(self, in_flight: int, overrun: float, hard_stop: bool, cancelled: int):
+        """
+        Registra o encerramento do teste
+        
+        Args:
+            in_flight: Usuários com cenário em andamento no fim do teste
+            overrun: Tempo além do fim previsto até todos encerrarem (segundos)
+            hard_stop: Se o período de drain acabou e houve parada forçada
+            cancelled: Usuários interrompidos pelo hard stop
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "in_flight": in_flight,
+            "overrun": overrun,
+            "hard_stop": hard_stop,
+            "cancelled": cancelled
+        }
+        
+        with self.lock:
+            self.drain_metrics.append(record)
+        self._notify("drain", record)
+    
+    def record_session_loss(
+        self,
+        user_id: int,
+        platform: str,
+        device: Optional[str],
+        error: str,
+        downtime: float,
+        attempts: int,
+        recovered: bool
+    ):
+        """
+        Registra uma sessão perdida no meio do teste e a sua recriação
+        
+        Args:
+            user_id: ID do usuário virtual
+            platform: Plataforma da sessão
+            device: Device da sessão
+            error: Erro fatal que derrubou a sessão
+            downtime: Tempo sem sessão até a recriação ou o fim do teste (segundos)
+            attempts: Tentativas de criar a nova sessão
+            recovered: Se a sessão foi recriada
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id,
+            "platform": platform,
+            "device": device,
+            "error": error,
+            "downtime": downtime,
+            "attempts": attempts,
+            "recovered": recovered
+        }
+        
+        with self.lock:
+            self.session_loss_metrics.append(record)
+        self._notify("session_loss", record)
+    
+    def record_circuit_open(self, platform: str, device: Optional[str], failures: int):
+        """
+        Registra a abertura do circuit breaker de um device
+        
+        Args:
+            platform: Plataforma do device
+            device: Device (None = plataforma sem devices configurados)
+            failures: Falhas seguidas que abriram o circuito
+        """
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "platform": platform,
+            "device": device,
+            "failures": failures
+        }
+        
+        with self.lock:
+            self.circuit_metrics.append(record)
+        self._notify("circuit", record)
+    
+    def add_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        """
+        Registra um callback chamado a cada novo registro
+        
+        Args:
+            callback: Função callback(kind, record), com kind em RECORD_KINDS
+        """
+        self.listeners.append(callback)
+    
+    def _notify(self, kind: str, record: Dict[str, Any]):
+        """Notifica os listeners sobre um novo registro"""
+        for callback in self.listeners:
+            try:
+                callback(kind, record)
+            except Exception as e:
+                logger.error(f"Erro em listener de métricas: {e}")
+    
+    def export(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Exporta os registros brutos (sem resumo)
+        
+        Usado pelos workers para enviar as métricas ao processo pai.
+        """
+        with self.lock:
+            return {f"{kind}_metrics": getattr(self, f"{kind}_metrics").copy() for kind in RECORD_KINDS}
+    
+    def merge(self, records: Dict[str, List[Dict[str, Any]]]):
+        """
+        Incorpora registros exportados por outro coletor
+        
+        Args:
+            records: Dicionário no formato retornado por export()
+        """
+        with self.lock:
+            for kind in RECORD_KINDS:
+                getattr(self, f"{kind}_metrics").extend(records.get(f"{kind}_metrics", []))
     
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -212,26 +633,241 @@ class MetricsCollector:
             return {
                 "device_metrics": self.device_metrics.copy(),
                 "action_metrics": self.action_metrics.copy(),
+                "step_metrics": self.step_metrics.copy(),
+                "transaction_metrics": self.transaction_metrics.copy(),
+                "iteration_metrics": self.iteration_metrics.copy(),
+                "device_wait_metrics": self.device_wait_metrics.copy(),
+                "session_metrics": self.session_metrics.copy(),
+                "element_cache_metrics": self.element_cache_metrics.copy(),
+                "warmup_metrics": self.warmup_metrics.copy(),
+                "drain_metrics": self.drain_metrics.copy(),
+                "session_loss_metrics": self.session_loss_metrics.copy(),
+                "circuit_metrics": self.circuit_metrics.copy(),
                 "summary": self._calculate_summary()
             }
     
+    @staticmethod
+    def _latency_stats(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Contagem, erros e distribuição das durações de um grupo de registros"""
+        durations = sorted(m['duration'] for m in records)
+        failed = sum(1 for m in records if not m['success'])
+        
+        return {
+            "count": len(durations),
+            "failed": failed,
+            "error_rate": failed / len(durations) * 100,
+            "avg": sum(durations) / len(durations),
+            "p50": durations[len(durations) // 2],
+            "p95": durations[int(len(durations) * 0.95)],
+            "max": durations[-1]
+        }
+    
+    def _calculate_steps(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resume cada ação de cada cenário, separando busca do elemento, espera
+        do polling e interação, e as novas tentativas da política de falha
+        """
+        groups = defaultdict(list)
+        for metric in self.step_metrics:
+            if not metric.get('overtime'):
+                groups[(metric['scenario'], metric['step'], metric['action'])].append(metric)
+        
+        steps = defaultdict(dict)
+        for (scenario, step, action), records in sorted(groups.items(), key=lambda item: item[0][:2]):
+            stats = self._latency_stats(records)
+            stats["lookup_avg"] = sum(m['lookup'] for m in records) / len(records)
+            stats["interaction_avg"] = sum(m['interaction'] for m in records) / len(records)
+            stats["poll_wait_avg"] = sum(m.get('poll_wait', 0) for m in records) / len(records)
+            stats["retries"] = sum(m.get('retries', 0) for m in records)
+            stats["retry_time"] = sum(m.get('retry_time', 0) for m in records)
+            steps[scenario][f"{step}. {action}"] = stats
+        return dict(steps)
+    
+    def _calculate_transactions(self) -> Dict[str, Dict[str, Any]]:
+        """Resume cada transação"""
+        groups = defaultdict(list)
+        for metric in self.transaction_metrics:
+            if not metric.get('overtime'):
+                groups[metric['name']].append(metric)
+        
+        return {name: self._latency_stats(records) for name, records in groups.items()}
+    
+    def _calculate_iterations(self) -> Dict[str, Any]:
+        """Resume as iterações agendadas (vazio fora dos executores de taxa de chegada)"""
+        if not self.iteration_metrics:
+            return {}
+        
+        counts = defaultdict(int)
+        for metric in self.iteration_metrics:
+            counts[metric['status']] += 1
+        
+        lags = [m['lag'] for m in self.iteration_metrics if m['status'] != 'dropped']
+        
+        return {
+            "scheduled": len(self.iteration_metrics),
+            "started": counts['on_time'] + counts['late'],
+            "late": counts['late'],
+            "dropped": counts['dropped'],
+            "avg_lag": sum(lags) / len(lags) if lags else 0,
+            "max_lag": max(lags) if lags else 0
+        }
+    
+    def _calculate_device_wait(self) -> Dict[str, Any]:
+        """Resume a espera por devices (vazio quando nenhum device foi emprestado)"""
+        if not self.device_wait_metrics:
+            return {}
+        
+        waits = sorted(m['wait'] for m in self.device_wait_metrics)
+        
+        return {
+            "count": len(waits),
+            "avg": sum(waits) / len(waits),
+            "p95": waits[int(len(waits) * 0.95)],
+            "max": waits[-1],
+            "timeouts": sum(1 for m in self.device_wait_metrics if not m['acquired'])
+        }
+    
+    def _calculate_sessions(self) -> Dict[str, Any]:
+        """Resume a criação de sessões e o aproveitamento do pool"""
+        if not self.session_metrics:
+            return {}
+        
+        created = sorted(m['duration'] for m in self.session_metrics if m['source'] != 'hit')
+        hits = sum(1 for m in self.session_metrics if m['source'] == 'hit')
+        misses = sum(1 for m in self.session_metrics if m['source'] == 'miss')
+        
+        return {
+            "created": len(created),
+            "pool_hits": hits,
+            "pool_misses": misses,
+            "pool_hit_rate": hits / (hits + misses) if hits + misses else 0,
+            "create_avg": sum(created) / len(created) if created else 0,
+            "create_p95": created[int(len(created) * 0.95)] if created else 0,
+            "create_max": created[-1] if created else 0
+        }
+    
+    def _calculate_element_cache(self) -> Dict[str, Any]:
+        """Resume o cache de elementos: buscas evitadas e handles expirados"""
+        if not self.element_cache_metrics:
+            return {}
+        
+        hits = sum(m['hits'] for m in self.element_cache_metrics)
+        misses = sum(m['misses'] for m in self.element_cache_metrics)
+        stale = sum(m['stale'] for m in self.element_cache_metrics)
+        
+        return {
+            "hits": hits,
+            "misses": misses,
+            "stale": stale,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0,
+            # Cada handle expirado custou uma nova busca
+            "lookups_saved": hits - stale
+        }
+    
+    def _calculate_warmup(self) -> Dict[str, Any]:
+        """Resume a fase de warm-up, com a latência de criação de sessão por device"""
+        if not self.warmup_metrics:
+            return {}
+        
+        ready = [m for m in self.warmup_metrics if m['success']]
+        
+        devices = defaultdict(list)
+        for metric in ready:
+            devices[metric['device'] or metric['platform']].append(metric['duration'])
+        
+        return {
+            "duration": (
+                max(m['finished'] for m in self.warmup_metrics) - min(m['started'] for m in self.warmup_metrics)
+            ),
+            "ready": len(ready),
+            "failed": len(self.warmup_metrics) - len(ready),
+            "attempts": sum(m['attempts'] for m in self.warmup_metrics),
+            "devices": {
+                device: {
+                    "count": len(durations),
+                    "avg": sum(durations) / len(durations),
+                    "max": max(durations)
+                }
+                for device, durations in devices.items()
+            }
+        }
+    
+    def _calculate_drain(self) -> Dict[str, Any]:
+        """Resume o encerramento: drain, hard stop e iterações fora da janela"""
+        if not self.drain_metrics:
+            return {}
+        
+        return {
+            "in_flight": sum(m['in_flight'] for m in self.drain_metrics),
+            "overrun": max(m['overrun'] for m in self.drain_metrics),
+            "hard_stop": any(m['hard_stop'] for m in self.drain_metrics),
+            "cancelled": sum(m['cancelled'] for m in self.drain_metrics),
+            "overtime_actions": sum(1 for m in self.action_metrics if m.get('overtime'))
+        }
+    
+    def _calculate_session_health(self) -> Dict[str, Any]:
+        """Resume as sessões perdidas, o tempo sem sessão e as aberturas de circuito por device"""
+        if not self.session_loss_metrics and not self.circuit_metrics:
+            return {}
+        
+        downtimes = [m['downtime'] for m in self.session_loss_metrics]
+        recovered = sum(1 for m in self.session_loss_metrics if m['recovered'])
+        circuit_opens = defaultdict(int)
+        for metric in self.circuit_metrics:
+            circuit_opens[metric['device'] or metric['platform']] += 1
+        
+        return {
+            "lost": len(downtimes),
+            "recovered": recovered,
+            "unrecovered": len(downtimes) - recovered,
+            "recreate_attempts": sum(m['attempts'] for m in self.session_loss_metrics),
+            "downtime_total": sum(downtimes),
+            "downtime_avg": sum(downtimes) / len(downtimes) if downtimes else 0,
+            "downtime_max": max(downtimes, default=0),
+            "circuit_opens": dict(circuit_opens)
+        }
+    
     def _calculate_summary(self) -> Dict[str, Any]:
         """Calcula estatísticas resumidas"""
-        if not self.action_metrics:
-            return {}
+        # Cenários concluídos ou cancelados após o fim do teste não entram nas estatísticas
+        measured = [m for m in self.action_metrics if not m.get('overtime')]
+        
+        if not measured:
+            partial = {
+                "steps": self._calculate_steps(),
+                "transactions": self._calculate_transactions(),
+                "iterations": self._calculate_iterations(),
+                "device_wait": self._calculate_device_wait(),
+                "sessions": self._calculate_sessions(),
+                "element_cache": self._calculate_element_cache(),
+                "warmup": self._calculate_warmup(),
+                "drain": self._calculate_drain(),
+                "session_health": self._calculate_session_health()
+            }
+            return {key: value for key, value in partial.items() if value}
         
         # Calcular estatísticas de ações
-        durations = [m['duration'] for m in self.action_metrics]
-        successes = sum(1 for m in self.action_metrics if m['success'])
-        total_actions = len(self.action_metrics)
+        durations = [m['duration'] for m in measured]
+        successes = sum(1 for m in measured if m['success'])
+        total_actions = len(measured)
         
         # Agrupar por cenário
         scenarios_stats = defaultdict(lambda: {'count': 0, 'durations': []})
-        for metric in self.action_metrics:
+        for metric in measured:
             scenario = metric['scenario']
             scenarios_stats[scenario]['count'] += 1
             scenarios_stats[scenario]['durations'].append(metric['duration'])
         
+        # Agrupar por plataforma
+        platforms_stats = defaultdict(lambda: {'count': 0, 'successful': 0, 'durations': []})
+        for metric in measured:
+            platform = metric.get('platform')
+            if platform is None:
+                continue
+            platforms_stats[platform]['count'] += 1
+            platforms_stats[platform]['successful'] += 1 if metric['success'] else 0
+            platforms_stats[platform]['durations'].append(metric['duration'])
+        
         # Calcular percentis
         durations_sorted = sorted(durations)
         p50 = durations_sorted[len(durations_sorted) // 2] if durations_sorted else 0
@@ -279,5 +915,35 @@ class MetricsCollector:
                     "avg_duration": sum(stats['durations']) / len(stats['durations'])
                 }
                 for name, stats in scenarios_stats.items()
-            }
+            },
+            
+            "platforms": {
+                name: {
+                    "count": stats['count'],
+                    "successful": stats['successful'],
+                    "failed": stats['count'] - stats['successful'],
+                    "success_rate": stats['successful'] / stats['count'] * 100,
+                    "avg_duration": sum(stats['durations']) / len(stats['durations']),
+                    "p95": sorted(stats['durations'])[int(len(stats['durations']) * 0.95)]
+                }
+                for name, stats in platforms_stats.items()
+            },
+            
+            "steps": self._calculate_steps(),
+            
+            "transactions": self._calculate_transactions(),
+            
+            "iterations": self._calculate_iterations(),
+            
+            "device_wait": self._calculate_device_wait(),
+            
+            "sessions": self._calculate_sessions(),
+            
+            "element_cache": self._calculate_element_cache(),
+            
+            "warmup": self._calculate_warmup(),
+            
+            "drain": self._calculate_drain(),
+            
+            "session_health": self._calculate_session_health()
         }
@@ -71,6 +71,161 @@ class ReportGenerator:
                 </tr>
             """
         
+        # Por plataforma (apenas quando há dados por plataforma)
+        platform_section = ""
+        if results.platforms:
+            platform_rows = ""
+            for platform, stats in results.platforms.items():
+                platform_rows += f"""
+                <tr>
+                    <td>{platform}</td>
+                    <td>{stats['count']}</td>
+                    <td>{stats['success_rate']:.1f}%</td>
+                    <td>{stats['avg_duration'] * 1000:.0f} ms</td>
+                    <td>{stats['p95'] * 1000:.0f} ms</td>
+                </tr>
+                """
+            platform_section = f"""
+            <!-- Por Plataforma -->
+            <section>
+                <h2>📱 Por Plataforma</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Plataforma</th>
+                            <th>Ações</th>
+                            <th>Taxa de Sucesso</th>
+                            <th>Média</th>
+                            <th>P95</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {platform_rows}
+                    </tbody>
+                </table>
+            </section>
+            """
+        
+        # Transações e ações (tempos em segundos no resumo)
+        transaction_section = ""
+        if results.transactions:
+            transaction_rows = ""
+            for name, stats in results.transactions.items():
+                transaction_rows += f"""
+                <tr>
+                    <td>{name}</td>
+                    <td>{stats['count']}</td>
+                    <td>{stats['error_rate']:.1f}%</td>
+                    <td>{stats['avg'] * 1000:.0f} ms</td>
+                    <td>{stats['p95'] * 1000:.0f} ms</td>
+                    <td>{stats['max'] * 1000:.0f} ms</td>
+                </tr>
+                """
+            transaction_section = f"""
+            <!-- Transações -->
+            <section>
+                <h2>🧾 Transações</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Transação</th>
+                            <th>Execuções</th>
+                            <th>Taxa de Erro</th>
+                            <th>Média</th>
+                            <th>P95</th>
+                            <th>Máx.</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {transaction_rows}
+                    </tbody>
+                </table>
+            </section>
+            """
+        
+        step_section = ""
+        if results.steps:
+            step_rows = ""
+            for scenario, steps in results.steps.items():
+                for step, stats in steps.items():
+                    step_rows += f"""
+                <tr>
+                    <td>{scenario}</td>
+                    <td>{step}</td>
+                    <td>{stats['count']}</td>
+                    <td>{stats['error_rate']:.1f}%</td>
+                    <td>{stats['avg'] * 1000:.0f} ms</td>
+                    <td>{stats['p95'] * 1000:.0f} ms</td>
+                    <td>{stats['lookup_avg'] * 1000:.0f} ms</td>
+                    <td>{stats.get('poll_wait_avg', 0) * 1000:.0f} ms</td>
+                    <td>{stats['interaction_avg'] * 1000:.0f} ms</td>
+                    <td>{stats.get('retries', 0)} ({stats.get('retry_time', 0):.1f} s)</td>
+                </tr>
+                """
+            step_section = f"""
+            <!-- Ações -->
+            <section>
+                <h2>👆 Tempo por Ação</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Cenário</th>
+                            <th>Ação</th>
+                            <th>Execuções</th>
+                            <th>Taxa de Erro</th>
+                            <th>Média</th>
+                            <th>P95</th>
+                            <th>Busca (média)</th>
+                            <th>Espera do Polling (média)</th>
+                            <th>Interação (média)</th>
+                            <th>Novas Tentativas</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {step_rows}
+                    </tbody>
+                </table>
+            </section>
+            """
+        
+        # Warm-up (fora da medição)
+        warmup_section = ""
+        if results.warmup:
+            warmup_rows = ""
+            for device, stats in results.warmup['devices'].items():
+                warmup_rows += f"""
+                <tr>
+                    <td>{device}</td>
+                    <td>{stats['count']}</td>
+                    <td>{stats['avg']:.2f} s</td>
+                    <td>{stats['max']:.2f} s</td>
+                </tr>
+                """
+            warmup_section = f"""
+            <!-- Warm-up -->
+            <section>
+                <h2>🔥 Warm-up (fora da medição)</h2>
+                <p>
+                    Duração: {results.warmup['duration']:.1f} s |
+                    Sessões prontas: {results.warmup['ready']} |
+                    Falhas: {results.warmup['failed']}
+                </p>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Device</th>
+                            <th>Sessões</th>
+                            <th>Criação (média)</th>
+                            <th>Criação (máx.)</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {warmup_rows}
+                    </tbody>
+                </table>
+            </section>
+            """
+        
         html = f"""
 <!DOCTYPE html>
 <html lang="pt-BR">
@@ -258,7 +413,10 @@ class ReportGenerator:
                     <canvas id="responseTimeChart"></canvas>
                 </div>
             </section>
-            
+            {platform_section}
+            {transaction_section}
+            {step_section}
+            {warmup_section}
             <!-- Recursos do Device -->
             <section>
                 <h2>📱 Recursos do Device</h2>
@@ -376,7 +534,8 @@ class ReportGenerator:
             if not action_metrics:
                 return
             
-            fieldnames = action_metrics[0].keys()
+            # União das chaves, na ordem em que aparecem
+            fieldnames = list(dict.fromkeys(key for metric in action_metrics for key in metric))
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             
             writer.writeheader()
@@ -103,6 +103,56 @@ class TestResults:
         """Tempo de resposta máximo (ms)"""
         return self.summary.get('response_time', {}).get('max', 0.0) * 1000
     
+    @property
+    def platforms(self) -> Dict[str, Dict[str, Any]]:
+        """Estatísticas por plataforma (android/ios)"""
+        return self.summary.get('platforms', {})
+    
+    @property
+    def steps(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Tempos por ação de cada cenário (busca do elemento e interação, em segundos)"""
+        return self.summary.get('steps', {})
+    
+    @property
+    def transactions(self) -> Dict[str, Dict[str, Any]]:
+        """Tempos por transação (segundos)"""
+        return self.summary.get('transactions', {})
+    
+    @property
+    def iterations(self) -> Dict[str, Any]:
+        """Iterações agendadas, atrasadas e descartadas (executores de taxa de chegada)"""
+        return self.summary.get('iterations', {})
+    
+    @property
+    def device_wait(self) -> Dict[str, Any]:
+        """Espera por devices livres (quando há limite de sessões por device)"""
+        return self.summary.get('device_wait', {})
+    
+    @property
+    def sessions(self) -> Dict[str, Any]:
+        """Criação de sessões Appium e aproveitamento do pool"""
+        return self.summary.get('sessions', {})
+    
+    @property
+    def element_cache(self) -> Dict[str, Any]:
+        """Cache de elementos: hits, misses, handles expirados e buscas evitadas"""
+        return self.summary.get('element_cache', {})
+    
+    @property
+    def warmup(self) -> Dict[str, Any]:
+        """Fase de warm-up (fora da medição): duração e latência de criação por device"""
+        return self.summary.get('warmup', {})
+    
+    @property
+    def drain(self) -> Dict[str, Any]:
+        """Encerramento: cenários em andamento no fim do teste, drain e hard stop"""
+        return self.summary.get('drain', {})
+    
+    @property
+    def session_health(self) -> Dict[str, Any]:
+        """Sessões perdidas no meio do teste, tempo sem sessão e circuitos abertos por device"""
+        return self.summary.get('session_health', {})
+    
     def check_thresholds(self) -> Dict[str, bool]:
         """
         Verifica se os thresholds foram atingidos
@@ -121,6 +171,8 @@ class TestResults:
                 results[metric] = self.response_time_p95 <= threshold
             elif metric == 'error_rate_max':
                 results[metric] = self.error_rate <= threshold
+            elif metric == 'dropped_iterations_max':
+                results[metric] = self.iterations.get('dropped', 0) <= threshold
             else:
                 results[metric] = None  # Threshold desconhecido
         
@@ -160,8 +212,18 @@ class TestResults:
                     "avg_cpu": self.avg_cpu,
                     "avg_memory": self.avg_memory,
                     "peak_memory": self.peak_memory
-                }
+                },
+                "platforms": self.platforms,
+                "steps": self.steps,
+                "transactions": self.transactions,
+                "iterations": self.iterations,
+                "device_wait": self.device_wait,
+                "sessions": self.sessions,
+                "element_cache": self.element_cache,
+                "drain": self.drain,
+                "session_health": self.session_health
             },
+            "warmup": self.warmup,
             "thresholds": self.thresholds,
             "threshold_results": self.check_thresholds(),
             "passed": self.passed_thresholds,
@@ -19,6 +19,11 @@ class SchemaValidator:
                 'properties': {
                     'name': {'type': 'string'},
                     'duration': {'type': 'integer', 'minimum': 1},
+                    'engine': {'type': 'string', 'enum': ['thread', 'asyncio']},
+                    'workers': {'type': 'integer', 'minimum': 1},
+                    'drain_timeout': {'type': 'number', 'minimum': 0},
+                    'seed': {'type': 'integer', 'minimum': 0},
+                    'scenario_mix': {'type': 'string', 'enum': ['random', 'exact']},
                 },
                 'required': ['name', 'duration']
             },
@@ -28,6 +33,30 @@ class SchemaValidator:
                     'initial': {'type': 'integer', 'minimum': 0},
                     'max': {'type': 'integer', 'minimum': 1},
                     'ramp_up_time': {'type': 'integer', 'minimum': 0},
+                    'executor': {
+                        'type': 'string',
+                        'enum': ['ramping-vus', 'constant-arrival-rate', 'ramping-arrival-rate']
+                    },
+                    'rate': {'type': 'number', 'minimum': 0},
+                    'time_unit': {'type': 'number', 'exclusiveMinimum': 0},
+                    'pre_allocated': {'type': 'integer', 'minimum': 1},
+                    'late_threshold': {'type': 'number', 'minimum': 0},
+                    'stages': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'duration': {'type': 'number', 'minimum': 0},
+                                'target': {'type': 'number', 'minimum': 0},
+                                'users': {'type': 'integer', 'minimum': 0},
+                                'easing': {
+                                    'type': 'string',
+                                    'enum': ['linear', 'step', 'ease-in', 'ease-out', 'ease-in-out']
+                                },
+                            },
+                            'required': ['duration']
+                        }
+                    },
                 },
                 'required': ['max']
             },
@@ -43,7 +72,27 @@ class SchemaValidator:
                             'device': {'type': 'string'},
                             'devices': {'type': 'array', 'items': {'type': 'string'}},
                             'capabilities': {'type': 'object'},
-                            'distribute': {'type': 'string'},
+                            'distribute': {'type': 'string', 'enum': ['round-robin', 'least-loaded', 'weighted']},
+                            'device_weights': {
+                                'type': 'object',
+                                'additionalProperties': {'type': 'number', 'exclusiveMinimum': 0}
+                            },
+                            'users': {'type': 'integer', 'minimum': 0},
+                            'share': {'type': 'number', 'exclusiveMinimum': 0},
+                            'max_sessions_per_device': {'type': 'integer', 'minimum': 1},
+                            'session_pool': {
+                                'type': 'object',
+                                'properties': {
+                                    'size': {'type': 'integer', 'minimum': 0},
+                                    'reset': {
+                                        'type': 'string',
+                                        'enum': ['none', 'terminate-activate', 'clear-data', 'deep-link']
+                                    },
+                                    'app_id': {'type': 'string'},
+                                    'deep_link': {'type': 'string'}
+                                }
+                            },
+                            'element_cache': {'type': 'boolean'},
                         }
                     }
                 }
@@ -56,6 +105,40 @@ class SchemaValidator:
                     'properties': {
                         'name': {'type': 'string'},
                         'weight': {'type': 'integer', 'minimum': 1},
+                        'think_time': {},  # segundos ou objeto {distribution, mean, ...}
+                        'pacing': {'type': 'number', 'minimum': 0},
+                        'polling': {},  # segundos ou objeto {strategy, interval, ...}
+                        'failure_policy': {},  # novas tentativas ou objeto {retries, on_failure, ...}
+                        'timeout': {'type': 'number', 'minimum': 0},
+                        'batch': {'type': 'boolean'},
+                        'data_sources': {
+                            'type': 'array',
+                            'items': {
+                                'type': 'object',
+                                'properties': {
+                                    'name': {'type': 'string'},
+                                    'path': {'type': 'string'},
+                                    'mode': {'type': 'string', 'enum': ['unique', 'sequential', 'circular', 'random']},
+                                    'format': {'type': 'string', 'enum': ['csv', 'jsonl']},
+                                    'delimiter': {'type': 'string'}
+                                },
+                                'required': ['name', 'path']
+                            }
+                        },
+                        'actions': {
+                            'type': 'array',
+                            'items': {'type': 'object'}
+                        }
+                    },
+                    'required': ['name', 'actions']
+                }
+            },
+            'flows': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'name': {'type': 'string'},
                         'actions': {
                             'type': 'array',
                             'items': {'type': 'object'}
@@ -64,6 +147,30 @@ class SchemaValidator:
                     'required': ['name', 'actions']
                 }
             },
+            'session_health': {
+                'type': 'object',
+                'properties': {
+                    'enabled': {'type': 'boolean'},
+                    'backoff': {'type': 'number', 'minimum': 0},
+                    'max_backoff': {'type': 'number', 'minimum': 0},
+                    'jitter': {'type': 'number', 'minimum': 0, 'maximum': 1},
+                    'failure_threshold': {'type': 'integer', 'minimum': 1},
+                    'open_time': {'type': 'number', 'minimum': 0},
+                    'fatal_errors': {'type': 'array', 'items': {'type': 'string'}}
+                }
+            },
+            'warmup': {
+                'type': 'object',
+                'properties': {
+                    'concurrency': {'type': 'integer', 'minimum': 1},
+                    'retries': {'type': 'integer', 'minimum': 0},
+                    'backoff': {'type': 'number', 'minimum': 0},
+                    'max_backoff': {'type': 'number', 'minimum': 0},
+                    'jitter': {'type': 'number', 'minimum': 0, 'maximum': 1},
+                    'min_ready': {'type': 'integer', 'minimum': 0},
+                    'timeout': {'type': 'number', 'exclusiveMinimum': 0}
+                }
+            },
             'thresholds': {
                 'type': 'object',
                 'properties': {
@@ -71,7 +178,8 @@ class SchemaValidator:
                     'response_time_p99': {'type': 'number'},
                     'error_rate_max': {'type': 'number'},
                     'cpu_max': {'type': 'number'},
-                    'memory_max': {'type': 'number'}
+                    'memory_max': {'type': 'number'},
+                    'dropped_iterations_max': {'type': 'number'}
                 }
             },
             'metrics': {
@@ -79,9 +187,12 @@ class SchemaValidator:
                 'properties': {
                     'collect': {
                         'type': 'array',
-                        'items': {'type': 'string'}
+                        'items': {'type': 'string', 'enum': ['cpu', 'memory', 'battery', 'network', 'fps']}
                     },
-                    'interval': {'type': 'number', 'minimum': 0.1}
+                    'interval': {'type': 'number', 'minimum': 0.1},
+                    'devices': {'type': 'array', 'items': {'type': 'string'}},
+                    'package': {'type': 'string'},
+                    'adb': {'type': 'string'}
                 }
             }
         },
@@ -83,3 +83,136 @@ def json_config_file(temp_dir, config_dict):
         json.dump(config_dict, f)
     
     return config_file
+
+
+class FakeAppiumServer:
+    """Servidor W3C WebDriver mínimo para testes sem Appium real"""
+    
+    ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+    
+    def __init__(self):
+        import threading
+        from http.server import ThreadingHTTPServer
+        
+        self.requests = []
+        self.sessions = {}
+        self.connections = 0
+        self.missing_elements = set()
+        self.stale_elements = set()  # ids que respondem "stale element reference" uma vez
+        self.crash_elements = set()  # buscas que derrubam a sessão uma vez (instrumentação caída)
+        self.refuse_sessions = 0  # próximas criações de sessão que falham
+        self.lock = threading.Lock()
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    def commands(self, method=None, suffix=None):
+        """Lista (método, path) das requisições recebidas, com filtro opcional"""
+        with self.lock:
+            return [
+                (m, p) for m, p, _ in self.requests
+                if (method is None or m == method) and (suffix is None or p.endswith(suffix))
+            ]
+    
+    def _dispatch(self, method, path, body):
+        import uuid
+        
+        parts = path.strip('/').split('/')
+        
+        if method == 'POST' and parts == ['session']:
+            if self.refuse_sessions:
+                self.refuse_sessions -= 1
+                return 500, {'error': 'session not created', 'message': 'Device offline'}
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = body.get('capabilities', {}).get('alwaysMatch', {})
+            return 200, {'sessionId': session_id, 'capabilities': self.sessions[session_id]}
+        
+        if len(parts) < 2 or parts[1] not in self.sessions:
+            return 404, {'error': 'invalid session id', 'message': 'Sessão inexistente'}
+        
+        if method == 'DELETE' and len(parts) == 2:
+            self.sessions.pop(parts[1], None)
+            return 200, None
+        
+        command = parts[2:]
+        if method == 'POST' and command == ['element']:
+            if body.get('value') in self.crash_elements:
+                self.crash_elements.discard(body.get('value'))
+                self.sessions.pop(parts[1])
+                return 404, {'error': 'invalid session id', 'message': 'A session is either terminated or not started'}
+            if body.get('value') in self.missing_elements:
+                return 404, {'error': 'no such element', 'message': body.get('value')}
+            return 200, {self.ELEMENT_KEY: f"el-{body.get('value')}"}
+        if method == 'POST' and len(command) == 3 and command[1] in self.stale_elements:
+            self.stale_elements.discard(command[1])
+            return 404, {'error': 'stale element reference', 'message': command[1]}
+        if method == 'GET' and command == ['element', 'active']:
+            return 200, {self.ELEMENT_KEY: 'el-active'}
+        if method == 'GET' and command == ['window', 'rect']:
+            return 200, {'x': 0, 'y': 0, 'width': 1080, 'height': 1920}
+        if method == 'GET' and command == ['screenshot']:
+            import base64
+            return 200, base64.b64encode(b'PNG').decode('ascii')
+        if method == 'POST' and command == ['appium', 'execute_driver']:
+            # Simula o script: cada ação do lote leva 2ms no servidor
+            import json
+            data = json.loads(body['script'].split('\n', 1)[0][len('const data = '):-1])
+            steps = [
+                {'duration': 2, 'lookup': 1, 'poll': 0, 'error': None, 'offset': 2 * (i + 1), 'think': think}
+                for i, think in enumerate(data['think'])
+            ]
+            return 200, {'result': {'steps': steps, 'implicit': data['implicit']}, 'logs': {}}
+        return 200, None
+    
+    def _make_handler(self):
+        import json
+        from http.server import BaseHTTPRequestHandler
+        
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+            
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                body = json.loads(raw) if raw else {}
+                with server.lock:
+                    server.requests.append((self.command, self.path, body))
+                    status, value = server._dispatch(self.command, self.path, body)
+                data = json.dumps({'value': value}).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            do_GET = do_POST = do_DELETE = _handle
+            
+            def log_message(self, *args):
+                pass
+        
+        return Handler
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_appium_server():
+    """Servidor W3C WebDriver fake rodando em localhost"""
+    server = FakeAppiumServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,213 @@
+"""
+Testes para as métricas do device Android pelo adb shell persistente
+"""
+
+import sys
+import textwrap
+import pytest
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.metrics.android import AdbShell, parse_battery, parse_cpu_ticks, parse_meminfo, parse_net_dev
+from mobileloadx.metrics.collector import MetricsCollector
+
+MEMINFO = """\
+Applications Memory Usage (in Kilobytes):
+** MEMINFO in pid 4321 [com.example.app] **
+                   Pss  Private  Private     Swap      Rss     Heap
+  Native Heap     9000     8900        0        0     9500    20480
+ App Summary
+                       Pss(KB)                        Rss(KB)
+                        ------                         ------
+           Java Heap:    10240                          20480
+         Native Heap:     5120                           6144
+            Graphics:     2048                           2048
+           TOTAL PSS:    51200            TOTAL RSS:    81920       TOTAL SWAP PSS:       12
+"""
+
+BATTERY = """\
+Current Battery Service state:
+  AC powered: false
+  level: 85
+  voltage: 3850
+  temperature: 325
+"""
+
+NET_DEV = """\
+Inter-|   Receive                                                |  Transmit
+ face |bytes packets errs drop fifo frame compressed multicast|bytes packets errs drop fifo colls carrier compressed
+    lo: 500 5 0 0 0 0 0 0 500 5 0 0 0 0 0 0
+ wlan0: {rx} 10 0 0 0 0 0 0 {tx} 20 0 0 0 0 0 0
+"""
+
+
+@pytest.fixture
+def fake_adb(temp_dir):
+    """
+    Executável adb falso: responde aos comandos do shell pelo stdin
+    
+    Registra cada processo iniciado (starts.log) e cada comando
+    (commands.log); o pid do app fica em pid (vazio = app encerrado) e o
+    comando "hang" nunca responde.
+    """
+    (temp_dir / 'pid').write_text('4321')
+    script = temp_dir / 'adb'
+    script.write_text(textwrap.dedent(f"""\
+        #!{sys.executable}
+        import sys
+        from pathlib import Path
+        
+        base = Path({str(temp_dir)!r})
+        with open(base / 'starts.log', 'a') as log:
+            log.write(' '.join(sys.argv[1:]) + '\\n')
+        
+        cpu_samples = net_samples = 0
+        for line in sys.stdin:
+            command, _, marker = line.strip().rpartition('; echo ')
+            with open(base / 'commands.log', 'a') as log:
+                log.write(command + '\\n')
+            pid = (base / 'pid').read_text()
+            output = ''
+            if command == 'hang':
+                continue
+            if command.startswith('pidof '):
+                output = pid
+            elif command.startswith('cat /proc/') and command.endswith('/stat; head -n 1 /proc/stat'):
+                cpu_samples += 1
+                if command.split('/')[2] == pid:
+                    ticks = 25 * cpu_samples
+                    output = f"{{pid}} (app (main) x) S 1 1 0 0 -1 0 0 0 0 0 {{ticks}} {{ticks}} 0 0 20 0\\n"
+                output += f"cpu  {{100 * cpu_samples}} 0 {{100 * cpu_samples}} 0 0 0 0 0 0 0"
+            elif command.startswith('dumpsys meminfo '):
+                output = {MEMINFO!r}
+            elif command == 'dumpsys battery':
+                output = {BATTERY!r}
+            elif command == 'cat /proc/net/dev':
+                net_samples += 1
+                output = {NET_DEV!r}.format(rx=1000 * net_samples, tx=400 * net_samples)
+            sys.stdout.write(output.rstrip('\\n') + '\\n' + marker + '\\n')
+            sys.stdout.flush()
+    """))
+    script.chmod(0o755)
+    return temp_dir
+
+
+def lines(path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+class TestParsers:
+    """Testes para a leitura das saídas do device"""
+    
+    def test_cpu_ticks(self):
+        """Testa utime + stime com parênteses e espaços no nome do processo"""
+        output = "77 (my (app) x) S 1 1 0 0 -1 0 0 0 0 0 120 30 0 0 20 0\ncpu  10 20 30 40 50 60 70 80 90 100"
+        
+        assert parse_cpu_ticks(output) == (150, 360)
+        assert parse_cpu_ticks("cpu  1 1 1 1 1 1 1 1") == (None, 8)
+    
+    def test_dumpsys(self):
+        """Testa App Summary do meminfo, bateria e rede sem loopback"""
+        assert parse_meminfo(MEMINFO) == {'heap': 10.0, 'native': 5.0, 'graphics': 2.0, 'total': 50.0}
+        assert parse_meminfo('No process found for: 4321') is None
+        assert parse_battery(BATTERY) == {'level': 85, 'voltage': 3850, 'temperature': 32.5}
+        assert parse_net_dev(NET_DEV.format(rx=1000, tx=400)) == {
+            'rx_bytes': 1000, 'tx_bytes': 400, 'rx_packets': 10, 'tx_packets': 20
+        }
+
+
+class TestAdbShell:
+    """Testes para o canal adb shell persistente"""
+    
+    def test_single_process_and_timeout(self, fake_adb):
+        """Testa comandos no mesmo processo e canal recriado após um comando sem resposta"""
+        shell = AdbShell('emulator-5554', adb=str(fake_adb / 'adb'), timeout=0.5)
+        
+        assert shell.run('pidof com.example.app') == '4321'
+        assert shell.run('dumpsys battery') == BATTERY.rstrip('\n')
+        assert shell.starts == 1
+        
+        with pytest.raises(TimeoutError):
+            shell.run('hang')
+        assert shell.run('pidof com.example.app') == '4321'
+        shell.close()
+        
+        assert lines(fake_adb / 'starts.log') == ['-s emulator-5554 shell'] * 2
+
+
+class TestCollector:
+    """Testes para a coleta pelo MetricsCollector"""
+    
+    def test_samples(self, fake_adb):
+        """Testa CPU pela diferença entre amostras, memória, bateria e rede com um único adb shell"""
+        collector = MetricsCollector(devices=['emulator-5554'], package='com.example.app', adb=str(fake_adb / 'adb'))
+        
+        first = collector._collect_device_metrics('emulator-5554')
+        second = collector._collect_device_metrics('emulator-5554')
+        collector.stop()
+        
+        assert first['cpu'] is None
+        assert second['cpu'] == pytest.approx(25.0)
+        assert second['memory']['total'] == 50.0
+        assert second['battery']['level'] == 85
+        assert second['network'] == {'rx_bytes': 1000, 'tx_bytes': 400, 'rx_packets': 0, 'tx_packets': 0}
+        assert second['device'] == 'emulator-5554'
+        assert len(lines(fake_adb / 'starts.log')) == 1
+        assert lines(fake_adb / 'commands.log').count('pidof com.example.app') == 1
+    
+    def test_app_restart(self, fake_adb):
+        """Testa pid resolvido de novo quando o processo do app some"""
+        collector = MetricsCollector(collect=['cpu'], package='com.example.app', adb=str(fake_adb / 'adb'))
+        collector._get_cpu_usage()
+        
+        (fake_adb / 'pid').write_text('5555')
+        assert collector._get_cpu_usage() is None
+        collector._get_cpu_usage()
+        collector.stop()
+        
+        assert lines(fake_adb / 'commands.log').count('pidof com.example.app') == 2
+        assert 'cat /proc/5555/stat; head -n 1 /proc/stat' in lines(fake_adb / 'commands.log')
+    
+    def test_missing_adb(self, temp_dir, caplog):
+        """Testa coleta desativada sem o adb"""
+        collector = MetricsCollector(adb=str(temp_dir / 'missing-adb'))
+        
+        assert collector._get_battery_info() is None
+        assert collector._get_network_stats() is None
+        assert caplog.text.count('adb não encontrado') == 1
+    
+    def test_invalid_metric(self):
+        """Testa métrica desconhecida"""
+        with pytest.raises(ValueError, match='Métricas de device desconhecidas'):
+            MetricsCollector(collect=['gpu'])
+
+
+class TestLoadTestDeviceMetrics:
+    """Testes para a configuração da coleta no teste"""
+    
+    def test_config_and_platform_defaults(self, temp_dir):
+        """Testa seção metrics e devices e package vindos da plataforma android"""
+        config = temp_dir / 'config.yaml'
+        config.write_text(
+            "test: {name: Metrics, duration: 60}\n"
+            "virtual_users: {max: 2}\n"
+            "platforms: [{android: {app: /app.apk, devices: [d2, d1], capabilities: {appPackage: com.example.app}}}]\n"
+            "metrics: {collect: [cpu, battery], interval: 2}\n"
+            "scenarios: [{name: Login, actions: [{tap: {id: login}}]}]\n"
+        )
+        test = LoadTest('Metrics', config_file=str(config))
+        
+        test._bind_device_metrics()
+        
+        collector = test.metrics_collector
+        assert (collector.collect, collector.interval) == (['cpu', 'battery'], 2)
+        assert (collector.devices, collector.package) == (['d1', 'd2'], 'com.example.app')
+    
+    def test_ios_only(self):
+        """Testa coleta desligada sem plataforma android"""
+        test = LoadTest('Metrics')
+        test.add_platform('ios', '/app.ipa')
+        
+        test._bind_device_metrics()
+        test.metrics_collector.start()
+        
+        assert test.metrics_collector.collect == []
+        assert not test.metrics_collector.is_collecting
@@ -0,0 +1,206 @@
+"""
+Testes para o executor de taxa de chegada (modelo aberto)
+"""
+
+import itertools
+import time
+import pytest
+from unittest.mock import patch
+from mobileloadx.core.arrival_rate import ArrivalRateConfig, ArrivalRateExecutor
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import split_shards
+
+
+def _offsets(config, count):
+    return [round(t, 6) for t in itertools.islice(config.iteration_offsets(), count)]
+
+
+class TestArrivalRateConfig:
+    """Testes para o cálculo do agendamento de iterações"""
+    
+    def test_constant_rate(self):
+        """Testa iterações igualmente espaçadas com taxa constante"""
+        assert _offsets(ArrivalRateConfig(rate=4), 4) == [0.0, 0.25, 0.5, 0.75]
+    
+    def test_time_unit(self):
+        """Testa taxa expressa por minuto"""
+        assert _offsets(ArrivalRateConfig(rate=120, time_unit=60), 3) == [0.0, 0.5, 1.0]
+    
+    def test_ramping_rate(self):
+        """Testa rampa linear de taxa seguida de taxa constante"""
+        config = ArrivalRateConfig(
+            executor='ramping-arrival-rate',
+            rate=0,
+            stages=[{'target': 10, 'duration': 10}]
+        )
+        
+        offsets = list(itertools.islice(config.iteration_offsets(), 60))
+        
+        # Integral da rampa 0 -> 10/s em 10s = 50 iterações
+        assert offsets[2] == pytest.approx(2.0)
+        assert sum(1 for t in offsets if t < 10) == 50
+        assert offsets[51] - offsets[50] == pytest.approx(0.1)
+    
+    def test_zero_rate_stops_schedule(self):
+        """Testa taxa zero sem iterações"""
+        assert _offsets(ArrivalRateConfig(rate=0), 3) == []
+    
+    def test_scaled(self):
+        """Testa divisão proporcional da taxa para shards"""
+        config = ArrivalRateConfig(
+            executor='ramping-arrival-rate',
+            rate=10,
+            pre_allocated=4,
+            stages=[{'target': 20, 'duration': 5}]
+        )
+        
+        half = config.scaled(0.5)
+        
+        assert half.rate == 5
+        assert half.pre_allocated == 2
+        assert half.stages == [{'target': 10, 'duration': 5}]
+    
+    def test_invalid_config(self):
+        """Testa erros de configuração"""
+        with pytest.raises(ValueError, match='Executor desconhecido'):
+            ArrivalRateConfig(executor='per-vu-iterations')
+        
+        with pytest.raises(ValueError, match='requer stages'):
+            ArrivalRateConfig(executor='ramping-arrival-rate')
+
+
+class TestArrivalRateExecutor:
+    """Testes de integração do executor com o LoadTest"""
+    
+    def test_iterations_follow_rate(self, fake_appium_server):
+        """Testa iterações no ritmo da taxa alvo"""
+        test = LoadTest('Open', duration=1, virtual_users=2)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.set_arrival_rate(rate=10)
+        
+        results = test.run()
+        
+        assert results.iterations['scheduled'] == pytest.approx(10, abs=1)
+        assert results.iterations['dropped'] == 0
+        assert results.total_actions == results.iterations['started']
+    
+    def test_iterations_dropped_without_free_user(self, fake_appium_server):
+        """Testa descarte de iterações quando todos os usuários estão ocupados"""
+        test = LoadTest('Open', duration=1, virtual_users=1)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Slow').wait(0.5))
+        test.set_arrival_rate(rate=10)
+        test.set_threshold('dropped_iterations_max', 0)
+        
+        results = test.run()
+        
+        assert results.iterations['dropped'] > 0
+        assert results.iterations['started'] <= 3
+        assert not results.passed_thresholds
+    
+    def test_pre_allocation_before_measurement(self, fake_appium_server):
+        """Testa sessões pré-alocadas criadas antes do início do relógio do teste"""
+        test = LoadTest('Open', duration=1, virtual_users=2)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.set_arrival_rate(rate=2)
+        started = []
+        start_user = ArrivalRateExecutor._start_user
+        
+        def record_start(executor, user):
+            start_user(executor, user)
+            started.append(time.monotonic())
+        
+        with patch.object(ArrivalRateExecutor, '_start_user', record_start):
+            test.run()
+        
+        assert len(started) == 2
+        assert max(started) <= test.start_monotonic
+    
+    def test_finished_iterations_released(self, fake_appium_server):
+        """Testa que só as iterações em andamento ficam registradas até o drain"""
+        test = LoadTest('Open', duration=1, virtual_users=2)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.set_arrival_rate(rate=20)
+        drained = []
+        drain_threads = LoadTest._drain_threads
+        
+        def record_drain(load_test, lifecycles, end_time):
+            drained.append(len(lifecycles))
+            return drain_threads(load_test, lifecycles, end_time)
+        
+        with patch.object(LoadTest, '_drain_threads', record_drain):
+            results = test.run()
+        
+        assert results.iterations['started'] > 10
+        assert drained[0] <= 2
+    
+    @pytest.mark.parametrize('pre_allocated, timeouts', [(3, 0), (1, 2)])
+    def test_users_beyond_device_capacity(self, fake_appium_server, pre_allocated, timeouts):
+        """Testa pool limitado aos devices e descarte no horário sem device livre"""
+        test = LoadTest('Open', duration=1, virtual_users=3)
+        test.add_platform(
+            'android', '/app.apk',
+            devices=['d1'],
+            max_sessions_per_device=1,
+            appium_server_url=fake_appium_server.url
+        )
+        test.add_scenario(Scenario('Slow').wait(0.3))
+        test.set_arrival_rate(rate=10, pre_allocated=pre_allocated)
+        
+        started = time.monotonic()
+        results = test.run()
+        
+        # Pré-alocação sem espera registrada; usuários criados depois desistem após late_threshold
+        waits = test.metrics_collector.device_wait_metrics
+        assert len(fake_appium_server.commands('POST', '/session')) == 1
+        assert len(waits) == timeouts and not any(m['acquired'] for m in waits)
+        assert all(m['wait'] < 0.5 for m in waits)
+        assert results.iterations['dropped'] > 2
+        assert 1 <= results.iterations['started'] <= 4
+        assert time.monotonic() - started < 2
+    
+    def test_requires_thread_engine(self):
+        """Testa erro com engine asyncio"""
+        test = LoadTest('Open', engine='asyncio')
+        test.add_platform('android', '/app.apk')
+        test.add_scenario(Scenario('Flow'))
+        test.set_arrival_rate(rate=1)
+        
+        with pytest.raises(ValueError, match='requer a engine thread'):
+            test.run()
+    
+    def test_executor_from_config(self, temp_dir):
+        """Testa configuração do executor pelo arquivo YAML"""
+        import yaml
+        
+        config_file = temp_dir / 'config.yaml'
+        with open(config_file, 'w') as f:
+            yaml.dump({
+                'test': {'name': 'T', 'duration': 10},
+                'virtual_users': {
+                    'max': 20,
+                    'executor': 'ramping-arrival-rate',
+                    'pre_allocated': 5,
+                    'stages': [{'target': 50, 'duration': 10}]
+                }
+            }, f)
+        
+        test = LoadTest('Test', config_file=str(config_file))
+        
+        assert test.arrival_rate.executor == 'ramping-arrival-rate'
+        assert test.arrival_rate.rate == 0
+        assert test.arrival_rate.pre_allocated == 5
+    
+    def test_shards_split_rate(self):
+        """Testa divisão da taxa entre shards"""
+        test = LoadTest('Open', virtual_users=4)
+        test.add_platform('android', '/app.apk')
+        test.set_arrival_rate(rate=8)
+        
+        shards = split_shards(test, 2)
+        
+        assert [s.arrival_rate.rate for s in shards] == [4, 4]
@@ -0,0 +1,148 @@
+"""
+Testes para o engine asyncio
+"""
+
+import asyncio
+import pytest
+from mobileloadx.core.async_engine import (
+    AsyncHTTPClient,
+    AsyncWebDriverSession,
+    AsyncVirtualUser,
+    WebDriverError,
+    execute_action,
+)
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario, Action
+from mobileloadx.metrics.collector import MetricsCollector
+
+
+class TestAsyncHTTPClient:
+    """Testes para o cliente HTTP assíncrono"""
+    
+    def test_reuses_keep_alive_connection(self, fake_appium_server):
+        """Testa reaproveitamento de conexões entre requisições"""
+        async def scenario():
+            client = AsyncHTTPClient()
+            session = AsyncWebDriverSession(client, fake_appium_server.url)
+            await session.create({'platformName': 'Android'})
+            for _ in range(5):
+                await session.get_window_rect()
+            await session.quit()
+            await client.close()
+            return client.connections_opened
+        
+        assert asyncio.run(scenario()) == 1
+        assert fake_appium_server.connections == 1
+    
+    def test_webdriver_error(self, fake_appium_server):
+        """Testa conversão de erros W3C em WebDriverError"""
+        fake_appium_server.missing_elements.add('//missing')
+        
+        async def scenario():
+            client = AsyncHTTPClient()
+            session = AsyncWebDriverSession(client, fake_appium_server.url)
+            await session.create({'platformName': 'Android'})
+            try:
+                await session.find_element('xpath', '//missing')
+            finally:
+                await client.close()
+        
+        with pytest.raises(WebDriverError) as exc_info:
+            asyncio.run(scenario())
+        
+        assert exc_info.value.error == 'no such element'
+
+
+class TestAsyncVirtualUser:
+    """Testes para o usuário virtual assíncrono"""
+    
+    def test_build_capabilities(self):
+        """Testa montagem das capabilities W3C"""
+        user = AsyncVirtualUser(
+            user_id=1,
+            platform='android',
+            app='/app.apk',
+            device='emulator-5554',
+            capabilities={'appium_server_url': 'http://x:4723', 'platformVersion': '13'}
+        )
+        
+        caps = user._build_capabilities()
+        
+        assert caps['platformName'] == 'Android'
+        assert caps['appium:app'] == '/app.apk'
+        assert caps['appium:udid'] == 'emulator-5554'
+        assert caps['appium:platformVersion'] == '13'
+        assert 'appium:appium_server_url' not in caps
+    
+    def test_execute_scenario_records_metrics(self, fake_appium_server):
+        """Testa execução de cenário e registro no MetricsCollector"""
+        collector = MetricsCollector()
+        scenario = Scenario('Login').tap(id='login').input('user', id='email').scroll().back()
+        
+        async def run_user():
+            client = AsyncHTTPClient()
+            user = AsyncVirtualUser(
+                user_id=1,
+                platform='android',
+                app='/app.apk',
+                capabilities={'appium_server_url': fake_appium_server.url},
+                scenarios=[(scenario, 100)],
+                metrics_collector=collector,
+                http_client=client
+            )
+            await user.start_async()
+            await user.execute_scenario_async()
+            await user.stop_async()
+            await client.close()
+        
+        asyncio.run(run_user())
+        
+        metrics = collector.get_metrics()
+        assert metrics['summary']['total_actions'] == 1
+        assert metrics['summary']['successful_actions'] == 1
+        assert len(fake_appium_server.commands('POST', '/click')) == 1
+        assert len(fake_appium_server.commands('POST', '/actions')) == 1
+    
+    def test_unknown_action(self, fake_appium_server):
+        """Testa erro com tipo de ação inválido"""
+        with pytest.raises(ValueError, match='Tipo de ação desconhecido'):
+            asyncio.run(execute_action(Action('invalid'), None, 'android'))
+
+
+class TestAsyncEngine:
+    """Testes de integração do engine asyncio com o LoadTest"""
+    
+    def test_run_with_asyncio_engine(self, fake_appium_server):
+        """Testa execução completa com engine asyncio"""
+        test = LoadTest('Async Test', duration=1, virtual_users=3, engine='asyncio')
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2'],
+                          appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button').back())
+        
+        results = test.run()
+        
+        assert results.total_actions > 0
+        assert results.failed_actions == 0
+        assert len(fake_appium_server.commands('POST', '/session')) == 3
+        assert len(fake_appium_server.commands('DELETE')) == 3
+    
+    def test_unknown_engine(self):
+        """Testa erro com engine desconhecida"""
+        test = LoadTest('Test', engine='gevent')
+        test.add_platform('android', '/app.apk')
+        test.add_scenario(Scenario('Flow'))
+        
+        with pytest.raises(ValueError, match='Engine desconhecida'):
+            test.run()
+    
+    def test_engine_from_config(self, temp_dir):
+        """Testa seleção da engine pelo arquivo de configuração"""
+        import yaml
+        
+        config_file = temp_dir / 'config.yaml'
+        with open(config_file, 'w') as f:
+            yaml.dump({'test': {'name': 'T', 'duration': 10, 'engine': 'asyncio'}}, f)
+        
+        test = LoadTest('Test', config_file=str(config_file))
+        
+        assert test.engine == 'asyncio'
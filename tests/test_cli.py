@@ -41,6 +41,22 @@ class TestRunCommand:
         assert result.exit_code == 0
         assert 'config_file' in result.output.lower() or 'config' in result.output.lower()
     
+    def test_run_workers_option(self, cli_runner):
+        """Testa opção --workers no help do comando run"""
+        result = cli_runner.invoke(run, ['--help'])
+        
+        assert result.exit_code == 0
+        assert '--workers' in result.output
+    
+    def test_run_invalid_workers(self, cli_runner, temp_dir):
+        """Testa erro com número de workers inválido"""
+        yaml_file = temp_dir / 'config.yaml'
+        yaml_file.write_text('test: {name: Test, duration: 1}')
+        
+        result = cli_runner.invoke(run, [str(yaml_file), '--workers', '0'])
+        
+        assert result.exit_code == 2
+    
     def test_run_missing_config_file(self, cli_runner):
         """Testa erro ao não fornecer arquivo de config"""
         result = cli_runner.invoke(run, [])
@@ -123,6 +139,30 @@ virtual_users: 1
         assert result.exit_code in [0, 1, 2]
 
 
+class TestDistributedCommands:
+    """Testes para os comandos controller e worker"""
+    
+    def test_controller_help(self, cli_runner):
+        """Testa help do comando controller"""
+        result = cli_runner.invoke(main, ['controller', '--help'])
+        
+        assert result.exit_code == 0
+        assert '--expect-workers' in result.output
+    
+    def test_worker_help(self, cli_runner):
+        """Testa help do comando worker"""
+        result = cli_runner.invoke(main, ['worker', '--help'])
+        
+        assert result.exit_code == 0
+        assert '--controller' in result.output
+    
+    def test_worker_invalid_address(self, cli_runner):
+        """Testa erro com endereço de controller inválido"""
+        result = cli_runner.invoke(main, ['worker', '--controller', 'localhost'])
+        
+        assert result.exit_code == 2
+
+
 class TestReportCommand:
     """Testes para comando report"""
     
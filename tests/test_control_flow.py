@@ -0,0 +1,191 @@
+"""
+Testes para o controle de fluxo nos cenários (loop, if_present, random_branch e call)
+"""
+
+import asyncio
+import pickle
+import random
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchElementException
+from mobileloadx.core.async_engine import AsyncHTTPClient, AsyncVirtualUser, AsyncWebDriverSession
+from mobileloadx.core.control_flow import Loop, RandomBranch, Walk
+from mobileloadx.core.driver_script import DriverScriptBatch
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario, ScenarioRun
+
+
+def missing(*values):
+    """find_element que não encontra os valores indicados"""
+    element = MagicMock()
+    
+    def find_element(by, value):
+        if value in values:
+            raise NoSuchElementException(value)
+        return element
+    return find_element
+
+
+def executed(run):
+    return [(step['step'], step['action']) for step in run.steps]
+
+
+class TestWalk:
+    """Testes para o percurso da árvore de execução"""
+    
+    def test_loop_range_and_branch_weights(self):
+        """Testa repetições sorteadas no intervalo e ramo de peso zero nunca escolhido"""
+        program = [Loop((2, 4), [0]), RandomBranch([1, 0], [[1], [2]])]
+        
+        counts = set()
+        for seed in range(20):
+            nodes = list(Walk(program, random.Random(seed)))
+            assert 2 not in nodes
+            counts.add(nodes.count(0))
+        
+        assert counts == {2, 3, 4}
+
+
+class TestScenarioControlFlow:
+    """Testes para a execução das construções no engine de threads"""
+    
+    def test_loop_keeps_step_numbers(self, mock_driver):
+        """Testa navegação única com o corpo do loop repetido e as mesmas posições nas métricas"""
+        scenario = Scenario('Browse').tap(id='home').loop(3, Scenario('Produto').tap(id='product').back())
+        
+        run = scenario.execute(mock_driver, 'android')
+        
+        assert executed(run) == [(1, 'tap home')] + [(2, 'tap product'), (3, 'back')] * 3
+    
+    def test_if_present(self, mock_driver):
+        """Testa ramo then com o elemento na tela e else sem ele"""
+        scenario = Scenario('Flow').if_present(
+            Scenario('Popup').tap(id='dismiss'), Scenario('Sem popup').back(), id='popup'
+        )
+        
+        mock_driver.find_element.side_effect = missing()
+        shown = scenario.execute(mock_driver, 'android')
+        mock_driver.find_element.side_effect = missing('popup')
+        hidden = scenario.execute(mock_driver, 'android')
+        
+        assert executed(shown) == [(1, 'if_present popup'), (2, 'tap dismiss')]
+        assert executed(hidden) == [(1, 'if_present popup'), (3, 'back')]
+    
+    def test_probe_has_no_think_time(self):
+        """Testa verificação de presença sem think time"""
+        scenario = Scenario('Flow', think_time=5).if_present(Scenario('Popup').back(), id='popup')
+        
+        assert scenario.think_after(scenario.actions[0]) == 0
+        assert scenario.think_after(scenario.actions[1]) == 5
+    
+    def test_random_branch(self, mock_driver):
+        """Testa execução de um único ramo por iteração"""
+        scenario = Scenario('Flow').random_branch([(1, Scenario('Carrinho').tap(id='cart')), (1, None)])
+        
+        runs = [scenario.execute(mock_driver, 'android') for _ in range(30)]
+        
+        assert {len(run.steps) for run in runs} == {0, 1}
+    
+    def test_unbalanced_transaction_in_block(self):
+        """Testa transação aberta dentro de um bloco"""
+        with pytest.raises(ValueError, match='não foi fechada'):
+            Scenario('Flow').loop(2, Scenario('Body').transaction_start('T').back())
+    
+    def test_batch_inside_loop(self, mock_driver):
+        """Testa um lote por repetição no modo batch"""
+        mock_driver.execute_driver.return_value.result = {'steps': [
+            {'duration': 5, 'lookup': 1, 'poll': 0, 'error': None, 'offset': 5, 'think': 0}
+        ] * 2, 'implicit': 0}
+        scenario = Scenario('Flow', batch=True).loop(2, Scenario('Body').tap(id='product').back())
+        
+        (loop,) = scenario.execution_segments()
+        run = scenario.execute(mock_driver, 'android')
+        
+        assert isinstance(loop.body[0], DriverScriptBatch)
+        assert mock_driver.execute_driver.call_count == 2
+        assert len(run.steps) == 4
+
+
+class TestConfig:
+    """Testes para o carregamento das construções"""
+    
+    def test_from_dict_with_flows(self):
+        """Testa construções aninhadas, call e serialização"""
+        flows = {'Login': Scenario.from_dict({'name': 'Login', 'actions': [
+            {'input': {'id': 'email', 'text': 'user@example.com'}}, {'tap': {'id': 'submit'}}
+        ]})}
+        data = {'name': 'Session', 'actions': [
+            {'call': 'Login'},
+            {'loop': {'times': [2, 5], 'actions': [
+                {'tap': {'id': 'product'}},
+                {'random_branch': [
+                    {'weight': 30, 'actions': [{'tap': {'id': 'add_to_cart'}}]},
+                    {'weight': 70, 'actions': []}
+                ]},
+                {'back': {}}
+            ]}},
+            {'if_present': {'id': 'rate_app', 'timeout': 1, 'then': [{'tap': {'id': 'later'}}]}}
+        ]}
+        
+        scenario = Scenario.from_dict(data, flows)
+        restored = Scenario.from_dict(pickle.loads(pickle.dumps(scenario)).to_dict())
+        
+        assert [action.label for action in scenario.actions] == [
+            'input email', 'tap submit', 'tap product', 'tap add_to_cart', 'back', 'if_present rate_app', 'tap later'
+        ]
+        assert restored.to_dict() == scenario.to_dict()
+        assert scenario.to_dict()['actions'][0] == {'input': {'id': 'email', 'text': 'user@example.com'}}
+    
+    def test_invalid_constructs(self):
+        """Testa erros de configuração com a posição da construção"""
+        with pytest.raises(ValueError, match=r"ação 1 \(call\): Sub-cenário não definido"):
+            Scenario.from_dict({'name': 'Flow', 'actions': [{'call': 'Checkout'}]})
+        
+        with pytest.raises(ValueError, match=r"ação 1 \(loop\): ação 1 \(tap\)"):
+            Scenario.from_dict({'name': 'Flow', 'actions': [{'loop': {'times': 2, 'actions': [{'tap': {}}]}}]})
+        
+        with pytest.raises(ValueError, match='Repetições inválidas'):
+            Scenario.from_dict({'name': 'Flow', 'actions': [{'loop': {'times': [3, 1], 'actions': []}}]})
+
+
+class TestAsyncControlFlow:
+    """Testes para o controle de fluxo no engine asyncio"""
+    
+    def test_if_present_and_loop(self, fake_appium_server):
+        """Testa verificação de presença e loop pela sessão assíncrona"""
+        fake_appium_server.missing_elements.add('popup')
+        scenario = (
+            Scenario('Flow')
+            .if_present(Scenario('Popup').tap(id='dismiss'), id='popup')
+            .loop(2, Scenario('Produto').tap(id='product'))
+        )
+        user = AsyncVirtualUser(1, 'android', '/app.apk', scenarios=[(scenario, 100)])
+        run = ScenarioRun()
+        
+        async def execute():
+            user.session = AsyncWebDriverSession(AsyncHTTPClient(), fake_appium_server.url)
+            await user.session.create({})
+            await user._run_actions(scenario, run)
+        
+        asyncio.run(execute())
+        
+        assert executed(run) == [(1, 'if_present popup'), (3, 'tap product'), (3, 'tap product')]
+        assert len(fake_appium_server.commands('POST', '/click')) == 2
+
+
+class TestLoadTestControlFlow:
+    """Testes para o controle de fluxo na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_loop_metrics(self, fake_appium_server, engine):
+        """Testa repetições do loop agregadas na mesma métrica por ação"""
+        test = LoadTest('Flow', duration=1, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Browse', pacing=5).tap(id='home').loop(3, Scenario('Produto').tap(id='product')))
+        
+        results = test.run()
+        
+        assert results.failed_actions == 0
+        assert len(fake_appium_server.commands('POST', '/click')) == 4
+        steps = results.to_dict()['summary']['steps']['Browse']
+        assert steps['2. tap product']['count'] == 3
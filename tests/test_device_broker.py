@@ -0,0 +1,118 @@
+"""
+Testes para o broker de devices
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from mobileloadx.core.device_broker import DeviceBroker
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+
+
+class TestDeviceBroker:
+    """Testes para o empréstimo de devices"""
+    
+    def test_respects_session_cap(self):
+        """Testa limite de sessões simultâneas por device"""
+        broker = DeviceBroker(['d1', 'd2'], max_sessions_per_device=1)
+        
+        assert sorted([broker.acquire(0), broker.acquire(0)]) == ['d1', 'd2']
+        assert broker.acquire(0) is None
+    
+    def test_without_cap_never_waits(self):
+        """Testa comportamento padrão sem limite"""
+        broker = DeviceBroker(['d1'])
+        
+        assert [broker.acquire(0) for _ in range(3)] == ['d1', 'd1', 'd1']
+    
+    def test_release_hands_off_in_fifo_order(self):
+        """Testa repasse do device devolvido ao primeiro da fila"""
+        broker = DeviceBroker(['d1'], max_sessions_per_device=1)
+        broker.acquire(0)
+        order = []
+        
+        def waiter(name):
+            order.append((name, broker.acquire(2)))
+        
+        first = threading.Thread(target=waiter, args=('first',))
+        first.start()
+        while broker.waiting < 1:
+            time.sleep(0.005)
+        second = threading.Thread(target=waiter, args=('second',))
+        second.start()
+        while broker.waiting < 2:
+            time.sleep(0.005)
+        
+        broker.release('d1')
+        first.join()
+        broker.release('d1')
+        second.join()
+        
+        assert order == [('first', 'd1'), ('second', 'd1')]
+    
+    def test_timeout_returns_none(self):
+        """Testa fim da espera quando nenhum device é devolvido"""
+        broker = DeviceBroker(['d1'], max_sessions_per_device=1)
+        broker.acquire(0)
+        
+        start = time.monotonic()
+        assert broker.acquire(0.05) is None
+        assert time.monotonic() - start < 1
+        assert broker.waiting == 0
+    
+    def test_close_wakes_waiters(self):
+        """Testa se close() libera os usuários em espera"""
+        broker = DeviceBroker(['d1'], max_sessions_per_device=1)
+        broker.acquire(0)
+        result = []
+        
+        thread = threading.Thread(target=lambda: result.append(broker.acquire()))
+        thread.start()
+        while broker.waiting < 1:
+            time.sleep(0.005)
+        broker.close()
+        thread.join(1)
+        
+        assert result == [None]
+    
+    def test_acquire_async(self):
+        """Testa espera sem bloquear o event loop"""
+        broker = DeviceBroker(['d1'], max_sessions_per_device=1)
+        
+        async def scenario():
+            holder = await broker.acquire_async(0)
+            waiting = asyncio.ensure_future(broker.acquire_async(1))
+            await asyncio.sleep(0.01)
+            broker.release(holder)
+            return await waiting, await broker.acquire_async(0.01)
+        
+        assert asyncio.run(scenario()) == ('d1', None)
+    
+    def test_invalid_cap(self):
+        """Testa validação do limite"""
+        with pytest.raises(ValueError, match='max_sessions_per_device'):
+            DeviceBroker(['d1'], max_sessions_per_device=0)
+
+
+class TestLoadTestDeviceLease:
+    """Testes para o empréstimo de devices no LoadTest"""
+    
+    def test_users_wait_for_busy_device(self, fake_appium_server):
+        """Testa se usuários além da capacidade esperam em vez de abrir sessão"""
+        test = LoadTest('Lease', duration=0.5, virtual_users=2)
+        test.add_platform(
+            'android', '/app.apk',
+            devices=['d1'],
+            max_sessions_per_device=1,
+            appium_server_url=fake_appium_server.url
+        )
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        
+        results = test.run()
+        
+        assert len(fake_appium_server.commands('POST', '/session')) == 1
+        assert results.device_wait['count'] == 2
+        assert results.device_wait['timeouts'] == 1
+        assert results.failed_actions == 0
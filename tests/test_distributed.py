@@ -0,0 +1,191 @@
+"""
+Testes para o modo distribuído controller/worker
+"""
+
+import socket
+import threading
+import time
+import pytest
+from mobileloadx.core.distributed import (
+    Controller,
+    MetricsStreamer,
+    Worker,
+    encode_batch,
+    decode_batch,
+    send_message,
+    shard_to_dict,
+    shard_from_dict,
+)
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import split_shards
+
+
+class TestProtocol:
+    """Testes para a serialização do protocolo"""
+    
+    def test_batch_round_trip(self):
+        """Testa codificação compacta de lotes de métricas"""
+        records = [
+            {'user_id': 0, 'scenario': 'A', 'duration': 1.5, 'success': True, 'error': None},
+            {'user_id': 1, 'scenario': 'B', 'duration': 0.5, 'success': False, 'error': 'x'},
+        ]
+        
+        message = encode_batch('action', records)
+        
+        assert message['fields'] == ['user_id', 'scenario', 'duration', 'success', 'error']
+        assert len(message['rows']) == 2
+        assert decode_batch(message) == ('action', records)
+    
+    def test_shard_round_trip(self):
+        """Testa serialização de shards com plataformas e cenários"""
+        test = LoadTest('Test', duration=60, virtual_users=4)
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2'], platformVersion='13')
+        test.add_scenario(Scenario('Login').tap(id='login').input('user', id='email'), weight=70)
+        
+        shard = split_shards(test, 2)[1]
+        restored = shard_from_dict(shard_to_dict(shard))
+        
+        assert restored.user_id_offset == 2
+        assert restored.platforms[0].devices == ['d2']
+        assert restored.platforms[0].capabilities == {'platformVersion': '13'}
+        scenario, weight = restored.scenarios[0]
+        assert weight == 70
+        assert [a.action_type for a in scenario.actions] == ['tap', 'input']
+        assert scenario.actions[1].params == {'text': 'user', 'id': 'email'}
+        assert restored.device_metrics['devices'] == ['d2']
+
+
+class TestControllerWorker:
+    """Testes de integração em localhost"""
+    
+    def test_no_workers_timeout(self):
+        """Testa erro quando nenhum worker se registra"""
+        controller = Controller(LoadTest('Test'), host='127.0.0.1', port=0)
+        try:
+            with pytest.raises(TimeoutError):
+                controller.wait_for_workers(timeout=0.2)
+        finally:
+            controller.close()
+    
+    def test_streamer_record_kinds(self):
+        """Testa registros de qualquer tipo enviados ao controller em mais de um lote"""
+        test = LoadTest('Test')
+        controller = Controller(test, host='127.0.0.1', port=0)
+        sock = socket.create_connection(('127.0.0.1', controller.port))
+        wfile = sock.makefile('wb')
+        try:
+            send_message(wfile, {'type': 'register', 'name': 'host-0'})
+            controller.wait_for_workers(timeout=5)
+            streamer = MetricsStreamer(lambda message: send_message(wfile, message))
+            
+            for index in range(2):
+                streamer.on_record('step', {'scenario': 'Flow', 'step': index})
+                streamer.on_record('action', {'user_id': index})
+                streamer.flush()
+            send_message(wfile, {'type': 'done'})
+            controller._receive(controller.workers[0])
+        finally:
+            wfile.close()
+            sock.close()
+            controller.close()
+        
+        assert [m['step'] for m in test.metrics_collector.step_metrics] == [0, 1]
+        assert len(test.metrics_collector.action_metrics) == 2
+    
+    def test_missing_data_source_fails_fast(self, fake_appium_server, temp_dir):
+        """Testa worker sem o arquivo da fonte de dados recusando o shard e teste interrompido"""
+        test = LoadTest('Distributed', duration=30, virtual_users=1)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(
+            Scenario('Login', data_sources=[{'name': 'users', 'path': str(temp_dir / 'missing.csv')}]).tap(id='a')
+        )
+        controller = Controller(test, host='127.0.0.1', port=0)
+        worker = Worker('127.0.0.1', controller.port, name='host-0')
+        executed = []
+        thread = threading.Thread(target=lambda: executed.append(worker.run()), daemon=True)
+        thread.start()
+        
+        try:
+            controller.wait_for_workers(timeout=10)
+            test.runner = controller
+            results = test.run()
+        finally:
+            controller.close()
+        thread.join(timeout=10)
+        
+        assert executed == [False]
+        assert results.duration < 10
+        assert not fake_appium_server.commands('POST', '/session')
+    
+    def test_warmup_windows_line_up(self, fake_appium_server):
+        """Testa medição iniciada junto em todos os workers, depois do warm-up mais lento"""
+        test = LoadTest('Distributed', duration=0.5, virtual_users=2)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.set_warmup(backoff=0.5, jitter=0)
+        fake_appium_server.refuse_sessions = 1  # um dos workers só fica pronto após o backoff
+        
+        controller = Controller(test, host='127.0.0.1', port=0, expected_workers=2)
+        workers = [Worker('127.0.0.1', controller.port, name=f'host-{i}') for i in range(2)]
+        threads = [threading.Thread(target=w.run, daemon=True) for w in workers]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            assert controller.wait_for_workers(timeout=10) == 2
+            test.runner = controller
+            started = time.monotonic()
+            results = test.run()
+        finally:
+            controller.close()
+        
+        for thread in threads:
+            thread.join(timeout=10)
+        
+        starts = [worker.test.start_monotonic for worker in workers]
+        assert test.start_monotonic - started >= 0.5
+        assert all(abs(start - test.start_monotonic) < 0.1 for start in starts)
+        assert results.total_actions > 0
+    
+    @pytest.mark.slow
+    def test_distributed_run(self, fake_appium_server):
+        """Testa execução distribuída com dois workers"""
+        test = LoadTest('Distributed', duration=2, virtual_users=4, engine='asyncio')
+        test.add_platform('android', '/app.apk', devices=['shared'],
+                          appium_server_url='http://unreachable:1')
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        
+        controller = Controller(test, host='127.0.0.1', port=0, expected_workers=2)
+        workers = [
+            Worker('127.0.0.1', controller.port, name=f'host-{i}',
+                   devices={'android': [f'device-{i}']},
+                   appium_server_url=fake_appium_server.url)
+            for i in range(2)
+        ]
+        threads = [threading.Thread(target=w.run, daemon=True) for w in workers]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            assert controller.wait_for_workers(timeout=10) == 2
+            test.runner = controller
+            results = test.run()
+        finally:
+            controller.close()
+        
+        for thread in threads:
+            thread.join(timeout=10)
+        
+        user_ids = {m['user_id'] for m in results.metrics['action_metrics']}
+        udids = {
+            body['capabilities']['alwaysMatch'].get('appium:udid')
+            for method, path, body in fake_appium_server.requests
+            if method == 'POST' and path == '/session'
+        }
+        assert results.total_actions > 0
+        assert user_ids == {0, 1, 2, 3}
+        assert udids == {'device-0', 'device-1'}
+        assert {w.name for w in controller.workers} == {'host-0', 'host-1'}
+        assert len(fake_appium_server.commands('POST', '/session')) == 4
+        assert not fake_appium_server.sessions  # todas as sessões encerradas
@@ -0,0 +1,125 @@
+"""
+Testes para a distribuição de usuários entre plataformas e devices
+"""
+
+import pytest
+from mobileloadx.core.distribution import (
+    compute_platform_quotas,
+    PlatformAllocator,
+    DeviceSelector,
+)
+from mobileloadx.core.load_test import LoadTest, PlatformConfig
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import split_shards
+
+
+def _platform(name, users=None, share=None):
+    return PlatformConfig(platform=name, app='/app', devices=[], capabilities={}, users=users, share=share)
+
+
+class TestPlatformQuotas:
+    """Testes para o cálculo de quotas por plataforma"""
+    
+    def test_equal_split_by_default(self):
+        """Testa divisão igual sem users/share"""
+        assert compute_platform_quotas([_platform('android'), _platform('ios')], 5) == [3, 2]
+    
+    def test_share_and_absolute_quota(self):
+        """Testa quota absoluta combinada com shares relativos"""
+        platforms = [_platform('android', users=2), _platform('ios', share=3), _platform('android', share=1)]
+        
+        assert compute_platform_quotas(platforms, 10) == [2, 6, 2]
+    
+    def test_absolute_quota_exceeds_total(self):
+        """Testa erro quando as quotas absolutas excedem o total"""
+        with pytest.raises(ValueError, match='excedem'):
+            compute_platform_quotas([_platform('android', users=5)], 3)
+    
+    def test_allocator_interleaves_platforms(self):
+        """Testa intercalação das plataformas durante o ramp-up"""
+        allocator = PlatformAllocator([_platform('android', share=2), _platform('ios')], 6)
+        
+        order = [allocator.next_platform() for _ in range(7)]
+        
+        assert order[:3] == [0, 1, 0]
+        assert order.count(0) == 4 and order.count(1) == 2
+        assert order[-1] is None
+
+
+class TestDeviceSelector:
+    """Testes para as estratégias de escolha de device"""
+    
+    def test_round_robin(self):
+        """Testa round-robin entre devices"""
+        selector = DeviceSelector(['d1', 'd2'])
+        
+        assert [selector.acquire() for _ in range(3)] == ['d1', 'd2', 'd1']
+    
+    def test_least_loaded(self):
+        """Testa escolha do device com menos usuários ativos"""
+        selector = DeviceSelector(['d1', 'd2'], 'least-loaded')
+        selector.acquire()
+        selector.acquire()
+        selector.release('d1')
+        
+        assert selector.acquire() == 'd1'
+    
+    def test_weighted(self):
+        """Testa distribuição ponderada por device_weights"""
+        selector = DeviceSelector(['d1', 'd2'], 'weighted', {'d1': 3, 'd2': 1})
+        
+        picks = [selector.acquire() for _ in range(8)]
+        
+        assert picks.count('d1') == 6
+        assert picks.count('d2') == 2
+    
+    def test_no_devices(self):
+        """Testa plataforma sem devices configurados"""
+        assert DeviceSelector([]).acquire() is None
+    
+    def test_unknown_strategy(self):
+        """Testa erro com estratégia desconhecida"""
+        with pytest.raises(ValueError, match='Estratégia de distribuição desconhecida'):
+            DeviceSelector(['d1'], 'random')
+
+
+class TestMultiPlatformLoadTest:
+    """Testes de integração com múltiplas plataformas"""
+    
+    def test_all_platforms_receive_users(self, fake_appium_server):
+        """Testa se todas as plataformas executam e as métricas são separadas"""
+        test = LoadTest('Mixed', duration=1, virtual_users=3)
+        test.add_platform('android', '/app.apk', devices=['a1'], users=2,
+                          appium_server_url=fake_appium_server.url)
+        test.add_platform('ios', '/app.ipa', devices=['i1'],
+                          appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        
+        results = test.run()
+        
+        assert set(results.platforms) == {'android', 'ios'}
+        assert results.platforms['android']['failed'] == 0
+        platforms = sorted(
+            body['capabilities']['alwaysMatch']['platformName']
+            for method, path, body in fake_appium_server.requests
+            if method == 'POST' and path == '/session'
+        )
+        assert platforms == ['Android', 'Android', 'iOS']
+    
+    def test_shards_split_platform_quotas(self):
+        """Testa divisão das quotas de cada plataforma entre shards"""
+        test = LoadTest('Mixed', virtual_users=5)
+        test.add_platform('android', '/app.apk', share=3)
+        test.add_platform('ios', '/app.ipa', share=2)
+        
+        shards = split_shards(test, 2)
+        
+        assert [[p.users for p in s.platforms] for s in shards] == [[2, 1], [1, 1]]
+        assert [s.virtual_users for s in shards] == [3, 2]
+    
+    def test_unknown_distribute(self):
+        """Testa erro com estratégia desconhecida em add_platform"""
+        test = LoadTest('Test')
+        
+        with pytest.raises(ValueError, match='Estratégia de distribuição desconhecida'):
+            test.add_platform('android', '/app.apk', distribute='random')
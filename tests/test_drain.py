@@ -0,0 +1,103 @@
+"""
+Testes para o drain e o hard stop no fim do teste
+"""
+
+import threading
+import time
+import pytest
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario, ScenarioCancelled
+from mobileloadx.metrics.collector import MetricsCollector
+
+
+class TestScenarioCancellation:
+    """Testes para a interrupção cooperativa do cenário"""
+    
+    def test_wait_is_interrupted(self, mock_driver):
+        """Testa se a espera termina assim que o cancelamento é pedido"""
+        cancel_event = threading.Event()
+        threading.Timer(0.05, cancel_event.set).start()
+        
+        start = time.monotonic()
+        with pytest.raises(ScenarioCancelled):
+            Scenario('Flow').wait(5).execute(mock_driver, 'android', cancel_event)
+        
+        assert time.monotonic() - start < 1
+    
+    def test_cancelled_before_next_action(self, mock_driver):
+        """Testa se nenhuma ação é executada após o cancelamento"""
+        cancel_event = threading.Event()
+        cancel_event.set()
+        
+        with pytest.raises(ScenarioCancelled):
+            Scenario('Flow').back().execute(mock_driver, 'android', cancel_event)
+        
+        mock_driver.back.assert_not_called()
+
+
+class TestOvertimeMetrics:
+    """Testes para resultados fora da janela do teste"""
+    
+    def test_overtime_excluded_from_summary(self):
+        """Testa se cenários após o fim do teste não entram nos percentis"""
+        collector = MetricsCollector()
+        collector.record_action(user_id=1, scenario='Flow', duration=0.1, success=True)
+        collector.record_action(user_id=2, scenario='Flow', duration=9.0, success=True, overtime=True)
+        collector.record_action(user_id=3, scenario='Flow', duration=0, success=False, overtime=True, cancelled=True)
+        collector.record_drain(in_flight=2, overrun=1.5, hard_stop=True, cancelled=1)
+        
+        summary = collector._calculate_summary()
+        
+        assert summary['total_actions'] == 1
+        assert summary['failed_actions'] == 0
+        assert summary['response_time']['max'] == pytest.approx(0.1)
+        assert summary['drain'] == {
+            'in_flight': 2, 'overrun': 1.5, 'hard_stop': True, 'cancelled': 1, 'overtime_actions': 2
+        }
+
+
+class TestLoadTestDrain:
+    """Testes para o encerramento do LoadTest"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_hard_stop_cancels_stuck_scenarios(self, fake_appium_server, engine):
+        """Testa cancelamento dos cenários que excedem o drain"""
+        test = LoadTest('Drain', duration=0.3, virtual_users=2, engine=engine, drain_timeout=0.2)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Slow').wait(5))
+        
+        start = time.monotonic()
+        results = test.run()
+        
+        assert time.monotonic() - start < 3
+        assert results.drain['hard_stop'] is True
+        assert results.drain['cancelled'] == 2
+        assert results.total_actions == 0
+        assert len(fake_appium_server.commands('DELETE')) == 2
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_drain_lets_scenarios_finish(self, fake_appium_server, engine):
+        """Testa conclusão dentro do drain, marcada como fora da janela"""
+        test = LoadTest('Drain', duration=0.1, virtual_users=1, engine=engine, drain_timeout=5)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Slow').wait(0.4))
+        
+        results = test.run()
+        
+        assert results.drain['hard_stop'] is False
+        assert results.drain['in_flight'] == 1
+        assert results.drain['overtime_actions'] == 1
+        assert results.total_actions == 0
+        assert results.metrics['action_metrics'][0]['success'] is True
+    
+    def test_drain_timeout_from_config(self, temp_dir):
+        """Testa carregamento do drain_timeout do arquivo de configuração"""
+        import yaml
+        
+        config_file = temp_dir / 'config.yaml'
+        with open(config_file, 'w') as f:
+            yaml.dump({'test': {'name': 'T', 'duration': 10, 'drain_timeout': 5}}, f)
+        
+        test = LoadTest('Test', config_file=str(config_file))
+        
+        assert test.drain_timeout == 5
@@ -0,0 +1,140 @@
+"""
+Testes para a execução de ações em lote no servidor (executeDriverScript)
+"""
+
+import json
+import pytest
+from mobileloadx.core.driver_script import DriverScriptBatch, DriverScriptError
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario, ScenarioRun
+from mobileloadx.core.session_metadata import SessionMetadata
+
+
+def server_steps(*durations, error=None):
+    """Resultado do script com um passo por duração (ms)"""
+    steps = []
+    offset = 0
+    for duration in durations:
+        offset += duration
+        steps.append({'duration': duration, 'lookup': 1, 'poll': 0, 'error': None, 'offset': offset, 'think': 0})
+    if error:
+        steps[-1]['error'] = error
+    return {'steps': steps, 'implicit': 0}
+
+
+class TestSegments:
+    """Testes para a divisão do cenário em lotes"""
+    
+    def test_client_actions_split_batches(self):
+        """Testa rotate e marcadores de transação fora dos lotes"""
+        scenario = (
+            Scenario('Flow', batch=True)
+            .transaction_start('Login').tap(id='a').input('x', id='b').transaction_end('Login')
+            .rotate('landscape').scroll().back()
+        )
+        
+        segments = scenario.execution_segments()
+        
+        assert [
+            [index for index, _ in segment.items] if isinstance(segment, DriverScriptBatch) else segment
+            for segment in segments
+        ] == [0, [1, 2], 3, 4, [5, 6]]
+    
+    def test_disabled_by_default(self):
+        """Testa execução ação a ação sem batch"""
+        assert Scenario('Flow').tap(id='a').back().execution_segments() == [0, 1]
+    
+    def test_script_data(self):
+        """Testa think time, implicit wait e gestos relativos serializados a cada execução"""
+        scenario = Scenario('Flow', batch=True).tap(id='login', timeout=5).scroll()
+        (batch,) = scenario.execution_segments()
+        metadata = SessionMetadata()
+        metadata.changed('implicit_wait', 2)
+        
+        script, timeout_ms = batch.prepare([0.5, 0], metadata, {'width': 1000, 'height': 2000})
+        
+        data = json.loads(script.split('\n', 1)[0][len('const data = '):-1])
+        assert data['think'] == [500, 0]
+        assert data['implicit'] == 2000
+        assert data['payloads']['1'][0]['actions'][0]['y'] == 1600
+        assert 'driver.elementClick(await element(t, "id", "login", 5000' in script
+        assert timeout_ms == 65500
+    
+    def test_serialization(self):
+        """Testa batch preservado em to_dict/from_dict"""
+        restored = Scenario.from_dict(Scenario('Flow', batch=True).tap(id='a').to_dict())
+        
+        assert restored.batch is True
+        assert isinstance(restored.execution_segments()[0], DriverScriptBatch)
+
+
+class TestScenarioBatch:
+    """Testes para a execução em lote no engine de threads"""
+    
+    def test_single_call_with_server_timings(self, mock_driver):
+        """Testa um executeDriverScript por lote e tempos medidos no servidor"""
+        mock_driver.execute_driver.return_value.result = server_steps(120, 80)
+        
+        scenario = Scenario('Flow', batch=True).tap(id='a').input('x', id='b').rotate('landscape')
+        run = scenario.execute(mock_driver, 'android')
+        
+        mock_driver.execute_driver.assert_called_once()
+        mock_driver.find_element.assert_not_called()
+        assert mock_driver.orientation == 'LANDSCAPE'
+        assert [step['duration'] for step in run.steps[:2]] == pytest.approx([0.12, 0.08])
+        assert run.steps[0]['lookup'] == pytest.approx(0.001)
+        assert len(run.steps) == 3
+    
+    def test_server_think_time_is_discounted(self, mock_driver):
+        """Testa think time executado no servidor fora da transação"""
+        result = server_steps(100, 100)
+        result['steps'][0]['think'] = 300
+        mock_driver.execute_driver.return_value.result = result
+        scenario = Scenario('Flow', batch=True).transaction_start('T').tap(id='a').tap(id='b').transaction_end('T')
+        
+        run = scenario.execute(mock_driver, 'android')
+        
+        assert run.paused == pytest.approx(0.3)
+        assert run.transactions[0]['duration'] < 0.3
+    
+    def test_failed_step_stops_scenario(self, mock_driver):
+        """Testa falha no servidor registrada na ação e propagada"""
+        mock_driver.execute_driver.return_value.result = server_steps(10, 50, error='Elemento não encontrado')
+        scenario = Scenario('Flow', batch=True).tap(id='a').tap(id='b').tap(id='c')
+        run = ScenarioRun()
+        
+        with pytest.raises(DriverScriptError, match='não encontrado'):
+            scenario.execute(mock_driver, 'android', run=run)
+        
+        assert [step['success'] for step in run.steps] == [True, False]
+    
+    def test_call_failure(self, mock_driver):
+        """Testa falha da chamada (ex.: plugin ausente) registrada na primeira ação do lote"""
+        mock_driver.execute_driver.side_effect = RuntimeError('plugin execute-driver ausente')
+        run = ScenarioRun()
+        
+        with pytest.raises(RuntimeError):
+            Scenario('Flow', batch=True).tap(id='a').tap(id='b').execute(mock_driver, 'android', run=run)
+        
+        assert len(run.steps) == 1
+        assert run.steps[0]['error'] == 'plugin execute-driver ausente'
+
+
+class TestLoadTestBatch:
+    """Testes para o modo batch na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_one_request_per_batch(self, fake_appium_server, engine):
+        """Testa uma requisição execute_driver por iteração, sem buscas pelo cliente"""
+        test = LoadTest('Batch', duration=0.2, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow', pacing=1, batch=True).tap(id='login').input('user', id='email').scroll())
+        
+        results = test.run()
+        
+        assert results.total_actions == 1
+        assert results.failed_actions == 0
+        assert len(fake_appium_server.commands('POST', '/appium/execute_driver')) == 1
+        assert fake_appium_server.commands('POST', '/element') == []
+        steps = results.to_dict()['summary']['steps']['Flow']
+        assert steps['1. tap login']['avg'] == pytest.approx(0.002)
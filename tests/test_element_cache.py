@@ -0,0 +1,126 @@
+"""
+Testes para o cache de elementos por sessão
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import StaleElementReferenceException
+from mobileloadx.core.element_cache import ElementCache
+from mobileloadx.core.async_engine import AsyncHTTPClient, AsyncWebDriverSession, execute_action
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.metrics.collector import MetricsCollector
+
+
+class TestElementCache:
+    """Testes para os contadores do cache"""
+    
+    def test_counters(self):
+        """Testa hits, misses e handles expirados"""
+        cache = ElementCache()
+        
+        assert cache.get('login') is None
+        cache.put('login', 'el-1')
+        assert cache.get('login') == 'el-1'
+        cache.invalidate('login')
+        
+        assert cache.get('login') is None
+        assert cache.take_counters() == {'hits': 1, 'misses': 2, 'stale': 1}
+        assert cache.take_counters() == {'hits': 0, 'misses': 0, 'stale': 0}
+    
+    def test_summary(self):
+        """Testa resumo com as buscas evitadas"""
+        collector = MetricsCollector()
+        collector.record_element_cache(1, 'android', hits=8, misses=2, stale=1)
+        collector.record_element_cache(2, 'android', hits=2, misses=2, stale=0)
+        
+        summary = collector._calculate_summary()['element_cache']
+        
+        assert summary['lookups_saved'] == 9
+        assert summary['hit_rate'] == pytest.approx(10 / 14)
+
+
+class TestScenarioElementCache:
+    """Testes para o reaproveitamento de elementos no engine de threads"""
+    
+    def test_reuses_element(self, mock_driver):
+        """Testa busca única para o mesmo locator"""
+        cache = ElementCache()
+        scenario = Scenario('Flow').tap(id='login').input('user', id='login')
+        
+        with patch('mobileloadx.core.scenario.WebDriverWait') as mock_wait_class:
+            element = mock_wait_class.return_value.until.return_value
+            run = scenario.execute(mock_driver, 'android', cache=cache)
+            scenario.execute(mock_driver, 'android', cache=cache)
+        
+        assert mock_wait_class.return_value.until.call_count == 1
+        assert element.click.call_count == 2
+        assert (cache.hits, cache.misses) == (3, 1)
+        assert run.steps[1]['lookup'] < 0.01
+    
+    def test_stale_element_is_found_again(self, mock_driver):
+        """Testa nova busca e repetição da interação com handle expirado"""
+        cache = ElementCache()
+        stale, fresh = MagicMock(), MagicMock()
+        stale.click.side_effect = StaleElementReferenceException('tela recriada')
+        cache.put(('id', 'login'), stale)
+        
+        with patch('mobileloadx.core.scenario.WebDriverWait') as mock_wait_class:
+            mock_wait_class.return_value.until.return_value = fresh
+            Scenario('Flow').tap(id='login').execute(mock_driver, 'android', cache=cache)
+        
+        fresh.click.assert_called_once()
+        assert cache.stale == 1
+        assert cache.get(('id', 'login')) is fresh
+    
+    def test_disabled_by_default(self, mock_driver):
+        """Testa busca a cada execução sem cache"""
+        scenario = Scenario('Flow').tap(id='login')
+        
+        with patch('mobileloadx.core.scenario.WebDriverWait') as mock_wait_class:
+            scenario.execute(mock_driver, 'android')
+            scenario.execute(mock_driver, 'android')
+        
+        assert mock_wait_class.return_value.until.call_count == 2
+
+
+class TestAsyncElementCache:
+    """Testes para o cache de elementos no engine asyncio"""
+    
+    def test_stale_element_is_found_again(self, fake_appium_server):
+        """Testa nova busca após "stale element reference" do servidor"""
+        action = Scenario('Flow').tap(id='login').actions[0]
+        cache = ElementCache()
+        
+        async def run():
+            session = AsyncWebDriverSession(AsyncHTTPClient(), fake_appium_server.url)
+            await session.create({})
+            await execute_action(action, session, 'android', cache)
+            fake_appium_server.stale_elements.add('el-login')
+            await execute_action(action, session, 'android', cache)
+            await execute_action(action, session, 'android', cache)
+        
+        asyncio.run(run())
+        
+        assert len(fake_appium_server.commands('POST', '/element')) == 2
+        assert len(fake_appium_server.commands('POST', '/click')) == 4
+        assert cache.take_counters() == {'hits': 2, 'misses': 1, 'stale': 1}
+
+
+class TestLoadTestElementCache:
+    """Testes para o cache de elementos na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_results_include_cache_counters(self, fake_appium_server, engine):
+        """Testa busca única por sessão e contadores nos resultados"""
+        test = LoadTest('Cache', duration=0.3, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url, element_cache=True)
+        test.add_scenario(Scenario('Flow', pacing=0.1).tap(id='login'))
+        
+        results = test.run()
+        
+        assert results.total_actions >= 2
+        assert len(fake_appium_server.commands('POST', '/element')) == 1
+        assert results.element_cache['misses'] == 1
+        assert results.element_cache['hits'] >= results.total_actions - 1
@@ -0,0 +1,170 @@
+"""
+Testes para a política de falha das ações (novas tentativas, continue e screenshot)
+"""
+
+import asyncio
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from mobileloadx.core.async_engine import AsyncHTTPClient, AsyncVirtualUser, AsyncWebDriverSession
+from mobileloadx.core.driver_script import DriverScriptBatch
+from mobileloadx.core.failure_policy import FailurePolicy
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Action, Scenario, ScenarioRun
+
+
+def flaky_click(mock_driver, *effects):
+    """Faz o click do elemento seguir effects (exceção ou None)"""
+    mock_driver.find_element.return_value.click.side_effect = list(effects)
+
+
+class TestFailurePolicy:
+    """Testes para a configuração da política"""
+    
+    def test_parse_and_serialize(self):
+        """Testa número de tentativas, dicionário e serialização só dos campos alterados"""
+        assert FailurePolicy.parse(2) == FailurePolicy(retries=2)
+        assert FailurePolicy.parse({'on_failure': 'continue', 'screenshot': True}).to_dict() == {
+            'on_failure': 'continue', 'screenshot': True
+        }
+        assert FailurePolicy(backoff=1, max_backoff=3).delay(4) == 3
+    
+    def test_invalid(self):
+        """Testa modo desconhecido e tentativas negativas"""
+        with pytest.raises(ValueError, match='on_failure desconhecido'):
+            FailurePolicy(on_failure='ignore')
+        
+        with pytest.raises(ValueError, match='retries'):
+            FailurePolicy(retries=-1)
+
+
+class TestScenarioFailurePolicy:
+    """Testes para a política na execução do engine de threads"""
+    
+    def test_retry_recorded_apart(self, mock_driver):
+        """Testa falha instável repetida e tentativas registradas à parte"""
+        flaky_click(mock_driver, WebDriverException('flaky'), None)
+        scenario = Scenario('Login', failure_policy={'retries': 2, 'backoff': 0.05}).tap(id='login')
+        
+        run = scenario.execute(mock_driver, 'android')
+        
+        (step,) = run.steps
+        assert step['success'] and step['retries'] == 1
+        assert step['retry_time'] >= 0.05
+        assert step['duration'] < step['retry_time']
+    
+    def test_retries_exhausted(self, mock_driver):
+        """Testa iteração encerrada após a última tentativa"""
+        flaky_click(mock_driver, *[WebDriverException('flaky')] * 3)
+        scenario = Scenario('Login', failure_policy={'retries': 2, 'backoff': 0}).tap(id='login').back()
+        run = ScenarioRun()
+        
+        with pytest.raises(WebDriverException):
+            scenario.execute(mock_driver, 'android', run=run)
+        
+        assert [(step['success'], step['retries']) for step in run.steps] == [(False, 2)]
+        mock_driver.back.assert_not_called()
+    
+    def test_continue_and_action_override(self, mock_driver):
+        """Testa cenário seguindo após a falha e política da ação substituindo a do cenário"""
+        flaky_click(mock_driver, WebDriverException('popup'), WebDriverException('submit'))
+        scenario = Scenario('Flow', failure_policy={'on_failure': 'continue'})
+        scenario.add_action(Action('tap', id='popup'))
+        scenario.add_action(Action('tap', id='submit', failure_policy={'on_failure': 'abort_iteration'}))
+        run = ScenarioRun()
+        
+        with pytest.raises(WebDriverException, match='submit'):
+            scenario.execute(mock_driver, 'android', run=run)
+        
+        assert [step['success'] for step in run.steps] == [False, False]
+    
+    def test_session_lost_not_retried(self, mock_driver):
+        """Testa sessão perdida sem novas tentativas nem continue"""
+        flaky_click(mock_driver, InvalidSessionIdException('invalid session id'))
+        scenario = Scenario('Login', failure_policy={'retries': 3, 'on_failure': 'continue'}).tap(id='login')
+        
+        with pytest.raises(InvalidSessionIdException):
+            scenario.execute(mock_driver, 'android')
+        
+        assert mock_driver.find_element.return_value.click.call_count == 1
+    
+    def test_screenshot(self, mock_driver, temp_dir):
+        """Testa screenshot salvo quando a ação falha"""
+        flaky_click(mock_driver, WebDriverException('flaky'))
+        scenario = Scenario('Check out', failure_policy={
+            'on_failure': 'continue', 'screenshot': True, 'screenshot_dir': str(temp_dir)
+        }).tap(id='pay')
+        
+        scenario.execute(mock_driver, 'android')
+        
+        (path,), _ = mock_driver.get_screenshot_as_file.call_args
+        assert path.startswith(str(temp_dir / 'Check_out-1-'))
+    
+    def test_timeout_and_batch(self):
+        """Testa timeout padrão do cenário e ações com política fora dos lotes"""
+        scenario = Scenario('Flow', batch=True, timeout=3).tap(id='home').back()
+        scenario.add_action(Action('tap', id='cart', failure_policy=1))
+        
+        segments = scenario.execution_segments()
+        
+        assert scenario.actions[0].default_timeout == 3
+        assert isinstance(segments[0], DriverScriptBatch) and segments[1] == 2
+    
+    def test_config_round_trip(self):
+        """Testa política e timeout lidos da configuração e serializados"""
+        data = {'name': 'Flow', 'timeout': 5, 'failure_policy': 2, 'actions': [
+            {'tap': {'id': 'home', 'failure_policy': {'on_failure': 'continue'}}}
+        ]}
+        
+        scenario = Scenario.from_dict(data)
+        
+        assert scenario.actions[0].failure == FailurePolicy(on_failure='continue')
+        assert scenario.to_dict() == {'name': 'Flow', 'timeout': 5, 'failure_policy': {'retries': 2}, 'actions': [
+            {'tap': {'id': 'home', 'failure_policy': {'on_failure': 'continue'}}}
+        ]}
+
+
+class TestAsyncFailurePolicy:
+    """Testes para a política no engine asyncio"""
+    
+    def test_retry_continue_and_screenshot(self, fake_appium_server, temp_dir):
+        """Testa tentativas, continue e screenshot pela sessão assíncrona"""
+        fake_appium_server.missing_elements.add('popup')
+        scenario = Scenario('Flow', timeout=0, failure_policy={
+            'retries': 1, 'backoff': 0, 'on_failure': 'continue', 'screenshot': True, 'screenshot_dir': str(temp_dir)
+        }).tap(id='popup').tap(id='home')
+        user = AsyncVirtualUser(1, 'android', '/app.apk', scenarios=[(scenario, 100)])
+        run = ScenarioRun()
+        
+        async def execute():
+            user.session = AsyncWebDriverSession(AsyncHTTPClient(), fake_appium_server.url)
+            await user.session.create({})
+            await user._run_actions(scenario, run)
+        
+        asyncio.run(execute())
+        
+        assert [(step['success'], step['retries']) for step in run.steps] == [(False, 1), (True, 0)]
+        (screenshot,) = temp_dir.iterdir()
+        assert screenshot.read_bytes() == b'PNG'
+
+
+class TestLoadTestFailurePolicy:
+    """Testes para a política na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_tolerated_failure(self, fake_appium_server, engine):
+        """Testa iteração concluída com a ação tolerada e tentativas nas métricas da ação"""
+        fake_appium_server.missing_elements.add('popup')
+        test = LoadTest('Policy', duration=1, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(
+            Scenario('Flow', pacing=5, timeout=0, failure_policy={'retries': 1, 'backoff': 0, 'on_failure': 'continue'})
+            .tap(id='popup').tap(id='home')
+        )
+        
+        results = test.run()
+        
+        assert results.failed_actions == 0
+        steps = results.to_dict()['summary']['steps']['Flow']
+        assert steps['1. tap popup']['retries'] == 1
+        assert steps['1. tap popup']['error_rate'] == 100
+        assert steps['2. tap home']['count'] == 1
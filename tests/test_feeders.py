@@ -0,0 +1,182 @@
+"""
+Testes para as fontes de dados (feeders)
+"""
+
+import json
+import pickle
+import threading
+import pytest
+from mobileloadx.core.feeders import DataFeeder, DataSourceConfig, DataSourceExhausted, substitute
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import build_shard_test, split_shards
+
+
+@pytest.fixture
+def users_csv(temp_dir):
+    """CSV com 4 usuários"""
+    path = temp_dir / 'users.csv'
+    path.write_text('email,password\n' + ''.join(f'user{i}@example.com,pw{i}\n' for i in range(4)))
+    return str(path)
+
+
+def feeder(path, mode='sequential'):
+    return DataFeeder(DataSourceConfig(name='users', path=path, mode=mode))
+
+
+class TestDataFeeder:
+    """Testes para leitura e atribuição das linhas"""
+    
+    def test_csv_and_jsonl_rows(self, users_csv, temp_dir):
+        """Testa leitura por posição de CSV e JSONL (linhas em branco ignoradas)"""
+        path = temp_dir / 'products.jsonl'
+        path.write_text('{"sku": 10, "name": "a"}\n\n{"sku": 20, "name": "b"}\n')
+        products = DataFeeder(DataSourceConfig(name='products', path=str(path)))
+        
+        assert feeder(users_csv).row(2) == {'email': 'user2@example.com', 'password': 'pw2'}
+        assert len(products) == 2
+        assert products.row(1) == {'sku': 20, 'name': 'b'}
+    
+    @pytest.mark.parametrize('mode, expected', [
+        ('sequential', [0, 1, 2, 3]),
+        ('circular', [0, 1, 2, 3, 0, 1]),
+        ('unique', [2, 2, 2]),
+    ])
+    def test_modes(self, users_csv, mode, expected):
+        """Testa a ordem das linhas em cada modo"""
+        source = feeder(users_csv, mode)
+        
+        rows = [source.next_row(user_id=2)['password'] for _ in expected]
+        
+        assert rows == [f'pw{i}' for i in expected]
+    
+    def test_exhausted(self, users_csv):
+        """Testa fim do arquivo no sequential e usuário sem linha no unique"""
+        source = feeder(users_csv)
+        for _ in range(4):
+            source.next_row(0)
+        
+        with pytest.raises(DataSourceExhausted, match='esgotada'):
+            source.next_row(0)
+        
+        with pytest.raises(DataSourceExhausted, match='usuário 4'):
+            feeder(users_csv, 'unique').next_row(4)
+    
+    def test_threads_never_share_a_row(self, temp_dir):
+        """Testa cursor sequencial entre threads sem linhas repetidas"""
+        path = temp_dir / 'ids.jsonl'
+        path.write_text(''.join(json.dumps({'id': i}) + '\n' for i in range(2000)))
+        source = DataFeeder(DataSourceConfig(name='ids', path=str(path)))
+        seen = []
+        
+        def consume():
+            seen.extend(source.next_row(0)['id'] for _ in range(250))
+        
+        threads = [threading.Thread(target=consume) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sorted(seen) == list(range(2000))
+    
+    def test_invalid_config(self, users_csv):
+        """Testa validação do modo e do formato"""
+        with pytest.raises(ValueError, match='Modo de fonte de dados'):
+            DataSourceConfig(name='users', path=users_csv, mode='shuffle')
+        
+        with pytest.raises(ValueError, match='não reconhecido'):
+            DataSourceConfig(name='users', path='users.txt')
+
+
+class TestSubstitution:
+    """Testes para os placeholders ${var}"""
+    
+    def test_substitute(self):
+        """Testa substituição em textos, tipos preservados e variável ausente"""
+        variables = {'email': 'a@b.com', 'sku': 10}
+        
+        assert substitute({'text': 'login ${email}', 'timeout': '${sku}'}, variables) == {
+            'text': 'login a@b.com', 'timeout': 10
+        }
+        
+        with pytest.raises(KeyError, match=r'\$\{missing\}'):
+            substitute('${missing}', variables)
+    
+    def test_scenario_iterations(self, users_csv, mock_driver):
+        """Testa uma linha por iteração com o label original nas métricas"""
+        scenario = Scenario('Login', data_sources=[{'name': 'users', 'path': users_csv}])
+        scenario.input('${email}', id='email').input('${users.password}', id='password').tap(id='submit')
+        
+        for _ in range(2):
+            run = scenario.execute(mock_driver, 'android', variables=scenario.next_variables(user_id=0))
+        
+        typed = [call.args[0] for call in mock_driver.find_element.return_value.send_keys.call_args_list]
+        assert typed == ['user0@example.com', 'pw0', 'user1@example.com', 'pw1']
+        assert run.steps[0]['action'] == 'input email'
+        assert scenario.plan[2][0] is scenario.actions[2]
+    
+    def test_without_variables_keeps_text(self, mock_driver):
+        """Testa cenário sem fontes de dados mantendo o texto literal"""
+        Scenario('Flow').input('${literal}', id='field').execute(mock_driver, 'android')
+        
+        mock_driver.find_element.return_value.send_keys.assert_called_once_with('${literal}')
+
+
+class TestDistribution:
+    """Testes para as fontes de dados entre processos"""
+    
+    def test_pickle_and_shard_partition(self, users_csv):
+        """Testa fonte reaberta no worker e linhas divididas entre os shards"""
+        test = LoadTest('Feed', virtual_users=2, workers=2)
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2'])
+        test.add_scenario(Scenario('Login', data_sources=[{'name': 'users', 'path': users_csv}]).tap(id='a'))
+        
+        rows = []
+        for shard in split_shards(test, 2):
+            shard.scenarios = pickle.loads(pickle.dumps(shard.scenarios))
+            scenario = build_shard_test(shard).scenarios[0][0]
+            rows.append([scenario.next_variables(0)['password'] for _ in range(2)])
+        
+        assert rows == [['pw0', 'pw2'], ['pw1', 'pw3']]
+    
+    def test_load_from_config(self, users_csv):
+        """Testa fontes de dados carregadas e serializadas com o cenário"""
+        data = {'name': 'Login', 'data_sources': [{'name': 'users', 'path': users_csv, 'mode': 'random'}],
+                'actions': [{'input': {'id': 'email', 'text': '${email}'}}]}
+        
+        restored = Scenario.from_dict(Scenario.from_dict(data).to_dict())
+        
+        assert restored.data_sources[0].config.mode == 'random'
+        assert restored.next_variables(0)['email'].endswith('@example.com')
+    
+    def test_paths_relative_to_config_file(self, users_csv, temp_dir, monkeypatch):
+        """Testa caminho relativo resolvido a partir do diretório do arquivo de configuração"""
+        config = temp_dir / 'config.yaml'
+        config.write_text(
+            "test: {name: Feed}\n"
+            "platforms: [{android: {app: /app.apk}}]\n"
+            "scenarios: [{name: Login, data_sources: [{name: users, path: users.csv}], actions: [{tap: {id: a}}]}]\n"
+        )
+        monkeypatch.chdir('/')
+        
+        scenario = LoadTest('Feed', config_file=str(config)).scenarios[0][0]
+        
+        assert scenario.data_sources[0].config.path == users_csv
+        assert len(scenario.data_sources[0]) == 4
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_load_test_uses_rows(self, fake_appium_server, users_csv, engine):
+        """Testa valores das linhas enviados ao Appium em cada engine"""
+        test = LoadTest('Feed', duration=0.2, virtual_users=2, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(
+            Scenario('Login', pacing=1, data_sources=[{'name': 'users', 'path': users_csv, 'mode': 'unique'}])
+            .input('${email}', id='email')
+        )
+        
+        results = test.run()
+        
+        assert results.failed_actions == 0
+        typed = sorted(body['text'] for method, path, body in fake_appium_server.requests if path.endswith('/value'))
+        assert typed == ['user0@example.com', 'user1@example.com']
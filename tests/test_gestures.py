@@ -0,0 +1,103 @@
+"""
+Testes para os gestos W3C Actions
+"""
+
+import pytest
+from mobileloadx.core.gestures import Gesture
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+
+PINCH = [
+    [{'move': [0.45, 0.5]}, 'down', {'move': [0.2, 0.5], 'duration': 0.3}, 'up'],
+    [{'move': [0.55, 0.5]}, 'down', {'move': [0.8, 0.5], 'duration': 0.3}, 'up'],
+]
+
+
+class TestGesture:
+    """Testes para a montagem do payload"""
+    
+    def test_long_press_drag(self):
+        """Testa passos de um dedo com pausa"""
+        gesture = Gesture([
+            [{'move': [100, 200]}, 'down', {'pause': 1}, {'move': [100, 800], 'duration': 0.5}, {'up': None}]
+        ])
+        
+        (finger,) = gesture.payload()
+        
+        assert finger['id'] == 'finger1'
+        assert finger['parameters'] == {'pointerType': 'touch'}
+        assert [action['type'] for action in finger['actions']] == [
+            'pointerMove', 'pointerDown', 'pause', 'pointerMove', 'pointerUp'
+        ]
+        assert finger['actions'][2]['duration'] == 1000
+        assert finger['actions'][3] == {'type': 'pointerMove', 'duration': 500, 'x': 100, 'y': 800}
+    
+    def test_relative_coordinates(self):
+        """Testa conversão das frações pelo tamanho da tela"""
+        gesture = Gesture(PINCH, relative=True)
+        
+        fingers = gesture.payload({'width': 1000, 'height': 2000})
+        
+        assert [finger['id'] for finger in fingers] == ['finger1', 'finger2']
+        assert fingers[0]['actions'][0] == {'type': 'pointerMove', 'duration': 0, 'x': 450, 'y': 1000}
+        assert fingers[1]['actions'][2]['x'] == 800
+    
+    @pytest.mark.parametrize('pointers, relative, message', [
+        ([], False, 'sem pointers'),
+        ([['tap']], False, 'Passo de gesto inválido'),
+        ([[{'move': [1]}]], False, r'move requer \[x, y\]'),
+        ([[{'move': [100, 0.5]}]], True, 'entre 0 e 1'),
+    ])
+    def test_invalid_gesture(self, pointers, relative, message):
+        """Testa validação dos passos"""
+        with pytest.raises(ValueError, match=message):
+            Gesture(pointers, relative=relative)
+
+
+class TestScenarioGesture:
+    """Testes para a ação gesture no cenário"""
+    
+    def test_single_request(self, mock_driver):
+        """Testa envio do gesto em uma única requisição"""
+        run = Scenario('Zoom').gesture(PINCH, relative=True, name='Pinch').execute(mock_driver, 'android')
+        
+        mock_driver.execute.assert_called_once()
+        command, params = mock_driver.execute.call_args[0]
+        assert command == 'actions'
+        assert len(params['actions']) == 2
+        assert run.steps[0]['action'] == 'Pinch'
+    
+    def test_load_from_config(self):
+        """Testa carregamento e serialização do gesto"""
+        scenario = Scenario.from_dict({'name': 'Zoom', 'actions': [{'gesture': {'pointers': PINCH, 'relative': True}}]})
+        
+        restored = Scenario.from_dict(scenario.to_dict())
+        
+        assert restored.actions[0].gesture.pointers == scenario.actions[0].gesture.pointers
+        
+        with pytest.raises(ValueError, match='ação 1 \\(gesture\\)'):
+            Scenario.from_dict({'name': 'Zoom', 'actions': [{'gesture': {}}]})
+
+
+class TestLoadTestGesture:
+    """Testes para os gestos na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_gestures_use_actions_endpoint(self, fake_appium_server, engine):
+        """Testa scroll, swipe e gesto enviados em uma requisição W3C Actions cada"""
+        test = LoadTest('Gesture', duration=0.2, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(
+            Scenario('Flow', pacing=1)
+            .scroll(duration=0.01)
+            .swipe(10, 20, 30, 40, duration=0.01)
+            .gesture(PINCH, relative=True)
+        )
+        
+        results = test.run()
+        
+        assert results.total_actions == 1
+        assert results.failed_actions == 0
+        assert len(fake_appium_server.commands('POST', '/actions')) == 3
+        pinch = [body for method, path, body in fake_appium_server.requests if path.endswith('/actions')][-1]
+        assert [finger['id'] for finger in pinch['actions']] == ['finger1', 'finger2']
@@ -0,0 +1,142 @@
+"""
+Testes para o polling da busca de elementos
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchElementException
+from mobileloadx.core.polling import PollingConfig
+from mobileloadx.core.session_metadata import SessionMetadata
+from mobileloadx.core.async_engine import AsyncHTTPClient, AsyncWebDriverSession, execute_action
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.metrics.collector import MetricsCollector
+
+
+def appearing_driver(misses):
+    """Driver cujo elemento só aparece após algumas buscas"""
+    driver = MagicMock()
+    element = MagicMock()
+    driver.find_element.side_effect = [NoSuchElementException('ainda não')] * misses + [element]
+    return driver, element
+
+
+class TestPollingConfig:
+    """Testes para a configuração do polling"""
+    
+    def test_parse(self):
+        """Testa conversão de número e dicionário"""
+        assert PollingConfig.parse(0.05) == PollingConfig(interval=0.05)
+        assert PollingConfig.parse({'strategy': 'implicit'}) == PollingConfig('implicit')
+        assert PollingConfig.parse(None) is None
+    
+    def test_backoff_intervals(self):
+        """Testa crescimento exponencial limitado a max_interval"""
+        intervals = PollingConfig('backoff', interval=0.1, factor=2, max_interval=0.5).intervals()
+        
+        assert [next(intervals) for _ in range(5)] == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+    
+    def test_invalid_config(self):
+        """Testa validação da configuração"""
+        with pytest.raises(ValueError, match='desconhecida'):
+            PollingConfig('random')
+        
+        with pytest.raises(ValueError, match='positivo'):
+            PollingConfig(interval=0)
+        
+        with pytest.raises(ValueError, match='max_interval'):
+            PollingConfig('backoff', interval=3)
+
+
+class TestScenarioPolling:
+    """Testes para o polling no engine de threads"""
+    
+    def test_fast_polling(self):
+        """Testa polling rápido e registro da espera entre tentativas"""
+        driver, element = appearing_driver(misses=2)
+        
+        run = Scenario('Flow', polling=0.01).tap(id='login').execute(driver, 'android')
+        
+        element.click.assert_called_once()
+        step = run.steps[0]
+        assert step['lookup'] < 0.3
+        assert 0.02 <= step['poll_wait'] <= step['lookup']
+    
+    def test_backoff(self):
+        """Testa novas tentativas com intervalo crescente"""
+        driver, element = appearing_driver(misses=3)
+        polling = {'strategy': 'backoff', 'interval': 0.01, 'factor': 2, 'max_interval': 0.05}
+        
+        run = Scenario('Flow').tap(id='login', polling=polling).execute(driver, 'android')
+        
+        assert driver.find_element.call_count == 4
+        assert run.steps[0]['poll_wait'] == pytest.approx(0.07, abs=0.03)
+    
+    def test_implicit_wait_set_once_per_session(self):
+        """Testa implicit wait no servidor, ajustado uma vez por sessão"""
+        driver, _ = appearing_driver(misses=0)
+        driver.find_element.side_effect = None
+        metadata = SessionMetadata()
+        scenario = Scenario('Flow', polling={'strategy': 'implicit'}).tap(id='a', timeout=5).tap(id='b', timeout=5)
+        
+        run = scenario.execute(driver, 'android', metadata=metadata)
+        scenario.execute(driver, 'android', metadata=metadata)
+        
+        driver.implicitly_wait.assert_called_once_with(5)
+        assert run.steps[0]['poll_wait'] < 0.01
+    
+    def test_action_overrides_scenario(self):
+        """Testa polling da ação substituindo o do cenário e serialização"""
+        scenario = Scenario('Flow', polling=0.1).tap(id='a').tap(id='b', polling={'strategy': 'implicit'})
+        
+        restored = Scenario.from_dict(scenario.to_dict())
+        
+        assert [action.find_polling.strategy for action in restored.actions] == ['fixed', 'implicit']
+        assert restored.actions[0].find_polling.interval == 0.1
+        assert 'polling' not in restored.actions[1].params
+    
+    def test_poll_wait_in_summary(self):
+        """Testa espera do polling separada no resumo por ação"""
+        collector = MetricsCollector()
+        collector.record_step(1, 'Flow', 1, 'tap a', 0.6, 0.5, True, poll_wait=0.4)
+        collector.record_step(1, 'Flow', 1, 'tap a', 0.2, 0.1, True, poll_wait=0.0)
+        
+        stats = collector._calculate_summary()['steps']['Flow']['1. tap a']
+        
+        assert stats['poll_wait_avg'] == pytest.approx(0.2)
+
+
+class TestAsyncPolling:
+    """Testes para o polling no engine asyncio"""
+    
+    def test_fast_polling(self, fake_appium_server):
+        """Testa polling rápido contra o servidor"""
+        action = Scenario('Flow', polling=0.01).tap(id='late').actions[0]
+        fake_appium_server.missing_elements.add('late')
+        
+        async def run():
+            session = AsyncWebDriverSession(AsyncHTTPClient(), fake_appium_server.url)
+            await session.create({})
+            asyncio.get_running_loop().call_later(0.05, fake_appium_server.missing_elements.clear)
+            return await execute_action(action, session, 'android')
+        
+        lookup, poll_wait = asyncio.run(run())
+        
+        assert lookup < 0.3
+        assert 0 < poll_wait <= lookup
+    
+    def test_implicit_wait(self, fake_appium_server):
+        """Testa implicit wait configurado na sessão"""
+        action = Scenario('Flow', polling={'strategy': 'implicit'}).tap(id='login', timeout=3).actions[0]
+        metadata = SessionMetadata()
+        
+        async def run():
+            session = AsyncWebDriverSession(AsyncHTTPClient(), fake_appium_server.url)
+            await session.create({})
+            await execute_action(action, session, 'android', metadata=metadata)
+            await execute_action(action, session, 'android', metadata=metadata)
+        
+        asyncio.run(run())
+        
+        timeouts = [body for method, path, body in fake_appium_server.requests if path.endswith('/timeouts')]
+        assert timeouts == [{'implicit': 3000}]
@@ -0,0 +1,147 @@
+"""
+Testes para os perfis de carga em estágios
+"""
+
+import pytest
+from mobileloadx.core.profile import LoadProfile, Stage, ease
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import split_shards
+
+
+class TestLoadProfile:
+    """Testes para o cálculo de usuários por estágio"""
+    
+    @pytest.mark.parametrize('easing', ['linear', 'step', 'ease-in', 'ease-out', 'ease-in-out'])
+    def test_easing_endpoints(self, easing):
+        """Testa se todas as curvas vão de 0 a 1"""
+        assert ease(easing, 0) == 0
+        assert ease(easing, 1) == 1
+    
+    def test_step_spike_and_ramp_down(self):
+        """Testa degrau, platô e ramp-down"""
+        profile = LoadProfile([
+            Stage(duration=10, target=10, easing='step'),
+            Stage(duration=20, target=10),
+            Stage(duration=10, target=0),
+        ])
+        
+        assert profile.users_at(0) == 0
+        assert profile.users_at(1) == 10
+        assert profile.users_at(25) == 10
+        assert profile.users_at(35) == 5
+        assert profile.users_at(100) == 0
+        assert profile.duration == 40
+        assert profile.peak == 10
+    
+    def test_ease_in_starts_slowly(self):
+        """Testa curva ease-in abaixo da linear no início"""
+        linear = LoadProfile([Stage(duration=10, target=100)])
+        ease_in = LoadProfile([Stage(duration=10, target=100, easing='ease-in')])
+        
+        assert ease_in.users_at(3) < linear.users_at(3)
+        assert ease_in.users_at(10) == linear.users_at(10) == 100
+    
+    def test_from_list_accepts_users(self):
+        """Testa estágios com 'users' (formato do README) e usuários iniciais"""
+        profile = LoadProfile.from_list([{'users': 10, 'duration': 60}], start=2)
+        
+        assert profile.users_at(0) == 2
+        assert profile.stages[0].target == 10
+    
+    def test_invalid_stages(self):
+        """Testa erros de configuração de estágio"""
+        with pytest.raises(ValueError, match='Estágio inválido'):
+            LoadProfile.from_list([{'duration': 10}])
+        
+        with pytest.raises(ValueError, match='Easing desconhecido'):
+            Stage(duration=10, target=1, easing='bounce')
+    
+    def test_scaled(self):
+        """Testa divisão proporcional dos alvos para shards"""
+        profile = LoadProfile([Stage(duration=10, target=10)]).scaled(0.3)
+        
+        assert profile.peak == 3
+        assert profile.users_at(5) == 2
+
+
+class TestLoadTestStages:
+    """Testes para estágios no LoadTest"""
+    
+    def test_add_stage(self):
+        """Testa se estágios definem duração e máximo de usuários"""
+        test = LoadTest('Spike', duration=999)
+        test.add_stage(30, 5).add_stage(10, 50, easing='step').add_stage(30, 5)
+        
+        assert test.duration == 70
+        assert test.max_virtual_users == 50
+        assert test._calculate_users_at_time(35) == 50
+    
+    def test_stages_from_config(self, temp_dir):
+        """Testa carregamento de stages do arquivo de configuração"""
+        import yaml
+        
+        config_file = temp_dir / 'config.yaml'
+        with open(config_file, 'w') as f:
+            yaml.dump({
+                'test': {'name': 'T', 'duration': 10},
+                'virtual_users': {
+                    'max': 5,
+                    'stages': [
+                        {'target': 20, 'duration': 60, 'easing': 'ease-out'},
+                        {'target': 0, 'duration': 30},
+                    ]
+                }
+            }, f)
+        
+        test = LoadTest('Test', config_file=str(config_file))
+        
+        assert test.duration == 90
+        assert test.max_virtual_users == 20
+        assert test.profile.stages[0].easing == 'ease-out'
+    
+    def test_shards_scale_profile(self):
+        """Testa divisão dos alvos dos estágios entre shards"""
+        test = LoadTest('Test')
+        test.add_platform('android', '/app.apk')
+        test.add_stage(10, 10)
+        
+        shards = split_shards(test, 2)
+        
+        assert [s.profile.users_at(10) for s in shards] == [5, 5]
+    
+    def test_ramp_down_retires_newest_users(self):
+        """Testa aposentadoria dos usuários mais recentes e reuso das vagas"""
+        test = LoadTest('Test', virtual_users=3)
+        test.add_platform('android', '/app.apk', devices=['d1'])
+        test.add_scenario(Scenario('Flow'))
+        test._prepare_distribution()
+        active = []
+        
+        created = test._adjust_users(active, 3)
+        test._adjust_users(active, 1)
+        
+        assert [u.retired for u in created] == [False, True, True]
+        assert active == created[:1]
+        
+        # Vagas só voltam quando os aposentados terminam
+        assert test._adjust_users(active, 3) == []
+        test._release_user(created[1])
+        test._release_user(created[2])
+        
+        respawned = test._adjust_users(active, 3)
+        assert [u.user_id for u in respawned] == [3, 4]
+    
+    def test_run_with_stages(self, fake_appium_server):
+        """Testa execução seguindo os estágios, com ramp-down"""
+        test = LoadTest('Stages')
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.add_stage(0, 2).add_stage(1, 2).add_stage(1.5, 1, easing='step')
+        
+        results = test.run()
+        
+        assert results.total_actions > 0
+        assert results.failed_actions == 0
+        assert len(fake_appium_server.commands('POST', '/session')) == 2
+        assert len(fake_appium_server.commands('DELETE')) == 2
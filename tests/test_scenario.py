@@ -64,9 +64,10 @@ class TestAction:
         action = Action('scroll', direction='down', duration=1)
         action.execute(mock_driver, 'android')
         
-        mock_driver.swipe.assert_called_once()
-        args = mock_driver.swipe.call_args
-        assert args[0][0] == 540  # width/2
+        mock_driver.execute.assert_called_once()
+        command, params = mock_driver.execute.call_args[0]
+        assert command == 'actions'  # W3C Actions
+        assert params['actions'][0]['actions'][0]['x'] == 540  # width/2
     
     def test_action_back(self, mock_driver):
         """Testa ação de voltar"""
@@ -153,3 +154,43 @@ class TestScenario:
         assert len(scenario.actions) == 3
         for action in scenario.actions:
             assert action.action_type == 'tap'
+
+
+class TestScenarioCompilation:
+    """Testes para a compilação dos cenários em planos de execução"""
+    
+    def test_locator_resolved_once(self):
+        """Testa resolução do locator na compilação"""
+        scenario = Scenario('Test').tap(accessibility_id='login').input('x', xpath='//email').input('y')
+        
+        assert [action.locator for action in scenario.actions] == [
+            ('accessibility id', 'login'), ('xpath', '//email'), None
+        ]
+        assert [step for _, step in scenario.plan] == [action.compile() for action in scenario.actions]
+    
+    def test_plan_executes_actions(self, mock_driver):
+        """Testa execução do plano compilado"""
+        with patch('mobileloadx.core.scenario.WebDriverWait') as mock_wait_class:
+            element = mock_wait_class.return_value.until.return_value
+            
+            Scenario('Test').tap(id='button').input('hello').back().execute(mock_driver, 'android')
+        
+        element.click.assert_called_once()
+        mock_driver.switch_to.active_element.send_keys.assert_called_once_with('hello')
+        mock_driver.back.assert_called_once()
+    
+    @pytest.mark.parametrize('action, message', [
+        ({'invalid': {}}, 'Tipo de ação desconhecido'),
+        ({'tap': {'text': 'x'}}, 'Nenhum locator válido'),
+        ({'scroll': {'direction': 'left'}}, 'Direção inválida'),
+        ({'swipe': {'start_x': 1, 'start_y': 2}}, 'end_x, end_y'),
+    ])
+    def test_invalid_action_fails_on_load(self, action, message):
+        """Testa erro ao carregar o cenário, e não durante o teste"""
+        with pytest.raises(ValueError, match=message):
+            Scenario.from_dict({'name': 'Broken', 'actions': [{'back': {}}, action]})
+    
+    def test_error_identifies_action(self):
+        """Testa identificação do cenário e da ação no erro"""
+        with pytest.raises(ValueError, match=r"Cenário 'Broken', ação 2 \(clik\)"):
+            Scenario.from_dict({'name': 'Broken', 'actions': [{'back': {}}, {'clik': {'id': 'x'}}]})
@@ -0,0 +1,162 @@
+"""
+Testes para a seleção ponderada dos cenários (mix de cenários)
+"""
+
+import random
+import threading
+from collections import Counter
+import pytest
+from mobileloadx.core.distributed import shard_from_dict, shard_to_dict
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.scenario_mix import AliasTable, ScenarioMix, interleave, user_rng
+from mobileloadx.core.sharding import split_shards
+from mobileloadx.core.virtual_user import VirtualUser
+
+
+def mix_test(mode='random', seed=7):
+    """LoadTest com os cenários Login (70) e Browse (30), pronto para criar usuários"""
+    test = LoadTest('Mix', virtual_users=4, seed=seed, scenario_mix=mode)
+    test.add_platform('android', '/app.apk')
+    test.add_scenario(Scenario('Login').tap(id='login'), weight=70)
+    test.add_scenario(Scenario('Browse').tap(id='home'), weight=30)
+    test.run_seed = seed
+    test._prepare_distribution()
+    return test
+
+
+class TestAliasTable:
+    """Testes para o sorteio pelo método alias"""
+    
+    def test_distribution(self):
+        """Testa frequências próximas dos pesos e peso zero nunca sorteado"""
+        table = AliasTable([5, 0, 3, 2])
+        rng = random.Random(1)
+        
+        counts = Counter(table.sample(rng) for _ in range(20000))
+        
+        assert counts[1] == 0
+        assert counts[0] / 20000 == pytest.approx(0.5, abs=0.02)
+        assert counts[2] / 20000 == pytest.approx(0.3, abs=0.02)
+        assert counts[3] / 20000 == pytest.approx(0.2, abs=0.02)
+    
+    def test_invalid_weights(self):
+        """Testa pesos negativos ou com soma zero"""
+        with pytest.raises(ValueError, match='Pesos dos cenários inválidos'):
+            AliasTable([0, 0])
+        
+        with pytest.raises(ValueError, match='Pesos dos cenários inválidos'):
+            AliasTable([1, -1])
+
+
+class TestExactMix:
+    """Testes para a sequência intercalada do modo exact"""
+    
+    def test_interleave(self):
+        """Testa ciclo reduzido e trechos sempre próximos dos pesos"""
+        cycle = interleave([70, 30])
+        
+        assert len(cycle) == 10
+        for length in range(1, 11):
+            assert abs(cycle[:length].count(1) - 0.3 * length) < 1
+        assert interleave([0.5, 0.25]) == [0, 1, 0]
+    
+    def test_threads_share_sequence(self):
+        """Testa mix exato entre threads (cursor compartilhado)"""
+        mix = ScenarioMix([('a', 1), ('b', 3)], mode='exact')
+        picks = []
+        
+        def select():
+            picks.extend(mix.select() for _ in range(100))
+        
+        threads = [threading.Thread(target=select) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert Counter(picks) == {'a': 100, 'b': 300}
+    
+    def test_invalid_mode(self):
+        """Testa modo desconhecido"""
+        with pytest.raises(ValueError, match='Modo de mix de cenários'):
+            ScenarioMix([('a', 1)], mode='shuffle')
+
+
+class TestVirtualUserMix:
+    """Testes para a seleção dos cenários pelos usuários virtuais"""
+    
+    def test_seed_reproduces_selection(self):
+        """Testa mesma sequência com a mesma seed e sequências diferentes por usuário"""
+        def sequence(user):
+            return [user._select_scenario().name for _ in range(50)]
+        
+        first = [sequence(user) for user in mix_test()._spawn_users(2, 0)]
+        again = [sequence(user) for user in mix_test()._spawn_users(2, 0)]
+        
+        assert first == again
+        assert first[0] != first[1]
+    
+    def test_seed_reproduces_iterations(self, mock_driver):
+        """Testa repetições sorteadas do loop repetidas com a mesma seed"""
+        scenario = Scenario('Browse').loop([1, 10], Scenario('Produto').tap(id='product'))
+        
+        def steps(seed):
+            rng = user_rng(seed, 0)
+            return [len(scenario.execute(mock_driver, 'android', rng=rng).steps) for _ in range(10)]
+        
+        assert steps(3) == steps(3)
+        assert len(set(steps(3))) > 1
+    
+    def test_exact_mix_across_users(self):
+        """Testa mix exato entre os usuários do teste"""
+        users = mix_test('exact')._spawn_users(4, 0)
+        
+        picks = Counter(users[turn % 4]._select_scenario().name for turn in range(20))
+        
+        assert picks == {'Login': 14, 'Browse': 6}
+    
+    def test_default_mix(self):
+        """Testa usuário criado sem o teste (tabela montada dos seus cenários)"""
+        user = VirtualUser(1, 'android', '/app.apk', scenarios=[(Scenario('Only'), 100)])
+        
+        assert user._select_scenario().name == 'Only'
+        
+        with pytest.raises(ValueError, match='Nenhum cenário configurado'):
+            VirtualUser(2, 'android', '/app.apk')._select_scenario()
+
+
+class TestLoadTestSeed:
+    """Testes para a seed da execução"""
+    
+    def test_config_and_shards(self, temp_dir):
+        """Testa seed e modo lidos da configuração e repassados aos shards"""
+        config = temp_dir / 'config.yaml'
+        config.write_text(
+            "test: {name: Mix, duration: 60, seed: 42, scenario_mix: exact}\n"
+            "virtual_users: {max: 4}\n"
+            "platforms: [{android: {app: /app.apk}}]\n"
+            "scenarios: [{name: Login, actions: [{tap: {id: login}}]}]\n"
+        )
+        test = LoadTest('Mix', config_file=str(config))
+        test.run_seed = test.seed
+        
+        shard = shard_from_dict(shard_to_dict(split_shards(test, 2)[1]))
+        
+        assert (test.seed, test.scenario_mix) == (42, 'exact')
+        assert (shard.seed, shard.scenario_mix) == (42, 'exact')
+    
+    def test_run_seed(self, fake_appium_server):
+        """Testa seed sorteada quando não configurada e modo inválido"""
+        test = LoadTest('Mix', duration=0.1, virtual_users=1)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Login').tap(id='login'))
+        
+        test.run()
+        
+        assert test.seed is None
+        assert isinstance(test.run_seed, int)
+        
+        test.scenario_mix = 'weighted'
+        with pytest.raises(ValueError, match='Modo de mix de cenários'):
+            test.run()
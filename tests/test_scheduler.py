@@ -0,0 +1,112 @@
+"""
+Testes para o agendador de eventos
+"""
+
+import threading
+import time
+import pytest
+from mobileloadx.core.scheduler import EventScheduler
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+
+
+class TestEventScheduler:
+    """Testes para o EventScheduler"""
+    
+    def test_events_run_in_time_order(self):
+        """Testa execução em ordem de horário, não de agendamento"""
+        scheduler = EventScheduler()
+        fired = []
+        now = time.monotonic()
+        
+        scheduler.call_at(now + 0.06, fired.append, 'c')
+        scheduler.call_at(now + 0.02, fired.append, 'a')
+        scheduler.call_at(now + 0.04, fired.append, 'b')
+        scheduler.call_at(now + 0.08, scheduler.stop)
+        scheduler.run()
+        
+        assert fired == ['a', 'b', 'c']
+    
+    def test_fires_at_exact_time(self):
+        """Testa precisão do disparo em relação ao horário agendado"""
+        scheduler = EventScheduler()
+        lags = []
+        start = time.monotonic()
+        
+        for i in range(1, 6):
+            when = start + i * 0.03
+            scheduler.call_at(when, lambda w=when: lags.append(time.monotonic() - w))
+        scheduler.call_at(start + 0.2, scheduler.stop)
+        scheduler.run()
+        
+        assert len(lags) == 5
+        assert max(lags) < 0.02
+    
+    def test_cancel(self):
+        """Testa cancelamento de evento"""
+        scheduler = EventScheduler()
+        fired = []
+        
+        event = scheduler.call_soon(fired.append, 'x')
+        event.cancel()
+        scheduler.call_soon(scheduler.stop)
+        scheduler.run()
+        
+        assert fired == []
+    
+    def test_wakes_on_event_from_other_thread(self):
+        """Testa se um evento agendado por outra thread acorda o scheduler ocioso"""
+        scheduler = EventScheduler()
+        fired = []
+        
+        def producer():
+            time.sleep(0.05)
+            scheduler.call_soon(fired.append, 'x')
+            scheduler.call_soon(scheduler.stop)
+        
+        threading.Thread(target=producer).start()
+        start = time.monotonic()
+        scheduler.run()
+        
+        assert fired == ['x']
+        assert time.monotonic() - start < 0.5
+
+
+class TestSpawnSchedule:
+    """Testes para o agendamento de usuários no LoadTest"""
+    
+    def test_linear_ramp_schedule(self):
+        """Testa instantes exatos do ramp-up linear"""
+        test = LoadTest('Test', virtual_users=4, ramp_up_time=2)
+        
+        assert test._spawn_schedule() == [(0.5, 1), (1.0, 2), (1.5, 3), (2.0, 4)]
+    
+    def test_profile_change_points_match_users_at(self):
+        """Testa se os pontos de mudança coincidem com users_at"""
+        test = LoadTest('Test')
+        test.add_stage(10, 10, easing='ease-out').add_stage(5, 3, easing='ease-in-out')
+        
+        for offset, users in test._spawn_schedule()[1:]:
+            assert test._calculate_users_at_time(offset + 1e-9) == users
+    
+    def test_run_ends_on_deadline(self, fake_appium_server):
+        """Testa fim do teste no prazo, sem esperar o próximo segundo"""
+        test = LoadTest('Test', duration=0.3, virtual_users=1)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        
+        results = test.run()
+        
+        assert results.duration == pytest.approx(0.3, abs=0.2)
+        assert results.total_actions > 0
+    
+    def test_stop_wakes_scheduler(self, fake_appium_server):
+        """Testa se LoadTest.stop() encerra o teste imediatamente"""
+        test = LoadTest('Test', duration=30, virtual_users=1)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        
+        threading.Timer(0.3, test.stop).start()
+        results = test.run()
+        
+        assert results.duration < 2
@@ -0,0 +1,193 @@
+"""
+Testes para o watchdog de sessões e o circuit breaker por device
+"""
+
+import random
+import time
+import pytest
+from unittest.mock import MagicMock, Mock
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
+from mobileloadx.core.async_engine import WebDriverError
+from mobileloadx.core.distributed import shard_from_dict, shard_to_dict
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.session_health import CircuitBreaker, SessionHealthConfig, is_session_fatal
+from mobileloadx.core.sharding import split_shards
+from mobileloadx.core.virtual_user import VirtualUser
+from mobileloadx.core.warmup import WarmupConfig
+from mobileloadx.metrics.collector import MetricsCollector
+
+
+class TestFatalErrors:
+    """Testes para a separação entre sessão perdida e erro do cenário"""
+    
+    @pytest.mark.parametrize('error', [
+        InvalidSessionIdException('invalid session id: A session is either terminated or not started'),
+        WebDriverError('invalid session id', 'Sessão inexistente', 404),
+        ConnectionRefusedError(111, 'Connection refused'),
+        WebDriverException(
+            'Original error: Cannot be proxied to UiAutomator2 server because the instrumentation '
+            'process is not running (probably crashed)'
+        ),
+    ])
+    def test_fatal(self, error):
+        """Testa erros que derrubam a sessão"""
+        assert is_session_fatal(error)
+    
+    @pytest.mark.parametrize('error', [
+        NoSuchElementException('no such element'),
+        TimeoutException('Elemento não apareceu'),
+        WebDriverError('no such element', 'login', 404),
+        ValueError('Variável não definida'),
+    ])
+    def test_scenario_errors(self, error):
+        """Testa erros do cenário, que não recriam a sessão"""
+        assert not is_session_fatal(error)
+    
+    def test_extra_patterns_and_disabled(self):
+        """Testa trechos de mensagem configurados e watchdog desligado"""
+        error = WebDriverException('Device farm lease expired')
+        
+        assert SessionHealthConfig(fatal_errors=['LEASE EXPIRED']).is_fatal(error)
+        assert not SessionHealthConfig(enabled=False).is_fatal(ConnectionRefusedError())
+
+
+class TestCircuitBreaker:
+    """Testes para o circuit breaker por device"""
+    
+    def test_open_probe_and_close(self):
+        """Testa abertura no limite, tentativa única no half-open e fechamento"""
+        opened = []
+        breaker = CircuitBreaker(
+            SessionHealthConfig(backoff=0.01, failure_threshold=2, open_time=0.05),
+            on_open=lambda device, failures: opened.append((device, failures))
+        )
+        
+        breaker.record_failure('d1')
+        assert breaker.state('d1') == 'closed'
+        breaker.record_failure('d1')
+        
+        assert breaker.state('d1') == 'open'
+        assert breaker.wait_time('d1') > 0
+        assert breaker.wait_time('d2') == 0
+        
+        time.sleep(0.06)
+        assert breaker.wait_time('d1') == 0
+        assert breaker.wait_time('d1') > 0
+        
+        breaker.record_failure('d1')
+        assert breaker.state('d1') == 'open'
+        assert opened == [('d1', 2), ('d1', 3)]
+        
+        breaker.record_success('d1')
+        assert breaker.state('d1') == 'closed'
+    
+    def test_invalid_config(self):
+        """Testa limites inválidos"""
+        with pytest.raises(ValueError, match='failure_threshold'):
+            SessionHealthConfig(failure_threshold=0)
+        
+        with pytest.raises(ValueError, match='Backoff'):
+            SessionHealthConfig(max_backoff=-1)
+    
+    def test_backoff_shared_with_warmup(self):
+        """Testa o mesmo atraso de recriação do warm-up para os mesmos parâmetros"""
+        params = {'backoff': 0.5, 'max_backoff': 3, 'jitter': 0.2}
+        health, warmup = SessionHealthConfig(**params), WarmupConfig(**params)
+        
+        assert [health.delay(n, random.Random(7)) for n in range(5)] == [
+            warmup.delay(n, random.Random(7)) for n in range(5)
+        ]
+
+
+class TestRecovery:
+    """Testes para a recriação da sessão pelo usuário virtual"""
+    
+    def test_backoff_and_circuit(self):
+        """Testa novas tentativas, espera pelo circuito aberto e tempo sem sessão registrado"""
+        health = SessionHealthConfig(backoff=0, failure_threshold=2, open_time=0.1)
+        breaker = CircuitBreaker(health)
+        collector = MetricsCollector()
+        user = VirtualUser(
+            1, 'android', '/app.apk', device='d1', metrics_collector=collector, health=health, breaker=breaker
+        )
+        driver = MagicMock()
+        user._create_driver = Mock(side_effect=[RuntimeError('Device offline'), RuntimeError('Device offline'), driver])
+        user.driver = dead = MagicMock()
+        
+        user._check_session(InvalidSessionIdException('invalid session id'))
+        assert user.session_lost
+        
+        assert user.recover_session(time.monotonic() + 5)
+        
+        dead.quit.assert_called_once()
+        assert user.driver is driver and not user.session_lost
+        (loss,) = collector.session_loss_metrics
+        assert loss['attempts'] == 3
+        assert loss['recovered'] is True
+        assert loss['downtime'] >= 0.1
+    
+    def test_gives_up_at_deadline(self):
+        """Testa desistência no fim do teste"""
+        user = VirtualUser(1, 'android', '/app.apk', health=SessionHealthConfig(backoff=0.01))
+        user._create_driver = Mock(side_effect=RuntimeError('Connection refused'))
+        user._check_session(ConnectionResetError())
+        
+        assert not user.recover_session(time.monotonic() + 0.05)
+        assert not user.session_lost and user.driver is None
+
+
+class TestLoadTestHealth:
+    """Testes para o watchdog na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_session_recreated(self, fake_appium_server, engine):
+        """Testa uma única falha pela sessão perdida e iterações seguintes na nova sessão"""
+        fake_appium_server.crash_elements.add('login')
+        test = LoadTest('Health', duration=1, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Login', pacing=0.2).tap(id='login'))
+        test.set_session_health(backoff=0.01)
+        
+        results = test.run()
+        
+        assert results.failed_actions == 1
+        assert results.total_actions > 1
+        assert results.session_health['lost'] == 1
+        assert results.session_health['recovered'] == 1
+        assert len(fake_appium_server.commands('POST', '/session')) == 2
+    
+    def test_disabled_keeps_failing(self, fake_appium_server):
+        """Testa falhas em sequência na sessão morta sem o watchdog"""
+        fake_appium_server.crash_elements.add('login')
+        test = LoadTest('Health', duration=0.6, virtual_users=1)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Login', pacing=0.1).tap(id='login'))
+        test.set_session_health(enabled=False)
+        
+        results = test.run()
+        
+        assert results.failed_actions == results.total_actions > 1
+        assert results.session_health == {}
+    
+    def test_config_and_shards(self, temp_dir):
+        """Testa session_health lido da configuração e enviado aos workers"""
+        config = temp_dir / 'config.yaml'
+        config.write_text(
+            "test: {name: Health, duration: 60}\n"
+            "virtual_users: {max: 2}\n"
+            "platforms: [{android: {app: /app.apk}}]\n"
+            "session_health: {failure_threshold: 5, open_time: 10, fatal_errors: [lease expired]}\n"
+            "scenarios: [{name: Login, actions: [{tap: {id: login}}]}]\n"
+        )
+        test = LoadTest('Health', config_file=str(config))
+        
+        shard = shard_from_dict(shard_to_dict(split_shards(test, 2)[0]))
+        
+        expected = SessionHealthConfig(failure_threshold=5, open_time=10, fatal_errors=['lease expired'])
+        assert shard.session_health == expected
@@ -0,0 +1,103 @@
+"""
+Testes para o cache de metadados da sessão
+"""
+
+import asyncio
+import pytest
+from mobileloadx.core.session_metadata import SessionMetadata
+from mobileloadx.core.async_engine import AsyncHTTPClient, AsyncWebDriverSession, execute_action
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+
+
+class TestSessionMetadata:
+    """Testes para leitura e invalidação dos metadados"""
+    
+    def test_fetch_loads_once(self):
+        """Testa leitura única de cada metadado"""
+        metadata = SessionMetadata()
+        calls = []
+        
+        def load():
+            calls.append(1)
+            return {'width': 1080, 'height': 1920}
+        
+        assert metadata.fetch('window_size', load) == metadata.fetch('window_size', load)
+        assert len(calls) == 1
+    
+    def test_orientation_change_invalidates_window_size(self):
+        """Testa descarte do tamanho da tela ao mudar orientação ou contexto"""
+        metadata = SessionMetadata()
+        metadata.fetch('window_size', lambda: {'width': 1080, 'height': 1920})
+        metadata.fetch('platform_version', lambda: '14')
+        
+        metadata.changed('orientation', 'LANDSCAPE')
+        
+        assert metadata.fetch('window_size', lambda: {'width': 1920, 'height': 1080})['width'] == 1920
+        assert metadata.fetch('orientation', lambda: 'PORTRAIT') == 'LANDSCAPE'
+        assert metadata.fetch('platform_version', lambda: '15') == '14'
+
+
+class TestScenarioMetadata:
+    """Testes para o uso dos metadados pelas ações"""
+    
+    def test_scroll_reads_window_size_once(self, mock_driver):
+        """Testa um único get_window_size por sessão"""
+        metadata = SessionMetadata()
+        scenario = Scenario('Flow').scroll().scroll(direction='up')
+        
+        scenario.execute(mock_driver, 'android', metadata=metadata)
+        scenario.execute(mock_driver, 'android', metadata=metadata)
+        
+        assert mock_driver.get_window_size.call_count == 1
+        assert mock_driver.execute.call_count == 4
+    
+    def test_rotate_and_context_switch(self, mock_driver):
+        """Testa nova leitura do tamanho da tela após rotação e troca de contexto"""
+        scenario = Scenario('Flow').scroll().rotate('landscape').scroll().switch_context('WEBVIEW_app').scroll()
+        
+        scenario.execute(mock_driver, 'android')
+        
+        assert mock_driver.orientation == 'LANDSCAPE'
+        mock_driver.switch_to.context.assert_called_once_with('WEBVIEW_app')
+        assert mock_driver.get_window_size.call_count == 3
+    
+    def test_invalid_params_on_load(self):
+        """Testa validação de rotate e switch_context no carregamento"""
+        with pytest.raises(ValueError, match='Orientação inválida'):
+            Scenario.from_dict({'name': 'Flow', 'actions': [{'rotate': {'orientation': 'diagonal'}}]})
+        
+        with pytest.raises(ValueError, match='requer context'):
+            Scenario.from_dict({'name': 'Flow', 'actions': [{'switch_context': {}}]})
+    
+    def test_async_scroll_uses_cache(self, fake_appium_server):
+        """Testa metadados no engine asyncio"""
+        actions = Scenario('Flow').scroll().scroll().rotate('landscape').scroll().actions
+        metadata = SessionMetadata()
+        
+        async def run():
+            session = AsyncWebDriverSession(AsyncHTTPClient(), fake_appium_server.url)
+            await session.create({})
+            for action in actions:
+                await execute_action(action, session, 'android', metadata=metadata)
+        
+        asyncio.run(run())
+        
+        assert len(fake_appium_server.commands('GET', '/window/rect')) == 2
+        assert len(fake_appium_server.commands('POST', '/orientation')) == 1
+
+
+class TestLoadTestMetadata:
+    """Testes para os metadados na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_window_size_read_once_per_session(self, fake_appium_server, engine):
+        """Testa leitura única do tamanho da tela entre iterações"""
+        test = LoadTest('Metadata', duration=0.3, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow', pacing=0.1).scroll(duration=0.01))
+        
+        results = test.run()
+        
+        assert results.total_actions >= 2
+        assert len(fake_appium_server.commands('GET', '/window/rect')) == 1
@@ -0,0 +1,116 @@
+"""
+Testes para o pool de sessões pré-aquecidas
+"""
+
+import pytest
+from mobileloadx.core.session_pool import SessionPool, SessionPoolConfig, reset_scripts
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import split_shards
+from mobileloadx.core.distributed import shard_from_dict, shard_to_dict
+
+
+class TestSessionPool:
+    """Testes para o SessionPool"""
+    
+    def test_checkout_by_device(self):
+        """Testa se sessões só são repassadas para o mesmo device"""
+        pool = SessionPool(SessionPoolConfig(reset='none'))
+        pool.checkin('d1', 's1')
+        
+        assert pool.checkout('d2') is None
+        assert pool.checkout('d1') == 's1'
+        assert pool.checkout('d1') is None
+    
+    def test_drain_closes_pool(self):
+        """Testa se o pool fechado recusa devoluções"""
+        pool = SessionPool(SessionPoolConfig(reset='none'))
+        pool.checkin(None, 's1')
+        pool.checkin('d1', 's2')
+        
+        assert sorted(pool.drain()) == ['s1', 's2']
+        assert pool.checkin(None, 's3') is False
+        assert pool.idle == 0
+    
+    def test_reset_scripts(self):
+        """Testa comandos de reset por plataforma"""
+        config = SessionPoolConfig(reset='terminate-activate', app_id='com.app')
+        
+        assert reset_scripts('android', config) == [
+            ('mobile: terminateApp', {'appId': 'com.app'}),
+            ('mobile: activateApp', {'appId': 'com.app'}),
+        ]
+        assert reset_scripts('ios', config)[0] == ('mobile: terminateApp', {'bundleId': 'com.app'})
+        
+        deep_link = SessionPoolConfig(reset='deep-link', deep_link='app://home', app_id='com.app')
+        assert reset_scripts('android', deep_link) == [
+            ('mobile: deepLink', {'url': 'app://home', 'package': 'com.app'})
+        ]
+        assert reset_scripts('android', SessionPoolConfig(reset='none')) == []
+    
+    def test_invalid_config(self):
+        """Testa validação da configuração"""
+        with pytest.raises(ValueError, match='requer app_id'):
+            SessionPoolConfig(reset='clear-data')
+        
+        with pytest.raises(ValueError, match='requer deep_link'):
+            SessionPoolConfig(reset='deep-link')
+        
+        with pytest.raises(ValueError, match='Reset desconhecido'):
+            SessionPoolConfig(reset='reinstall')
+
+
+class TestLoadTestSessionPool:
+    """Testes para o pool de sessões no LoadTest"""
+    
+    def _build_test(self, server_url, engine):
+        test = LoadTest('Pool', engine=engine)
+        test.add_platform(
+            'android', '/app.apk',
+            session_pool={'size': 2, 'reset': 'terminate-activate', 'app_id': 'com.app'},
+            appium_server_url=server_url
+        )
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        # 2 usuários, um é aposentado e depois substituído por um novo
+        test.add_stage(0, 2).add_stage(0.3, 2).add_stage(0, 1).add_stage(0.3, 1).add_stage(0, 2).add_stage(0.3, 2)
+        return test
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_sessions_are_reused(self, fake_appium_server, engine):
+        """Testa pré-aquecimento, reaproveitamento e encerramento das sessões"""
+        test = self._build_test(fake_appium_server.url, engine)
+        
+        results = test.run()
+        
+        assert len(fake_appium_server.commands('POST', '/session')) == 2
+        assert len(fake_appium_server.commands('DELETE')) == 2
+        assert results.warmup['ready'] == 2
+        assert results.sessions['pool_hits'] == 3
+        assert results.sessions['pool_misses'] == 0
+        assert results.failed_actions == 0
+        
+        # Reset (terminate + activate) a cada devolução ao pool
+        assert len(fake_appium_server.commands('POST', '/execute/sync')) == 6
+    
+    def test_without_pool_records_creation_latency(self, fake_appium_server):
+        """Testa registro do tempo de criação sem pool"""
+        test = LoadTest('NoPool', duration=0.3, virtual_users=1)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        
+        results = test.run()
+        
+        assert results.sessions['created'] == 1
+        assert results.sessions['pool_hits'] == 0
+        assert results.sessions['create_max'] > 0
+    
+    def test_pool_config_reaches_shards(self):
+        """Testa envio da configuração do pool aos workers distribuídos"""
+        test = LoadTest('Test', virtual_users=2)
+        test.add_platform('android', '/app.apk', session_pool={'size': 1, 'reset': 'none'})
+        test.add_scenario(Scenario('Flow'))
+        
+        shard = split_shards(test, 2)[0]
+        restored = shard_from_dict(shard_to_dict(shard))
+        
+        assert restored.platforms[0].session_pool == SessionPoolConfig(size=1, reset='none')
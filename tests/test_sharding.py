@@ -0,0 +1,128 @@
+"""
+Testes para a execução multi-processo
+"""
+
+from datetime import datetime
+import pytest
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import build_shard_test, split_shards, _split_evenly
+from mobileloadx.metrics.collector import MetricsCollector
+
+
+class TestSplitShards:
+    """Testes para a divisão do teste em shards"""
+    
+    def test_split_evenly(self):
+        """Testa divisão equilibrada de usuários"""
+        assert _split_evenly(10, 3) == [4, 3, 3]
+        assert _split_evenly(2, 4) == [1, 1, 0, 0]
+    
+    def test_users_and_ids_are_partitioned(self):
+        """Testa se usuários e IDs não se sobrepõem entre shards"""
+        test = LoadTest('Test', virtual_users=10)
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2', 'd3', 'd4'])
+        test.add_scenario(Scenario('Flow'))
+        
+        shards = split_shards(test, 3)
+        
+        assert [s.virtual_users for s in shards] == [4, 3, 3]
+        assert [s.user_id_offset for s in shards] == [0, 4, 7]
+        assert shards[0].platforms[0].devices == ['d1', 'd4']
+        assert shards[1].platforms[0].devices == ['d2']
+        # O LoadTest original não é alterado
+        assert test.platforms[0].devices == ['d1', 'd2', 'd3', 'd4']
+    
+    def test_few_devices_are_shared(self):
+        """Testa compartilhamento de devices quando há menos devices que workers"""
+        test = LoadTest('Test', virtual_users=4)
+        test.add_platform('android', '/app.apk', devices=['d1'])
+        
+        shards = split_shards(test, 2)
+        
+        assert all(s.platforms[0].devices == ['d1'] for s in shards)
+    
+    def test_empty_shards_are_skipped(self):
+        """Testa se workers sem usuários são omitidos"""
+        test = LoadTest('Test', virtual_users=1)
+        test.add_platform('android', '/app.apk')
+        
+        assert len(split_shards(test, 4)) == 1
+    
+    def test_device_metrics(self):
+        """Testa configuração da coleta nos workers e cada device lido por um único worker"""
+        test = LoadTest('Test', virtual_users=4)
+        test.add_platform('android', '/app.apk', devices=['d1'], appPackage='com.a')
+        test.set_device_metrics(collect=['cpu'], interval=5, package='com.b', adb='/opt/adb')
+        
+        workers = [build_shard_test(shard).metrics_collector for shard in split_shards(test, 2)]
+        
+        assert [(c.collect, c.devices) for c in workers] == [(['cpu'], ['d1']), ([], [])]
+        assert {(c.interval, c.package, c.adb) for c in workers} == {(5, 'com.b', '/opt/adb')}
+        assert test.metrics_collector.devices == []
+    
+    def test_device_metrics_disabled(self):
+        """Testa coleta desligada também nos workers"""
+        test = LoadTest('Test', virtual_users=4)
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2'])
+        test.set_device_metrics(collect=[])
+        
+        assert all(shard.device_metrics['collect'] == [] for shard in split_shards(test, 2))
+
+
+class TestMetricsMerge:
+    """Testes para exportação e mescla de métricas"""
+    
+    def test_export_and_merge(self):
+        """Testa mescla de registros de coletores diferentes"""
+        worker1 = MetricsCollector()
+        worker2 = MetricsCollector()
+        worker1.record_action(user_id=0, scenario='A', duration=1.0, success=True)
+        worker2.record_action(user_id=1, scenario='A', duration=3.0, success=False, error='x')
+        
+        parent = MetricsCollector()
+        parent.merge(worker1.export())
+        parent.merge(worker2.export())
+        
+        summary = parent.get_metrics()['summary']
+        assert summary['total_actions'] == 2
+        assert summary['failed_actions'] == 1
+        assert summary['response_time']['max'] == 3.0
+
+
+class TestShardedRun:
+    """Testes de integração do modo multi-processo"""
+    
+    @pytest.mark.slow
+    def test_run_with_workers(self, fake_appium_server):
+        """Testa execução com dois processos worker"""
+        test = LoadTest('Sharded', duration=2, virtual_users=4, engine='asyncio', workers=2)
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2'],
+                          appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        
+        results = test.run()
+        
+        user_ids = {m['user_id'] for m in results.metrics['action_metrics']}
+        assert results.total_actions > 0
+        assert user_ids == {0, 1, 2, 3}
+        assert len(fake_appium_server.commands('POST', '/session')) == 4
+    
+    @pytest.mark.slow
+    def test_warmup_before_shared_start(self, fake_appium_server):
+        """Testa relógio iniciado depois do warm-up de todos os shards"""
+        test = LoadTest('Sharded', duration=1, virtual_users=2, workers=2)
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2'],
+                          appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.set_warmup(backoff=0.5, jitter=0)
+        fake_appium_server.refuse_sessions = 1  # um dos shards só fica pronto após o backoff
+        
+        results = test.run()
+        
+        warmup = results.metrics['warmup_metrics']
+        first_action = min(
+            datetime.fromisoformat(m['timestamp']).timestamp() for m in results.metrics['action_metrics']
+        )
+        assert len(warmup) == 2 and max(m['attempts'] for m in warmup) == 2
+        assert max(m['finished'] for m in warmup) <= results.start_time <= first_action
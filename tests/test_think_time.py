@@ -0,0 +1,103 @@
+"""
+Testes para think time e pacing
+"""
+
+import random
+import pytest
+from mobileloadx.core.think_time import ThinkTime
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+
+
+class TestThinkTime:
+    """Testes para as distribuições de think time"""
+    
+    def test_parse(self):
+        """Testa conversão de número e dicionário"""
+        assert ThinkTime.parse(2) == ThinkTime(mean=2.0)
+        assert ThinkTime.parse({'distribution': 'uniform', 'min': 1, 'max': 3}) == ThinkTime('uniform', min=1, max=3)
+        assert ThinkTime.parse(None) is None
+    
+    @pytest.mark.parametrize('spec, low, high', [
+        ({'mean': 1.5}, 1.5, 1.5),
+        ({'distribution': 'uniform', 'min': 1, 'max': 2}, 1, 2),
+        ({'distribution': 'normal', 'mean': 1, 'stddev': 5, 'max': 3}, 0, 3),
+        ({'distribution': 'exponential', 'mean': 1, 'min': 0.5}, 0.5, float('inf')),
+    ])
+    def test_sample_within_bounds(self, spec, low, high):
+        """Testa limites das amostras de cada distribuição"""
+        think_time = ThinkTime.parse(spec)
+        rng = random.Random(1)
+        samples = [think_time.sample(rng) for _ in range(500)]
+        
+        assert all(low <= sample <= high for sample in samples)
+    
+    def test_exponential_mean(self):
+        """Testa média da distribuição exponencial"""
+        think_time = ThinkTime('exponential', mean=2)
+        rng = random.Random(7)
+        samples = [think_time.sample(rng) for _ in range(5000)]
+        
+        assert sum(samples) / len(samples) == pytest.approx(2, rel=0.1)
+    
+    def test_invalid_config(self):
+        """Testa validação da configuração"""
+        with pytest.raises(ValueError, match='desconhecida'):
+            ThinkTime('poisson')
+        
+        with pytest.raises(ValueError, match='requer max'):
+            ThinkTime('uniform', min=1)
+        
+        with pytest.raises(ValueError, match='Pacing'):
+            Scenario('Flow', pacing=-1)
+
+
+class TestScenarioThinkTime:
+    """Testes para think time e pacing no cenário"""
+    
+    def test_action_overrides_scenario(self):
+        """Testa think time da ação substituindo o do cenário"""
+        scenario = Scenario('Flow', think_time=1).tap(id='a').tap(id='b', think_time=3)
+        
+        assert [scenario.think_after(action) for action in scenario.actions] == [1, 3]
+        assert 'think_time' not in scenario.actions[1].params
+    
+    def test_roundtrip(self):
+        """Testa serialização para os workers distribuídos"""
+        scenario = Scenario('Flow', think_time={'distribution': 'uniform', 'min': 1, 'max': 2}, pacing=10)
+        scenario.tap(id='a', think_time=0.5)
+        
+        restored = Scenario.from_dict(scenario.to_dict())
+        
+        assert restored.think_time == scenario.think_time
+        assert restored.pacing == 10
+        assert restored.actions[0].think_time == ThinkTime(mean=0.5)
+        assert restored.actions[0].params == {'id': 'a'}
+
+
+class TestLoadTestPacing:
+    """Testes para think time e pacing na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_think_time_excluded_from_duration(self, fake_appium_server, engine):
+        """Testa se o think time não entra na duração medida"""
+        test = LoadTest('Think', duration=0.3, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow', think_time=0.2).tap(id='button'))
+        
+        results = test.run()
+        
+        durations = [m['duration'] for m in results.metrics['action_metrics'] if m['success']]
+        assert durations
+        assert max(durations) < 0.15
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_pacing_limits_iterations(self, fake_appium_server, engine):
+        """Testa intervalo fixo entre o início das iterações"""
+        test = LoadTest('Pacing', duration=0.5, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow', pacing=0.2).tap(id='button'))
+        
+        results = test.run()
+        
+        assert 2 <= results.total_actions <= 3
@@ -0,0 +1,151 @@
+"""
+Testes para os tempos por ação e por transação
+"""
+
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario, ScenarioRun
+from mobileloadx.core.virtual_user import VirtualUser
+from mobileloadx.metrics.collector import MetricsCollector
+
+
+class TestScenarioRun:
+    """Testes para o registro de tempos da execução do cenário"""
+    
+    def test_lookup_separated_from_interaction(self, mock_driver):
+        """Testa separação entre busca do elemento e interação"""
+        def slow_until(condition):
+            time.sleep(0.05)
+            return MagicMock()
+        
+        with patch('mobileloadx.core.scenario.WebDriverWait') as mock_wait_class:
+            mock_wait_class.return_value.until.side_effect = slow_until
+            run = Scenario('Flow').tap(id='login').back().execute(mock_driver, 'android')
+        
+        tap, back = run.steps
+        assert (tap['step'], tap['action'], back['action']) == (1, 'tap login', 'back')
+        assert tap['lookup'] >= 0.05
+        assert tap['interaction'] == pytest.approx(tap['duration'] - tap['lookup'])
+        assert back['lookup'] == 0
+    
+    def test_transaction_covers_actions(self, mock_driver):
+        """Testa duração da transação com as ações do grupo"""
+        scenario = Scenario('Flow').transaction_start('Login').back().wait(0.05).transaction_end('Login')
+        
+        run = scenario.execute(mock_driver, 'android')
+        
+        assert [t['name'] for t in run.transactions] == ['Login']
+        assert run.transactions[0]['duration'] >= 0.05
+        assert run.transactions[0]['success'] is True
+    
+    def test_think_time_not_in_transaction(self, mock_driver):
+        """Testa desconto do think time dentro da transação"""
+        scenario = Scenario('Flow', think_time=0.1).transaction_start('Login').back().transaction_end('Login')
+        
+        run = scenario.execute(mock_driver, 'android')
+        
+        assert run.paused >= 0.1
+        assert run.transactions[0]['duration'] < 0.05
+    
+    def test_failure_records_elapsed_time(self, mock_driver):
+        """Testa registro da falha com o tempo real, fechando a transação aberta"""
+        mock_driver.back.side_effect = RuntimeError('tela travada')
+        scenario = Scenario('Flow').transaction_start('Checkout').wait(0.05).back().transaction_end('Checkout')
+        run = ScenarioRun()
+        
+        with pytest.raises(RuntimeError):
+            scenario.execute(mock_driver, 'android', run=run)
+        
+        assert [step['success'] for step in run.steps] == [True, False]
+        assert run.steps[1]['error'] == 'tela travada'
+        assert run.transactions[0]['success'] is False
+        assert run.transactions[0]['duration'] >= 0.05
+
+
+class TestTransactionValidation:
+    """Testes para a validação dos marcadores de transação"""
+    
+    def test_end_without_start(self):
+        """Testa erro ao fechar transação não aberta"""
+        with pytest.raises(ValueError, match="não foi aberta"):
+            Scenario('Flow').transaction_end('Login')
+    
+    def test_duplicate_start(self):
+        """Testa erro ao abrir transação já aberta"""
+        with pytest.raises(ValueError, match="já está aberta"):
+            Scenario('Flow').transaction_start('Login').transaction_start('Login')
+    
+    def test_missing_name_on_load(self):
+        """Testa erro de carregamento sem nome de transação"""
+        with pytest.raises(ValueError, match='requer name'):
+            Scenario.from_dict({'name': 'Flow', 'actions': [{'transaction_start': {}}]})
+    
+    def test_roundtrip(self):
+        """Testa serialização dos marcadores"""
+        scenario = Scenario('Flow').transaction_start('Login').tap(id='a').transaction_end('Login')
+        
+        restored = Scenario.from_dict(scenario.to_dict())
+        
+        assert [action.label for action in restored.actions] == ['Login', 'tap a', 'Login']
+
+
+class TestStepMetrics:
+    """Testes para o resumo por ação e por transação"""
+    
+    def test_summary_groups_by_step_and_transaction(self):
+        """Testa agregação por ação do cenário e por transação"""
+        collector = MetricsCollector()
+        for duration, lookup in [(0.2, 0.15), (0.4, 0.25)]:
+            collector.record_step(1, 'Flow', 1, 'tap login', duration, lookup, True)
+        collector.record_step(1, 'Flow', 2, 'back', 0.1, 0.0, False, error='x')
+        collector.record_step(1, 'Flow', 2, 'back', 9.0, 0.0, True, overtime=True)
+        collector.record_transaction(1, 'Flow', 'Login', 0.5, True)
+        collector.record_transaction(1, 'Flow', 'Login', 0.7, False)
+        
+        summary = collector._calculate_summary()
+        
+        assert list(summary['steps']['Flow']) == ['1. tap login', '2. back']
+        tap = summary['steps']['Flow']['1. tap login']
+        assert tap['count'] == 2
+        assert tap['avg'] == pytest.approx(0.3)
+        assert tap['lookup_avg'] == pytest.approx(0.2)
+        assert tap['interaction_avg'] == pytest.approx(0.1)
+        assert summary['steps']['Flow']['2. back']['count'] == 1
+        assert summary['transactions']['Login']['count'] == 2
+        assert summary['transactions']['Login']['error_rate'] == 50
+    
+    def test_failed_scenario_keeps_duration(self, mock_driver):
+        """Testa se falhas não entram com duração zero"""
+        collector = MetricsCollector()
+        mock_driver.back.side_effect = RuntimeError('falhou')
+        user = VirtualUser(1, 'android', '/app.apk', scenarios=[(Scenario('Flow').wait(0.05).back(), 100)],
+                           metrics_collector=collector)
+        user.driver = mock_driver
+        user.is_active = True
+        
+        user.execute_scenario()
+        
+        record = collector.action_metrics[0]
+        assert record['success'] is False
+        assert record['duration'] >= 0.05
+
+
+class TestLoadTestSteps:
+    """Testes para os tempos por ação na execução"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_results_include_steps_and_transactions(self, fake_appium_server, engine):
+        """Testa tempos por ação e por transação nos resultados"""
+        test = LoadTest('Steps', duration=0.3, virtual_users=1, engine=engine)
+        test.add_platform('android', '/app.apk', appium_server_url=fake_appium_server.url)
+        test.add_scenario(
+            Scenario('Flow').transaction_start('Login').tap(id='login').input('user').transaction_end('Login').back()
+        )
+        
+        results = test.run()
+        
+        assert list(results.steps['Flow']) == ['2. tap login', '3. input', '5. back']
+        assert results.transactions['Login']['count'] >= 1
+        assert results.to_dict()['summary']['transactions']['Login']['failed'] == 0
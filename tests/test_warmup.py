@@ -0,0 +1,222 @@
+"""
+Testes para a fase de warm-up
+"""
+
+import asyncio
+import socket
+import threading
+import time
+import pytest
+from mobileloadx.core.warmup import WarmupConfig, WarmupError, run_warmup, run_warmup_async
+from mobileloadx.core.load_test import LoadTest
+from mobileloadx.core.scenario import Scenario
+from mobileloadx.core.sharding import split_shards
+from mobileloadx.core.distributed import shard_from_dict, shard_to_dict
+
+
+class TestWarmupConfig:
+    """Testes para o backoff do warm-up"""
+    
+    def test_exponential_backoff_is_capped(self):
+        """Testa backoff exponencial limitado a max_backoff"""
+        config = WarmupConfig(backoff=1, max_backoff=5, jitter=0)
+        
+        assert [config.delay(attempt) for attempt in range(4)] == [1, 2, 4, 5]
+    
+    def test_jitter_range(self):
+        """Testa variação do atraso dentro do jitter"""
+        config = WarmupConfig(backoff=2, jitter=0.5)
+        delays = [config.delay(0) for _ in range(200)]
+        
+        assert all(1 <= delay <= 3 for delay in delays)
+        assert len(set(delays)) > 1
+    
+    def test_invalid_config(self):
+        """Testa validação da configuração"""
+        with pytest.raises(ValueError, match='Concorrência'):
+            WarmupConfig(concurrency=0)
+        
+        with pytest.raises(ValueError, match='Jitter'):
+            WarmupConfig(jitter=2)
+
+
+class TestRunWarmup:
+    """Testes para a execução do warm-up"""
+    
+    def test_retries_until_ready(self):
+        """Testa novas tentativas após falhas"""
+        failures = {'a': 2}
+        records = []
+        
+        def bring_up(item):
+            if failures.get(item, 0) > 0:
+                failures[item] -= 1
+                raise ConnectionError('Appium ocupado')
+        
+        ready = run_warmup(
+            ['a', 'b'], bring_up,
+            WarmupConfig(backoff=0, retries=2),
+            lambda item, duration, attempts, error: records.append((item, attempts, error))
+        )
+        
+        assert ready == 2
+        assert sorted(records) == [('a', 3, None), ('b', 1, None)]
+    
+    def test_concurrency_limit(self):
+        """Testa limite de sessões criadas ao mesmo tempo"""
+        lock = threading.Lock()
+        running = [0, 0]  # atual, máximo
+        
+        def bring_up(item):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+        
+        run_warmup(list(range(8)), bring_up, WarmupConfig(concurrency=2), lambda *args: None)
+        
+        assert running[1] == 2
+    
+    def test_fails_below_min_ready(self):
+        """Testa erro quando o mínimo de sessões não fica pronto"""
+        def bring_up(item):
+            if item == 'bad':
+                raise ConnectionError('sem device')
+        
+        config = WarmupConfig(backoff=0, retries=1)
+        
+        with pytest.raises(WarmupError, match='1/2'):
+            run_warmup(['ok', 'bad'], bring_up, config, lambda *args: None)
+        
+        relaxed = WarmupConfig(backoff=0, retries=1, min_ready=1, concurrency=1)
+        assert run_warmup(['ok', 'bad'], bring_up, relaxed, lambda *args: None) == 1
+    
+    def test_timeout_skips_waiting_items(self):
+        """Testa itens ainda na fila registrados como timeout depois do prazo"""
+        calls = []
+        records = []
+        
+        def bring_up(item):
+            calls.append(item)
+            time.sleep(0.2)
+            raise ConnectionError('Appium ocupado')
+        
+        config = WarmupConfig(concurrency=1, retries=0, timeout=0.5)
+        run_warmup(list(range(10)), bring_up, config, lambda *args: records.append(args), strict=False)
+        
+        assert len(calls) == 3
+        assert len(records) == 10
+        skipped = [(attempts, error) for _, _, attempts, error in records[3:]]
+        assert skipped == [(0, 'Prazo do warm-up esgotado (0.5s)')] * 7
+    
+    def test_async_timeout_skips_waiting_items(self):
+        """Testa prazo do warm-up para corrotinas aguardando o semáforo"""
+        calls = []
+        
+        async def bring_up(item):
+            calls.append(item)
+            await asyncio.sleep(0.2)
+        
+        config = WarmupConfig(concurrency=1, timeout=0.5)
+        asyncio.run(run_warmup_async(list(range(10)), bring_up, config, lambda *args: None, strict=False))
+        
+        assert len(calls) == 3
+    
+    def test_duration_includes_retries(self):
+        """Testa latência do item medida desde a primeira tentativa"""
+        failures = {'a': 2}
+        records = []
+        
+        def bring_up(item):
+            if failures[item] > 0:
+                failures[item] -= 1
+                raise ConnectionError('Appium ocupado')
+        
+        config = WarmupConfig(backoff=0.05, jitter=0, retries=2)
+        run_warmup(['a'], bring_up, config, lambda item, duration, attempts, error: records.append(duration))
+        
+        (duration,) = records
+        assert duration >= 0.15
+    
+    def test_async_concurrency_limit(self):
+        """Testa limite de concorrência na versão asyncio"""
+        running = [0, 0]
+        
+        async def bring_up(item):
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+        
+        ready = asyncio.run(run_warmup_async(
+            list(range(6)), bring_up, WarmupConfig(concurrency=3), lambda *args: None
+        ))
+        
+        assert ready == 6
+        assert running[1] == 3
+
+
+class TestLoadTestWarmup:
+    """Testes para o warm-up no LoadTest"""
+    
+    @pytest.mark.parametrize('engine', ['thread', 'asyncio'])
+    def test_sessions_ready_before_measurement(self, fake_appium_server, engine):
+        """Testa criação das sessões antes do início da medição"""
+        test = LoadTest('Warmup', duration=0.3, virtual_users=3, engine=engine)
+        test.add_platform('android', '/app.apk', devices=['d1', 'd2'], appium_server_url=fake_appium_server.url)
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.set_warmup(concurrency=2)
+        
+        results = test.run()
+        
+        assert results.warmup['ready'] == 3
+        assert set(results.warmup['devices']) == {'d1', 'd2'}
+        assert results.sessions['pool_hits'] == 3
+        assert len(fake_appium_server.commands('POST', '/session')) == 3
+        assert len(fake_appium_server.commands('DELETE')) == 3
+        
+        warmup_end = max(m['finished'] for m in results.metrics['warmup_metrics'])
+        assert warmup_end <= results.start_time
+    
+    def test_incomplete_warmup_aborts_test(self):
+        """Testa interrupção do teste quando o warm-up falha"""
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            closed_port = sock.getsockname()[1]
+        
+        test = LoadTest('Warmup', duration=10, virtual_users=2, engine='asyncio')
+        test.add_platform('android', '/app.apk', appium_server_url=f'http://127.0.0.1:{closed_port}')
+        test.add_scenario(Scenario('Flow').tap(id='button'))
+        test.set_warmup(retries=1, backoff=0)
+        
+        with pytest.raises(WarmupError):
+            test.run()
+        
+        assert test.is_running is False
+    
+    def test_warmup_from_config(self, temp_dir):
+        """Testa carregamento do warm-up do arquivo de configuração"""
+        import yaml
+        
+        config_file = temp_dir / 'config.yaml'
+        with open(config_file, 'w') as f:
+            yaml.dump({
+                'test': {'name': 'T', 'duration': 10},
+                'warmup': {'concurrency': 8, 'min_ready': 4}
+            }, f)
+        
+        test = LoadTest('Test', config_file=str(config_file))
+        
+        assert test.warmup == WarmupConfig(concurrency=8, min_ready=4)
+    
+    def test_shards_scale_min_ready(self):
+        """Testa divisão de min_ready entre os workers"""
+        test = LoadTest('Test', virtual_users=4)
+        test.add_platform('android', '/app.apk')
+        test.set_warmup(min_ready=4)
+        
+        shards = [shard_from_dict(shard_to_dict(shard)) for shard in split_shards(test, 2)]
+        
+        assert [shard.warmup.min_ready for shard in shards] == [2, 2]